@@ -17,6 +17,11 @@ from agents.base.llm_reasoner import (
     SpecializedReasoner,
 )
 from agents.base.message_bus import Message, MessageBus
+from agents.base.message_log import (
+    JsonFilePersistence,
+    MessagePersistence,
+    SegmentedLogPersistence,
+)
 from agents.base.model_selector import (
     ModelConfig,
     ModelRequirements,
@@ -24,6 +29,7 @@ from agents.base.model_selector import (
     TaskComplexity,
 )
 from agents.base.prompt_templates import PromptTemplate, PromptTemplates
+from agents.base.response_cache import PersistentResponseCache
 from agents.base.resource_monitor import ResourceThresholds, SystemResourceMonitor
 from agents.base.state_manager import AgentState, StateManager, StateSnapshot
 
@@ -37,17 +43,21 @@ __all__ = [
     "AnomalyAnalyzer",
     "DiagnosisAnalyzer",
     "LLMReasoner",
+    "JsonFilePersistence",
     "Message",
     "MessageBus",
+    "MessagePersistence",
     "ModelConfig",
     "ModelRequirements",
     "OllamaModelSelector",
+    "PersistentResponseCache",
     "PromptTemplate",
     "PromptTemplates",
     "ReasoningResult",
     "RecommendationGenerator",
     "ResourceThresholds",
     "ResponseFormat",
+    "SegmentedLogPersistence",
     "SpecializedReasoner",
     "SystemResourceMonitor",
     "TaskComplexity",
@@ -16,7 +16,9 @@ Example usage:
 """
 import json
 import logging
+import os
 import re
+import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
@@ -24,9 +26,45 @@ from typing import Dict, Any, List, Optional, Callable, Union
 
 from agents.base.model_selector import OllamaModelSelector, TaskComplexity
 from agents.base.prompt_templates import PromptTemplate, PromptTemplates
+from agents.base.response_cache import PersistentResponseCache, get_response_cache
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool limits for the shared Ollama HTTP client
+HTTP_MAX_CONNECTIONS = 8
+HTTP_MAX_KEEPALIVE = 4
+HTTP_KEEPALIVE_EXPIRY = 120.0
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client():
+    """Get the process-wide keep-alive HTTP client, creating it on first use.
+
+    Reusing one client keeps TCP connections to Ollama open between calls
+    instead of reconnecting for every request.
+
+    Returns:
+        Shared httpx.Client
+
+    Raises:
+        ImportError: If httpx is not installed
+    """
+    global _http_client
+    import httpx
+
+    with _http_client_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                )
+            )
+        return _http_client
+
 
 class ResponseFormat(str, Enum):
     """Supported response formats for LLM reasoning."""
@@ -80,11 +118,13 @@ class LLMReasoner:
     - JSON response parsing and validation
     - Error handling and retries
     - Timeout management
+    - Optional persistent response cache
 
     Attributes:
         model_selector: OllamaModelSelector for choosing models
         default_timeout: Default timeout in seconds
         max_retries: Maximum retry attempts for failed calls
+        response_cache: PersistentResponseCache shared across reasoners, or None
 
     Example:
         >>> reasoner = LLMReasoner()
@@ -104,7 +144,8 @@ class LLMReasoner:
         model_selector: Optional[OllamaModelSelector] = None,
         default_timeout: float = DEFAULT_TIMEOUT,
         max_retries: int = MAX_RETRIES,
-        ollama_host: Optional[str] = None
+        ollama_host: Optional[str] = None,
+        response_cache: Optional[PersistentResponseCache] = None
     ):
         """Initialize the LLMReasoner.
 
@@ -113,6 +154,8 @@ class LLMReasoner:
             default_timeout: Default timeout in seconds (max 60).
             max_retries: Maximum retry attempts for failed calls.
             ollama_host: Ollama API host. Uses OLLAMA_HOST env var or localhost.
+            response_cache: Response cache to use. Opens the shared cache at
+                LLM_CACHE_PATH if None and the env var is set.
         """
         self.model_selector = model_selector or OllamaModelSelector(
             ollama_host=ollama_host
@@ -121,10 +164,21 @@ class LLMReasoner:
         self.max_retries = max_retries
         self.ollama_host = ollama_host or self.model_selector.ollama_host
 
+        cache_path = os.getenv('LLM_CACHE_PATH')
+        if response_cache is None and cache_path:
+            response_cache = get_response_cache(
+                cache_path,
+                ttl_hours=float(os.getenv('LLM_CACHE_TTL_HOURS', '24'))
+            )
+        self.response_cache = response_cache
+
         # Track usage stats
         self._total_calls = 0
         self._successful_calls = 0
         self._total_tokens = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._latency_saved_ms = 0
 
         logger.debug(
             f"LLMReasoner initialized with timeout={self.default_timeout}s, "
@@ -191,22 +245,54 @@ class LLMReasoner:
         # Build final prompt
         final_prompt = self._build_prompt(prompt, system_prompt, fmt)
 
+        # Serve identical requests from the cache
+        cache_options = self._cache_options(config)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(final_prompt, model, fmt.value, cache_options)
+            if cached is not None:
+                content, validation_errors = self._format_response(
+                    cached.response, fmt, schema
+                )
+                self._cache_hits += 1
+                self._latency_saved_ms += cached.latency_ms
+                self._successful_calls += 1
+                duration_ms = int((time.time() - start_time) * 1000)
+                logger.info(f"Reasoning served from cache: model={model}, format={fmt.value}")
+                return ReasoningResult(
+                    success=True,
+                    content=content,
+                    raw_response=cached.response,
+                    model_used=model,
+                    duration_ms=duration_ms,
+                    validation_errors=validation_errors
+                )
+            self._cache_misses += 1
+
         # Execute with retries
         last_error = None
         for attempt in range(self.max_retries + 1):
             try:
+                call_start = time.time()
                 raw_response = self._call_ollama(
                     model=model,
                     prompt=final_prompt,
                     config=config,
                     timeout=timeout
                 )
+                call_ms = int((time.time() - call_start) * 1000)
 
                 # Format response
                 content, validation_errors = self._format_response(
                     raw_response, fmt, schema
                 )
 
+                # Only cache responses that parsed and validated cleanly
+                if self.response_cache is not None and not validation_errors:
+                    self.response_cache.set(
+                        final_prompt, model, fmt.value, cache_options,
+                        raw_response, latency_ms=call_ms
+                    )
+
                 duration_ms = int((time.time() - start_time) * 1000)
 
                 # Track success
@@ -365,6 +451,21 @@ class LLMReasoner:
 
         return "\n".join(parts)
 
+    @staticmethod
+    def _cache_options(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Generation options that affect output, used in the cache key.
+
+        Args:
+            config: Model execution configuration
+
+        Returns:
+            Options dictionary
+        """
+        return {
+            "temperature": config.get("temperature", 0.7),
+            "num_ctx": config.get("num_ctx", 4096),
+        }
+
     def _call_ollama(
         self,
         model: str,
@@ -406,7 +507,7 @@ class LLMReasoner:
 
             logger.debug(f"Calling Ollama: model={model}, timeout={timeout}s")
 
-            response = httpx.post(
+            response = _get_http_client().post(
                 f"{self.ollama_host}/api/generate",
                 json=payload,
                 timeout=timeout
@@ -563,6 +664,10 @@ class LLMReasoner:
             'successful_calls': self._successful_calls,
             'success_rate': success_rate,
             'total_tokens': self._total_tokens,
+            'cache_enabled': self.response_cache is not None,
+            'cache_hits': self._cache_hits,
+            'cache_misses': self._cache_misses,
+            'latency_saved_ms': self._latency_saved_ms,
         }
 
     def reset_stats(self):
@@ -570,6 +675,9 @@ class LLMReasoner:
         self._total_calls = 0
         self._successful_calls = 0
         self._total_tokens = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._latency_saved_ms = 0
 
     def estimate_complexity(self, prompt: str) -> str:
         """Estimate task complexity from prompt text.
@@ -589,9 +697,7 @@ class LLMReasoner:
             True if Ollama is reachable, False otherwise
         """
         try:
-            import httpx
-
-            response = httpx.get(
+            response = _get_http_client().get(
                 f"{self.ollama_host}/api/tags",
                 timeout=5.0
             )
@@ -1,7 +1,15 @@
-"""Inter-agent message bus with async pub/sub, persistence, and dead letter handling."""
+"""Inter-agent message bus with async pub/sub, persistence, and dead letter handling.
 
+Routing throughput can be measured with:
+
+    python -m agents.base.message_bus --benchmark --messages 5000
+"""
+
+import argparse
 import asyncio
-import json
+import random
+import tempfile
+import time
 import uuid
 from collections import defaultdict
 from dataclasses import asdict, dataclass
@@ -9,7 +17,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Coroutine, Dict, List, Optional, Set
 
-import aiofiles
+from agents.base.message_log import MessagePersistence, SegmentedLogPersistence
 
 
 @dataclass
@@ -65,19 +73,138 @@ class Message:
 MessageHandler = Callable[[Message], Coroutine[Any, Any, bool]]
 
 
+class _TopicNode:
+    """Trie node for one topic segment."""
+
+    __slots__ = ('children', 'exact', 'prefix', 'through')
+
+    def __init__(self):
+        self.children: Dict[str, '_TopicNode'] = {}
+        # Patterns without '#' that end at this node
+        self.exact: Set[str] = set()
+        # '#' patterns whose literal prefix ends at this node
+        self.prefix: Set[str] = set()
+        # '#' patterns whose literal prefix passes through or ends at this node
+        self.through: Set[str] = set()
+
+
+class TopicIndex:
+    """Subscription patterns indexed as a trie over dot-separated segments.
+    
+    Matching follows MessageBus._topic_matches: '*' matches exactly one
+    segment; a pattern containing '#' matches when it agrees with the topic
+    over their common length, and a '#' segment matches everything after it.
+    Routing a topic visits only trie paths that can match it instead of
+    testing every subscribed pattern.
+    """
+
+    def __init__(self):
+        self._root = _TopicNode()
+        self._patterns: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._patterns
+
+    @staticmethod
+    def _segments(pattern: str):
+        """Split a pattern into (segments, is_prefix_pattern)."""
+        parts = pattern.split('.')
+        if '#' not in pattern:
+            return parts, False
+        if '#' in parts:
+            parts = parts[:parts.index('#')]
+        return parts, True
+
+    def add(self, pattern: str):
+        """Index a pattern (no-op if already present)."""
+        if pattern in self._patterns:
+            return
+        self._patterns.add(pattern)
+
+        parts, is_prefix = self._segments(pattern)
+        node = self._root
+        if is_prefix:
+            node.through.add(pattern)
+        for part in parts:
+            node = node.children.setdefault(part, _TopicNode())
+            if is_prefix:
+                node.through.add(pattern)
+        (node.prefix if is_prefix else node.exact).add(pattern)
+
+    def remove(self, pattern: str):
+        """Remove a pattern and prune nodes left empty."""
+        if pattern not in self._patterns:
+            return
+        self._patterns.discard(pattern)
+
+        parts, is_prefix = self._segments(pattern)
+        path = [self._root]
+        for part in parts:
+            path.append(path[-1].children[part])
+
+        (path[-1].prefix if is_prefix else path[-1].exact).discard(pattern)
+        if is_prefix:
+            for node in path:
+                node.through.discard(pattern)
+
+        for depth in range(len(parts), 0, -1):
+            node = path[depth]
+            if node.children or node.exact or node.through:
+                break
+            del path[depth - 1].children[parts[depth - 1]]
+
+    def match(self, topic: str) -> Set[str]:
+        """Return all indexed patterns matching a topic."""
+        parts = topic.split('.')
+        matched: Set[str] = set()
+        frontier = [self._root]
+
+        for part in parts:
+            next_frontier = []
+            for node in frontier:
+                matched |= node.prefix
+                child = node.children.get(part)
+                if child is not None:
+                    next_frontier.append(child)
+                if part != '*':
+                    star = node.children.get('*')
+                    if star is not None:
+                        next_frontier.append(star)
+            frontier = next_frontier
+            if not frontier:
+                return matched
+
+        for node in frontier:
+            matched |= node.exact
+            # '#' patterns longer than the topic still match on the common prefix
+            matched |= node.through
+        return matched
+
+
 class MessageBus:
     """Async message bus for inter-agent communication."""
 
-    def __init__(self, persistence_path: str = "./data/messages"):
+    def __init__(
+        self,
+        persistence_path: str = "./data/messages",
+        persistence: Optional[MessagePersistence] = None
+    ):
         """Initialize message bus.
         
         Args:
             persistence_path: Path to store persisted messages
+            persistence: Storage backend. Defaults to a segmented log
+                under persistence_path.
         """
         self.persistence_path = Path(persistence_path)
         self.persistence_path.mkdir(parents=True, exist_ok=True)
+        self._persistence = persistence or SegmentedLogPersistence(str(self.persistence_path))
         
         self._subscribers: Dict[str, Set[str]] = defaultdict(set)
+        self._topic_index = TopicIndex()
         self._handlers: Dict[str, MessageHandler] = {}
         self._message_queues: Dict[str, asyncio.Queue] = defaultdict(lambda: asyncio.Queue())
         self._dead_letter_queue: asyncio.Queue = asyncio.Queue()
@@ -102,6 +229,9 @@ class MessageBus:
         
         self._running = True
         
+        # Replay recent history from the persisted log
+        await self._restore_history()
+        
         # Start worker for each subscriber
         for subscriber_id in self._handlers:
             task = asyncio.create_task(self._process_messages(subscriber_id))
@@ -122,6 +252,25 @@ class MessageBus:
         # Wait for tasks to complete
         await asyncio.gather(*self._worker_tasks, return_exceptions=True)
         self._worker_tasks.clear()
+        
+        # Flush pending writes
+        try:
+            await self._persistence.close()
+        except Exception as e:
+            print(f"Error closing message persistence: {e}")
+
+    async def _restore_history(self):
+        """Load the most recent persisted messages into in-memory history."""
+        try:
+            await self._persistence.open()
+            records = await self._persistence.query(limit=self._max_history)
+        except Exception as e:
+            print(f"Error restoring message history: {e}")
+            return
+        
+        known = {m.message_id for m in self._message_history}
+        restored = [Message.from_dict(r) for r in records if r['message_id'] not in known]
+        self._message_history = (restored + self._message_history)[-self._max_history:]
 
     async def subscribe(
         self,
@@ -140,6 +289,7 @@ class MessageBus:
             True if subscription successful
         """
         self._subscribers[topic].add(subscriber_id)
+        self._topic_index.add(topic)
         self._handlers[subscriber_id] = handler
         
         # Start worker if bus is running and worker doesn't exist
@@ -163,6 +313,8 @@ class MessageBus:
         """
         if topic in self._subscribers:
             self._subscribers[topic].discard(subscriber_id)
+            if not self._subscribers[topic]:
+                self._topic_index.remove(topic)
             
             # Remove from all topics if no longer subscribed to any
             if not any(subscriber_id in subs for subs in self._subscribers.values()):
@@ -236,15 +388,8 @@ class MessageBus:
         
         # Find matching subscribers
         subscribers = set()
-        
-        # Exact match
-        if message.topic in self._subscribers:
-            subscribers.update(self._subscribers[message.topic])
-        
-        # Wildcard match (simple implementation)
-        for topic_pattern in self._subscribers:
-            if self._topic_matches(message.topic, topic_pattern):
-                subscribers.update(self._subscribers[topic_pattern])
+        for topic_pattern in self._topic_index.match(message.topic):
+            subscribers.update(self._subscribers[topic_pattern])
         
         # Queue message for each subscriber
         for subscriber_id in subscribers:
@@ -342,15 +487,8 @@ class MessageBus:
         Args:
             message: Message to persist
         """
-        date_str = message.timestamp.strftime("%Y%m%d")
-        message_dir = self.persistence_path / date_str
-        message_dir.mkdir(exist_ok=True)
-        
-        message_file = message_dir / f"{message.message_id}.json"
-        
         try:
-            async with aiofiles.open(message_file, 'w') as f:
-                await f.write(json.dumps(message.to_dict(), indent=2))
+            await self._persistence.append(message.to_dict())
         except Exception as e:
             print(f"Error persisting message {message.message_id}: {e}")
 
@@ -361,18 +499,12 @@ class MessageBus:
             message: Message that failed
             reason: Reason for failure
         """
-        dlq_dir = self.persistence_path / "dead_letters"
-        dlq_dir.mkdir(exist_ok=True)
-        
-        dlq_file = dlq_dir / f"{message.message_id}.json"
-        
         data = message.to_dict()
         data['dead_letter_reason'] = reason
         data['dead_letter_timestamp'] = datetime.now().isoformat()
         
         try:
-            async with aiofiles.open(dlq_file, 'w') as f:
-                await f.write(json.dumps(data, indent=2))
+            await self._persistence.append(data, dead_letter=True)
         except Exception as e:
             print(f"Error persisting dead letter {message.message_id}: {e}")
 
@@ -401,6 +533,34 @@ class MessageBus:
         
         return history[-limit:]
 
+    async def query_history(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        dead_letters: bool = False
+    ) -> List[Message]:
+        """Query persisted message history.
+        
+        Unlike get_message_history, this reads the persisted log and is not
+        limited to the in-memory window.
+        
+        Args:
+            topic: Optional topic filter
+            since: Only messages at or after this time
+            until: Only messages at or before this time
+            limit: Maximum number of messages to return
+            dead_letters: Query dead letters instead of published messages
+            
+        Returns:
+            List of messages, oldest first
+        """
+        records = await self._persistence.query(
+            topic=topic, since=since, until=until, limit=limit, dead_letters=dead_letters
+        )
+        return [Message.from_dict(r) for r in records]
+
 
 async def main():
     """Test message bus."""
@@ -449,5 +609,96 @@ async def main():
     print("\nAll tests passed!")
 
 
+class _NullPersistence(MessagePersistence):
+    """Persistence backend that stores nothing, for routing benchmarks."""
+
+    async def append(self, record: Dict[str, Any], dead_letter: bool = False):
+        pass
+
+    async def query(self, topic=None, since=None, until=None, limit=100, dead_letters=False):
+        return []
+
+
+async def benchmark(
+    subscription_counts: tuple = (10, 1000, 10000),
+    messages: int = 2000,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Compare publish throughput of trie routing against a linear pattern scan.
+    
+    Each subscriber listens on 'agent.<n>.<event>', 'agent.<n>.*' or
+    'agent.<n>.#'; messages go to random agent topics. Persistence is disabled
+    so only routing and queueing are timed.
+    
+    Args:
+        subscription_counts: Subscription counts to test
+        messages: Messages published per run
+        seed: Random seed
+        
+    Returns:
+        One dict per subscription count with messages/sec for both strategies
+    """
+    events = ['created', 'updated', 'failed', 'completed', 'heartbeat']
+    results = []
+    
+    async def handler(message: Message) -> bool:
+        return True
+    
+    for count in subscription_counts:
+        rng = random.Random(seed)
+        agents = max(1, count // 3)
+        patterns = []
+        for i in range(count):
+            agent = i % agents
+            kind = i % 3
+            if kind == 0:
+                patterns.append(f"agent.{agent}.{rng.choice(events)}")
+            elif kind == 1:
+                patterns.append(f"agent.{agent}.*")
+            else:
+                patterns.append(f"agent.{agent}.#")
+        topics = [f"agent.{rng.randrange(agents)}.{rng.choice(events)}" for _ in range(messages)]
+        
+        rates = {}
+        for strategy in ('trie', 'linear'):
+            with tempfile.TemporaryDirectory() as tmp:
+                bus = MessageBus(persistence_path=tmp, persistence=_NullPersistence())
+                for i, pattern in enumerate(patterns):
+                    await bus.subscribe(f"sub_{i}", pattern, handler)
+                
+                if strategy == 'linear':
+                    bus._topic_index.match = lambda topic, bus=bus: {
+                        p for p in bus._subscribers if bus._topic_matches(topic, p)
+                    }
+                
+                start = time.perf_counter()
+                for topic in topics:
+                    await bus.publish(topic, "benchmark", {})
+                rates[strategy] = messages / (time.perf_counter() - start)
+        
+        results.append({
+            'subscriptions': count,
+            'trie_msgs_per_sec': round(rates['trie']),
+            'linear_msgs_per_sec': round(rates['linear']),
+            'speedup': round(rates['trie'] / rates['linear'], 1),
+        })
+    
+    return results
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Message bus smoke test and routing benchmark")
+    parser.add_argument('--benchmark', action='store_true', help="Run the routing benchmark")
+    parser.add_argument('--messages', type=int, default=2000, help="Messages per benchmark run")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        for row in asyncio.run(benchmark(messages=args.messages)):
+            print(
+                f"{row['subscriptions']:>6} subscriptions: "
+                f"trie {row['trie_msgs_per_sec']:>8} msg/s, "
+                f"linear {row['linear_msgs_per_sec']:>8} msg/s "
+                f"({row['speedup']}x)"
+            )
+    else:
+        asyncio.run(main())
@@ -0,0 +1,433 @@
+"""Pluggable persistence backends for the message bus.
+
+SegmentedLogPersistence (the default) appends messages and dead letters as
+compact JSON lines to size-bounded segment files. Appends that arrive close
+together are group-committed: they are buffered for a few milliseconds and
+written with a single write and fsync. Each segment keeps an in-memory index of
+record timestamps and offsets per topic, so history queries read only the
+matching records, newest segment first, holding at most ``limit`` messages.
+
+JsonFilePersistence keeps the original one-JSON-file-per-message layout.
+"""
+
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiofiles
+
+# Segment files roll over once they reach this size
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Oldest segments beyond this count are deleted on rollover
+DEFAULT_MAX_SEGMENTS = 32
+
+# How long an append waits for others to share its write and fsync
+DEFAULT_COMMIT_INTERVAL = 0.002
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+
+# Index key for "all topics" within a segment
+_ALL = None
+
+
+class MessagePersistence(ABC):
+    """Storage backend used by MessageBus for messages and dead letters."""
+
+    async def open(self):
+        """Prepare the backend (recover state, build indexes)."""
+
+    @abstractmethod
+    async def append(self, record: Dict[str, Any], dead_letter: bool = False):
+        """Durably store one message record.
+
+        Args:
+            record: Message dictionary (Message.to_dict() plus dead letter fields)
+            dead_letter: Whether the record is a dead letter
+        """
+
+    @abstractmethod
+    async def query(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        dead_letters: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Return the newest ``limit`` matching records, oldest first.
+
+        Args:
+            topic: Optional exact topic filter
+            since: Only records at or after this time
+            until: Only records at or before this time
+            limit: Maximum number of records
+            dead_letters: Query dead letters instead of messages
+
+        Returns:
+            List of record dictionaries
+        """
+
+    async def replay(self, since: Optional[datetime] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield stored message records in append order.
+
+        Args:
+            since: Only records at or after this time
+        """
+        for record in await self.query(since=since, limit=2 ** 31):
+            yield record
+
+    async def close(self):
+        """Flush pending writes and release resources."""
+
+
+def _record_time(record: Dict[str, Any]) -> float:
+    return datetime.fromisoformat(record['timestamp']).timestamp()
+
+
+class JsonFilePersistence(MessagePersistence):
+    """One pretty-printed JSON file per message, grouped into per-day directories."""
+
+    def __init__(self, path: str):
+        """Initialize backend.
+
+        Args:
+            path: Root directory for message files
+        """
+        self.path = Path(path)
+
+    async def append(self, record: Dict[str, Any], dead_letter: bool = False):
+        if dead_letter:
+            directory = self.path / "dead_letters"
+        else:
+            directory = self.path / datetime.fromisoformat(record['timestamp']).strftime("%Y%m%d")
+        directory.mkdir(parents=True, exist_ok=True)
+
+        async with aiofiles.open(directory / f"{record['message_id']}.json", 'w') as f:
+            await f.write(json.dumps(record, indent=2))
+
+    async def query(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        dead_letters: bool = False
+    ) -> List[Dict[str, Any]]:
+        if dead_letters:
+            files = list((self.path / "dead_letters").glob("*.json"))
+        else:
+            files = [
+                f for day in self.path.glob("[0-9]" * 8) for f in day.glob("*.json")
+            ]
+
+        records = []
+        for file in files:
+            try:
+                record = json.loads(file.read_text())
+            except (OSError, ValueError):
+                continue
+            if topic and record.get('topic') != topic:
+                continue
+            ts = datetime.fromisoformat(record['timestamp'])
+            if (since and ts < since) or (until and ts > until):
+                continue
+            records.append(record)
+
+        records.sort(key=lambda r: r['timestamp'])
+        return records[-limit:] if limit else []
+
+
+class _Segment:
+    """One log file plus its in-memory topic/timestamp index."""
+
+    __slots__ = ('path', 'size', 'min_ts', 'max_ts', 'messages', 'dead_letters')
+
+    def __init__(self, path: Path, size: int = 0):
+        self.path = path
+        self.size = size
+        self.min_ts = float('inf')
+        self.max_ts = float('-inf')
+        # topic (or _ALL) -> (timestamps, offsets), in append order
+        self.messages: Dict[Optional[str], Tuple[array, array]] = {}
+        self.dead_letters: Dict[Optional[str], Tuple[array, array]] = {}
+
+    def add(self, topic: str, ts: float, offset: int, dead_letter: bool):
+        index = self.dead_letters if dead_letter else self.messages
+        for key in (topic, _ALL):
+            entry = index.get(key)
+            if entry is None:
+                entry = index[key] = (array('d'), array('Q'))
+            entry[0].append(ts)
+            entry[1].append(offset)
+        self.min_ts = min(self.min_ts, ts)
+        self.max_ts = max(self.max_ts, ts)
+
+
+class SegmentedLogPersistence(MessagePersistence):
+    """Append-only segmented JSON-lines log with group commit."""
+
+    def __init__(
+        self,
+        path: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+        commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+        fsync: bool = True
+    ):
+        """Initialize backend. Nothing is read or created until first use.
+
+        Args:
+            path: Directory holding the segment files
+            segment_bytes: Size at which a segment is rolled over
+            max_segments: Number of segments retained
+            commit_interval: Seconds an append waits to share a commit
+            fsync: Whether each commit is fsynced
+        """
+        self.path = Path(path)
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+
+        self._segments: List[_Segment] = []
+        self._file = None
+        self._opened = False
+        self._open_lock = asyncio.Lock()
+        self._pending: List[Tuple[Dict[str, Any], bool, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+        self._stats = {
+            'records': 0,
+            'commits': 0,
+            'segments': 0
+        }
+
+    async def open(self):
+        """Scan existing segments, truncate a torn tail and rebuild the index."""
+        async with self._open_lock:
+            if not self._opened:
+                await asyncio.to_thread(self._recover)
+                self._opened = True
+
+    def _recover(self):
+        self._segments = []
+        self._stats['records'] = 0
+        paths = sorted(self.path.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+        for i, path in enumerate(paths):
+            segment = _Segment(path)
+            offset = 0
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("torn write")
+                        record = json.loads(line)
+                        segment.add(
+                            record['topic'], _record_time(record), offset,
+                            'dead_letter_reason' in record
+                        )
+                    except (ValueError, KeyError):
+                        # Only the tail of the newest segment can be partial
+                        if i == len(paths) - 1:
+                            break
+                        raise
+                    offset += len(line)
+            if offset < path.stat().st_size:
+                os.truncate(path, offset)
+            segment.size = offset
+            self._segments.append(segment)
+            self._stats['records'] += len(segment.messages.get(_ALL, ((), ()))[0])
+
+        if not self._segments:
+            self._segments.append(_Segment(self._segment_path(0)))
+        self._stats['segments'] = len(self._segments)
+
+    def _segment_path(self, number: int) -> Path:
+        return self.path / f"{SEGMENT_PREFIX}{number:012d}{SEGMENT_SUFFIX}"
+
+    async def append(self, record: Dict[str, Any], dead_letter: bool = False):
+        """Queue a record for the next group commit and wait until it is written.
+
+        Args:
+            record: Message dictionary
+            dead_letter: Whether the record is a dead letter
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((record, dead_letter, future))
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_pending())
+
+        await future
+
+    async def _flush_pending(self):
+        while self._pending:
+            if self.commit_interval:
+                await asyncio.sleep(self.commit_interval)
+
+            batch, self._pending = self._pending, []
+            try:
+                await self.open()
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._stats['commits'] += 1
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], bool, asyncio.Future]]):
+        """Write one group commit, rolling segments over as they fill."""
+        segment = self._segments[-1]
+        buffer = bytearray()
+        entries = []
+
+        if self._file is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._file = open(segment.path, 'ab')
+
+        for record, dead_letter, _ in batch:
+            line = (json.dumps(record, separators=(',', ':'), default=str) + '\n').encode()
+            if segment.size and segment.size + len(buffer) + len(line) > self.segment_bytes:
+                self._commit(segment, buffer, entries)
+                buffer, entries = bytearray(), []
+                segment = self._roll_over()
+
+            entries.append((record['topic'], _record_time(record), segment.size + len(buffer), dead_letter))
+            buffer += line
+
+        self._commit(segment, buffer, entries)
+        self._stats['records'] += len(batch)
+
+    def _commit(self, segment: _Segment, data: bytes, entries: List[tuple]):
+        """Write and sync data, then make its records visible to queries."""
+        if not data:
+            return
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        segment.size += len(data)
+        for entry in entries:
+            segment.add(*entry)
+
+    def _roll_over(self) -> _Segment:
+        self._file.close()
+        number = int(self._segments[-1].path.stem[len(SEGMENT_PREFIX):]) + 1
+        segment = _Segment(self._segment_path(number))
+        self._segments.append(segment)
+        self._file = open(segment.path, 'ab')
+
+        while len(self._segments) > self.max_segments:
+            expired = self._segments.pop(0)
+            try:
+                expired.path.unlink()
+            except FileNotFoundError:
+                pass
+
+        self._stats['segments'] = len(self._segments)
+        return segment
+
+    async def query(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        dead_letters: bool = False
+    ) -> List[Dict[str, Any]]:
+        await self.open()
+        if limit <= 0:
+            return []
+
+        lo = since.timestamp() if since else float('-inf')
+        hi = until.timestamp() if until else float('inf')
+
+        # Walk the index newest-first, collecting at most `limit` offsets
+        wanted: List[Tuple[Path, List[int]]] = []
+        remaining = limit
+        for segment in reversed(list(self._segments)):
+            if segment.max_ts < lo or segment.min_ts > hi:
+                continue
+            index = segment.dead_letters if dead_letters else segment.messages
+            entry = index.get(topic if topic else _ALL)
+            if entry is None:
+                continue
+
+            timestamps, offsets = entry
+            selected = []
+            for i in range(len(offsets) - 1, -1, -1):
+                if lo <= timestamps[i] <= hi:
+                    selected.append(offsets[i])
+                    remaining -= 1
+                    if not remaining:
+                        break
+            if selected:
+                wanted.append((segment.path, selected[::-1]))
+            if not remaining:
+                break
+
+        return await asyncio.to_thread(self._read_records, wanted[::-1])
+
+    @staticmethod
+    def _read_records(wanted: List[Tuple[Path, List[int]]]) -> List[Dict[str, Any]]:
+        records = []
+        for path, offsets in wanted:
+            try:
+                with open(path, 'rb') as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        records.append(json.loads(f.readline()))
+            except FileNotFoundError:
+                # Segment dropped by retention while we were reading
+                continue
+        return records
+
+    async def replay(self, since: Optional[datetime] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield stored message records in append order, one segment at a time.
+
+        Args:
+            since: Only records at or after this time
+        """
+        await self.open()
+        lo = since.timestamp() if since else float('-inf')
+
+        for segment in list(self._segments):
+            entry = segment.messages.get(_ALL)
+            if entry is None or segment.max_ts < lo:
+                continue
+            timestamps, offsets = entry
+            selected = [offsets[i] for i in range(len(offsets)) if timestamps[i] >= lo]
+            for record in await asyncio.to_thread(self._read_records, [(segment.path, selected)]):
+                yield record
+
+    async def close(self):
+        """Wait for pending commits and close the active segment."""
+        if self._flusher is not None:
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._opened = False
+        self._segments = []
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get log statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        return self._stats.copy()
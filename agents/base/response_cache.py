@@ -0,0 +1,350 @@
+"""
+Persistent LLM Response Cache
+
+SQLite-backed prompt/response cache shared by every LLMReasoner in a process
+(and by separate processes pointing at the same file). Identical prompts sent
+to the same model with the same generation options are answered from disk
+instead of re-running inference.
+
+Features:
+- SHA256 hash of (prompt + model + format + options) as cache key, built the
+  same way as insights_core.prompts.cache.ResponseCache
+- TTL-based expiration
+- Size-based eviction by entry count and total stored bytes (least recently
+  used first)
+- Hit/miss counters and the generation latency saved by hits
+
+Example usage:
+    >>> from agents.base.response_cache import get_response_cache
+    >>> cache = get_response_cache("/var/cache/gsc/llm_responses.db")
+    >>> cached = cache.get(prompt, "llama3.2:3b", "json", {"temperature": 0.7})
+    >>> if cached is None:
+    ...     raw = call_model(prompt)
+    ...     cache.set(prompt, "llama3.2:3b", "json", {"temperature": 0.7}, raw, latency_ms=850)
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default TTL for cached responses
+DEFAULT_TTL_HOURS = 24
+
+# Default size limits before least-recently-used entries are evicted
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    cached_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses (last_access);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A response served from the cache.
+
+    Attributes:
+        response: Raw response text as returned by the model
+        latency_ms: Generation latency of the original call in milliseconds
+        hit_count: Number of times the entry has been served
+    """
+    response: str
+    latency_ms: int
+    hit_count: int
+
+
+class PersistentResponseCache:
+    """SQLite-backed cache of raw LLM responses.
+
+    Attributes:
+        path: Database file path (':memory:' for a process-local cache)
+        ttl_seconds: Entry lifetime in seconds
+        max_entries: Maximum number of entries kept
+        max_bytes: Maximum total size of stored responses in bytes
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_hours: float = DEFAULT_TTL_HOURS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Database file path; parent directories are created
+            ttl_hours: Time-to-live for entries in hours
+            max_entries: Maximum entries before LRU eviction
+            max_bytes: Maximum stored response bytes before LRU eviction
+        """
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+
+        if path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._latency_saved_ms = 0
+
+        logger.debug(
+            f"PersistentResponseCache opened: path={path}, ttl={ttl_hours}h, "
+            f"max_entries={max_entries}, max_bytes={max_bytes}"
+        )
+
+    @staticmethod
+    def _make_key(
+        prompt: str,
+        model: str,
+        response_format: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate cache key from prompt, model, format and options.
+
+        Args:
+            prompt: The full prompt string
+            model: Model name
+            response_format: Requested response format ('json' or 'text')
+            options: Generation options that change the output
+
+        Returns:
+            SHA256 hex digest as cache key
+        """
+        content = json.dumps({
+            "prompt": prompt,
+            "model": model,
+            "format": response_format,
+            "options": options or {},
+        }, sort_keys=True, default=str)
+
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(
+        self,
+        prompt: str,
+        model: str,
+        response_format: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Optional[CachedResponse]:
+        """Get a cached response if present and not expired.
+
+        Args:
+            prompt: The full prompt string
+            model: Model name
+            response_format: Requested response format
+            options: Generation options
+
+        Returns:
+            CachedResponse on a hit, None otherwise
+        """
+        key = self._make_key(prompt, model, response_format, options)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, latency_ms, hit_count, cached_at "
+                "FROM llm_responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            response, latency_ms, hit_count, cached_at = row
+            if now - cached_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_responses SET last_access = ?, hit_count = hit_count + 1 "
+                "WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+            self._hits += 1
+            self._latency_saved_ms += latency_ms
+
+        return CachedResponse(response=response, latency_ms=latency_ms, hit_count=hit_count + 1)
+
+    def set(
+        self,
+        prompt: str,
+        model: str,
+        response_format: str,
+        options: Optional[Dict[str, Any]],
+        response: str,
+        latency_ms: int = 0
+    ) -> None:
+        """Store a response and evict old entries if over the size limits.
+
+        Args:
+            prompt: The full prompt string
+            model: Model name
+            response_format: Requested response format
+            options: Generation options
+            response: Raw response text
+            latency_ms: Generation latency of the call in milliseconds
+        """
+        key = self._make_key(prompt, model, response_format, options)
+        size = len(response.encode())
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, response, size_bytes, latency_ms, cached_at, last_access, hit_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, model, response, size, int(latency_ms), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones over the limits."""
+        self._conn.execute(
+            "DELETE FROM llm_responses WHERE cached_at < ?",
+            (time.time() - self.ttl_seconds,)
+        )
+
+        count, total_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # Walk entries from least to most recently used until both limits hold
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size_bytes FROM llm_responses ORDER BY last_access"
+        ):
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total_bytes -= size
+
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", doomed)
+        logger.debug(f"Evicted {len(doomed)} cached responses")
+
+    def invalidate_by_model(self, model: str) -> int:
+        """Remove all entries for a model.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM llm_responses WHERE model = ?", (model,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self) -> int:
+        """Remove all entries and reset statistics.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM llm_responses").rowcount
+            self._conn.commit()
+            self._hits = 0
+            self._misses = 0
+            self._latency_saved_ms = 0
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dict with cache metrics
+        """
+        with self._lock:
+            count, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+            ).fetchone()
+            total_requests = self._hits + self._misses
+            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0.0
+
+            return {
+                "entries": count,
+                "bytes": total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_hours": self.ttl_seconds / 3600,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_percent": round(hit_rate, 2),
+                "latency_saved_ms": self._latency_saved_ms,
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        """Get number of cached entries."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+
+_caches: Dict[str, PersistentResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(path: str, **kwargs) -> PersistentResponseCache:
+    """Get the process-wide cache for a database path, opening it once.
+
+    Args:
+        path: Database file path
+        **kwargs: Passed to PersistentResponseCache on first open
+
+    Returns:
+        Shared PersistentResponseCache instance
+    """
+    key = os.path.abspath(path) if path != ':memory:' else path
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = PersistentResponseCache(path, **kwargs)
+            _caches[key] = cache
+        return cache
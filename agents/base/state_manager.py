@@ -1,4 +1,16 @@
-"""Agent state management with persistence, transitions, and recovery."""
+"""Agent state management with persistence, transitions, and recovery.
+
+Each agent is persisted as two files under the storage path:
+
+- ``<agent_id>.json``: a compact snapshot of the current state and data,
+  replaced atomically (write to a temp file, then rename)
+- ``<agent_id>.history.jsonl``: an append-only log of transitions and data
+  updates, one JSON record per line
+
+The snapshot records how many log bytes it already reflects, so recovery loads
+the snapshot and replays only the log tail written after it. In write-behind
+mode changes are coalesced per agent and flushed on an interval or on close().
+"""
 
 import asyncio
 import json
@@ -8,10 +20,16 @@ from dataclasses import asdict, dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import aiofiles
 
+# Seconds between write-behind flushes
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# The history log is compacted once it holds this many times max_history records
+LOG_COMPACTION_FACTOR = 2
+
 
 class StateTransitionError(Exception):
     """Raised when an invalid state transition is attempted."""
@@ -81,14 +99,24 @@ class StateManager:
         AgentState.TERMINATED: []
     }
 
-    def __init__(self, storage_path: str = "./data/agent_states"):
+    def __init__(
+        self,
+        storage_path: str = "./data/agent_states",
+        write_behind: bool = False,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    ):
         """Initialize state manager.
         
         Args:
             storage_path: Path to store state files
+            write_behind: Coalesce changes and flush them in the background
+                instead of writing on every change
+            flush_interval: Seconds between write-behind flushes
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
         
         self._states: Dict[str, AgentState] = {}
         self._state_data: Dict[str, Dict[str, Any]] = defaultdict(dict)
@@ -96,6 +124,13 @@ class StateManager:
         self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         
         self._max_history = 100
+        
+        # Log records not yet written, and per-agent log size/record count on disk
+        self._pending_log: Dict[str, List[str]] = defaultdict(list)
+        self._log_sizes: Dict[str, int] = {}
+        self._log_counts: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def initialize_agent(self, agent_id: str, initial_data: Optional[Dict[str, Any]] = None) -> bool:
         """Initialize a new agent with state.
@@ -121,6 +156,7 @@ class StateManager:
                 timestamp=datetime.now()
             )
             self._history[agent_id].append(snapshot)
+            self._log(agent_id, snapshot.to_dict())
             
             await self._persist_state(agent_id)
             return True
@@ -174,6 +210,7 @@ class StateManager:
                 metadata=metadata
             )
             self._history[agent_id].append(snapshot)
+            self._log(agent_id, snapshot.to_dict())
             
             # Trim history if needed
             if len(self._history[agent_id]) > self._max_history:
@@ -221,6 +258,11 @@ class StateManager:
                 return False
             
             self._state_data[agent_id].update(data)
+            self._log(agent_id, {
+                'agent_id': agent_id,
+                'update': data,
+                'timestamp': datetime.now().isoformat()
+            })
             await self._persist_state(agent_id)
             return True
 
@@ -248,53 +290,173 @@ class StateManager:
         Returns:
             True if recovery successful
         """
-        state_file = self.storage_path / f"{agent_id}.json"
-        if not state_file.exists():
+        # Don't let unflushed changes be overwritten by older disk state
+        if agent_id in self._dirty:
+            await self.flush(agent_id)
+        
+        state_file = self._state_file(agent_id)
+        log_file = self._log_file(agent_id)
+        if not state_file.exists() and not log_file.exists():
             return False
         
         try:
-            async with aiofiles.open(state_file, 'r') as f:
-                content = await f.read()
-                data = json.loads(content)
+            data = {}
+            if state_file.exists():
+                async with aiofiles.open(state_file, 'r') as f:
+                    data = json.loads(await f.read())
+            
+            log_bytes = b''
+            if log_file.exists():
+                async with aiofiles.open(log_file, 'rb') as f:
+                    log_bytes = await f.read()
+            
+            state = AgentState(data['state']) if 'state' in data else None
+            state_data = data.get('data', {})
+            history = [StateSnapshot.from_dict(s) for s in data.get('history', [])]
+            
+            # Replay the log: history from every transition, state from the tail
+            offset = data.get('log_offset', 0)
+            position = 0
+            records = 0
+            for line in log_bytes.splitlines(keepends=True):
+                if not line.endswith(b'\n'):
+                    break  # torn final write
+                record = json.loads(line)
+                if 'update' in record:
+                    if position >= offset:
+                        state_data.update(record['update'])
+                else:
+                    history.append(StateSnapshot.from_dict(record))
+                    if position >= offset:
+                        state = AgentState(record['state'])
+                        state_data = dict(record['data'])
+                position += len(line)
+                records += 1
+            
+            if state is None:
+                return False
             
             async with self._locks[agent_id]:
-                self._states[agent_id] = AgentState(data['state'])
-                self._state_data[agent_id] = data['data']
-                
-                # Restore history if available
-                if 'history' in data:
-                    self._history[agent_id] = [
-                        StateSnapshot.from_dict(snapshot_dict)
-                        for snapshot_dict in data['history']
-                    ]
+                self._states[agent_id] = state
+                self._state_data[agent_id] = state_data
+                self._history[agent_id] = history[-self._max_history:]
+                if position < len(log_bytes):
+                    os.truncate(log_file, position)
+                self._log_sizes[agent_id] = position
+                self._log_counts[agent_id] = records
             
             return True
         except Exception as e:
             print(f"Error recovering state for {agent_id}: {e}")
             return False
 
+    def _state_file(self, agent_id: str) -> Path:
+        return self.storage_path / f"{agent_id}.json"
+
+    def _log_file(self, agent_id: str) -> Path:
+        return self.storage_path / f"{agent_id}.history.jsonl"
+
+    def _log(self, agent_id: str, record: Dict[str, Any]):
+        """Queue a record for the agent's history log."""
+        self._pending_log[agent_id].append(json.dumps(record, separators=(',', ':')) + '\n')
+
     async def _persist_state(self, agent_id: str):
-        """Persist agent state to disk.
+        """Persist agent state, or schedule it in write-behind mode.
         
         Args:
             agent_id: Agent identifier
         """
-        state_file = self.storage_path / f"{agent_id}.json"
+        if not self.write_behind:
+            await self._write_agent(agent_id)
+            return
         
-        data = {
-            'agent_id': agent_id,
-            'state': self._states[agent_id].value,
-            'data': self._state_data[agent_id],
-            'last_updated': datetime.now().isoformat(),
-            'history': [snapshot.to_dict() for snapshot in self._history[agent_id][-10:]]
-        }
+        self._dirty.add(agent_id)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Flush dirty agents every flush_interval until none are left."""
+        while self._dirty:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self, agent_id: Optional[str] = None):
+        """Write pending changes to disk.
+        
+        Args:
+            agent_id: Only flush this agent (default: all dirty agents)
+        """
+        agent_ids = [agent_id] if agent_id else list(self._dirty)
+        for aid in agent_ids:
+            if aid not in self._dirty:
+                continue
+            async with self._locks[aid]:
+                self._dirty.discard(aid)
+                if aid in self._states:
+                    await self._write_agent(aid)
+
+    async def close(self):
+        """Flush pending changes and stop the write-behind task."""
+        await self.flush()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+
+    async def _write_agent(self, agent_id: str):
+        """Append pending log records, then atomically replace the snapshot.
+        
+        Caller must hold the agent's lock (or be the only writer).
+        
+        Args:
+            agent_id: Agent identifier
+        """
+        lines = self._pending_log.pop(agent_id, [])
+        log_file = self._log_file(agent_id)
         
         try:
-            async with aiofiles.open(state_file, 'w') as f:
-                await f.write(json.dumps(data, indent=2))
+            if lines:
+                chunk = ''.join(lines).encode()
+                if agent_id in self._log_sizes:
+                    async with aiofiles.open(log_file, 'ab') as f:
+                        await f.write(chunk)
+                    self._log_sizes[agent_id] += len(chunk)
+                    self._log_counts[agent_id] += len(lines)
+                else:
+                    # First write for this agent in this process starts a fresh log
+                    await self._replace_file(log_file, chunk)
+                    self._log_sizes[agent_id] = len(chunk)
+                    self._log_counts[agent_id] = len(lines)
+            
+            # Compact: keep only the retained history once the log grows too long
+            if self._log_counts.get(agent_id, 0) > LOG_COMPACTION_FACTOR * self._max_history:
+                history = self._history[agent_id][-self._max_history:]
+                chunk = ''.join(
+                    json.dumps(snapshot.to_dict(), separators=(',', ':')) + '\n'
+                    for snapshot in history
+                ).encode()
+                await self._replace_file(log_file, chunk)
+                self._log_sizes[agent_id] = len(chunk)
+                self._log_counts[agent_id] = len(history)
+            
+            data = {
+                'agent_id': agent_id,
+                'state': self._states[agent_id].value,
+                'data': self._state_data[agent_id],
+                'last_updated': datetime.now().isoformat(),
+                'log_offset': self._log_sizes.get(agent_id, 0)
+            }
+            await self._replace_file(self._state_file(agent_id), json.dumps(data).encode())
         except Exception as e:
             print(f"Error persisting state for {agent_id}: {e}")
 
+    async def _replace_file(self, path: Path, content: bytes):
+        """Write content to a temp file and rename it over path."""
+        tmp_path = path.with_name(path.name + '.tmp')
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(content)
+        os.replace(tmp_path, path)
+
     async def cleanup_agent(self, agent_id: str) -> bool:
         """Remove agent state and cleanup resources.
         
@@ -311,11 +473,15 @@ class StateManager:
                 del self._state_data[agent_id]
             if agent_id in self._history:
                 del self._history[agent_id]
+            self._pending_log.pop(agent_id, None)
+            self._log_sizes.pop(agent_id, None)
+            self._log_counts.pop(agent_id, None)
+            self._dirty.discard(agent_id)
             
-            # Remove state file
-            state_file = self.storage_path / f"{agent_id}.json"
-            if state_file.exists():
-                state_file.unlink()
+            # Remove state files
+            for path in (self._state_file(agent_id), self._log_file(agent_id)):
+                if path.exists():
+                    path.unlink()
             
             return True
 
@@ -7,6 +7,8 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from agents.watcher.page_history import PageHistories
+
 
 @dataclass
 class Anomaly:
@@ -387,6 +389,229 @@ class AnomalyDetector:
         
         return None
 
+    def detect_batch(
+        self,
+        histories: PageHistories,
+        current_days: int,
+        min_baseline_days: int = 7,
+        traffic_threshold_percent: float = 30.0,
+        position_threshold: float = 5.0,
+        engagement_threshold_percent: float = 25.0,
+        conversion_threshold_percent: float = 20.0
+    ) -> List[Anomaly]:
+        """Run the per-page checks across all pages at once.
+
+        Vectorized equivalent of calling detect_traffic_drop,
+        detect_position_drop, detect_ctr_anomaly, detect_engagement_change,
+        detect_conversion_drop and detect_zero_traffic for every page, with
+        each page's last current_days days as the current period and the
+        days before as its baseline. NULL clicks, impressions and rates count
+        as 0 and NULL positions as 100.
+
+        Args:
+            histories: Page histories (see build_page_histories)
+            current_days: Days at the end of each history in the current period
+            min_baseline_days: Baseline days a page needs to be checked
+            traffic_threshold_percent: Click drop threshold percentage
+            position_threshold: Position drop threshold in positions
+            engagement_threshold_percent: Engagement change threshold percentage
+            conversion_threshold_percent: Conversion drop threshold percentage
+
+        Returns:
+            Anomalies with page_path set, grouped by page in histories order
+        """
+        if not len(histories) or not histories.width:
+            return []
+
+        baseline = histories.baseline_mask(current_days)
+        checked = baseline.sum(axis=1) >= min_baseline_days
+
+        clicks = np.nan_to_num(histories.metric('clicks'))
+        impressions = np.nan_to_num(histories.metric('impressions'))
+        positions = np.nan_to_num(histories.metric('avg_position'), nan=100.0)
+
+        found: List[List[Anomaly]] = [[] for _ in range(len(histories))]
+        checks = [
+            self._batch_traffic_drops(clicks, baseline, checked, traffic_threshold_percent),
+            self._batch_position_drops(positions, baseline, checked, position_threshold),
+            self._batch_ctr_anomalies(histories.metric('ctr'), baseline, checked),
+            self._batch_engagement_changes(
+                histories.metric('engagement_rate'), baseline, checked, engagement_threshold_percent
+            ),
+            self._batch_conversion_drops(
+                histories.metric('conversion_rate'), baseline, checked, conversion_threshold_percent
+            ),
+            self._batch_zero_traffic(clicks, impressions, baseline, checked),
+        ]
+        for check in checks:
+            for index, anomaly in check:
+                anomaly.page_path = histories.page_paths[index]
+                found[index].append(anomaly)
+
+        return [anomaly for page in found for anomaly in page]
+
+    def _batch_traffic_drops(self, clicks, baseline, checked, threshold_percent):
+        """Vectorized detect_traffic_drop."""
+        count, mean, _ = _baseline_stats(clicks, baseline)
+        low, high = _baseline_range(clicks, baseline)
+        current = clicks[:, -1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drop = (mean - current) / mean * 100
+        flagged = checked & (count >= self.min_data_points) & (mean != 0) & (drop > threshold_percent)
+
+        for i in np.flatnonzero(flagged):
+            yield i, Anomaly(
+                metric_name='clicks',
+                page_path='',
+                current_value=float(current[i]),
+                expected_value=float(mean[i]),
+                deviation_percent=float(drop[i]),
+                severity='critical' if drop[i] > 50 else 'warning',
+                detected_at=datetime.now(),
+                context={
+                    'threshold': threshold_percent,
+                    'historical_avg': float(mean[i]),
+                    'historical_min': float(low[i]),
+                    'historical_max': float(high[i])
+                }
+            )
+
+    def _batch_position_drops(self, positions, baseline, checked, threshold_positions):
+        """Vectorized detect_position_drop."""
+        count, mean, _ = _baseline_stats(positions, baseline)
+        best, worst = _baseline_range(positions, baseline)
+        current = positions[:, -1]
+        drop = current - mean
+        flagged = checked & (count >= self.min_data_points) & (drop > threshold_positions)
+
+        for i in np.flatnonzero(flagged):
+            yield i, Anomaly(
+                metric_name='position',
+                page_path='',
+                current_value=float(current[i]),
+                expected_value=float(mean[i]),
+                deviation_percent=float(drop[i] / mean[i] * 100),
+                severity='critical' if drop[i] > 10 else 'warning',
+                detected_at=datetime.now(),
+                context={
+                    'threshold': threshold_positions,
+                    'position_drop': float(drop[i]),
+                    'historical_avg': float(mean[i]),
+                    'historical_best': float(best[i]),
+                    'historical_worst': float(worst[i])
+                }
+            )
+
+    def _batch_ctr_anomalies(self, ctrs, baseline, checked):
+        """Vectorized detect_ctr_anomaly (baseline skips NULL and zero CTRs)."""
+        mask = baseline & (np.nan_to_num(ctrs) != 0)
+        count, mean, std = _baseline_stats(ctrs, mask)
+        current = np.nan_to_num(ctrs[:, -1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score = np.abs((current - mean) / std)
+        flagged = (
+            checked & (count >= self.min_data_points) & (count >= 2)
+            & (std != 0) & (z_score > self.sensitivity)
+        )
+
+        for i in np.flatnonzero(flagged):
+            deviation = (current[i] - mean[i]) / mean[i] * 100 if mean[i] > 0 else 0
+            yield i, Anomaly(
+                metric_name='ctr',
+                page_path='',
+                current_value=float(current[i]),
+                expected_value=float(mean[i]),
+                deviation_percent=float(abs(deviation)),
+                severity='critical' if z_score[i] > self.sensitivity * 1.5 else 'warning',
+                detected_at=datetime.now(),
+                context={
+                    'z_score': float(z_score[i]),
+                    'std_dev': float(std[i]),
+                    'historical_mean': float(mean[i]),
+                    'direction': 'increase' if current[i] > mean[i] else 'decrease'
+                }
+            )
+
+    def _batch_engagement_changes(self, rates, baseline, checked, threshold_percent):
+        """Vectorized detect_engagement_change (baseline skips NULL and zero rates)."""
+        mask = baseline & (np.nan_to_num(rates) != 0)
+        count, mean, _ = _baseline_stats(rates, mask)
+        current = np.nan_to_num(rates[:, -1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.abs((current - mean) / mean * 100)
+        flagged = (
+            checked & (count >= 1) & (count >= self.min_data_points)
+            & (mean != 0) & (change > threshold_percent)
+        )
+
+        for i in np.flatnonzero(flagged):
+            yield i, Anomaly(
+                metric_name='engagement_rate',
+                page_path='',
+                current_value=float(current[i]),
+                expected_value=float(mean[i]),
+                deviation_percent=float(change[i]),
+                severity='warning' if change[i] < 50 else 'critical',
+                detected_at=datetime.now(),
+                context={
+                    'threshold': threshold_percent,
+                    'historical_avg': float(mean[i]),
+                    'direction': 'increase' if current[i] > mean[i] else 'decrease'
+                }
+            )
+
+    def _batch_conversion_drops(self, rates, baseline, checked, threshold_percent):
+        """Vectorized detect_conversion_drop (baseline skips NULL and zero rates)."""
+        filled = np.nan_to_num(rates)
+        recorded = (baseline & (filled != 0)).sum(axis=1)
+        count, mean, _ = _baseline_stats(rates, baseline & (filled > 0))
+        current = filled[:, -1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drop = (mean - current) / mean * 100
+        flagged = (
+            checked & (recorded >= 1) & (recorded >= self.min_data_points)
+            & (count > 0) & (mean != 0) & (drop > threshold_percent)
+        )
+
+        for i in np.flatnonzero(flagged):
+            yield i, Anomaly(
+                metric_name='conversion_rate',
+                page_path='',
+                current_value=float(current[i]),
+                expected_value=float(mean[i]),
+                deviation_percent=float(drop[i]),
+                severity='critical' if drop[i] > 40 else 'warning',
+                detected_at=datetime.now(),
+                context={
+                    'threshold': threshold_percent,
+                    'historical_avg': float(mean[i]),
+                    'historical_data_points': int(count[i])
+                }
+            )
+
+    def _batch_zero_traffic(self, clicks, impressions, baseline, checked):
+        """Vectorized detect_zero_traffic."""
+        count, mean, _ = _baseline_stats(clicks, baseline)
+        flagged = (
+            checked & (count >= self.min_data_points) & (mean > 10)
+            & (clicks[:, -1] == 0) & (impressions[:, -1] == 0)
+        )
+
+        for i in np.flatnonzero(flagged):
+            yield i, Anomaly(
+                metric_name='zero_traffic',
+                page_path='',
+                current_value=0,
+                expected_value=float(mean[i]),
+                deviation_percent=100,
+                severity='critical',
+                detected_at=datetime.now(),
+                context={
+                    'historical_avg_clicks': float(mean[i]),
+                    'possible_cause': 'page_deleted_or_deindexed'
+                }
+            )
+
     def calculate_baseline(
         self,
         time_series: List[float],
@@ -415,3 +640,21 @@ class AnomalyDetector:
             std_dev = 0.0
         
         return baseline, std_dev
+
+
+def _baseline_stats(values: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-row count, mean and sample standard deviation over masked cells."""
+    count = mask.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(mask, values, 0.0).sum(axis=1) / count
+        squares = np.where(mask, (values - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        std = np.sqrt(squares / (count - 1))
+    return count, mean, std
+
+
+def _baseline_range(values: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row min and max over masked cells (inf/-inf for empty rows)."""
+    return (
+        np.where(mask, values, np.inf).min(axis=1),
+        np.where(mask, values, -np.inf).max(axis=1),
+    )
@@ -0,0 +1,107 @@
+"""Bulk page history loading for the watcher agent.
+
+All page histories are read in a single query and packed into one
+right-aligned (pages x days) NumPy array per metric, so the anomaly checks
+can run across every page at once instead of one query and one pass per page.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Columns of gsc.mv_unified_page_performance used by the watcher checks
+HISTORY_METRICS = (
+    'clicks',
+    'impressions',
+    'ctr',
+    'avg_position',
+    'engagement_rate',
+    'conversion_rate',
+    'sessions',
+)
+
+
+@dataclass
+class PageHistories:
+    """Per-page metric histories, packed right-aligned.
+
+    Row i holds the history of page_paths[i]: its lengths[i] observed days
+    (oldest first) fill the last lengths[i] columns, so column -1 is each
+    page's latest day. Padding and NULL values are NaN.
+    """
+
+    page_paths: List[str]
+    lengths: np.ndarray  # int, shape (n_pages,)
+    values: Dict[str, np.ndarray]  # float64, shape (n_pages, width)
+
+    def __len__(self) -> int:
+        return len(self.page_paths)
+
+    @property
+    def width(self) -> int:
+        """Length of the longest history."""
+        return int(self.lengths.max()) if len(self.lengths) else 0
+
+    def metric(self, name: str) -> np.ndarray:
+        """(pages x width) values of one metric."""
+        if name not in self.values:
+            raise ValueError(f"Unknown metric: {name}. Available: {list(self.values)}")
+        return self.values[name]
+
+    def series(self, index: int, name: str) -> List[Optional[float]]:
+        """One page's history of a metric, oldest first (None for NULL)."""
+        length = int(self.lengths[index])
+        if not length:
+            return []
+        values = self.metric(name)[index, -length:]
+        return [None if np.isnan(v) else float(v) for v in values]
+
+    def baseline_mask(self, current_days: int) -> np.ndarray:
+        """Columns before each page's last current_days days."""
+        columns = np.arange(self.width)
+        first = self.width - self.lengths[:, None]
+        return (columns >= first) & (columns < self.width - current_days)
+
+
+def build_page_histories(
+    rows: Iterable[Mapping[str, Any]],
+    page_paths: Optional[Sequence[str]] = None,
+    metrics: Sequence[str] = HISTORY_METRICS
+) -> PageHistories:
+    """Pack rows ordered by (page_path, date) into PageHistories.
+
+    Args:
+        rows: Row mappings with page_path and the metric columns
+        page_paths: Page order of the result; pages without rows get an empty
+            history and rows for other pages are ignored (default: order of
+            first appearance)
+        metrics: Metric columns to keep
+
+    Returns:
+        PageHistories
+    """
+    grouped: Dict[str, List[Mapping[str, Any]]] = {path: [] for path in page_paths or ()}
+    for row in rows:
+        path = row['page_path']
+        if page_paths is None:
+            grouped.setdefault(path, [])
+        if path in grouped:
+            grouped[path].append(row)
+
+    paths = list(grouped)
+    lengths = np.array([len(grouped[path]) for path in paths], dtype=int)
+    width = int(lengths.max()) if len(lengths) else 0
+
+    values = {}
+    for name in metrics:
+        packed = np.full((len(paths), width), np.nan)
+        for i, path in enumerate(paths):
+            history = grouped[path]
+            if history:
+                packed[i, width - len(history):] = [
+                    np.nan if row.get(name) is None else float(row[name]) for row in history
+                ]
+        values[name] = packed
+
+    return PageHistories(page_paths=paths, lengths=lengths, values=values)
@@ -24,6 +24,7 @@ from agents.base.llm_reasoner import AnomalyAnalyzer, LLMReasoner, ReasoningResu
 from agents.base.prompt_templates import PromptTemplates
 from agents.watcher.alert_manager import Alert, AlertManager
 from agents.watcher.anomaly_detector import Anomaly, AnomalyDetector
+from agents.watcher.page_history import PageHistories, build_page_histories
 from agents.watcher.trend_analyzer import Trend, TrendAnalyzer
 
 
@@ -184,136 +185,23 @@ class WatcherAgent(AgentContract):
         Returns:
             List of detected anomalies
         """
-        anomalies = []
-        
         # Get pages with recent data
         pages = await self._get_active_pages(days, property_filter)
         
-        for page in pages:
-            page_path = page['page_path']
-            
-            # Get historical data for this page
-            historical = await self._get_page_historical_data(
-                page_path,
-                days + 30,  # Extra days for baseline
-                property_filter
-            )
-            
-            if not historical:
-                continue
-            
-            # Split into baseline and current
-            baseline_data = historical[:-days]
-            current_data = historical[-days:]
-            
-            if not current_data:
-                continue
-            
-            # Detect traffic drops
-            if len(baseline_data) >= 7:
-                current_clicks = current_data[-1].get('clicks', 0)
-                historical_clicks = [d.get('clicks', 0) for d in baseline_data]
-                
-                anomaly = self.anomaly_detector.detect_traffic_drop(
-                    current_clicks,
-                    historical_clicks,
-                    threshold_percent=30.0
-                )
-                
-                if anomaly:
-                    anomaly.page_path = page_path
-                    anomalies.append(anomaly)
-                    
-                    # Create alert
-                    await self._create_anomaly_alert(anomaly, page)
-            
-            # Detect position drops
-            if len(baseline_data) >= 7:
-                current_position = current_data[-1].get('avg_position', 100)
-                historical_positions = [d.get('avg_position', 100) for d in baseline_data]
-                
-                anomaly = self.anomaly_detector.detect_position_drop(
-                    current_position,
-                    historical_positions,
-                    threshold_positions=5.0
-                )
-                
-                if anomaly:
-                    anomaly.page_path = page_path
-                    anomalies.append(anomaly)
-                    await self._create_anomaly_alert(anomaly, page)
-            
-            # Detect CTR anomalies
-            if len(baseline_data) >= 7:
-                current_ctr = current_data[-1].get('ctr', 0)
-                historical_ctrs = [d.get('ctr', 0) for d in baseline_data if d.get('ctr')]
-                
-                anomaly = self.anomaly_detector.detect_ctr_anomaly(
-                    current_ctr,
-                    historical_ctrs
-                )
-                
-                if anomaly:
-                    anomaly.page_path = page_path
-                    anomalies.append(anomaly)
-                    await self._create_anomaly_alert(anomaly, page)
-            
-            # Detect engagement changes
-            if len(baseline_data) >= 7:
-                current_engagement = current_data[-1].get('engagement_rate', 0)
-                historical_engagement = [
-                    d.get('engagement_rate', 0) for d in baseline_data
-                    if d.get('engagement_rate')
-                ]
-                
-                if historical_engagement:
-                    anomaly = self.anomaly_detector.detect_engagement_change(
-                        current_engagement,
-                        historical_engagement,
-                        threshold_percent=25.0
-                    )
-                    
-                    if anomaly:
-                        anomaly.page_path = page_path
-                        anomalies.append(anomaly)
-                        await self._create_anomaly_alert(anomaly, page)
-            
-            # Detect conversion drops
-            if len(baseline_data) >= 7:
-                current_conversion = current_data[-1].get('conversion_rate', 0)
-                historical_conversions = [
-                    d.get('conversion_rate', 0) for d in baseline_data
-                    if d.get('conversion_rate')
-                ]
-                
-                if historical_conversions:
-                    anomaly = self.anomaly_detector.detect_conversion_drop(
-                        current_conversion,
-                        historical_conversions,
-                        threshold_percent=20.0
-                    )
-                    
-                    if anomaly:
-                        anomaly.page_path = page_path
-                        anomalies.append(anomaly)
-                        await self._create_anomaly_alert(anomaly, page)
-            
-            # Detect zero traffic (dead pages)
-            if len(baseline_data) >= 7:
-                current_clicks = current_data[-1].get('clicks', 0)
-                current_impressions = current_data[-1].get('impressions', 0)
-                historical_clicks = [d.get('clicks', 0) for d in baseline_data]
-                
-                anomaly = self.anomaly_detector.detect_zero_traffic(
-                    current_clicks,
-                    current_impressions,
-                    historical_clicks
-                )
-                
-                if anomaly:
-                    anomaly.page_path = page_path
-                    anomalies.append(anomaly)
-                    await self._create_anomaly_alert(anomaly, page)
+        # Load every page's history in one query (extra days for baseline)
+        histories = await self._get_page_histories(
+            [page['page_path'] for page in pages],
+            days + 30,
+            property_filter
+        )
+        
+        # Traffic, position, CTR, engagement, conversion and zero-traffic
+        # checks across all pages at once
+        anomalies = self.anomaly_detector.detect_batch(histories, current_days=days)
+        
+        pages_by_path = {page['page_path']: page for page in pages}
+        for anomaly in anomalies:
+            await self._create_anomaly_alert(anomaly, pages_by_path[anomaly.page_path])
         
         self._detected_anomalies = anomalies
         
@@ -338,21 +226,21 @@ class WatcherAgent(AgentContract):
         # Get pages with sufficient data
         pages = await self._get_active_pages(days * 2, property_filter)
         
-        for page in pages:
+        # Load every page's time series in one query
+        histories = await self._get_page_histories(
+            [page['page_path'] for page in pages],
+            days * 2,
+            property_filter
+        )
+        
+        for index, page in enumerate(pages):
             page_path = page['page_path']
             
-            # Get time series data
-            time_series = await self._get_page_time_series(
-                page_path,
-                days * 2,
-                property_filter
-            )
-            
-            if not time_series:
+            if not histories.lengths[index]:
                 continue
             
             # Detect linear trends in clicks
-            clicks_series = [d.get('clicks', 0) for d in time_series]
+            clicks_series = [v or 0 for v in histories.series(index, 'clicks')]
             trend = self.trend_analyzer.detect_linear_trend(clicks_series)
             
             if trend:
@@ -362,7 +250,7 @@ class WatcherAgent(AgentContract):
                 await self._create_trend_alert(trend, page)
             
             # Detect acceleration in impressions
-            impressions_series = [d.get('impressions', 0) for d in time_series]
+            impressions_series = [v or 0 for v in histories.series(index, 'impressions')]
             trend = self.trend_analyzer.detect_acceleration(impressions_series)
             
             if trend:
@@ -372,7 +260,7 @@ class WatcherAgent(AgentContract):
                 await self._create_trend_alert(trend, page)
             
             # Detect volatility
-            ctr_series = [d.get('ctr', 0) for d in time_series if d.get('ctr')]
+            ctr_series = [v for v in histories.series(index, 'ctr') if v]
             
             if ctr_series:
                 trend = self.trend_analyzer.detect_volatility(ctr_series)
@@ -805,42 +693,47 @@ class WatcherAgent(AgentContract):
         
         return [dict(row) for row in rows]
 
-    async def _get_page_historical_data(
+    async def _get_page_histories(
         self,
-        page_path: str,
+        page_paths: List[str],
         days: int,
         property_filter: Optional[str]
-    ) -> List[Dict]:
-        """Get historical data for a page."""
+    ) -> PageHistories:
+        """Get the histories of many pages in one query.
+        
+        Args:
+            page_paths: Pages to load, in result order
+            days: Number of days to look back
+            property_filter: Optional property filter
+            
+        Returns:
+            PageHistories with one row per requested page
+        """
+        if not page_paths:
+            return build_page_histories([], page_paths)
+        
         query = """
-            SELECT date, clicks, impressions, ctr, avg_position,
-                   engagement_rate, conversion_rate, sessions
+            SELECT page_path, date,
+                   COALESCE(clicks, 0) AS clicks,
+                   COALESCE(impressions, 0) AS impressions,
+                   ctr, avg_position, engagement_rate, conversion_rate, sessions
             FROM gsc.mv_unified_page_performance
-            WHERE page_path = $1
+            WHERE page_path = ANY($1::text[])
               AND date >= CURRENT_DATE - $2
         """
         
-        params = [page_path, days]
+        params = [list(page_paths), days]
         
         if property_filter:
             query += " AND property = $3"
             params.append(property_filter)
         
-        query += " ORDER BY date ASC"
+        query += " ORDER BY page_path, date ASC"
         
         async with self._pool.acquire() as conn:
             rows = await conn.fetch(query, *params)
         
-        return [dict(row) for row in rows]
-
-    async def _get_page_time_series(
-        self,
-        page_path: str,
-        days: int,
-        property_filter: Optional[str]
-    ) -> List[Dict]:
-        """Get time series data for a page."""
-        return await self._get_page_historical_data(page_path, days, property_filter)
+        return build_page_histories(rows, page_paths)
 
     async def health_check(self) -> AgentHealth:
         """Check agent health."""
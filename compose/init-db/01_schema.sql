@@ -55,6 +55,9 @@ CREATE INDEX idx_dim_query_hash ON gsc.dim_query(query_hash);
 -- =============================================
 
 -- Main fact table for GSC daily data
+-- Range-partitioned by month on date: date-bounded queries prune to the
+-- matching partitions and retention drops whole partitions.
+-- Monthly partitions are managed by sql/32_fact_gsc_daily_partitioning.sql.
 CREATE TABLE IF NOT EXISTS gsc.fact_gsc_daily (
     date DATE NOT NULL,
     property VARCHAR(500) NOT NULL,
@@ -68,16 +71,19 @@ CREATE TABLE IF NOT EXISTS gsc.fact_gsc_daily (
     position NUMERIC(10,2) DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    -- Composite primary key
+    -- Composite primary key (must include the partition key)
     PRIMARY KEY (date, property, url, query, country, device)
-);
+) PARTITION BY RANGE (date);
+
+-- Catch-all for dates without a monthly partition yet
+CREATE TABLE IF NOT EXISTS gsc.fact_gsc_daily_default
+    PARTITION OF gsc.fact_gsc_daily DEFAULT;
 
 -- Create indexes for common query patterns
-CREATE INDEX idx_fact_gsc_date ON gsc.fact_gsc_daily(date DESC);
+-- (date-leading lookups are served by the primary key and the covering index)
 CREATE INDEX idx_fact_gsc_property ON gsc.fact_gsc_daily(property);
 CREATE INDEX idx_fact_gsc_url ON gsc.fact_gsc_daily(url);
 CREATE INDEX idx_fact_gsc_query ON gsc.fact_gsc_daily(query);
-CREATE INDEX idx_fact_gsc_date_property ON gsc.fact_gsc_daily(date DESC, property);
 
 -- Create covering index for common aggregations
 CREATE INDEX idx_fact_gsc_covering ON gsc.fact_gsc_daily(
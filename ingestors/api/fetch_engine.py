@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Concurrent Fetch Engine for the Search Analytics API Ingestor
+Fans out (property, date, page-offset) work units over a bounded thread pool
+while every request still goes through the shared EnterprisRateLimiter
+"""
+
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FetchUnit:
+    """A single Search Analytics request: one page of one day for one property"""
+    property: str
+    day: date
+    start_row: int = 0
+
+
+@dataclass
+class PropertyProgress:
+    """Per-property bookkeeping used to commit days and advance the watermark"""
+    property: str
+    start_date: date
+    end_date: date
+    pending_days: Deque[date] = field(default_factory=deque)
+    buffered_rows: Dict[date, List[Dict[str, Any]]] = field(default_factory=dict)
+    completed_days: Set[date] = field(default_factory=set)
+    day_rows: Dict[date, int] = field(default_factory=dict)
+    committed_through: Optional[date] = None
+    halt_at: Optional[date] = None
+    requests: int = 0
+    rows_processed: int = 0
+    days_processed: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Render progress in the same shape as GSCAPIIngestor.ingest_property stats"""
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            'property': self.property,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'days_processed': self.days_processed,
+            'rows_processed': self.rows_processed,
+            'watermark': self.committed_through.isoformat() if self.committed_through else None,
+            'requests': self.requests,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows_processed / elapsed, 2) if elapsed > 0 else 0.0,
+            'errors': self.errors
+        }
+
+
+class ConcurrentFetchEngine:
+    """
+    Bounded-concurrency fetch pipeline for GSCAPIIngestor.
+
+    API calls run on a worker pool; transformation, upserts and watermark
+    updates stay on the calling thread so the single warehouse connection is
+    never shared between threads. Days can finish out of order, so the
+    watermark only advances over the contiguous run of committed days - a
+    crash therefore resumes from the first day that was not fully written.
+    """
+
+    def __init__(self, ingestor: Any, max_workers: int = 4):
+        """
+        Initialize the engine
+
+        Args:
+            ingestor: GSCAPIIngestor providing fetch, transform, upsert and watermark methods
+            max_workers: Maximum number of API requests in flight
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        self.ingestor = ingestor
+        self.max_workers = max_workers
+        self.progress: Dict[str, PropertyProgress] = {}
+        self._continuations: Deque[FetchUnit] = deque()
+        self._rotation: Deque[str] = deque()
+
+    def add_property(self, property: str, start_date: date, end_date: date) -> None:
+        """Queue every day in [start_date, end_date] for a property"""
+        progress = PropertyProgress(property, start_date, end_date)
+        progress.committed_through = start_date - timedelta(days=1)
+        current = start_date
+        while current <= end_date:
+            progress.pending_days.append(current)
+            current += timedelta(days=1)
+        self.progress[property] = progress
+        self._rotation.append(property)
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute all queued work units
+
+        Returns:
+            Per-property statistics keyed by property URL
+        """
+        if not self.progress:
+            return {}
+
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='gsc-fetch') as executor:
+            while True:
+                while len(in_flight) < self.max_workers:
+                    unit = self._next_unit()
+                    if unit is None:
+                        break
+                    future = executor.submit(self.ingestor.fetch_search_analytics_page,
+                                             unit.property, unit.day, unit.start_row)
+                    in_flight[future] = unit
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    unit = in_flight.pop(future)
+                    progress = self.progress[unit.property]
+                    progress.requests += 1
+                    try:
+                        page_rows = future.result()
+                    except Exception as e:
+                        self._fail_day(progress, unit, e)
+                    else:
+                        self._handle_page(progress, unit, page_rows)
+                    if not progress.pending_days and not self._has_work_for(unit.property, in_flight):
+                        progress.finished_at = progress.finished_at or time.monotonic()
+
+        results = {}
+        for property, progress in self.progress.items():
+            progress.finished_at = progress.finished_at or time.monotonic()
+            results[property] = progress.to_stats()
+            logger.info(
+                f"Concurrent ingestion for {property}: {progress.rows_processed} rows, "
+                f"{progress.days_processed} days, {results[property]['rows_per_second']} rows/s"
+            )
+        return results
+
+    def _next_unit(self) -> Optional[FetchUnit]:
+        """Pick the next unit, preferring follow-up pages, then rotating across properties"""
+        if self._continuations:
+            return self._continuations.popleft()
+
+        for _ in range(len(self._rotation)):
+            property = self._rotation[0]
+            self._rotation.rotate(-1)
+            progress = self.progress[property]
+            while progress.pending_days:
+                day = progress.pending_days.popleft()
+                if progress.halt_at is None or day < progress.halt_at:
+                    return FetchUnit(property, day)
+        return None
+
+    def _has_work_for(self, property: str, in_flight: Dict[Any, FetchUnit]) -> bool:
+        """Check whether a property still has requests queued or running"""
+        return (any(unit.property == property for unit in in_flight.values())
+                or any(unit.property == property for unit in self._continuations))
+
+    def _handle_page(self, progress: PropertyProgress, unit: FetchUnit,
+                     page_rows: List[Dict[str, Any]]) -> None:
+        """Buffer a fetched page and commit the day once its last page has arrived"""
+        buffer = progress.buffered_rows.setdefault(unit.day, [])
+        buffer.extend(page_rows)
+
+        if len(page_rows) >= self.ingestor.max_rows:
+            self._continuations.append(
+                FetchUnit(unit.property, unit.day, unit.start_row + self.ingestor.max_rows)
+            )
+            return
+
+        api_rows = progress.buffered_rows.pop(unit.day)
+        progress.days_processed += 1
+
+        if api_rows:
+            transformed_rows = [
+                self.ingestor.transform_api_row(row, unit.property)
+                for row in api_rows
+            ]
+            rows_processed = self.ingestor.upsert_data(transformed_rows)
+            progress.rows_processed += rows_processed
+            progress.day_rows[unit.day] = rows_processed
+            self._complete_day(progress, unit.day)
+            return
+
+        days_old = (date.today() - unit.day).days
+        if days_old >= self.ingestor.gsc_data_delay_days:
+            progress.day_rows[unit.day] = 0
+            self._complete_day(progress, unit.day)
+        else:
+            logger.warning(
+                f"No data for {unit.property} on {unit.day} yet "
+                f"({days_old} days old, below {self.ingestor.gsc_data_delay_days}-day threshold) - will retry later"
+            )
+            self._halt(progress, unit.day)
+
+    def _fail_day(self, progress: PropertyProgress, unit: FetchUnit, error: Exception) -> None:
+        """Record a failed unit; the watermark will not move past its day"""
+        error_msg = f"Error ingesting {unit.property} on {unit.day} (startRow={unit.start_row}): {error}"
+        logger.error(error_msg)
+        progress.errors.append(error_msg)
+        progress.buffered_rows.pop(unit.day, None)
+        self._halt(progress, unit.day)
+
+    def _halt(self, progress: PropertyProgress, day: date) -> None:
+        """Stop scheduling days at or after `day` for this property"""
+        if progress.halt_at is None or day < progress.halt_at:
+            progress.halt_at = day
+
+    def _complete_day(self, progress: PropertyProgress, day: date) -> None:
+        """Mark a day as written and advance the watermark over the contiguous prefix"""
+        progress.completed_days.add(day)
+        next_day = progress.committed_through + timedelta(days=1)
+        while next_day in progress.completed_days:
+            if progress.halt_at is not None and next_day >= progress.halt_at:
+                break
+            self.ingestor.update_watermark(progress.property, next_day,
+                                           progress.day_rows.get(next_day, 0))
+            progress.completed_days.discard(next_day)
+            progress.committed_through = next_day
+            next_day += timedelta(days=1)
@@ -9,6 +9,7 @@ import sys
 import json
 import time
 import logging
+import threading
 from datetime import datetime, timedelta, date, timezone
 from typing import List, Dict, Any, Optional, Tuple
 import psycopg2
@@ -20,6 +21,8 @@ from dotenv import load_dotenv
 
 # Import enterprise rate limiter
 from ingestors.api.rate_limiter import EnterprisRateLimiter, RateLimitConfig
+from ingestors.api.fetch_engine import ConcurrentFetchEngine
+from ingestors.bulk_loader import BulkLoader, GSC_DAILY
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +44,8 @@ class GSCAPIIngestor:
         self.config = config
         self.service = None
         self.conn = None
+        self._credentials = None
+        self._thread_local = threading.local()
         
         # Initialize enterprise rate limiter
         rate_limit_config = RateLimitConfig(
@@ -57,6 +62,13 @@ class GSCAPIIngestor:
         
         self.max_rows = int(config.get('GSC_API_ROWS_PER_PAGE', 25000))
 
+        # How rows reach fact_gsc_daily: 'insert' (execute_values upsert) or
+        # 'copy' (COPY into unlogged staging + one set-based merge)
+        self.load_method: str = str(config.get('GSC_LOAD_METHOD', 'insert')).lower()
+        if self.load_method not in ('insert', 'copy'):
+            raise ValueError("GSC_LOAD_METHOD must be 'insert' or 'copy'")
+        self._bulk_loader: Optional[BulkLoader] = None
+
         # Ingestion window configuration
         # Number of days to ingest on incremental runs
         try:
@@ -85,6 +97,14 @@ class GSCAPIIngestor:
         if self.gsc_data_delay_days < 1:
             self.gsc_data_delay_days = 4
 
+        # Number of concurrent API requests. 1 keeps the original serial
+        # property-by-property, day-by-day behaviour.
+        try:
+            self.fetch_workers: int = int(config.get('GSC_FETCH_WORKERS', 1))
+        except (TypeError, ValueError):
+            raise ValueError("GSC_FETCH_WORKERS must be a valid integer")
+        if self.fetch_workers <= 0:
+            raise ValueError("GSC_FETCH_WORKERS must be a positive integer")
         
     def connect_gsc(self) -> None:
         """Initialize Google Search Console service"""
@@ -98,6 +118,7 @@ class GSCAPIIngestor:
                     scopes=['https://www.googleapis.com/auth/webmasters.readonly']
                 )
                 self.service = build('searchconsole', 'v1', credentials=credentials)
+                self._credentials = credentials
                 logger.info("Connected to Google Search Console API")
             else:
                 # Mock service for testing
@@ -209,6 +230,116 @@ class GSCAPIIngestor:
             logger.error(f"Error checking existing data for {property}: {e}")
             return False
             
+    def _get_service(self) -> Any:
+        """
+        Return a GSC service object that is safe to use from the current thread.
+
+        The discovery client is built on httplib2, which is not thread-safe, so
+        worker threads of the concurrent fetch engine each build their own
+        client from the shared credentials. Mock services are shared as-is.
+        """
+        if self._credentials is None or threading.current_thread() is threading.main_thread():
+            return self.service
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            service = build('searchconsole', 'v1', credentials=self._credentials,
+                            cache_discovery=False)
+            self._thread_local.service = service
+        return service
+
+    def _execute_query(
+        self,
+        property: str,
+        request_body: Dict[str, Any],
+        wait_for_token: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Execute one Search Analytics request with rate limiting and retries
+
+        Args:
+            property: GSC property URL
+            request_body: Search Analytics request body
+            wait_for_token: Keep re-acquiring from the rate limiter until a token
+                is granted. Required when several threads share the limiter.
+
+        Returns:
+            Raw API response
+        """
+        service = self._get_service()
+        attempt = 0
+        while True:
+            # Acquire permission to make request
+            while True:
+                wait_time = self.rate_limiter.acquire(property)
+                if wait_time <= 0:
+                    break
+                logger.info(f"Rate limiter: waiting {wait_time:.2f}s before request")
+                time.sleep(wait_time)
+                if not wait_for_token:
+                    break
+
+            try:
+                # Make API request
+                if hasattr(service, 'searchanalytics'):
+                    response = service.searchanalytics().query(
+                        siteUrl=property,
+                        body=request_body
+                    ).execute()
+                else:
+                    # Mock response for testing
+                    response = service.query_search_analytics(
+                        property, request_body
+                    )
+
+                # Record success
+                self.rate_limiter.record_success()
+                return response
+
+            except HttpError as e:
+                if e.resp.status == 429:  # Rate limit
+                    logger.warning(f"Rate limit hit (429), attempt {attempt + 1}")
+                    self.rate_limiter.record_failure(is_rate_limit=True)
+
+                    if not self.rate_limiter.should_retry():
+                        logger.error("Max retries exceeded for rate limiting")
+                        raise
+
+                    # Get backoff time and wait
+                    backoff_time = self.rate_limiter.get_backoff_time()
+                    logger.info(f"Backing off for {backoff_time:.2f}s")
+                    time.sleep(backoff_time)
+                    attempt += 1
+
+                elif e.resp.status in [500, 503]:  # Server errors
+                    logger.warning(f"Server error ({e.resp.status}), attempt {attempt + 1}")
+                    self.rate_limiter.record_failure(is_rate_limit=False)
+
+                    if not self.rate_limiter.should_retry():
+                        logger.error("Max retries exceeded for server errors")
+                        raise
+
+                    backoff_time = self.rate_limiter.get_backoff_time()
+                    time.sleep(backoff_time)
+                    attempt += 1
+                else:
+                    # Other errors, don't retry
+                    raise
+
+            except Exception as e:
+                logger.error(f"Unexpected error during API call: {e}")
+                raise
+
+    def _build_request_body(self, start_date: date, end_date: date, start_row: int = 0) -> Dict[str, Any]:
+        """Build a Search Analytics request body"""
+        return {
+            'startDate': start_date.strftime('%Y-%m-%d'),
+            'endDate': end_date.strftime('%Y-%m-%d'),
+            'dimensions': ['page', 'query', 'country', 'device', 'date'],
+            'rowLimit': self.max_rows,
+            'startRow': start_row,
+            'dataState': 'final'  # Use final data only
+        }
+
     def fetch_search_analytics(
         self, 
         property: str, 
@@ -229,77 +360,12 @@ class GSCAPIIngestor:
         rows = []
         
         # API request body
-        request_body = {
-            'startDate': start_date.strftime('%Y-%m-%d'),
-            'endDate': end_date.strftime('%Y-%m-%d'),
-            'dimensions': ['page', 'query', 'country', 'device', 'date'],
-            'rowLimit': self.max_rows,
-            'startRow': 0,
-            'dataState': 'final'  # Use final data only
-        }
+        request_body = self._build_request_body(start_date, end_date)
         
         try:
             # Handle pagination
             while True:
-                # Apply rate limiting with exponential backoff
-                attempt = 0
-                while True:
-                    # Acquire permission to make request
-                    wait_time = self.rate_limiter.acquire(property)
-                    if wait_time > 0:
-                        logger.info(f"Rate limiter: waiting {wait_time:.2f}s before request")
-                        time.sleep(wait_time)
-                    
-                    try:
-                        # Make API request
-                        if hasattr(self.service, 'searchanalytics'):
-                            response = self.service.searchanalytics().query(
-                                siteUrl=property,
-                                body=request_body
-                            ).execute()
-                        else:
-                            # Mock response for testing
-                            response = self.service.query_search_analytics(
-                                property, request_body
-                            )
-                        
-                        # Record success
-                        self.rate_limiter.record_success()
-                        break  # Success, exit retry loop
-                        
-                    except HttpError as e:
-                        if e.resp.status == 429:  # Rate limit
-                            logger.warning(f"Rate limit hit (429), attempt {attempt + 1}")
-                            self.rate_limiter.record_failure(is_rate_limit=True)
-                            
-                            if not self.rate_limiter.should_retry():
-                                logger.error("Max retries exceeded for rate limiting")
-                                raise
-                                
-                            # Get backoff time and wait
-                            backoff_time = self.rate_limiter.get_backoff_time()
-                            logger.info(f"Backing off for {backoff_time:.2f}s")
-                            time.sleep(backoff_time)
-                            attempt += 1
-                            
-                        elif e.resp.status in [500, 503]:  # Server errors
-                            logger.warning(f"Server error ({e.resp.status}), attempt {attempt + 1}")
-                            self.rate_limiter.record_failure(is_rate_limit=False)
-                            
-                            if not self.rate_limiter.should_retry():
-                                logger.error("Max retries exceeded for server errors")
-                                raise
-                                
-                            backoff_time = self.rate_limiter.get_backoff_time()
-                            time.sleep(backoff_time)
-                            attempt += 1
-                        else:
-                            # Other errors, don't retry
-                            raise
-                            
-                    except Exception as e:
-                        logger.error(f"Unexpected error during API call: {e}")
-                        raise
+                response = self._execute_query(property, request_body)
                 
                 # Process response
                 if 'rows' in response:
@@ -318,6 +384,32 @@ class GSCAPIIngestor:
             logger.error(f"Error fetching search analytics for {property}: {e}")
             
         return rows
+
+    def fetch_search_analytics_page(
+        self,
+        property: str,
+        day: date,
+        start_row: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a single page of search analytics rows for one day.
+
+        Unlike fetch_search_analytics, errors are raised to the caller so the
+        concurrent engine can hold the watermark at the failed day.
+
+        Args:
+            property: GSC property URL
+            day: Date to fetch
+            start_row: Row offset of the page
+
+        Returns:
+            Rows of the page (fewer than max_rows means it was the last page)
+        """
+        request_body = self._build_request_body(day, day, start_row)
+        response = self._execute_query(property, request_body, wait_for_token=True)
+        page_rows = response.get('rows', [])
+        logger.debug(f"Fetched {len(page_rows)} rows for {property} on {day} (startRow={start_row})")
+        return page_rows
         
     def transform_api_row(self, row: Dict[str, Any], property: str) -> Tuple:
         """
@@ -377,6 +469,9 @@ class GSCAPIIngestor:
         if not rows:
             return 0
             
+        if self.load_method == 'copy' and not isinstance(self.conn, MockDBConnection):
+            return self._bulk_load(rows)
+
         try:
             with self.conn.cursor() as cur:
                 # Use the UPSERT pattern
@@ -403,7 +498,69 @@ class GSCAPIIngestor:
             logger.error(f"Error upserting data: {e}")
             self.conn.rollback()
             return 0
+
+    def _bulk_load(self, rows: List[Tuple]) -> int:
+        """
+        Load rows with COPY into unlogged staging and merge into the fact table
+
+        Args:
+            rows: List of tuples in transform_api_row order
+
+        Returns:
+            Number of rows processed
+        """
+        if self._bulk_loader is None or self._bulk_loader.conn is not self.conn:
+            self._bulk_loader = BulkLoader(self.conn, GSC_DAILY)
+        try:
+            loaded = self._bulk_loader.load(rows)
+            self.conn.commit()
+            logger.info(f"Bulk loaded {loaded} rows to warehouse")
+            return loaded
+        except Exception as e:
+            logger.error(f"Error bulk loading data: {e}")
+            self.conn.rollback()
+            return 0
             
+    def plan_ingestion_window(self, property: str) -> Optional[Tuple[date, date]]:
+        """
+        Determine the date window to ingest for a property
+
+        Args:
+            property: GSC property URL
+
+        Returns:
+            (start_date, end_date) inclusive, or None if the property is up to date
+        """
+        # Determine if this is an initial backfill based on presence of existing data
+        use_initial_backfill = not self.has_data_for_property(property)
+
+        yesterday = date.today() - timedelta(days=1)
+
+        if use_initial_backfill:
+            # Initial backfill covers a longer window ending yesterday
+            # Compute start_date to include `initial_backfill_days` days (inclusive)
+            start_date = yesterday - timedelta(days=self.initial_backfill_days - 1)
+            end_date = yesterday
+            logger.info(
+                f"Performing initial backfill for {property}: {self.initial_backfill_days} days from {start_date} to {end_date}"
+            )
+        else:
+            # Use watermark to determine incremental window
+            last_date = self.get_watermark(property)
+            start_date = last_date + timedelta(days=1)
+            end_date = min(start_date + timedelta(days=self.ingest_days), yesterday)
+
+            # Nothing to do if we are already up to date
+            if start_date > yesterday:
+                logger.info(f"Property {property} is up to date")
+                return None
+
+            logger.info(
+                f"Performing incremental ingestion for {property}: {self.ingest_days} days from {start_date} to {end_date}"
+            )
+
+        return start_date, end_date
+
     def ingest_property(self, property: str) -> Dict[str, Any]:
         """
         Ingest data for a single property
@@ -422,35 +579,13 @@ class GSCAPIIngestor:
             'rows_processed': 0,
             'errors': []
         }
+        started_at = time.monotonic()
         
         try:
-            # Determine if this is an initial backfill based on presence of existing data
-            use_initial_backfill = not self.has_data_for_property(property)
-
-            yesterday = date.today() - timedelta(days=1)
-
-            if use_initial_backfill:
-                # Initial backfill covers a longer window ending yesterday
-                # Compute start_date to include `initial_backfill_days` days (inclusive)
-                start_date = yesterday - timedelta(days=self.initial_backfill_days - 1)
-                end_date = yesterday
-                logger.info(
-                    f"Performing initial backfill for {property}: {self.initial_backfill_days} days from {start_date} to {end_date}"
-                )
-            else:
-                # Use watermark to determine incremental window
-                last_date = self.get_watermark(property)
-                start_date = last_date + timedelta(days=1)
-                end_date = min(start_date + timedelta(days=self.ingest_days), yesterday)
-                
-                # Nothing to do if we are already up to date
-                if start_date > yesterday:
-                    logger.info(f"Property {property} is up to date")
-                    return stats
-                
-                logger.info(
-                    f"Performing incremental ingestion for {property}: {self.ingest_days} days from {start_date} to {end_date}"
-                )
+            window = self.plan_ingestion_window(property)
+            if window is None:
+                return stats
+            start_date, end_date = window
 
             # Record date range in stats
             stats['start_date'] = start_date.isoformat()
@@ -518,7 +653,55 @@ class GSCAPIIngestor:
             logger.error(error_msg)
             stats['errors'].append(error_msg)
 
+        elapsed = time.monotonic() - started_at
+        stats['elapsed_seconds'] = round(elapsed, 3)
+        stats['rows_per_second'] = round(stats['rows_processed'] / elapsed, 2) if elapsed > 0 else 0.0
         return stats
+
+    def ingest_properties_concurrently(self, properties: List[str]) -> List[Dict[str, Any]]:
+        """
+        Ingest several properties with the bounded-concurrency fetch engine
+
+        (property, date, page-offset) units for all properties share the
+        worker pool and the global rate limiter. Each day is committed and the
+        watermark advanced as soon as it is complete, so an interrupted run
+        resumes from the first day that was not written.
+
+        Args:
+            properties: GSC property URLs
+
+        Returns:
+            Ingestion statistics per property
+        """
+        engine = ConcurrentFetchEngine(self, max_workers=self.fetch_workers)
+        planning_stats = []
+
+        for property in properties:
+            try:
+                window = self.plan_ingestion_window(property)
+            except Exception as e:
+                error_msg = f"Error ingesting {property}: {str(e)}"
+                logger.error(error_msg)
+                planning_stats.append({
+                    'property': property, 'start_date': None, 'end_date': None,
+                    'days_processed': 0, 'rows_processed': 0, 'errors': [error_msg]
+                })
+                continue
+            if window is None:
+                planning_stats.append({
+                    'property': property, 'start_date': None, 'end_date': None,
+                    'days_processed': 0, 'rows_processed': 0, 'errors': []
+                })
+                continue
+            engine.add_property(property, *window)
+
+        logger.info(
+            f"Starting concurrent ingestion of {len(engine.progress)} properties "
+            f"with {self.fetch_workers} workers"
+        )
+        engine_stats = engine.run()
+
+        return planning_stats + [engine_stats[p] for p in properties if p in engine_stats]
         
     def run(self) -> Dict[str, Any]:
         """
@@ -533,6 +716,7 @@ class GSCAPIIngestor:
             'properties_processed': [],
             'total_rows': 0,
             'errors': [],
+            'throughput': {},
             'rate_limiter_metrics': {}
         }
         
@@ -549,16 +733,27 @@ class GSCAPIIngestor:
                 properties = ["https://subdomain.example.com/"]
                 logger.info(f"Using test property for mock mode: {properties[0]}")
             
-            # Process each property
-            for property in properties:
-                logger.info(f"Processing property: {property}")
-                stats = self.ingest_property(property)
+            # Process properties, concurrently when more than one worker is configured
+            if self.fetch_workers > 1:
+                property_stats = self.ingest_properties_concurrently(properties)
+            else:
+                property_stats = []
+                for property in properties:
+                    logger.info(f"Processing property: {property}")
+                    property_stats.append(self.ingest_property(property))
+
+            for stats in property_stats:
                 summary['properties_processed'].append(stats)
                 summary['total_rows'] += stats['rows_processed']
-                
+                summary['throughput'][stats['property']] = {
+                    'rows_processed': stats['rows_processed'],
+                    'elapsed_seconds': stats.get('elapsed_seconds', 0.0),
+                    'rows_per_second': stats.get('rows_per_second', 0.0)
+                }
+
                 if stats['errors']:
                     summary['errors'].extend(stats['errors'])
-                    
+
             # Get rate limiter metrics
             summary['rate_limiter_metrics'] = self.rate_limiter.get_metrics()
             logger.info(f"Rate limiter metrics: {summary['rate_limiter_metrics']}")
@@ -678,7 +873,11 @@ def main():
         # Initial backfill configuration (defaults to ~16 months)
         'GSC_INITIAL_BACKFILL_DAYS': os.getenv('GSC_INITIAL_BACKFILL_DAYS', '480'),
         # GSC data delay threshold - only advance watermark for empty dates older than this
-        'GSC_DATA_DELAY_DAYS': os.getenv('GSC_DATA_DELAY_DAYS', '4')
+        'GSC_DATA_DELAY_DAYS': os.getenv('GSC_DATA_DELAY_DAYS', '4'),
+        # Concurrent API requests across properties/days (1 = serial)
+        'GSC_FETCH_WORKERS': os.getenv('GSC_FETCH_WORKERS', '1'),
+        # Warehouse load path: 'insert' (execute_values) or 'copy' (COPY + staging merge)
+        'GSC_LOAD_METHOD': os.getenv('GSC_LOAD_METHOD', 'insert')
     }
     
     # Run ingestor
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+COPY-based Bulk Loader for Warehouse Fact Tables
+Streams rows into an unlogged staging table with COPY FROM STDIN and merges
+them into the fact table with a single set-based INSERT ... ON CONFLICT
+"""
+
+import io
+import sys
+import time
+import random
+import logging
+import argparse
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FactTableSpec:
+    """Describes a fact table the bulk loader can merge into"""
+    table: str
+    staging_table: str
+    key_columns: Tuple[str, ...]
+    value_columns: Tuple[str, ...]
+    update_columns: Tuple[str, ...]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """All loaded columns, in row tuple order"""
+        return self.key_columns + self.value_columns
+
+
+GSC_DAILY = FactTableSpec(
+    table='gsc.fact_gsc_daily',
+    staging_table='gsc.stg_fact_gsc_daily',
+    key_columns=('date', 'property', 'url', 'query', 'country', 'device'),
+    value_columns=('clicks', 'impressions', 'ctr', 'position'),
+    update_columns=('clicks', 'impressions', 'ctr', 'position')
+)
+
+GA4_DAILY = FactTableSpec(
+    table='gsc.fact_ga4_daily',
+    staging_table='gsc.stg_fact_ga4_daily',
+    key_columns=('date', 'property', 'page_path'),
+    value_columns=(
+        'sessions', 'engaged_sessions', 'engagement_rate', 'bounce_rate',
+        'conversions', 'conversion_rate', 'avg_session_duration',
+        'page_views', 'avg_time_on_page', 'exits', 'exit_rate'
+    ),
+    # exits / exit_rate are not provided by the extract and are left untouched on update
+    update_columns=(
+        'sessions', 'engaged_sessions', 'engagement_rate', 'bounce_rate',
+        'conversions', 'conversion_rate', 'avg_session_duration',
+        'page_views', 'avg_time_on_page'
+    )
+)
+
+FACT_TABLES = {
+    'gsc': GSC_DAILY,
+    'ga4': GA4_DAILY,
+}
+
+
+def _format_copy_value(value: Any) -> str:
+    """Encode a Python value in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    text = str(value)
+    if any(c in text for c in '\\\t\n\r'):
+        text = (text.replace('\\', '\\\\')
+                    .replace('\t', '\\t')
+                    .replace('\n', '\\n')
+                    .replace('\r', '\\r'))
+    return text
+
+
+class CopyRowStream(io.TextIOBase):
+    """
+    File-like reader that renders row tuples as COPY text lazily.
+
+    copy_expert pulls from it in chunks, so rows are never materialized as
+    one large string.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._rows: Iterator[Sequence[Any]] = iter(rows)
+        self._buffer = ''
+        self.rows_written = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_line(self) -> Optional[str]:
+        row = next(self._rows, None)
+        if row is None:
+            return None
+        self.rows_written += 1
+        return '\t'.join(_format_copy_value(v) for v in row) + '\n'
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            chunks = [self._buffer]
+            self._buffer = ''
+            line = self._next_line()
+            while line is not None:
+                chunks.append(line)
+                line = self._next_line()
+            return ''.join(chunks)
+
+        while len(self._buffer) < size:
+            line = self._next_line()
+            if line is None:
+                break
+            self._buffer += line
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    def readline(self, size: int = -1) -> str:
+        if not self._buffer:
+            self._buffer = self._next_line() or ''
+        newline = self._buffer.find('\n')
+        end = len(self._buffer) if newline < 0 else newline + 1
+        if size is not None and 0 <= size < end:
+            end = size
+        line, self._buffer = self._buffer[:end], self._buffer[end:]
+        return line
+
+
+class BulkLoader:
+    """
+    Loads fact rows through COPY into an unlogged staging table, then merges.
+
+    The staging table is truncated at the start of every load. TRUNCATE holds
+    an ACCESS EXCLUSIVE lock until the caller commits, so concurrent loads into
+    the same fact table are serialized rather than mixing their rows.
+
+    The loader does not commit - callers keep their existing transaction
+    handling and commit or roll back around `load`.
+    """
+
+    def __init__(self, conn: Any, spec: FactTableSpec):
+        """
+        Initialize the loader
+
+        Args:
+            conn: psycopg2 connection
+            spec: Target fact table description
+        """
+        self.conn = conn
+        self.spec = spec
+        self._staging_ready = False
+
+    def ensure_staging_table(self) -> None:
+        """Create the unlogged staging table if sql/31_bulk_load_staging.sql has not been applied"""
+        if self._staging_ready:
+            return
+        with self.conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE UNLOGGED TABLE IF NOT EXISTS {self.spec.staging_table} AS
+                SELECT {', '.join(self.spec.columns)}
+                FROM {self.spec.table}
+                WITH NO DATA
+            """)
+        self._staging_ready = True
+
+    def copy_sql(self) -> str:
+        """COPY statement streaming into the staging table"""
+        return (f"COPY {self.spec.staging_table} ({', '.join(self.spec.columns)}) "
+                f"FROM STDIN WITH (FORMAT text)")
+
+    def merge_sql(self) -> str:
+        """Set-based merge from staging into the fact table"""
+        columns = ', '.join(self.spec.columns)
+        keys = ', '.join(self.spec.key_columns)
+        updates = ',\n                '.join(
+            f"{col} = EXCLUDED.{col}" for col in self.spec.update_columns
+        )
+        table_name = self.spec.table.split('.')[-1]
+        changed = '\n                OR '.join(
+            f"{table_name}.{col} IS DISTINCT FROM EXCLUDED.{col}"
+            for col in self.spec.update_columns
+        )
+        return f"""
+            INSERT INTO {self.spec.table} ({columns})
+            SELECT DISTINCT ON ({keys}) {columns}
+            FROM {self.spec.staging_table}
+            ORDER BY {keys}
+            ON CONFLICT ({keys})
+            DO UPDATE SET
+                {updates},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE {changed}
+        """
+
+    def load(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Stream rows into staging and merge them into the fact table
+
+        Args:
+            rows: Tuples in `spec.columns` order
+
+        Returns:
+            Number of rows streamed through COPY
+        """
+        self.ensure_staging_table()
+        stream = CopyRowStream(rows)
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"TRUNCATE {self.spec.staging_table}")
+                cur.copy_expert(self.copy_sql(), stream)
+                if stream.rows_written:
+                    cur.execute(self.merge_sql())
+                cur.execute(f"TRUNCATE {self.spec.staging_table}")
+        except Exception:
+            # The caller will roll back, which may undo a staging table created above
+            self._staging_ready = False
+            raise
+        logger.debug(f"Bulk loaded {stream.rows_written} rows into {self.spec.table}")
+        return stream.rows_written
+
+
+# =============================================
+# BENCHMARK MODE
+# =============================================
+
+def _execute_values_upsert(conn: Any, spec: FactTableSpec, rows: List[Tuple]) -> None:
+    """The pre-existing INSERT ... VALUES ... ON CONFLICT path, for comparison"""
+    from psycopg2.extras import execute_values
+
+    keys = ', '.join(spec.key_columns)
+    updates = ', '.join(f"{col} = EXCLUDED.{col}" for col in spec.update_columns)
+    with conn.cursor() as cur:
+        execute_values(cur, f"""
+            INSERT INTO {spec.table} ({', '.join(spec.columns)}) VALUES %s
+            ON CONFLICT ({keys})
+            DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+        """, rows)
+
+
+def generate_synthetic_rows(spec: FactTableSpec, count: int,
+                            property_url: str = 'https://benchmark.example.com/',
+                            seed: int = 42) -> List[Tuple]:
+    """Generate unique synthetic fact rows for a benchmark run"""
+    rng = random.Random(seed)
+    day = date.today() - timedelta(days=3650)
+    rows = []
+    for i in range(count):
+        if spec is GSC_DAILY:
+            clicks = rng.randint(0, 50)
+            impressions = clicks + rng.randint(1, 500)
+            rows.append((
+                day, property_url, f"{property_url}page-{i // 20}", f"benchmark query {i}",
+                rng.choice(['usa', 'gbr', 'deu']), rng.choice(['DESKTOP', 'MOBILE', 'TABLET']),
+                clicks, impressions, round(clicks / impressions, 6), round(rng.uniform(1, 50), 2)
+            ))
+        else:
+            sessions = rng.randint(1, 500)
+            engaged = rng.randint(0, sessions)
+            rows.append((
+                day, property_url, f"/benchmark/page-{i}",
+                sessions, engaged, round(engaged / sessions, 4), round(1 - engaged / sessions, 4),
+                rng.randint(0, 5), 0.01, round(rng.uniform(5, 300), 2),
+                sessions * 2, round(rng.uniform(5, 300), 2), 0, 0.0
+            ))
+    return rows
+
+
+def benchmark(conn: Any, spec: FactTableSpec, rows: List[Tuple], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Compare rows/sec of the COPY + merge path against execute_values
+
+    Each run is rolled back, so the fact table is left unchanged.
+
+    Args:
+        conn: psycopg2 connection
+        spec: Target fact table description
+        rows: Rows to load on every run
+        repeat: Number of timed runs per method (best run is reported)
+
+    Returns:
+        Benchmark results per method
+    """
+    loader = BulkLoader(conn, spec)
+    loader.ensure_staging_table()
+    conn.commit()
+
+    methods = {
+        'execute_values': lambda: _execute_values_upsert(conn, spec, rows),
+        'copy_merge': lambda: loader.load(rows),
+    }
+    results: Dict[str, Any] = {'table': spec.table, 'rows': len(rows), 'repeat': repeat}
+    for name, run in methods.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+            conn.rollback()
+        best = min(timings)
+        results[name] = {
+            'best_seconds': round(best, 4),
+            'rows_per_second': round(len(rows) / best, 1) if best > 0 else 0.0
+        }
+    baseline = results['execute_values']['rows_per_second']
+    results['speedup'] = round(results['copy_merge']['rows_per_second'] / baseline, 2) if baseline else None
+    return results
+
+
+def main() -> int:
+    """Run the bulk loader benchmark against a warehouse"""
+    import os
+    import psycopg2
+
+    parser = argparse.ArgumentParser(description='Benchmark COPY + merge against execute_values upserts')
+    parser.add_argument('--table', choices=sorted(FACT_TABLES), default='gsc', help='Fact table to load')
+    parser.add_argument('--rows', type=int, default=25000, help='Rows per load (default: one API page)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per method')
+    parser.add_argument('--dsn', default=os.getenv('WAREHOUSE_DSN'), help='Warehouse DSN')
+    args = parser.parse_args()
+
+    if not args.dsn:
+        logger.error("WAREHOUSE_DSN is not set")
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    spec = FACT_TABLES[args.table]
+    conn = psycopg2.connect(args.dsn)
+    try:
+        results = benchmark(conn, spec, generate_synthetic_rows(spec, args.rows), args.repeat)
+    finally:
+        conn.close()
+
+    for method in ('execute_values', 'copy_merge'):
+        logger.info(f"{method:>15}: {results[method]['rows_per_second']:>12,.1f} rows/s "
+                    f"(best of {args.repeat}: {results[method]['best_seconds']}s)")
+    logger.info(f"Speedup: {results['speedup']}x for {results['rows']} rows into {results['table']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,6 +17,7 @@ import yaml
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ga4.ga4_client import GA4Client
+from ingestors.bulk_loader import BulkLoader, GA4_DAILY
 
 # Configure logging
 logging.basicConfig(
@@ -76,7 +77,8 @@ class GA4Extractor:
             'extraction': {
                 'default_days_back': 30,
                 'rate_limit_qps': 10,
-                'batch_size': 1000
+                'batch_size': 1000,
+                'load_method': 'insert'
             },
             'validation': {
                 'min_sessions_threshold': 0,
@@ -161,27 +163,31 @@ class GA4Extractor:
                     for row in data
                 ]
                 
-                # Batch upsert
-                execute_batch(cur, """
-                    INSERT INTO gsc.fact_ga4_daily (
-                        date, property, page_path,
-                        sessions, engaged_sessions, engagement_rate, bounce_rate,
-                        conversions, conversion_rate, avg_session_duration,
-                        page_views, avg_time_on_page, exits, exit_rate
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (date, property, page_path)
-                    DO UPDATE SET
-                        sessions = EXCLUDED.sessions,
-                        engaged_sessions = EXCLUDED.engaged_sessions,
-                        engagement_rate = EXCLUDED.engagement_rate,
-                        bounce_rate = EXCLUDED.bounce_rate,
-                        conversions = EXCLUDED.conversions,
-                        conversion_rate = EXCLUDED.conversion_rate,
-                        avg_session_duration = EXCLUDED.avg_session_duration,
-                        page_views = EXCLUDED.page_views,
-                        avg_time_on_page = EXCLUDED.avg_time_on_page,
-                        updated_at = CURRENT_TIMESTAMP
-                """, rows, page_size=self.config['extraction']['batch_size'])
+                if self.config['extraction'].get('load_method', 'insert') == 'copy':
+                    # COPY into unlogged staging + one set-based merge
+                    BulkLoader(conn, GA4_DAILY).load(rows)
+                else:
+                    # Batch upsert
+                    execute_batch(cur, """
+                        INSERT INTO gsc.fact_ga4_daily (
+                            date, property, page_path,
+                            sessions, engaged_sessions, engagement_rate, bounce_rate,
+                            conversions, conversion_rate, avg_session_duration,
+                            page_views, avg_time_on_page, exits, exit_rate
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (date, property, page_path)
+                        DO UPDATE SET
+                            sessions = EXCLUDED.sessions,
+                            engaged_sessions = EXCLUDED.engaged_sessions,
+                            engagement_rate = EXCLUDED.engagement_rate,
+                            bounce_rate = EXCLUDED.bounce_rate,
+                            conversions = EXCLUDED.conversions,
+                            conversion_rate = EXCLUDED.conversion_rate,
+                            avg_session_duration = EXCLUDED.avg_session_duration,
+                            page_views = EXCLUDED.page_views,
+                            avg_time_on_page = EXCLUDED.avg_time_on_page,
+                            updated_at = CURRENT_TIMESTAMP
+                    """, rows, page_size=self.config['extraction']['batch_size'])
             
             conn.commit()
             self.stats['rows_inserted'] += len(data)
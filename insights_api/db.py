@@ -0,0 +1,76 @@
+"""
+Shared asyncpg connection pool for the Insights API
+
+The pool is created in the app's startup event and closed on shutdown, so
+request handlers borrow an already-open connection instead of connecting
+per request and never block the event loop on database I/O.
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+import asyncpg
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Errors handlers report as "Database error": server-side errors, client/protocol
+# errors (e.g. a closed pool) and connection failures
+DB_ERRORS = (asyncpg.PostgresError, asyncpg.InterfaceError, OSError)
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def init_pool(dsn: Optional[str] = None) -> asyncpg.Pool:
+    """
+    Create the shared pool (no-op if it already exists)
+
+    Pool size comes from API_DB_POOL_MIN / API_DB_POOL_MAX (default 2 / 20).
+
+    Args:
+        dsn: Database connection string (default: WAREHOUSE_DSN)
+
+    Returns:
+        asyncpg.Pool
+
+    Raises:
+        HTTPException: If no DSN is configured
+    """
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            dsn = dsn or os.getenv('WAREHOUSE_DSN')
+            if not dsn:
+                raise HTTPException(status_code=500, detail="Database not configured")
+            _pool = await asyncpg.create_pool(
+                dsn,
+                min_size=int(os.getenv('API_DB_POOL_MIN', 2)),
+                max_size=int(os.getenv('API_DB_POOL_MAX', 20)),
+                command_timeout=60
+            )
+            logger.info("Database connection pool created")
+    return _pool
+
+
+async def get_pool() -> asyncpg.Pool:
+    """
+    Get the shared pool, creating it from WAREHOUSE_DSN if startup did not
+
+    Raises:
+        HTTPException: If no DSN is configured
+    """
+    if _pool is not None:
+        return _pool
+    return await init_pool()
+
+
+async def close_pool() -> None:
+    """Close the shared pool"""
+    global _pool
+    async with _pool_lock:
+        if _pool is not None:
+            await _pool.close()
+            _pool = None
+            logger.info("Database connection pool closed")
@@ -5,6 +5,7 @@ RESTful API for querying and managing insights from the Unified Insight Engine
 """
 import os
 import sys
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import List, Optional
@@ -28,8 +29,9 @@ from insights_core.models import (
     InsightStatus,
     EntityType
 )
-from insights_core.repository import InsightRepository
+from insights_core.async_repository import AsyncInsightRepository
 from insights_core.config import InsightsConfig
+from insights_api import db
 
 # Configure logging
 logging.basicConfig(
@@ -63,15 +65,16 @@ app.include_router(actions_router)
 
 # Initialize config and repository
 config = InsightsConfig()
-repository: Optional[InsightRepository] = None
+repository: Optional[AsyncInsightRepository] = None
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize repository on startup"""
+    """Open the shared connection pool and initialize repository on startup"""
     global repository
     try:
-        repository = InsightRepository(config.warehouse_dsn)
+        pool = await db.init_pool(config.warehouse_dsn)
+        repository = AsyncInsightRepository(pool)
         logger.info("Insights API started successfully")
         logger.info(f"Connected to: {config.warehouse_dsn.split('@')[1] if '@' in config.warehouse_dsn else 'database'}")
     except Exception as e:
@@ -79,6 +82,14 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared connection pool"""
+    global repository
+    repository = None
+    await db.close_pool()
+
+
 # ============================================================================
 # INDEX & NAVIGATION
 # ============================================================================
@@ -297,7 +308,7 @@ async def health_check():
     """Health check endpoint"""
     try:
         if repository:
-            stats = repository.get_stats()
+            stats = await repository.get_stats()
             return {
                 "status": "healthy",
                 "timestamp": datetime.utcnow().isoformat(),
@@ -317,7 +328,7 @@ async def health_check():
 async def get_stats():
     """Get repository statistics"""
     try:
-        stats = repository.get_stats()
+        stats = await repository.get_stats()
         return {
             "status": "success",
             "data": stats
@@ -343,7 +354,7 @@ async def query_insights(
 ):
     """Query insights with filters"""
     try:
-        insights = repository.query(
+        insights = await repository.query(
             property=property,
             category=category,
             status=status,
@@ -371,7 +382,7 @@ async def get_insight(
 ):
     """Get a specific insight by ID"""
     try:
-        insight = repository.get_by_id(insight_id)
+        insight = await repository.get_by_id(insight_id)
         if not insight:
             raise HTTPException(status_code=404, detail=f"Insight {insight_id} not found")
         
@@ -395,7 +406,7 @@ async def get_by_category(
 ):
     """Get insights by category"""
     try:
-        insights = repository.get_by_category(
+        insights = await repository.get_by_category(
             category=category,
             property=property,
             severity=severity,
@@ -421,7 +432,7 @@ async def get_by_status(
 ):
     """Get insights by status"""
     try:
-        insights = repository.get_by_status(
+        insights = await repository.get_by_status(
             status=status,
             property=property,
             limit=limit
@@ -447,7 +458,7 @@ async def get_for_entity(
 ):
     """Get all insights for a specific entity"""
     try:
-        insights = repository.get_for_entity(
+        insights = await repository.get_for_entity(
             entity_type=entity_type,
             entity_id=entity_id,
             property=property,
@@ -478,7 +489,7 @@ async def update_insight(
 ):
     """Update an existing insight"""
     try:
-        updated_insight = repository.update(insight_id, update)
+        updated_insight = await repository.update(insight_id, update)
         if not updated_insight:
             raise HTTPException(status_code=404, detail=f"Insight {insight_id} not found")
         
@@ -505,7 +516,7 @@ async def get_recent_insights(
 ):
     """Get insights generated in the last N hours"""
     try:
-        insights = repository.query_recent(hours=hours, property=property)
+        insights = await repository.query_recent(hours=hours, property=property)
         
         return {
             "status": "success",
@@ -527,16 +538,17 @@ async def get_actionable_insights(
     """Get insights that require action (status=new or diagnosed)"""
     try:
         # Get insights with new or diagnosed status
-        new_insights = repository.get_by_status(
-            status=InsightStatus.NEW,
-            property=property,
-            limit=limit
-        )
-        
-        diagnosed_insights = repository.get_by_status(
-            status=InsightStatus.DIAGNOSED,
-            property=property,
-            limit=limit
+        new_insights, diagnosed_insights = await asyncio.gather(
+            repository.get_by_status(
+                status=InsightStatus.NEW,
+                property=property,
+                limit=limit
+            ),
+            repository.get_by_status(
+                status=InsightStatus.DIAGNOSED,
+                property=property,
+                limit=limit
+            )
         )
         
         all_actionable = new_insights + diagnosed_insights
@@ -567,7 +579,7 @@ async def get_property_summary(
 ):
     """Get summary statistics for a property"""
     try:
-        insights = repository.query(property=property, limit=10000)
+        insights = await repository.query(property=property, limit=10000)
         
         # Calculate summary stats
         total = len(insights)
@@ -10,17 +10,17 @@ Provides endpoints for aggregated insight data:
 - /api/v1/insights/aggregations/top-issues
 
 These endpoints leverage the database views created in sql/24_insight_aggregation_views.sql
-for efficient aggregation queries.
+for efficient aggregation queries. Queries run on the API's shared asyncpg pool
+(insights_api.db), so handlers never block the event loop.
 """
 import logging
-import os
 from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel, Field
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from insights_api.db import DB_ERRORS, get_pool
 
 logger = logging.getLogger(__name__)
 
@@ -136,23 +136,24 @@ class TopIssue(BaseModel):
 
 
 # ============================================================================
-# DATABASE CONNECTION
+# DATABASE ACCESS
 # ============================================================================
 
-def get_db_connection():
+async def fetch_rows(query: str, *args) -> List[dict]:
     """
-    Get database connection using WAREHOUSE_DSN environment variable
+    Run a query on a pooled connection
 
-    Returns:
-        psycopg2.connection: Database connection
+    Args:
+        query: SQL with $n placeholders
+        *args: Query parameters
 
-    Raises:
-        HTTPException: If DSN not configured
+    Returns:
+        List[dict]: Result rows
     """
-    dsn = os.getenv('WAREHOUSE_DSN')
-    if not dsn:
-        raise HTTPException(status_code=500, detail="Database not configured")
-    return psycopg2.connect(dsn)
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, *args)
+    return [dict(row) for row in rows]
 
 
 # ============================================================================
@@ -182,27 +183,18 @@ async def get_insights_by_page(
     Raises:
         HTTPException: If database error occurs
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                SELECT *
-                FROM gsc.vw_insights_by_page
-                WHERE property = %s
-                ORDER BY total_insights DESC
-                LIMIT %s OFFSET %s
-            """, (property, limit, offset))
-
-            results = [dict(row) for row in cur.fetchall()]
-            return results
-
-    except psycopg2.Error as e:
+        return await fetch_rows("""
+            SELECT *
+            FROM gsc.vw_insights_by_page
+            WHERE property = $1
+            ORDER BY total_insights DESC
+            LIMIT $2 OFFSET $3
+        """, property, limit, offset)
+
+    except DB_ERRORS as e:
         logger.error(f"Database error in by-page aggregation: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    finally:
-        if conn:
-            conn.close()
 
 
 @router.get("/by-subdomain", response_model=List[SubdomainAggregation])
@@ -228,35 +220,25 @@ async def get_insights_by_subdomain(
     Raises:
         HTTPException: If database error occurs
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if property:
-                cur.execute("""
-                    SELECT *
-                    FROM gsc.vw_insights_by_subdomain
-                    WHERE property = %s
-                    ORDER BY total_insights DESC
-                    LIMIT %s OFFSET %s
-                """, (property, limit, offset))
-            else:
-                cur.execute("""
-                    SELECT *
-                    FROM gsc.vw_insights_by_subdomain
-                    ORDER BY total_insights DESC
-                    LIMIT %s OFFSET %s
-                """, (limit, offset))
-
-            results = [dict(row) for row in cur.fetchall()]
-            return results
-
-    except psycopg2.Error as e:
+        if property:
+            return await fetch_rows("""
+                SELECT *
+                FROM gsc.vw_insights_by_subdomain
+                WHERE property = $1
+                ORDER BY total_insights DESC
+                LIMIT $2 OFFSET $3
+            """, property, limit, offset)
+        return await fetch_rows("""
+            SELECT *
+            FROM gsc.vw_insights_by_subdomain
+            ORDER BY total_insights DESC
+            LIMIT $1 OFFSET $2
+        """, limit, offset)
+
+    except DB_ERRORS as e:
         logger.error(f"Database error in by-subdomain aggregation: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    finally:
-        if conn:
-            conn.close()
 
 
 @router.get("/by-category", response_model=List[CategoryAggregation])
@@ -282,35 +264,25 @@ async def get_insights_by_category(
     Raises:
         HTTPException: If database error occurs
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if property:
-                cur.execute("""
-                    SELECT *
-                    FROM gsc.vw_insights_by_category
-                    WHERE property = %s
-                    ORDER BY total_insights DESC
-                    LIMIT %s OFFSET %s
-                """, (property, limit, offset))
-            else:
-                cur.execute("""
-                    SELECT *
-                    FROM gsc.vw_insights_by_category
-                    ORDER BY total_insights DESC
-                    LIMIT %s OFFSET %s
-                """, (limit, offset))
-
-            results = [dict(row) for row in cur.fetchall()]
-            return results
-
-    except psycopg2.Error as e:
+        if property:
+            return await fetch_rows("""
+                SELECT *
+                FROM gsc.vw_insights_by_category
+                WHERE property = $1
+                ORDER BY total_insights DESC
+                LIMIT $2 OFFSET $3
+            """, property, limit, offset)
+        return await fetch_rows("""
+            SELECT *
+            FROM gsc.vw_insights_by_category
+            ORDER BY total_insights DESC
+            LIMIT $1 OFFSET $2
+        """, limit, offset)
+
+    except DB_ERRORS as e:
         logger.error(f"Database error in by-category aggregation: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    finally:
-        if conn:
-            conn.close()
 
 
 @router.get("/dashboard", response_model=List[DashboardSummary])
@@ -333,32 +305,22 @@ async def get_dashboard_summary(
     Raises:
         HTTPException: If database error occurs
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if property:
-                cur.execute("""
-                    SELECT *
-                    FROM gsc.vw_insights_dashboard
-                    WHERE property = %s
-                """, (property,))
-            else:
-                cur.execute("""
-                    SELECT *
-                    FROM gsc.vw_insights_dashboard
-                    ORDER BY total_insights DESC
-                """)
-
-            results = [dict(row) for row in cur.fetchall()]
-            return results
-
-    except psycopg2.Error as e:
+        if property:
+            return await fetch_rows("""
+                SELECT *
+                FROM gsc.vw_insights_dashboard
+                WHERE property = $1
+            """, property)
+        return await fetch_rows("""
+            SELECT *
+            FROM gsc.vw_insights_dashboard
+            ORDER BY total_insights DESC
+        """)
+
+    except DB_ERRORS as e:
         logger.error(f"Database error in dashboard aggregation: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    finally:
-        if conn:
-            conn.close()
 
 
 @router.get("/timeseries", response_model=List[TimeseriesPoint])
@@ -383,51 +345,41 @@ async def get_timeseries(
     Raises:
         HTTPException: If database error occurs
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if category:
-                cur.execute("""
-                    SELECT
-                        property,
-                        date::text,
-                        category,
-                        insight_count,
-                        high_count,
-                        medium_count,
-                        low_count
-                    FROM gsc.vw_insights_timeseries
-                    WHERE property = %s
-                      AND category = %s
-                      AND date >= CURRENT_DATE - INTERVAL '%s days'
-                    ORDER BY date DESC
-                """, (property, category, days))
-            else:
-                cur.execute("""
-                    SELECT
-                        property,
-                        date::text,
-                        category,
-                        insight_count,
-                        high_count,
-                        medium_count,
-                        low_count
-                    FROM gsc.vw_insights_timeseries
-                    WHERE property = %s
-                      AND date >= CURRENT_DATE - INTERVAL '%s days'
-                    ORDER BY date DESC, category
-                """, (property, days))
-
-            results = [dict(row) for row in cur.fetchall()]
-            return results
-
-    except psycopg2.Error as e:
+        if category:
+            return await fetch_rows("""
+                SELECT
+                    property,
+                    date::text,
+                    category,
+                    insight_count,
+                    high_count,
+                    medium_count,
+                    low_count
+                FROM gsc.vw_insights_timeseries
+                WHERE property = $1
+                  AND category = $2
+                  AND date >= CURRENT_DATE - $3::int
+                ORDER BY date DESC
+            """, property, category, days)
+        return await fetch_rows("""
+            SELECT
+                property,
+                date::text,
+                category,
+                insight_count,
+                high_count,
+                medium_count,
+                low_count
+            FROM gsc.vw_insights_timeseries
+            WHERE property = $1
+              AND date >= CURRENT_DATE - $2::int
+            ORDER BY date DESC, category
+        """, property, days)
+
+    except DB_ERRORS as e:
         logger.error(f"Database error in timeseries aggregation: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    finally:
-        if conn:
-            conn.close()
 
 
 @router.get("/top-issues", response_model=List[TopIssue])
@@ -455,36 +407,27 @@ async def get_top_issues(
     Raises:
         HTTPException: If database error occurs
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
-                SELECT *
-                FROM gsc.vw_top_issues
-                WHERE property = %s
-            """
-            params = [property]
-
-            if category:
-                query += " AND category = %s"
-                params.append(category)
+        query = """
+            SELECT *
+            FROM gsc.vw_top_issues
+            WHERE property = $1
+        """
+        params = [property]
 
-            if severity:
-                query += " AND severity = %s"
-                params.append(severity)
+        if category:
+            params.append(category)
+            query += f" AND category = ${len(params)}"
 
-            query += " LIMIT %s"
-            params.append(limit)
+        if severity:
+            params.append(severity)
+            query += f" AND severity = ${len(params)}"
 
-            cur.execute(query, params)
+        params.append(limit)
+        query += f" LIMIT ${len(params)}"
 
-            results = [dict(row) for row in cur.fetchall()]
-            return results
+        return await fetch_rows(query, *params)
 
-    except psycopg2.Error as e:
+    except DB_ERRORS as e:
         logger.error(f"Database error in top-issues aggregation: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    finally:
-        if conn:
-            conn.close()
@@ -0,0 +1,197 @@
+"""
+Async repository for reading and updating insights from async code
+Mirrors InsightRepository's query methods on a shared asyncpg pool, so
+FastAPI handlers can await them without blocking the event loop
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import asyncpg
+
+from insights_core.models import (
+    Insight,
+    InsightUpdate,
+    InsightCategory,
+    InsightSeverity,
+    InsightStatus,
+    EntityType
+)
+from insights_core.repository import row_to_insight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncInsightRepository:
+    """Async insight reads and updates on an asyncpg pool"""
+
+    def __init__(self, pool: asyncpg.Pool):
+        """
+        Initialize repository
+
+        Args:
+            pool: asyncpg pool (owned by the caller, which also closes it)
+        """
+        self.pool = pool
+
+    async def get_by_id(self, insight_id: str) -> Optional[Insight]:
+        """Get insight by ID"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT * FROM gsc.insights WHERE id = $1
+            """, insight_id)
+        return row_to_insight(dict(row)) if row else None
+
+    async def update(self, insight_id: str, update: InsightUpdate) -> Optional[Insight]:
+        """Update an existing insight (fields left as None are not changed)"""
+        if update.status is None and update.description is None and update.linked_insight_id is None:
+            # No fields to update
+            return await self.get_by_id(insight_id)
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                UPDATE gsc.insights
+                SET status = COALESCE($2, status),
+                    description = COALESCE($3, description),
+                    linked_insight_id = COALESCE($4, linked_insight_id),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = $1
+                RETURNING *
+            """,
+                insight_id,
+                update.status.value if update.status is not None else None,
+                update.description,
+                update.linked_insight_id
+            )
+        return row_to_insight(dict(row)) if row else None
+
+    async def query(
+        self,
+        property: Optional[str] = None,
+        category: Optional[InsightCategory] = None,
+        status: Optional[InsightStatus] = None,
+        severity: Optional[InsightSeverity] = None,
+        entity_type: Optional[EntityType] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Insight]:
+        """Query insights with filters"""
+        filters = [
+            ('property', property),
+            ('category', category.value if category else None),
+            ('status', status.value if status else None),
+            ('severity', severity.value if severity else None),
+            ('entity_type', entity_type.value if entity_type else None),
+        ]
+        where_clauses = []
+        values = []
+        for column, value in filters:
+            if value:
+                values.append(value)
+                where_clauses.append(f"{column} = ${len(values)}")
+
+        where_sql = ""
+        if where_clauses:
+            where_sql = "WHERE " + " AND ".join(where_clauses)
+
+        values.extend([limit, offset])
+
+        return await self._fetch_insights(f"""
+            SELECT * FROM gsc.insights
+            {where_sql}
+            ORDER BY generated_at DESC
+            LIMIT ${len(values) - 1} OFFSET ${len(values)}
+        """, *values)
+
+    async def get_by_status(
+        self,
+        status: InsightStatus,
+        property: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Insight]:
+        """Get insights by status"""
+        return await self.query(
+            property=property,
+            status=status,
+            limit=limit
+        )
+
+    async def get_by_category(
+        self,
+        category: InsightCategory,
+        property: Optional[str] = None,
+        severity: Optional[InsightSeverity] = None,
+        limit: int = 100
+    ) -> List[Insight]:
+        """Get insights by category"""
+        return await self.query(
+            property=property,
+            category=category,
+            severity=severity,
+            limit=limit
+        )
+
+    async def get_for_entity(
+        self,
+        entity_type: str,
+        entity_id: str,
+        property: str,
+        days_back: int = 90
+    ) -> List[Insight]:
+        """Get all insights for a specific entity"""
+        return await self._fetch_insights("""
+            SELECT * FROM gsc.insights
+            WHERE entity_type = $1
+                AND entity_id = $2
+                AND property = $3
+                AND generated_at >= $4
+            ORDER BY generated_at DESC
+        """,
+            entity_type,
+            entity_id,
+            property,
+            datetime.utcnow() - timedelta(days=days_back)
+        )
+
+    async def query_recent(
+        self,
+        hours: int = 24,
+        property: Optional[str] = None
+    ) -> List[Insight]:
+        """Get insights generated in the last N hours"""
+        values = [datetime.utcnow() - timedelta(hours=hours)]
+        where_sql = "generated_at >= $1"
+
+        if property:
+            values.append(property)
+            where_sql += " AND property = $2"
+
+        return await self._fetch_insights(f"""
+            SELECT * FROM gsc.insights
+            WHERE {where_sql}
+            ORDER BY generated_at DESC
+        """, *values)
+
+    async def get_stats(self) -> dict:
+        """Get repository statistics"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT
+                    COUNT(*) as total_insights,
+                    COUNT(DISTINCT property) as unique_properties,
+                    SUM(CASE WHEN category = 'risk' THEN 1 ELSE 0 END) as risk_count,
+                    SUM(CASE WHEN category = 'opportunity' THEN 1 ELSE 0 END) as opportunity_count,
+                    SUM(CASE WHEN status = 'new' THEN 1 ELSE 0 END) as new_count,
+                    SUM(CASE WHEN status = 'diagnosed' THEN 1 ELSE 0 END) as diagnosed_count,
+                    SUM(CASE WHEN severity = 'high' THEN 1 ELSE 0 END) as high_severity_count,
+                    MAX(generated_at) as latest_insight,
+                    MIN(generated_at) as earliest_insight
+                FROM gsc.insights
+            """)
+        return dict(row) if row else {}
+
+    async def _fetch_insights(self, query: str, *args) -> List[Insight]:
+        """Run a query returning gsc.insights rows"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(query, *args)
+        return [row_to_insight(dict(row)) for row in rows]
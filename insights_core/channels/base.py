@@ -1,8 +1,9 @@
 """
 Base channel interface for dispatching insights
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import logging
@@ -25,6 +26,9 @@ class DispatchResult:
 class Channel(ABC):
     """Base class for all dispatch channels"""
     
+    # Whether many insights can be combined into one message
+    supports_digest = False
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize channel with configuration
@@ -74,5 +78,47 @@ class Channel(ABC):
         """
         return self.enabled
     
+    @property
+    def endpoint(self) -> Optional[str]:
+        """HTTP endpoint this channel posts to (None if not HTTP)"""
+        return None
+    
+    async def send_async(self, insight: Any, client: Any = None, **kwargs) -> DispatchResult:
+        """
+        Send insight without blocking the event loop
+        
+        HTTP channels override this to post with the shared keep-alive
+        client; others run send() in a worker thread.
+        
+        Args:
+            insight: Insight object to dispatch
+            client: httpx.AsyncClient for self.endpoint (optional)
+            **kwargs: Additional channel-specific parameters
+            
+        Returns:
+            DispatchResult
+        """
+        return await asyncio.to_thread(self.send, insight, **kwargs)
+    
+    def send_digest(self, insights: List[Any]) -> DispatchResult:
+        """
+        Send many insights as one message (channels with supports_digest)
+        
+        Args:
+            insights: Insights to combine
+            
+        Returns:
+            DispatchResult for the combined message
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support digests")
+    
+    async def send_digest_async(self, insights: List[Any], client: Any = None) -> DispatchResult:
+        """Send a digest without blocking the event loop"""
+        return await asyncio.to_thread(self.send_digest, insights)
+    
+    def _digest_id(self, insights: List[Any]) -> str:
+        """insight_id reported for a digest"""
+        return f"digest:{','.join(str(insight.id) for insight in insights)}"
+    
     def __repr__(self):
         return f"{self.__class__.__name__}(enabled={self.enabled})"
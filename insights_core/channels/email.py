@@ -4,7 +4,7 @@ Email channel implementation
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 from .base import Channel, DispatchResult
 
@@ -12,6 +12,8 @@ from .base import Channel, DispatchResult
 class EmailChannel(Channel):
     """SMTP email channel for dispatching insights"""
     
+    supports_digest = True
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.smtp_host = config.get('smtp_host', 'localhost')
@@ -174,26 +176,57 @@ class EmailChannel(Channel):
         </div>
         """
     
-    def send(self, insight: Any, **kwargs) -> DispatchResult:
+    def format_digest(self, insights: List[Any]) -> Dict[str, Any]:
         """
-        Send insight via email
+        Format many insights as one HTML email
         
         Args:
-            insight: Insight to send
-            **kwargs: Additional parameters
+            insights: Insights to list
             
         Returns:
-            DispatchResult
+            Dict with subject and HTML body
         """
+        subject = f"GSC Insights digest: {len(insights)} new insights"
+        
+        rows = ''.join(
+            f"""<tr>
+                <td style="color: {self._get_severity_color(insight.severity)}; font-weight: bold;">{insight.severity.upper()}</td>
+                <td>{insight.title}</td>
+                <td>{insight.property}</td>
+                <td>{insight.category.value}</td>
+            </tr>"""
+            for insight in insights
+        )
+        
+        html = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h1>{len(insights)} new insights</h1>
+            <table cellpadding="6" style="border-collapse: collapse;">
+                <tr><th>Severity</th><th>Title</th><th>Property</th><th>Category</th></tr>
+                {rows}
+            </table>
+            <p>This is an automated message from GSC Insight Engine.</p>
+        </body>
+        </html>
+        """
+        
+        return {
+            'subject': subject,
+            'html': html
+        }
+    
+    def _deliver(self, build_message, insight_id: str, title: str) -> DispatchResult:
+        """Build and send one email, with dry-run and config checks"""
         start_time = datetime.utcnow()
         
         # Dry run mode
         if self.dry_run:
-            self.logger.info(f"[DRY RUN] Would send email: {insight.title}")
+            self.logger.info(f"[DRY RUN] Would send email: {title}")
             return DispatchResult(
                 success=True,
                 channel='email',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=start_time,
                 response={'dry_run': True}
             )
@@ -203,14 +236,14 @@ class EmailChannel(Channel):
             return DispatchResult(
                 success=False,
                 channel='email',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=start_time,
                 error="Email not configured correctly"
             )
         
         try:
             # Format message
-            message_data = self.format_message(insight)
+            message_data = build_message()
             
             # Create MIME message
             msg = MIMEMultipart('alternative')
@@ -232,12 +265,12 @@ class EmailChannel(Channel):
                 
                 server.send_message(msg)
             
-            self.logger.info(f"Sent insight email: {insight.title}")
+            self.logger.info(f"Sent insight email: {title}")
             
             return DispatchResult(
                 success=True,
                 channel='email',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=datetime.utcnow(),
                 response={'recipients': self.to_emails}
             )
@@ -247,7 +280,28 @@ class EmailChannel(Channel):
             return DispatchResult(
                 success=False,
                 channel='email',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=datetime.utcnow(),
                 error=str(e)
             )
+    
+    def send(self, insight: Any, **kwargs) -> DispatchResult:
+        """
+        Send insight via email
+        
+        Args:
+            insight: Insight to send
+            **kwargs: Additional parameters
+            
+        Returns:
+            DispatchResult
+        """
+        return self._deliver(lambda: self.format_message(insight), insight.id, insight.title)
+    
+    def send_digest(self, insights: List[Any]) -> DispatchResult:
+        """Send many insights as one email"""
+        return self._deliver(
+            lambda: self.format_digest(insights),
+            self._digest_id(insights),
+            f"digest of {len(insights)} insights"
+        )
@@ -1,8 +1,9 @@
 """
 Slack channel implementation
 """
+import httpx
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from .base import Channel, DispatchResult
 
@@ -10,6 +11,11 @@ from .base import Channel, DispatchResult
 class SlackChannel(Channel):
     """Slack webhook channel for dispatching insights"""
     
+    supports_digest = True
+    
+    # Insights listed in a digest message (Slack allows 50 blocks)
+    DIGEST_MAX_ITEMS = 40
+    
     SEVERITY_EMOJIS = {
         'critical': '🚨',
         'high': '⚠️',
@@ -42,6 +48,10 @@ class SlackChannel(Channel):
         
         return True
     
+    @property
+    def endpoint(self) -> Optional[str]:
+        return self.webhook_url
+    
     def format_message(self, insight: Any) -> Dict[str, Any]:
         """
         Format insight as Slack message with blocks
@@ -177,26 +187,74 @@ class SlackChannel(Channel):
         
         return "\n".join(lines)
     
-    def send(self, insight: Any, **kwargs) -> DispatchResult:
+    def format_digest(self, insights: List[Any]) -> Dict[str, Any]:
         """
-        Send insight to Slack webhook
+        Format many insights as one Slack message
         
         Args:
-            insight: Insight to send
-            **kwargs: Additional parameters
+            insights: Insights to list (most severe first is up to the caller)
             
         Returns:
-            DispatchResult
+            Slack message payload
         """
+        counts = {}
+        for insight in insights:
+            counts[insight.severity] = counts.get(insight.severity, 0) + 1
+        summary = ', '.join(
+            f"{counts[severity]} {severity}" for severity in self.SEVERITY_EMOJIS if severity in counts
+        )
+        text = f"{len(insights)} new insights ({summary})"
+        
+        blocks = [
+            {
+                "type": "header",
+                "text": {"type": "plain_text", "text": f"🔔 {text}", "emoji": True}
+            }
+        ]
+        for insight in insights[:self.DIGEST_MAX_ITEMS]:
+            emoji = self.SEVERITY_EMOJIS.get(insight.severity, 'ℹ️')
+            blocks.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": (
+                        f"{emoji} *{insight.title}*\n"
+                        f"{insight.property} · {insight.category.value} · {insight.severity.upper()}"
+                    )
+                }
+            })
+        if len(insights) > self.DIGEST_MAX_ITEMS:
+            blocks.append({
+                "type": "context",
+                "elements": [{
+                    "type": "mrkdwn",
+                    "text": f"…and {len(insights) - self.DIGEST_MAX_ITEMS} more"
+                }]
+            })
+        
+        payload = {
+            "text": text,
+            "blocks": blocks,
+            "username": self.username,
+            "icon_emoji": self.icon_emoji
+        }
+        
+        if self.channel:
+            payload["channel"] = self.channel
+        
+        return payload
+    
+    def _precheck(self, insight_id: str, title: str) -> Optional[DispatchResult]:
+        """Result for dry-run or invalid config, None if the message should be sent"""
         start_time = datetime.utcnow()
         
         # Dry run mode
         if self.dry_run:
-            self.logger.info(f"[DRY RUN] Would send to Slack: {insight.title}")
+            self.logger.info(f"[DRY RUN] Would send to Slack: {title}")
             return DispatchResult(
                 success=True,
                 channel='slack',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=start_time,
                 response={'dry_run': True}
             )
@@ -206,16 +264,29 @@ class SlackChannel(Channel):
             return DispatchResult(
                 success=False,
                 channel='slack',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=start_time,
                 error="Slack not configured correctly"
             )
         
+        return None
+    
+    def _failure(self, insight_id: str, error: Exception) -> DispatchResult:
+        if isinstance(error, (requests.exceptions.RequestException, httpx.HTTPError)):
+            self.logger.error(f"Failed to send to Slack: {error}")
+        else:
+            self.logger.error(f"Unexpected error sending to Slack: {error}", exc_info=True)
+        return DispatchResult(
+            success=False,
+            channel='slack',
+            insight_id=insight_id,
+            timestamp=datetime.utcnow(),
+            error=str(error)
+        )
+    
+    def _post(self, payload: Dict[str, Any], insight_id: str, title: str) -> DispatchResult:
+        """Post a message to the webhook"""
         try:
-            # Format message
-            payload = self.format_message(insight)
-            
-            # Send to webhook
             response = requests.post(
                 self.webhook_url,
                 json=payload,
@@ -225,31 +296,107 @@ class SlackChannel(Channel):
             
             response.raise_for_status()
             
-            self.logger.info(f"Sent insight to Slack: {insight.title}")
+            self.logger.info(f"Sent insight to Slack: {title}")
             
             return DispatchResult(
                 success=True,
                 channel='slack',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=datetime.utcnow(),
                 response={'status_code': response.status_code}
             )
             
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to send to Slack: {e}")
-            return DispatchResult(
-                success=False,
-                channel='slack',
-                insight_id=insight.id,
-                timestamp=datetime.utcnow(),
-                error=str(e)
-            )
         except Exception as e:
-            self.logger.error(f"Unexpected error sending to Slack: {e}", exc_info=True)
+            return self._failure(insight_id, e)
+    
+    async def _post_async(
+        self,
+        payload: Dict[str, Any],
+        insight_id: str,
+        title: str,
+        client: Optional[httpx.AsyncClient]
+    ) -> DispatchResult:
+        """Post a message to the webhook with an async (keep-alive) client"""
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.post(self.webhook_url, json=payload)
+            else:
+                response = await client.post(self.webhook_url, json=payload)
+            
+            response.raise_for_status()
+            
+            self.logger.info(f"Sent insight to Slack: {title}")
+            
             return DispatchResult(
-                success=False,
+                success=True,
                 channel='slack',
-                insight_id=insight.id,
+                insight_id=insight_id,
                 timestamp=datetime.utcnow(),
-                error=str(e)
+                response={'status_code': response.status_code}
             )
+            
+        except Exception as e:
+            return self._failure(insight_id, e)
+    
+    def send(self, insight: Any, **kwargs) -> DispatchResult:
+        """
+        Send insight to Slack webhook
+        
+        Args:
+            insight: Insight to send
+            **kwargs: Additional parameters
+            
+        Returns:
+            DispatchResult
+        """
+        result = self._precheck(insight.id, insight.title)
+        if result is not None:
+            return result
+        
+        try:
+            payload = self.format_message(insight)
+        except Exception as e:
+            return self._failure(insight.id, e)
+        
+        return self._post(payload, insight.id, insight.title)
+    
+    async def send_async(
+        self,
+        insight: Any,
+        client: Optional[httpx.AsyncClient] = None,
+        **kwargs
+    ) -> DispatchResult:
+        """Send insight to Slack using a shared keep-alive client"""
+        result = self._precheck(insight.id, insight.title)
+        if result is not None:
+            return result
+        
+        try:
+            payload = self.format_message(insight)
+        except Exception as e:
+            return self._failure(insight.id, e)
+        
+        return await self._post_async(payload, insight.id, insight.title, client)
+    
+    def send_digest(self, insights: List[Any]) -> DispatchResult:
+        """Send many insights to Slack as one message"""
+        insight_id, title = self._digest_id(insights), f"digest of {len(insights)} insights"
+        result = self._precheck(insight_id, title)
+        if result is not None:
+            return result
+        
+        return self._post(self.format_digest(insights), insight_id, title)
+    
+    async def send_digest_async(
+        self,
+        insights: List[Any],
+        client: Optional[httpx.AsyncClient] = None
+    ) -> DispatchResult:
+        """Send a digest using a shared keep-alive client"""
+        insight_id, title = self._digest_id(insights), f"digest of {len(insights)} insights"
+        result = self._precheck(insight_id, title)
+        if result is not None:
+            return result
+        
+        return await self._post_async(self.format_digest(insights), insight_id, title, client)
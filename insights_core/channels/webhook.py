@@ -1,8 +1,9 @@
 """
 Generic webhook channel implementation
 """
+import httpx
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 from .base import Channel, DispatchResult
 
@@ -28,6 +29,10 @@ class WebhookChannel(Channel):
         
         return True
     
+    @property
+    def endpoint(self) -> Optional[str]:
+        return self.url
+    
     def format_message(self, insight: Any) -> Dict[str, Any]:
         """
         Format insight as webhook payload
@@ -58,17 +63,8 @@ class WebhookChannel(Channel):
         
         return payload
     
-    def send(self, insight: Any, **kwargs) -> DispatchResult:
-        """
-        Send insight to webhook
-        
-        Args:
-            insight: Insight to send
-            **kwargs: Additional parameters
-            
-        Returns:
-            DispatchResult
-        """
+    def _precheck(self, insight: Any) -> Optional[DispatchResult]:
+        """Result for dry-run or invalid config, None if the webhook should be sent"""
         start_time = datetime.utcnow()
         
         # Dry run mode
@@ -92,13 +88,57 @@ class WebhookChannel(Channel):
                 error="Webhook not configured correctly"
             )
         
+        return None
+    
+    def _headers(self) -> Dict[str, str]:
+        """Default headers merged with custom headers"""
+        headers = {'Content-Type': 'application/json'}
+        headers.update(self.headers)
+        return headers
+    
+    def _sent(self, insight: Any, status_code: int) -> DispatchResult:
+        self.logger.info(f"Sent webhook for insight: {insight.title}")
+        
+        return DispatchResult(
+            success=True,
+            channel='webhook',
+            insight_id=insight.id,
+            timestamp=datetime.utcnow(),
+            response={'status_code': status_code}
+        )
+    
+    def _failure(self, insight: Any, error: Exception) -> DispatchResult:
+        if isinstance(error, (requests.exceptions.RequestException, httpx.HTTPError)):
+            self.logger.error(f"Failed to send webhook: {error}")
+        else:
+            self.logger.error(f"Unexpected error sending webhook: {error}", exc_info=True)
+        return DispatchResult(
+            success=False,
+            channel='webhook',
+            insight_id=insight.id,
+            timestamp=datetime.utcnow(),
+            error=str(error)
+        )
+    
+    def send(self, insight: Any, **kwargs) -> DispatchResult:
+        """
+        Send insight to webhook
+        
+        Args:
+            insight: Insight to send
+            **kwargs: Additional parameters
+            
+        Returns:
+            DispatchResult
+        """
+        result = self._precheck(insight)
+        if result is not None:
+            return result
+        
         try:
             # Format payload
             payload = self.format_message(insight)
-            
-            # Merge custom headers
-            headers = {'Content-Type': 'application/json'}
-            headers.update(self.headers)
+            headers = self._headers()
             
             # Send request
             if self.method == 'POST':
@@ -120,31 +160,40 @@ class WebhookChannel(Channel):
             
             response.raise_for_status()
             
-            self.logger.info(f"Sent webhook for insight: {insight.title}")
+            return self._sent(insight, response.status_code)
             
-            return DispatchResult(
-                success=True,
-                channel='webhook',
-                insight_id=insight.id,
-                timestamp=datetime.utcnow(),
-                response={'status_code': response.status_code}
-            )
+        except Exception as e:
+            return self._failure(insight, e)
+    
+    async def send_async(
+        self,
+        insight: Any,
+        client: Optional[httpx.AsyncClient] = None,
+        **kwargs
+    ) -> DispatchResult:
+        """Send insight to the webhook using a shared keep-alive client"""
+        result = self._precheck(insight)
+        if result is not None:
+            return result
+        
+        try:
+            payload = self.format_message(insight)
+            if self.method not in ('POST', 'PUT'):
+                raise ValueError(f"Unsupported HTTP method: {self.method}")
+            
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.request(
+                        self.method, self.url, json=payload, headers=self._headers()
+                    )
+            else:
+                response = await client.request(
+                    self.method, self.url, json=payload, headers=self._headers()
+                )
+            
+            response.raise_for_status()
+            
+            return self._sent(insight, response.status_code)
             
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to send webhook: {e}")
-            return DispatchResult(
-                success=False,
-                channel='webhook',
-                insight_id=insight.id,
-                timestamp=datetime.utcnow(),
-                error=str(e)
-            )
         except Exception as e:
-            self.logger.error(f"Unexpected error sending webhook: {e}", exc_info=True)
-            return DispatchResult(
-                success=False,
-                channel='webhook',
-                insight_id=insight.id,
-                timestamp=datetime.utcnow(),
-                error=str(e)
-            )
+            return self._failure(insight, e)
@@ -0,0 +1,354 @@
+"""
+Quota-Aware Collection Scheduler
+================================
+Shared async scheduler for external data collection APIs (SERP providers,
+PageSpeed Insights).
+
+Features:
+- One token bucket per provider, shared by every collector in the process,
+  so parallel runs cannot exceed the provider's request rate together
+- Bounded concurrency per run (a fixed pool of workers, not a task per item)
+- Retry with exponential backoff and jitter on rate limiting (429), server
+  errors (5xx) and transport failures; Retry-After is honoured when present
+- Successful results handed to a writer in batches while the run continues
+
+Usage:
+    from insights_core.collection_scheduler import CollectionScheduler
+
+    scheduler = CollectionScheduler('pagespeed')
+
+    async def store(batch):
+        await monitor.store_metrics_batch(property, batch)
+
+    results = await scheduler.run(page_paths, fetch_one, on_batch=store)
+    failed = [r.item for r in results if not r.success]
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Retries after the first attempt for retryable errors
+DEFAULT_MAX_RETRIES = 3
+
+# Exponential backoff: base * 2^(attempt-1), capped, with jitter
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 60.0
+
+# Successful results handed to the writer at a time
+DEFAULT_WRITE_BATCH_SIZE = 50
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class ProviderQuota:
+    """Request rate and concurrency allowed for a provider.
+
+    Attributes:
+        rate_per_second: Sustained requests per second (token refill rate)
+        burst: Requests that may start back to back (bucket capacity)
+        max_concurrency: Requests in flight at once per run
+    """
+    rate_per_second: float
+    burst: int = 1
+    max_concurrency: int = 1
+
+
+# Defaults per provider; override with <PROVIDER>_RATE_PER_SECOND,
+# <PROVIDER>_BURST and <PROVIDER>_MAX_CONCURRENCY environment variables.
+# PageSpeed allows 400 requests/100s per project; the SERP APIs are sized
+# for their entry plans.
+DEFAULT_PROVIDER_QUOTAS: Dict[str, ProviderQuota] = {
+    'valueserp': ProviderQuota(rate_per_second=2.0, burst=4, max_concurrency=4),
+    'serpapi': ProviderQuota(rate_per_second=1.0, burst=2, max_concurrency=2),
+    'serpstack': ProviderQuota(rate_per_second=1.0, burst=1, max_concurrency=2),
+    'pagespeed': ProviderQuota(rate_per_second=4.0, burst=4, max_concurrency=8),
+}
+
+# Quota for providers without an entry above
+FALLBACK_QUOTA = ProviderQuota(rate_per_second=1.0, burst=1, max_concurrency=1)
+
+
+def get_provider_quota(provider: str) -> ProviderQuota:
+    """Get the quota for a provider, applying environment overrides.
+
+    Args:
+        provider: Provider name ('valueserp', 'serpapi', 'serpstack', 'pagespeed')
+
+    Returns:
+        ProviderQuota for the provider
+    """
+    default = DEFAULT_PROVIDER_QUOTAS.get(provider, FALLBACK_QUOTA)
+    prefix = provider.upper()
+    return ProviderQuota(
+        rate_per_second=float(os.getenv(f'{prefix}_RATE_PER_SECOND', default.rate_per_second)),
+        burst=int(os.getenv(f'{prefix}_BURST', default.burst)),
+        max_concurrency=int(os.getenv(f'{prefix}_MAX_CONCURRENCY', default.max_concurrency)),
+    )
+
+
+class TokenBucket:
+    """Token bucket handing out reservations.
+
+    A request takes a token and sleeps until the token would have been
+    available, so concurrent callers queue in arrival order. The state is
+    guarded by a thread lock rather than asyncio primitives, which lets one
+    bucket be shared by event loops in different threads or successive
+    asyncio.run() calls.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int = 1):
+        """
+        Initialize token bucket
+
+        Args:
+            rate_per_second: Tokens added per second
+            capacity: Maximum stored tokens (burst size)
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Take tokens, going into debt if necessary
+
+        Args:
+            tokens: Tokens to take
+
+        Returns:
+            Seconds to wait before the reserved request may start
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait until a request may start"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_token_bucket(provider: str) -> TokenBucket:
+    """Get the process-wide token bucket for a provider"""
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            quota = get_provider_quota(provider)
+            bucket = TokenBucket(quota.rate_per_second, quota.burst)
+            _buckets[provider] = bucket
+        return bucket
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether a failed request is worth retrying"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header, if the error carries one"""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    value = error.response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class CollectionResult:
+    """Outcome of collecting one item.
+
+    Attributes:
+        item: The input item
+        value: Value returned by the fetch function
+        error: Last error (fetch or write), None on success
+        attempts: Fetch attempts made
+    """
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+
+    @property
+    def success(self) -> bool:
+        return self.attempts > 0 and self.error is None
+
+
+class CollectionScheduler:
+    """
+    Runs fetches against one provider within its quota
+
+    Example:
+        scheduler = CollectionScheduler('valueserp')
+        results = await scheduler.run(queries, tracker._collect_query,
+                                      on_batch=tracker._store_query_results)
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        quota: Optional[ProviderQuota] = None,
+        bucket: Optional[TokenBucket] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            provider: Provider name, selects the quota and shared bucket
+            quota: Quota override (defaults to get_provider_quota(provider))
+            bucket: Token bucket override (defaults to the shared bucket)
+            max_retries: Retries after the first attempt
+            backoff_base: Backoff for the first retry in seconds
+            backoff_max: Maximum backoff in seconds
+        """
+        self.provider = provider
+        self.quota = quota or get_provider_quota(provider)
+        self.bucket = bucket or get_token_bucket(provider)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'batches_written': 0}
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number `attempt`"""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    async def _fetch(self, result: CollectionResult, fetch: Callable[[Any], Awaitable[Any]]):
+        """Fetch one item, retrying retryable errors"""
+        for attempt in range(1, self.max_retries + 2):
+            await self.bucket.acquire()
+            self._stats['requests'] += 1
+            result.attempts = attempt
+            try:
+                result.value = await fetch(result.item)
+                result.error = None
+                return
+            except Exception as e:
+                result.error = e
+                if attempt > self.max_retries or not is_retryable(e):
+                    break
+                delay = self._backoff(attempt, e)
+                self._stats['retries'] += 1
+                logger.warning(
+                    f"{self.provider} request failed ({e}), retry {attempt}/{self.max_retries} "
+                    f"in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        self._stats['failures'] += 1
+
+    async def _write(
+        self,
+        batch: List[CollectionResult],
+        on_batch: Callable[[List[Any]], Awaitable[None]]
+    ):
+        """Hand a batch to the writer; a failed write fails its results"""
+        try:
+            await on_batch([r.value for r in batch])
+            self._stats['batches_written'] += 1
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} {self.provider} results: {e}")
+            for result in batch:
+                result.error = e
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        fetch: Callable[[Any], Awaitable[Any]],
+        on_batch: Optional[Callable[[List[Any]], Awaitable[None]]] = None,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        max_concurrency: Optional[int] = None
+    ) -> List[CollectionResult]:
+        """
+        Fetch all items within the provider quota
+
+        Args:
+            items: Items to collect
+            fetch: Async function fetching one item
+            on_batch: Async writer called with lists of fetched values
+            batch_size: Values per writer call
+            max_concurrency: Override for the quota's concurrency
+
+        Returns:
+            One CollectionResult per item, in input order
+        """
+        results = [CollectionResult(item) for item in items]
+        if not results:
+            return results
+
+        queue = iter(results)
+        pending: List[CollectionResult] = []
+        workers = min(max_concurrency or self.quota.max_concurrency, len(results))
+
+        async def worker():
+            for result in queue:
+                await self._fetch(result, fetch)
+                if on_batch is None or result.error is not None:
+                    continue
+                pending.append(result)
+                if len(pending) >= batch_size:
+                    batch = pending[:]
+                    pending.clear()
+                    await self._write(batch, on_batch)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+        if pending:
+            await self._write(pending, on_batch)
+
+        succeeded = sum(1 for r in results if r.success)
+        logger.info(
+            f"{self.provider}: collected {succeeded}/{len(results)} items "
+            f"with {workers} workers"
+        )
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get request, retry, failure and write counters"""
+        return dict(self._stats)
+
+
+__all__ = [
+    'CollectionScheduler',
+    'CollectionResult',
+    'ProviderQuota',
+    'TokenBucket',
+    'get_provider_quota',
+    'get_token_bucket',
+]
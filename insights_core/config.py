@@ -33,7 +33,18 @@ class InsightsConfig(BaseModel):
     # Window sizes
     default_window_days: int = 7
     extended_window_days: int = 28
-    
+
+    # Anomaly forecasting
+    anomaly_forecast_mode: str = 'batch'  # 'batch' (seasonal baseline + Prophet on flagged) or 'prophet' (per page)
+    anomaly_batch_max_pages: int = 1000
+    anomaly_prophet_workers: int = 4  # Processes refitting flagged pages; 0 = baseline only
+
+    # Engine execution
+    engine_max_workers: int = 4  # Detectors running concurrently; 1 = one at a time
+    engine_detector_timeout_seconds: float = 1800.0  # Per detector run; 0 = no limit
+    engine_property_fanout: bool = False  # All-property refresh runs detectors once per property
+    engine_data_snapshot: bool = True  # Detectors share one read of the unified view per refresh
+
     # Dispatcher settings
     dispatcher_enabled: bool = Field(
         default_factory=lambda: os.getenv('DISPATCHER_ENABLED', 'false').lower() == 'true'
@@ -13,12 +13,18 @@ import asyncio
 import logging
 import os
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import asyncpg
 import httpx
 
+from insights_core.collection_scheduler import (
+    DEFAULT_WRITE_BATCH_SIZE,
+    CollectionScheduler,
+    TokenBucket,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -269,14 +275,32 @@ class CoreWebVitalsMonitor:
         metrics: Dict
     ):
         """Store CWV metrics in database"""
+        await self.store_metrics_batch(property, [(page_path, metrics)])
+
+    async def store_metrics_batch(
+        self,
+        property: str,
+        page_metrics: List[Tuple[str, Dict]]
+    ):
+        """
+        Store CWV metrics for several pages in one round trip
+
+        Args:
+            property: Property URL
+            page_metrics: (page_path, metrics) pairs as returned by fetch_page_metrics()
+        """
+        if not page_metrics:
+            return
+
         try:
             # Normalize property URL (remove trailing slash)
             property = property.rstrip('/')
+            check_date = date.today()
 
             pool = await self.get_pool()
 
             async with pool.acquire() as conn:
-                await conn.execute("""
+                await conn.executemany("""
                     INSERT INTO performance.core_web_vitals (
                         property,
                         page_path,
@@ -332,36 +356,40 @@ class CoreWebVitalsMonitor:
                         lighthouse_version = EXCLUDED.lighthouse_version,
                         user_agent = EXCLUDED.user_agent,
                         fetch_time = EXCLUDED.fetch_time
-                """,
-                    property,
-                    page_path,
-                    date.today(),
-                    metrics['strategy'],
-                    metrics.get('lcp'),
-                    metrics.get('fid'),
-                    metrics.get('cls'),
-                    metrics.get('fcp'),
-                    metrics.get('inp'),
-                    metrics.get('ttfb'),
-                    metrics.get('tti'),
-                    metrics.get('tbt'),
-                    metrics.get('speed_index'),
-                    metrics.get('performance_score'),
-                    metrics.get('accessibility_score'),
-                    metrics.get('best_practices_score'),
-                    metrics.get('seo_score'),
-                    metrics.get('pwa_score'),
-                    metrics.get('cwv_assessment'),
-                    metrics.get('opportunities'),
-                    metrics.get('diagnostics'),
-                    {},  # audits (full audit data, can be large)
-                    metrics.get('lighthouse_version'),
-                    metrics.get('user_agent'),
-                    metrics.get('fetch_time'),
-                    {}  # raw_response (stored but not queried often)
-                )
-
-            logger.info(f"Stored CWV metrics: {property}{page_path} ({metrics['strategy']})")
+                """, [
+                    (
+                        property,
+                        page_path,
+                        check_date,
+                        metrics['strategy'],
+                        metrics.get('lcp'),
+                        metrics.get('fid'),
+                        metrics.get('cls'),
+                        metrics.get('fcp'),
+                        metrics.get('inp'),
+                        metrics.get('ttfb'),
+                        metrics.get('tti'),
+                        metrics.get('tbt'),
+                        metrics.get('speed_index'),
+                        metrics.get('performance_score'),
+                        metrics.get('accessibility_score'),
+                        metrics.get('best_practices_score'),
+                        metrics.get('seo_score'),
+                        metrics.get('pwa_score'),
+                        metrics.get('cwv_assessment'),
+                        metrics.get('opportunities'),
+                        metrics.get('diagnostics'),
+                        {},  # audits (full audit data, can be large)
+                        metrics.get('lighthouse_version'),
+                        metrics.get('user_agent'),
+                        metrics.get('fetch_time'),
+                        {}  # raw_response (stored but not queried often)
+                    )
+                    for page_path, metrics in page_metrics
+                ])
+
+            for page_path, metrics in page_metrics:
+                logger.info(f"Stored CWV metrics: {property}{page_path} ({metrics['strategy']})")
 
         except Exception as e:
             logger.error(f"Error storing metrics: {e}")
@@ -432,16 +460,22 @@ class CoreWebVitalsMonitor:
         property: str,
         page_paths: List[str],
         strategies: List[str] = None,
-        delay_seconds: float = 1.0
+        delay_seconds: Optional[float] = None,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE
     ) -> Dict:
         """
         Monitor multiple pages
 
+        Page/strategy checks run concurrently within the PageSpeed quota
+        (see insights_core.collection_scheduler) and are stored in batches.
+
         Args:
             property: Property URL
             page_paths: List of page paths
             strategies: List of strategies ['mobile', 'desktop']
-            delay_seconds: Delay between requests (rate limiting)
+            delay_seconds: Minimum spacing between request starts
+                (None = use the PageSpeed quota)
+            batch_size: Results stored per database round trip
 
         Returns:
             Summary of results
@@ -449,31 +483,55 @@ class CoreWebVitalsMonitor:
         if strategies is None:
             strategies = ['mobile']  # Default to mobile only to save API quota
 
-        results = []
+        logger.info(f"Monitoring {len(page_paths)} pages for {property}")
+
+        async def fetch(check: Tuple[str, str]) -> Tuple[str, Dict]:
+            page_path, strategy = check
+            metrics = await self.fetch_page_metrics(urljoin(property, page_path), strategy)
+            return page_path, metrics
+
+        async def store(batch: List[Tuple[str, Dict]]):
+            await self.store_metrics_batch(property, batch)
+
+        scheduler = CollectionScheduler(
+            'pagespeed',
+            bucket=TokenBucket(1.0 / delay_seconds) if delay_seconds else None
+        )
+        collected = await scheduler.run(
+            [(page_path, strategy) for page_path in page_paths for strategy in strategies],
+            fetch,
+            on_batch=store,
+            batch_size=batch_size
+        )
+
+        page_results = {page_path: {} for page_path in page_paths}
         success_count = 0
         error_count = 0
 
-        logger.info(f"Monitoring {len(page_paths)} pages for {property}")
-
-        for i, page_path in enumerate(page_paths):
-            try:
-                result = await self.monitor_page(property, page_path, strategies, delay_seconds=0)
-                results.append(result)
-
-                # Count successes
-                for strategy_result in result['results'].values():
-                    if strategy_result['success']:
-                        success_count += 1
-                    else:
-                        error_count += 1
-
-                # Rate limiting between pages
-                if i < len(page_paths) - 1:
-                    await asyncio.sleep(delay_seconds)
+        for outcome in collected:
+            page_path, strategy = outcome.item
+            if outcome.success:
+                metrics = outcome.value[1]
+                page_results[page_path][strategy] = {
+                    'success': True,
+                    'performance_score': metrics['performance_score'],
+                    'lcp': metrics.get('lcp'),
+                    'cls': metrics.get('cls'),
+                    'cwv_assessment': metrics.get('cwv_assessment')
+                }
+                success_count += 1
+            else:
+                logger.error(f"Error monitoring {page_path} ({strategy}): {outcome.error}")
+                page_results[page_path][strategy] = {
+                    'success': False,
+                    'error': str(outcome.error)
+                }
+                error_count += 1
 
-            except Exception as e:
-                logger.error(f"Error monitoring {page_path}: {e}")
-                error_count += len(strategies)
+        results = [
+            {'property': property, 'page_path': page_path, 'results': page_results[page_path]}
+            for page_path in page_results
+        ]
 
         logger.info(f"Monitoring complete: {success_count} successful, {error_count} errors")
 
@@ -0,0 +1,370 @@
+"""
+Data Snapshot - Refresh-Scoped Unified Page Time Series
+=======================================================
+gsc.vw_unified_page_performance re-aggregates fact_gsc_daily (REGEXP_REPLACE
+plus window functions) every time it is queried. During an engine refresh
+the view is instead read once per property into a UnifiedSnapshot:
+- One (pages x days) array per base metric, NaN where a page has no row
+- Pages sorted by (property, page_path), days ascending over a fixed window
+- Accessors for the shapes detectors need: long-format rows, the latest
+  matching row per page, and SeriesBatch input for batch forecasting
+
+SnapshotStore caches snapshots for one refresh and is safe to share between
+detectors running on different threads.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import psycopg2
+
+from insights_core.batch_forecasting import SeriesBatch
+
+logger = logging.getLogger(__name__)
+
+# Base (non window-function) columns of vw_unified_page_performance
+SNAPSHOT_METRICS = (
+    'gsc_clicks',
+    'gsc_impressions',
+    'gsc_ctr',
+    'gsc_position',
+    'ga_sessions',
+    'ga_engagement_rate',
+    'ga_bounce_rate',
+    'ga_conversions',
+    'ga_page_views',
+)
+
+# Metrics returned as ints in row accessors, matching the view's column types.
+# NULLs in the view are NaN in the arrays and None in rows.
+COUNT_METRICS = ('gsc_clicks', 'gsc_impressions', 'ga_sessions', 'ga_conversions', 'ga_page_views')
+
+# Days of history loaded (the longest detector lookback)
+SNAPSHOT_DAYS = 90
+
+
+@dataclass
+class UnifiedSnapshot:
+    """Unified page time series for one property (or all), stored column-wise"""
+    property: Optional[str]  # None = all properties
+    keys: List[Tuple[str, str]]  # (property, page_path) per row, sorted
+    dates: np.ndarray  # datetime64[D], shape (n_days,)
+    observed: np.ndarray  # bool, shape (n_pages, n_days): the view has a row
+    metrics: Dict[str, np.ndarray]  # float32, shape (n_pages, n_days), NaN = no row
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def metric(self, name: str) -> np.ndarray:
+        """(pages x days) values of one metric, NaN where a page has no row"""
+        if name not in self.metrics:
+            raise ValueError(f"Unknown metric: {name}. Available: {list(SNAPSHOT_METRICS)}")
+        return self.metrics[name]
+
+    def window(self, since: date, until: Optional[date] = None) -> slice:
+        """Column slice for since <= date < until (until=None: through the last day)"""
+        start = np.datetime64(since, 'D')
+        first = int(np.searchsorted(self.dates, start, side='left'))
+        if until is None:
+            return slice(first, len(self.dates))
+        last = int(np.searchsorted(self.dates, np.datetime64(until, 'D'), side='left'))
+        return slice(first, max(first, last))
+
+    def properties(self, since: Optional[date] = None) -> List[str]:
+        """Properties with at least one row (since a date, if given)"""
+        cols = self.window(since) if since else slice(None)
+        has_rows = self.observed[:, cols].any(axis=1)
+        return sorted({self.keys[i][0] for i in np.flatnonzero(has_rows)})
+
+    def records(
+        self,
+        metrics: Sequence[str],
+        since: date,
+        until: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Long-format rows, one per observed page-day
+
+        Args:
+            metrics: Metrics to include
+            since: First date (inclusive)
+            until: Last date (exclusive, None = through the last day)
+
+        Returns:
+            Dicts with property, page_path, date and the metrics, ordered by
+            property, page_path, date
+        """
+        cols = self.window(since, until)
+        pages, days = np.nonzero(self.observed[:, cols])
+        return self._rows(metrics, pages, days + (cols.start or 0))
+
+    def latest_records(
+        self,
+        metrics: Sequence[str],
+        since: date,
+        where: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The latest row per page since a date, optionally among matching rows
+
+        Equivalent to SELECT DISTINCT ON (property, page_path) ... WHERE
+        <where> ORDER BY property, page_path, date DESC.
+
+        Args:
+            metrics: Metrics to include
+            since: First date (inclusive)
+            where: Optional bool (pages x days) condition rows must meet
+
+        Returns:
+            One dict per page with a matching row, ordered by property, page_path
+        """
+        cols = self.window(since)
+        mask = self.observed[:, cols]
+        if where is not None:
+            mask = mask & where[:, cols]
+
+        pages = np.flatnonzero(mask.any(axis=1))
+        if not len(pages):
+            return []
+        last = mask.shape[1] - 1 - np.argmax(mask[pages, ::-1], axis=1)
+        return self._rows(metrics, pages, last + (cols.start or 0))
+
+    def series_batch(
+        self,
+        metric: str = 'gsc_clicks',
+        min_points: int = 30,
+        min_total: float = 100,
+        max_pages: int = 1000
+    ) -> SeriesBatch:
+        """
+        Eligible page series for batch forecasting
+
+        Same selection as batch_forecasting.fetch_series_batch: days with the
+        metric above zero, at least min_points of them and a total of at least
+        min_total, highest totals first.
+
+        Args:
+            metric: Metric to forecast
+            min_points: Minimum days with data
+            min_total: Minimum metric total over the window
+            max_pages: Maximum number of pages
+
+        Returns:
+            SeriesBatch on the snapshot's date axis
+        """
+        values = self.metric(metric).astype(np.float64)
+        values[~(values > 0)] = np.nan
+
+        counts = (~np.isnan(values)).sum(axis=1)
+        totals = np.nansum(values, axis=1)
+        eligible = np.flatnonzero((counts >= min_points) & (totals >= min_total))
+        eligible = eligible[np.argsort(-totals[eligible], kind='stable')][:max_pages]
+
+        return SeriesBatch(
+            keys=[self.keys[i] for i in eligible],
+            dates=self.dates,
+            values=values[eligible]
+        )
+
+    def _rows(self, metrics: Sequence[str], pages: np.ndarray, days: np.ndarray) -> List[Dict[str, Any]]:
+        """Build row dicts for (page, day) index pairs"""
+        columns = {name: self.metric(name)[pages, days].tolist() for name in metrics}
+        day_values = self.dates[days].astype(date).tolist()
+
+        rows = []
+        for n, page in enumerate(pages.tolist()):
+            property_url, page_path = self.keys[page]
+            row = {'property': property_url, 'page_path': page_path, 'date': day_values[n]}
+            for name, values in columns.items():
+                value = values[n]
+                if value != value:  # NaN: NULL in the view
+                    value = None
+                elif name in COUNT_METRICS:
+                    value = int(value)
+                row[name] = value
+            rows.append(row)
+        return rows
+
+    def subset(self, property: str) -> 'UnifiedSnapshot':
+        """Snapshot restricted to one property (shares no arrays with self)"""
+        rows = [i for i, (property_url, _) in enumerate(self.keys) if property_url == property]
+        return UnifiedSnapshot(
+            property=property,
+            keys=[self.keys[i] for i in rows],
+            dates=self.dates,
+            observed=self.observed[rows],
+            metrics={name: values[rows] for name, values in self.metrics.items()}
+        )
+
+
+def build_snapshot(
+    rows: Iterable[Sequence[Any]],
+    start: date,
+    end: date,
+    property: Optional[str] = None
+) -> UnifiedSnapshot:
+    """
+    Pivot (property, page_path, date, *SNAPSHOT_METRICS) rows into a snapshot
+
+    Args:
+        rows: Long-format rows; dates outside [start, end] are ignored
+        start: First day of the date axis
+        end: Last day of the date axis (inclusive)
+        property: Property the rows were loaded for (None = all)
+
+    Returns:
+        UnifiedSnapshot with pages sorted by (property, page_path)
+    """
+    n_days = (end - start).days + 1
+    dates = np.arange(np.datetime64(start, 'D'), np.datetime64(start, 'D') + n_days)
+
+    index: Dict[Tuple[str, str], int] = {}
+    page_idx: List[int] = []
+    day_idx: List[int] = []
+    vals: List[Sequence[Any]] = []
+    for row in rows:
+        offset = (row[2] - start).days
+        if offset < 0 or offset >= n_days:
+            continue
+        page_idx.append(index.setdefault((row[0], row[1]), len(index)))
+        day_idx.append(offset)
+        vals.append(row[3:])
+
+    keys = sorted(index)
+    rank = {key: i for i, key in enumerate(keys)}
+    remap = np.array([rank[key] for key in index], dtype=np.intp)
+    pages = remap[np.array(page_idx, dtype=np.intp)] if page_idx else np.array([], dtype=np.intp)
+    days = np.array(day_idx, dtype=np.intp)
+
+    observed = np.zeros((len(keys), n_days), dtype=bool)
+    observed[pages, days] = True
+
+    data = np.array(vals, dtype=np.float32).reshape(len(vals), len(SNAPSHOT_METRICS))
+    metrics = {}
+    for column, name in enumerate(SNAPSHOT_METRICS):
+        values = np.full((len(keys), n_days), np.nan, dtype=np.float32)
+        values[pages, days] = data[:, column]
+        metrics[name] = values
+
+    return UnifiedSnapshot(property=property, keys=keys, dates=dates, observed=observed, metrics=metrics)
+
+
+def load_snapshot(conn, property: Optional[str] = None, days_back: int = SNAPSHOT_DAYS) -> UnifiedSnapshot:
+    """
+    Read the unified view once into a snapshot
+
+    Args:
+        conn: psycopg2 connection
+        property: Optional property filter
+        days_back: Days of history to load
+
+    Returns:
+        UnifiedSnapshot covering [today - days_back, today]
+    """
+    end = date.today()
+    start = end - timedelta(days=days_back)
+
+    query = f"""
+        SELECT property, page_path, date, {', '.join(SNAPSHOT_METRICS)}
+        FROM gsc.vw_unified_page_performance
+        WHERE date >= %s
+    """
+    params: List[Any] = [start]
+    if property:
+        query += " AND property = %s"
+        params.append(property)
+
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        rows = cur.fetchall()
+
+    snapshot = build_snapshot(rows, start, end, property=property)
+    logger.info(f"Loaded unified snapshot: {len(rows)} rows, {len(snapshot)} pages")
+    return snapshot
+
+
+class SnapshotStore:
+    """
+    Refresh-scoped cache of unified snapshots, loaded once per property
+
+    A property's snapshot is cut from the all-property snapshot when that one
+    is already loaded. Load failures are cached as None so detectors fall back
+    to their own queries without retrying the load.
+    """
+
+    def __init__(self, dsn: str, days_back: int = SNAPSHOT_DAYS):
+        """
+        Initialize store
+
+        Args:
+            dsn: Database connection string
+            days_back: Days of history per snapshot
+        """
+        self.dsn = dsn
+        self.days_back = days_back
+        self._snapshots: Dict[Optional[str], Optional[UnifiedSnapshot]] = {}
+        self._locks: Dict[Optional[str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.pages_loaded = 0
+
+    def get(self, property: Optional[str] = None) -> Optional[UnifiedSnapshot]:
+        """
+        Get the snapshot for a property, loading it on first use
+
+        Args:
+            property: Property filter (None = all properties)
+
+        Returns:
+            UnifiedSnapshot, or None if it could not be loaded
+        """
+        with self._lock:
+            if property in self._snapshots:
+                return self._snapshots[property]
+            key_lock = self._locks.setdefault(property, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if property in self._snapshots:
+                    return self._snapshots[property]
+                everything = self._snapshots.get(None)
+
+            snapshot = everything.subset(property) if everything is not None else self._load(property)
+
+            with self._lock:
+                self._snapshots[property] = snapshot
+            return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        """Database loads, time spent loading and pages loaded"""
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'load_seconds': self.load_seconds,
+                'pages_loaded': self.pages_loaded,
+            }
+
+    def _load(self, property: Optional[str]) -> Optional[UnifiedSnapshot]:
+        """Load one snapshot from the database"""
+        started = time.monotonic()
+        try:
+            conn = psycopg2.connect(self.dsn)
+            try:
+                snapshot = load_snapshot(conn, property=property, days_back=self.days_back)
+            finally:
+                conn.close()
+            with self._lock:
+                self.pages_loaded += len(snapshot)
+            return snapshot
+        except Exception as e:
+            logger.warning(f"Failed to load unified snapshot for {property or 'all properties'}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self.loads += 1
+                self.load_seconds += time.monotonic() - started
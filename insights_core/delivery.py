@@ -0,0 +1,254 @@
+"""
+Async Delivery Engine
+=====================
+Shared delivery layer for notification channels (InsightDispatcher and
+AlertManager's notification queue).
+
+Features:
+- Per-channel concurrency limits, so one slow Slack or webhook endpoint
+  only holds up its own channel's deliveries
+- One keep-alive HTTP client per endpoint (scheme, host, port), reused by
+  every delivery to that endpoint during a run
+- Per-channel latency histograms (cumulative across runs)
+
+Usage:
+    from insights_core.delivery import DeliveryEngine
+
+    engine = DeliveryEngine({'slack': 2})
+    try:
+        client = engine.client(webhook_url)
+        ok = await engine.deliver('slack', lambda: notifier.send(payload, config, client=client))
+    finally:
+        await engine.aclose()
+
+    engine.get_stats()['slack']['p95_seconds']
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Deliveries in flight at once per channel
+DEFAULT_CHANNEL_CONCURRENCY = {
+    'slack': 2,
+    'email': 4,
+    'jira': 4,
+    'webhook': 8,
+}
+
+# Concurrency for channels without an entry above
+FALLBACK_CHANNEL_CONCURRENCY = 4
+
+# Request timeout for endpoint clients (seconds)
+DEFAULT_TIMEOUT = 10.0
+
+# Idle connections kept open per endpoint client
+DEFAULT_MAX_KEEPALIVE = 8
+
+# Histogram bucket upper bounds in seconds (last bucket catches the rest)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Quantiles are estimated by interpolating inside the bucket that holds
+    them, as Prometheus' histogram_quantile does.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency"""
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.counts[i] += 1
+                    break
+            self.count += 1
+            self.sum += seconds
+            self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimated latency at quantile q (0-1)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts per bucket bound plus summary statistics"""
+        return {
+            'count': self.count,
+            'sum_seconds': self.sum,
+            'mean_seconds': self.sum / self.count if self.count else 0.0,
+            'p50_seconds': self.quantile(0.5),
+            'p95_seconds': self.quantile(0.95),
+            'max_seconds': self.max,
+            'buckets': {
+                ('+Inf' if math.isinf(bound) else str(bound)): count
+                for bound, count in zip(self.buckets, self.counts)
+            },
+        }
+
+
+class EndpointClients:
+    """One keep-alive httpx.AsyncClient per endpoint origin"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_keepalive: int = DEFAULT_MAX_KEEPALIVE):
+        """
+        Initialize client registry
+
+        Args:
+            timeout: Request timeout in seconds
+            max_keepalive: Idle connections kept per endpoint
+        """
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_keepalive_connections=max_keepalive)
+        self._clients: Dict[Tuple[str, str, Optional[int]], httpx.AsyncClient] = {}
+
+    @staticmethod
+    def origin(url: str) -> Tuple[str, str, Optional[int]]:
+        """(scheme, host, port) of a URL"""
+        parts = urlsplit(url)
+        return parts.scheme, parts.hostname or '', parts.port
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Client for the URL's endpoint, created on first use"""
+        key = self.origin(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._clients[key] = client
+        return client
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def aclose(self) -> None:
+        """Close every client"""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+class DeliveryEngine:
+    """
+    Runs channel deliveries under per-channel concurrency limits
+
+    Clients and semaphores belong to the event loop of the current run and
+    are dropped by aclose(); histograms persist across runs.
+    """
+
+    def __init__(
+        self,
+        channel_concurrency: Optional[Dict[str, int]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE
+    ):
+        """
+        Initialize delivery engine
+
+        Args:
+            channel_concurrency: Overrides for DEFAULT_CHANNEL_CONCURRENCY
+            timeout: Request timeout for endpoint clients
+            max_keepalive: Idle connections kept per endpoint
+        """
+        self.channel_concurrency = {**DEFAULT_CHANNEL_CONCURRENCY, **(channel_concurrency or {})}
+        self.clients = EndpointClients(timeout=timeout, max_keepalive=max_keepalive)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._errors: Dict[str, int] = {}
+
+    def limit(self, channel: str) -> int:
+        """Concurrency limit of a channel"""
+        return self.channel_concurrency.get(channel, FALLBACK_CHANNEL_CONCURRENCY)
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Keep-alive client for an endpoint URL"""
+        return self.clients.get(url)
+
+    def histogram(self, channel: str) -> LatencyHistogram:
+        """Latency histogram of a channel"""
+        histogram = self._histograms.get(channel)
+        if histogram is None:
+            histogram = self._histograms[channel] = LatencyHistogram()
+        return histogram
+
+    async def deliver(self, channel: str, send: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run one delivery within the channel's concurrency limit
+
+        Args:
+            channel: Channel name (selects the limit and histogram)
+            send: Starts the delivery; called once a slot is free
+
+        Returns:
+            Whatever send's awaitable returns; exceptions propagate
+        """
+        semaphore = self._semaphores.get(channel)
+        if semaphore is None:
+            semaphore = self._semaphores[channel] = asyncio.Semaphore(self.limit(channel))
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                return await send()
+            except Exception:
+                self._errors[channel] = self._errors.get(channel, 0) + 1
+                raise
+            finally:
+                self.histogram(channel).observe(time.perf_counter() - start)
+
+    async def aclose(self) -> None:
+        """Close endpoint clients and release per-run state"""
+        await self.clients.aclose()
+        self._semaphores = {}
+
+    async def __aenter__(self) -> 'DeliveryEngine':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency snapshot, concurrency limit and error count per channel"""
+        return {
+            channel: {
+                **histogram.snapshot(),
+                'concurrency': self.limit(channel),
+                'errors': self._errors.get(channel, 0),
+            }
+            for channel, histogram in self._histograms.items()
+        }
+
+
+__all__ = [
+    'DeliveryEngine',
+    'EndpointClients',
+    'LatencyHistogram',
+]
@@ -0,0 +1,197 @@
+"""
+Detector DAG - Dependency-Aware Parallel Detector Execution
+===========================================================
+Runs InsightEngine's detectors concurrently instead of one after another:
+- Dependencies are declared by detector class name; a detector starts once
+  every detector it depends on has finished (successfully or not)
+- Independent detectors run at the same time, at most max_workers at once
+- Each run gets a wall-clock timeout; a detector that exceeds it is
+  reported as failed and no longer waited for
+- Runs can fan out over several properties, in which case dependencies only
+  apply between runs for the same property
+
+Worker threads are daemons: a timed-out detector cannot be interrupted, so it
+keeps running in the background without holding up the refresh or shutdown.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Detectors that consume insights produced by other detectors (by class name).
+# DiagnosisDetector diagnoses the NEW risks written by the risk producers.
+DETECTOR_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'DiagnosisDetector': (
+        'AnomalyDetector',
+        'CannibalizationDetector',
+        'ContentQualityDetector',
+        'CWVQualityDetector',
+        'TopicStrategyDetector',
+        'TrendDetector',
+    ),
+}
+
+
+@dataclass
+class DetectorRun:
+    """Outcome of one detector run for one property"""
+    detector: str
+    property: Optional[str]
+    insights_created: int = 0
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+    timed_out: bool = False
+
+
+class DetectorDAG:
+    """
+    Runs detectors concurrently while respecting their dependencies
+
+    Example:
+        >>> dag = DetectorDAG(detectors, max_workers=4, timeout_seconds=600)
+        >>> runs = dag.run(['sc-domain:a.com', 'sc-domain:b.com'])
+    """
+
+    def __init__(
+        self,
+        detectors: Sequence[Any],
+        dependencies: Optional[Dict[str, Sequence[str]]] = None,
+        max_workers: int = 4,
+        timeout_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the executor
+
+        Args:
+            detectors: Detector instances (anything with detect(property=...))
+            dependencies: Detector class name -> names it must run after
+                (defaults to DETECTOR_DEPENDENCIES)
+            max_workers: Maximum number of detectors running at once
+            timeout_seconds: Per-run wall-clock limit (None or 0 = no limit)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.detectors = list(detectors)
+        self.dependencies = DETECTOR_DEPENDENCIES if dependencies is None else dependencies
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds or None
+
+    def run(self, properties: Sequence[Optional[str]] = (None,)) -> List[DetectorRun]:
+        """
+        Run every detector for every property
+
+        Args:
+            properties: Property filters to run for (None = all properties
+                in a single run per detector)
+
+        Returns:
+            One DetectorRun per (property, detector), in input order
+
+        Raises:
+            ValueError: If the declared dependencies contain a cycle
+        """
+        tasks = [(detector, prop) for prop in properties for detector in self.detectors]
+        upstream = self._resolve_upstream(tasks)
+
+        results: Dict[int, DetectorRun] = {}
+        waiting = set(range(len(tasks)))
+        running: Dict[Future, Tuple[int, float]] = {}
+
+        while waiting or running:
+            # Start ready tasks (all upstream runs finished) in input order
+            for i in sorted(waiting):
+                if len(running) >= self.max_workers:
+                    break
+                if upstream[i] <= results.keys():
+                    waiting.discard(i)
+                    running[self._start(*tasks[i])] = (i, time.monotonic())
+
+            if not running:
+                stuck = sorted({self._name(tasks[i][0]) for i in waiting})
+                raise ValueError(f"Detector dependencies contain a cycle: {', '.join(stuck)}")
+
+            done, _ = wait(running, timeout=self._next_deadline(running), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                i, _ = running.pop(future)
+                results[i] = future.result()
+
+            if self.timeout_seconds:
+                now = time.monotonic()
+                for future, (i, started) in list(running.items()):
+                    if now - started >= self.timeout_seconds:
+                        del running[future]
+                        detector, prop = tasks[i]
+                        name = self._name(detector)
+                        logger.error(f"{name} timed out after {self.timeout_seconds:g}s")
+                        results[i] = DetectorRun(
+                            detector=name,
+                            property=prop,
+                            duration_seconds=now - started,
+                            error=f"Timed out after {self.timeout_seconds:g}s",
+                            timed_out=True
+                        )
+
+        return [results[i] for i in range(len(tasks))]
+
+    def _resolve_upstream(self, tasks: List[Tuple[Any, Optional[str]]]) -> List[Set[int]]:
+        """Indexes of the tasks each task must wait for (same property only)"""
+        names = [self._name(detector) for detector, _ in tasks]
+        upstream = []
+        for i, (_, prop) in enumerate(tasks):
+            required = self.dependencies.get(names[i], ())
+            upstream.append({
+                j for j, (_, other_prop) in enumerate(tasks)
+                if j != i and other_prop == prop and names[j] in required
+            })
+        return upstream
+
+    def _next_deadline(self, running: Dict[Future, Tuple[int, float]]) -> Optional[float]:
+        """Seconds until the earliest running task times out"""
+        if not self.timeout_seconds:
+            return None
+        oldest = min(started for _, started in running.values())
+        return max(0.0, oldest + self.timeout_seconds - time.monotonic())
+
+    def _start(self, detector: Any, property: Optional[str]) -> Future:
+        """Run one detector on a daemon worker thread"""
+        future: Future = Future()
+        name = self._name(detector)
+
+        def target():
+            future.set_result(self._run_detector(detector, property))
+
+        logger.info(f"--- Running {name}" + (f" for {property}" if property else "") + " ---")
+        threading.Thread(target=target, name=f"detector-{name}", daemon=True).start()
+        return future
+
+    def _run_detector(self, detector: Any, property: Optional[str]) -> DetectorRun:
+        """Run one detector and capture its outcome"""
+        name = self._name(detector)
+        started = time.monotonic()
+        try:
+            insights_created = detector.detect(property=property)
+            return DetectorRun(
+                detector=name,
+                property=property,
+                insights_created=insights_created,
+                duration_seconds=time.monotonic() - started
+            )
+        except Exception as e:
+            logger.error(f"{name} failed: {e}", exc_info=True)
+            return DetectorRun(
+                detector=name,
+                property=property,
+                duration_seconds=time.monotonic() - started,
+                error=str(e)
+            )
+
+    @staticmethod
+    def _name(detector: Any) -> str:
+        """Detector name used for dependencies and stats"""
+        return detector.__class__.__name__
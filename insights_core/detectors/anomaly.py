@@ -11,11 +11,19 @@ handles:
 
 This approach provides more accurate anomaly detection with fewer false
 positives compared to simple statistical methods like Z-score.
+
+In batch mode (the default, anomaly_forecast_mode = 'batch') all page series
+are fetched in one query and screened with a vectorized weekly-seasonal
+baseline; Prophet is only fitted, in a process pool, for the pages the
+baseline flags. See insights_core/batch_forecasting.py.
 """
 import logging
 import asyncio
 from typing import List
 from datetime import datetime, timedelta, date
+
+import numpy as np
+
 from insights_core.detectors.base import BaseDetector
 from insights_core.models import (
     InsightCreate,
@@ -25,6 +33,11 @@ from insights_core.models import (
     InsightMetrics,
 )
 from insights_core.forecasting import ProphetForecaster
+from insights_core.batch_forecasting import (
+    fetch_series_batch,
+    refit_with_prophet,
+    score_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +52,9 @@ class AnomalyDetector(BaseDetector):
     3. Generate forecasts for recent days
     4. Compare actual vs forecast to detect anomalies
 
+    In batch mode steps 1-2 run once for all pages: a seasonal baseline
+    screens every page and Prophet confirms only the flagged ones.
+
     Severity Levels:
     - HIGH: >30% deviation from forecast
     - MEDIUM: >20% deviation from forecast
@@ -82,13 +98,16 @@ class AnomalyDetector(BaseDetector):
         Returns:
             Number of insights created
         """
+        if self.config.anomaly_forecast_mode == 'batch':
+            return self._detect_batch(property)
+
         logger.info("Starting Prophet-based anomaly detection...")
 
         # Get pages to analyze
         pages = self._get_pages_to_analyze(property)
         logger.info(f"Analyzing {len(pages)} pages for anomalies")
 
-        insights_created = 0
+        insights = []
 
         for page_data in pages:
             try:
@@ -107,8 +126,7 @@ class AnomalyDetector(BaseDetector):
                     )
 
                     if insight_create:
-                        self.repository.create(insight_create)
-                        insights_created += 1
+                        insights.append(insight_create)
                         logger.info(
                             f"Created anomaly insight for {page_data['page_path']}: "
                             f"{anomaly['deviation_pct']:.1f}% deviation"
@@ -121,6 +139,81 @@ class AnomalyDetector(BaseDetector):
                 )
                 continue
 
+        insights_created = self._persist_insights(insights)
+        logger.info(f"AnomalyDetector created {insights_created} insights")
+        return insights_created
+
+    def _detect_batch(self, property: str = None, metric: str = 'gsc_clicks') -> int:
+        """
+        Run anomaly detection for all pages at once
+
+        Args:
+            property: Optional property filter (None = all properties)
+            metric: Metric to analyze (default: gsc_clicks)
+
+        Returns:
+            Number of insights created
+        """
+        logger.info("Starting batch anomaly detection...")
+
+        snapshot = self._get_snapshot(property)
+        if snapshot is not None:
+            batch = snapshot.series_batch(metric, max_pages=self.config.anomaly_batch_max_pages)
+        else:
+            conn = self._get_db_connection()
+            try:
+                batch = fetch_series_batch(
+                    conn,
+                    metric=metric,
+                    days_back=90,
+                    property=property,
+                    max_pages=self.config.anomaly_batch_max_pages
+                )
+            finally:
+                conn.close()
+
+        scores = score_batch(batch)
+        flagged = np.flatnonzero(scores.flagged)
+        logger.info(f"Seasonal baseline flagged {len(flagged)} of {len(batch)} pages")
+
+        # Prophet confirms the flagged pages; without workers (or when a fit
+        # fails) the baseline interval is used as is
+        workers = self.config.anomaly_prophet_workers
+        intervals = refit_with_prophet(batch, flagged, max_workers=workers) if workers > 0 else {}
+
+        insights = []
+
+        for i in flagged:
+            property_url, page_path = batch.keys[i]
+            try:
+                expected, lower, upper = intervals.get(i) or (
+                    scores.expected[i], scores.lower[i], scores.upper[i]
+                )
+                anomaly = self._build_anomaly(
+                    property=property_url,
+                    page_path=page_path,
+                    metric=metric,
+                    latest_date=scores.latest_date(batch, i),
+                    actual_value=float(scores.actual[i]),
+                    expected_value=float(expected),
+                    lower_bound=float(lower),
+                    upper_bound=float(upper)
+                )
+
+                if anomaly:
+                    insight_create = self._create_insight_from_anomaly(
+                        anomaly,
+                        {'property': property_url, 'page_path': page_path}
+                    )
+
+                    if insight_create:
+                        insights.append(insight_create)
+
+            except Exception as e:
+                logger.warning(f"Failed to create anomaly insight for {page_path}: {e}", exc_info=True)
+                continue
+
+        insights_created = self._persist_insights(insights)
         logger.info(f"AnomalyDetector created {insights_created} insights")
         return insights_created
 
@@ -134,6 +227,23 @@ class AnomalyDetector(BaseDetector):
         Returns:
             List of page data dicts with property, page_path, recent clicks
         """
+        snapshot = self._get_snapshot(property)
+        if snapshot is not None:
+            batch = snapshot.series_batch('gsc_clicks', max_pages=50)
+            observed = ~np.isnan(batch.values)
+            # Last day with clicks; every eligible page has at least 30
+            latest = observed.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+            return [
+                {
+                    'property': property_url,
+                    'page_path': page_path,
+                    'data_points': int(observed[i].sum()),
+                    'total_clicks': int(np.nansum(batch.values[i])),
+                    'latest_date': batch.dates[latest[i]].item(),
+                }
+                for i, (property_url, page_path) in enumerate(batch.keys)
+            ]
+
         conn = self._get_db_connection()
         try:
             from psycopg2.extras import RealDictCursor
@@ -257,51 +367,88 @@ class AnomalyDetector(BaseDetector):
             lower_bound = float(forecast_row['yhat_lower'])
             upper_bound = float(forecast_row['yhat_upper'])
 
-            # Check if actual is outside prediction interval
-            if actual_value < lower_bound or actual_value > upper_bound:
-                deviation = actual_value - expected_value
-                deviation_pct = (deviation / expected_value * 100) if expected_value > 0 else 0
+            return self._build_anomaly(
+                property=property,
+                page_path=page_path,
+                metric=metric,
+                latest_date=latest_date,
+                actual_value=actual_value,
+                expected_value=expected_value,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound
+            )
 
-                # Calculate severity based on deviation percentage
-                severity = self._calculate_severity(abs(deviation_pct))
+        except Exception as e:
+            logger.error(f"Error in async forecast anomaly detection: {e}")
+            return None
 
-                # Determine direction
-                direction = 'above' if actual_value > upper_bound else 'below'
+    def _build_anomaly(
+        self,
+        property: str,
+        page_path: str,
+        metric: str,
+        latest_date,
+        actual_value: float,
+        expected_value: float,
+        lower_bound: float,
+        upper_bound: float
+    ) -> dict:
+        """
+        Build the anomaly dict for a value outside its forecast interval
 
-                # Calculate confidence based on how far outside interval
-                if direction == 'below':
-                    confidence = min(0.95, 0.7 + (lower_bound - actual_value) / lower_bound * 0.25)
-                else:
-                    confidence = min(0.95, 0.7 + (actual_value - upper_bound) / upper_bound * 0.25)
+        Args:
+            property: Property URL
+            page_path: Page path
+            metric: Metric analyzed
+            latest_date: Date of the actual value
+            actual_value: Observed value
+            expected_value: Forecast value
+            lower_bound: Lower bound of the prediction interval
+            upper_bound: Upper bound of the prediction interval
 
-                logger.info(
-                    f"Anomaly detected for {page_path}: "
-                    f"expected {expected_value:.0f}, actual {actual_value:.0f} "
-                    f"({deviation_pct:+.1f}%)"
-                )
+        Returns:
+            Anomaly dict or None if the value is inside the interval
+        """
+        # Check if actual is outside prediction interval
+        if not (actual_value < lower_bound or actual_value > upper_bound):
+            return None
 
-                return {
-                    'property': property,
-                    'page_path': page_path,
-                    'metric': metric,
-                    'date': latest_date.date() if hasattr(latest_date, 'date') else latest_date,
-                    'expected': expected_value,
-                    'actual': actual_value,
-                    'deviation': deviation,
-                    'deviation_pct': round(deviation_pct, 2),
-                    'lower_bound': lower_bound,
-                    'upper_bound': upper_bound,
-                    'severity': severity,
-                    'direction': direction,
-                    'confidence': round(confidence, 2)
-                }
+        deviation = actual_value - expected_value
+        deviation_pct = (deviation / expected_value * 100) if expected_value > 0 else 0
 
-            # No anomaly detected
-            return None
+        # Calculate severity based on deviation percentage
+        severity = self._calculate_severity(abs(deviation_pct))
 
-        except Exception as e:
-            logger.error(f"Error in async forecast anomaly detection: {e}")
-            return None
+        # Determine direction
+        direction = 'above' if actual_value > upper_bound else 'below'
+
+        # Calculate confidence based on how far outside interval
+        if direction == 'below':
+            confidence = min(0.95, 0.7 + (lower_bound - actual_value) / lower_bound * 0.25)
+        else:
+            confidence = min(0.95, 0.7 + (actual_value - upper_bound) / upper_bound * 0.25)
+
+        logger.info(
+            f"Anomaly detected for {page_path}: "
+            f"expected {expected_value:.0f}, actual {actual_value:.0f} "
+            f"({deviation_pct:+.1f}%)"
+        )
+
+        return {
+            'property': property,
+            'page_path': page_path,
+            'metric': metric,
+            'date': latest_date.date() if hasattr(latest_date, 'date') else latest_date,
+            'expected': expected_value,
+            'actual': actual_value,
+            'deviation': deviation,
+            'deviation_pct': round(deviation_pct, 2),
+            'lower_bound': lower_bound,
+            'upper_bound': upper_bound,
+            'severity': severity,
+            'direction': direction,
+            'confidence': round(confidence, 2)
+        }
 
     def _calculate_severity(self, deviation_pct: float) -> InsightSeverity:
         """
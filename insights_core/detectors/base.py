@@ -5,7 +5,10 @@ from abc import ABC, abstractmethod
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import logging
+from typing import List, Optional
 
+from insights_core.data_snapshot import SnapshotStore, UnifiedSnapshot
+from insights_core.models import InsightCreate
 from insights_core.repository import InsightRepository
 from insights_core.config import InsightsConfig
 
@@ -28,11 +31,27 @@ class BaseDetector(ABC):
         self.repository = repository
         self.config = config
         self.conn_string = config.warehouse_dsn
+        # Set by InsightEngine for the duration of a refresh
+        self.snapshots: Optional[SnapshotStore] = None
     
     def _get_db_connection(self):
         """Get database connection"""
         return psycopg2.connect(self.conn_string)
     
+    def _get_snapshot(self, property: str = None) -> Optional[UnifiedSnapshot]:
+        """
+        Get the refresh's unified data snapshot
+        
+        Args:
+            property: Optional property filter
+            
+        Returns:
+            UnifiedSnapshot, or None outside a refresh (query the view instead)
+        """
+        if self.snapshots is None:
+            return None
+        return self.snapshots.get(property)
+    
     @abstractmethod
     def detect(self, property: str = None) -> int:
         """
@@ -46,6 +65,21 @@ class BaseDetector(ABC):
         """
         pass
     
+    def _persist_insights(self, insights: List[InsightCreate]) -> int:
+        """
+        Write all insights from a detection run in one batch
+        
+        Args:
+            insights: Insights collected during detection
+            
+        Returns:
+            Number of insights persisted
+        """
+        if not insights:
+            return 0
+        self.repository.create_many(insights)
+        return len(insights)
+    
     def _get_recent_data(self, days: int = 7, property: str = None) -> list:
         """
         Helper to get recent data from unified view
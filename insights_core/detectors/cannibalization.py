@@ -19,6 +19,7 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 
 from insights_core.detectors.base import BaseDetector
+from insights_core.keyword_matrix import load_keyword_matrix
 from insights_core.models import (
     InsightCreate,
     InsightMetrics,
@@ -54,6 +55,7 @@ class CannibalizationDetector(BaseDetector):
     MIN_SHARED_KEYWORDS = 3  # Minimum shared keywords to consider
     MIN_KEYWORD_IMPRESSIONS = 100  # Minimum impressions to consider a keyword
     MIN_PAGE_CLICKS = 10  # Minimum clicks for a page to be analyzed
+    MAX_PAIRS_PER_PAGE = 50  # Most-overlapping partners kept per page
 
     # Severity thresholds
     HIGH_SEVERITY_THRESHOLD = 0.8  # 80% overlap = high severity
@@ -84,6 +86,7 @@ class CannibalizationDetector(BaseDetector):
             logger.warning("Property required for cannibalization detection")
             return 0
 
+        insights = []
         insights_created = 0
         logger.info(f"Starting cannibalization detection for {property}")
 
@@ -116,16 +119,10 @@ class CannibalizationDetector(BaseDetector):
                         overlap.update(winner_loser)
 
                         # Create insight
-                        insight = self._create_cannibalization_insight(overlap, property)
-
-                        try:
-                            self.repository.create(insight)
-                            insights_created += 1
-                            logger.debug(f"Created insight for pages: {overlap['page_a']} vs {overlap['page_b']}")
-                        except Exception as e:
-                            # May already exist
-                            logger.debug(f"Insight creation skipped: {e}")
+                        insights.append(self._create_cannibalization_insight(overlap, property))
+                        logger.debug(f"Created insight for pages: {overlap['page_a']} vs {overlap['page_b']}")
 
+            insights_created = self._persist_insights(insights)
             logger.info(f"Cannibalization detection complete: {insights_created} insights created")
             return insights_created
 
@@ -137,88 +134,44 @@ class CannibalizationDetector(BaseDetector):
         """
         Find pages with overlapping keywords
 
-        Queries GSC data to find pages that rank for the same keywords.
+        Builds a sparse page x keyword matrix from one scan of GSC data and
+        takes shared-keyword counts for all page pairs from its product with
+        itself (see insights_core.keyword_matrix).
 
         Returns:
             List of overlap dicts with page pairs and shared keywords
         """
         conn = None
-        cursor = None
         overlaps = []
 
         try:
             conn = self._get_db_connection()
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-            # Get pages with their keywords
-            cursor.execute("""
-                WITH page_keywords AS (
-                    SELECT
-                        page,
-                        ARRAY_AGG(DISTINCT query) as keywords,
-                        SUM(clicks) as total_clicks,
-                        SUM(impressions) as total_impressions
-                    FROM gsc.search_performance
-                    WHERE property = %s
-                      AND date >= CURRENT_DATE - INTERVAL '30 days'
-                      AND impressions >= %s
-                    GROUP BY page
-                    HAVING SUM(clicks) >= %s
-                ),
-                page_pairs AS (
-                    SELECT
-                        a.page as page_a,
-                        b.page as page_b,
-                        a.keywords as keywords_a,
-                        b.keywords as keywords_b,
-                        a.total_clicks as clicks_a,
-                        b.total_clicks as clicks_b,
-                        a.total_impressions as impressions_a,
-                        b.total_impressions as impressions_b
-                    FROM page_keywords a
-                    CROSS JOIN page_keywords b
-                    WHERE a.page < b.page
-                )
-                SELECT
-                    page_a,
-                    page_b,
-                    keywords_a,
-                    keywords_b,
-                    clicks_a,
-                    clicks_b,
-                    impressions_a,
-                    impressions_b,
-                    (SELECT ARRAY_AGG(x) FROM UNNEST(keywords_a) x WHERE x = ANY(keywords_b)) as shared_keywords
-                FROM page_pairs
-                WHERE (SELECT COUNT(*) FROM UNNEST(keywords_a) x WHERE x = ANY(keywords_b)) >= %s
-            """, (property, self.MIN_KEYWORD_IMPRESSIONS, self.MIN_PAGE_CLICKS, self.MIN_SHARED_KEYWORDS))
-
-            rows = cursor.fetchall()
-
-            for row in rows:
-                shared = row['shared_keywords'] or []
-                keywords_a = row['keywords_a'] or []
-                keywords_b = row['keywords_b'] or []
-
-                if not shared or not keywords_a or not keywords_b:
-                    continue
+            matrix = load_keyword_matrix(
+                conn,
+                property,
+                days=30,
+                min_impressions=self.MIN_KEYWORD_IMPRESSIONS
+            ).restrict(min_page_clicks=self.MIN_PAGE_CLICKS)
 
-                # Calculate overlap score (Jaccard-like)
-                union_size = len(set(keywords_a) | set(keywords_b))
-                overlap_score = len(shared) / union_size if union_size > 0 else 0
+            pairs = matrix.overlapping_pairs(
+                min_shared=self.MIN_SHARED_KEYWORDS,
+                top_k=self.MAX_PAIRS_PER_PAGE
+            )
 
+            for page_a, page_b, shared_count, overlap_score in pairs:
                 overlaps.append({
-                    'page_a': row['page_a'],
-                    'page_b': row['page_b'],
-                    'keywords_a': keywords_a,
-                    'keywords_b': keywords_b,
-                    'shared_keywords': shared,
-                    'shared_count': len(shared),
+                    'page_a': page_a,
+                    'page_b': page_b,
+                    'keywords_a': matrix.keywords(page_a),
+                    'keywords_b': matrix.keywords(page_b),
+                    'shared_keywords': matrix.shared_keywords(page_a, page_b),
+                    'shared_count': shared_count,
                     'overlap_score': overlap_score,
-                    'clicks_a': row['clicks_a'],
-                    'clicks_b': row['clicks_b'],
-                    'impressions_a': row['impressions_a'],
-                    'impressions_b': row['impressions_b']
+                    'clicks_a': matrix.page_clicks(page_a),
+                    'clicks_b': matrix.page_clicks(page_b),
+                    'impressions_a': matrix.page_impressions(page_a),
+                    'impressions_b': matrix.page_impressions(page_b)
                 })
 
             return overlaps
@@ -228,8 +181,6 @@ class CannibalizationDetector(BaseDetector):
             return []
 
         finally:
-            if cursor:
-                cursor.close()
             if conn:
                 conn.close()
 
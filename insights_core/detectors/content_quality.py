@@ -20,6 +20,7 @@ from typing import List, Dict, Optional
 import asyncio
 
 from insights_core.detectors.base import BaseDetector
+from insights_core.keyword_matrix import KeywordMatrix, load_keyword_matrix, url_path
 from insights_core.models import (
     InsightCreate,
     EntityType,
@@ -73,6 +74,7 @@ class ContentQualityDetector(BaseDetector):
     # Cannibalization thresholds
     SIMILARITY_THRESHOLD = 0.8  # Minimum embedding similarity to flag cannibalization
     MIN_SHARED_KEYWORDS = 5  # Minimum shared ranking keywords to confirm cannibalization
+    MAX_RANKING_POSITION = 20  # Only keywords ranking this high count as shared
 
     def __init__(self, repository, config):
         """
@@ -84,6 +86,9 @@ class ContentQualityDetector(BaseDetector):
         """
         super().__init__(repository, config)
 
+        # Ranking-keyword matrices per property (see _get_keyword_matrix)
+        self._keyword_matrices: Dict[str, KeywordMatrix] = {}
+
         # Initialize EmbeddingGenerator for cannibalization detection
         try:
             from insights_core.embeddings import EmbeddingGenerator
@@ -110,7 +115,7 @@ class ContentQualityDetector(BaseDetector):
         logger.info("Starting ContentQualityDetector")
 
         try:
-            insights_created = 0
+            insights = []
 
             # Get content data from database
             pages = self._get_content_data(property)
@@ -126,47 +131,43 @@ class ContentQualityDetector(BaseDetector):
                     # Check 1: Low readability
                     if self._has_low_readability(page):
                         insight = self._create_readability_insight(page, page_property)
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(f"Content quality issue detected: {page_path}, issue: low_readability")
 
                     # Check 2: Missing or short meta description
                     if self._has_meta_description_issue(page):
                         insight = self._create_meta_description_insight(page, page_property)
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(f"Content quality issue detected: {page_path}, issue: missing_meta_description")
 
                     # Check 3: Title too short
                     if self._has_short_title(page):
                         insight = self._create_short_title_insight(page, page_property)
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(f"Content quality issue detected: {page_path}, issue: title_too_short")
 
                     # Check 4: Title too long
                     if self._has_long_title(page):
                         insight = self._create_long_title_insight(page, page_property)
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(f"Content quality issue detected: {page_path}, issue: title_too_long")
 
                     # Check 5: Missing H1 tags
                     if self._has_missing_h1(page):
                         insight = self._create_missing_h1_insight(page, page_property)
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(f"Content quality issue detected: {page_path}, issue: missing_h1")
 
                     # Check 6: Thin content
                     if self._has_thin_content(page):
                         insight = self._create_thin_content_insight(page, page_property)
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(f"Content quality issue detected: {page_path}, issue: thin_content")
             else:
                 logger.info(f"No page snapshots found for property: {property}")
 
+            insights_created = self._persist_insights(insights)
+
             # Check 7: Content cannibalization (if embedder available)
             # This runs independently of page snapshot checks
             if self.embedder and property:
@@ -478,6 +479,9 @@ class ContentQualityDetector(BaseDetector):
         """
         logger.info("Starting cannibalization detection")
 
+        # Reload ranking keywords for this run
+        self._keyword_matrices.pop(property, None)
+
         try:
             # Use asyncio to call async embedder methods
             loop = asyncio.new_event_loop()
@@ -498,7 +502,7 @@ class ContentQualityDetector(BaseDetector):
 
             logger.info(f"Found {len(cannibalization_pairs)} potential cannibalization pairs")
 
-            insights_created = 0
+            insights = []
 
             for pair in cannibalization_pairs:
                 try:
@@ -522,9 +526,7 @@ class ContentQualityDetector(BaseDetector):
                             similarity,
                             shared_keywords_count
                         )
-
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
 
                         logger.info(
                             f"Cannibalization detected: {page_a} vs {page_b}, "
@@ -535,6 +537,7 @@ class ContentQualityDetector(BaseDetector):
                     logger.warning(f"Error processing cannibalization pair: {e}")
                     continue
 
+            insights_created = self._persist_insights(insights)
             logger.info(f"Created {insights_created} cannibalization insights")
             return insights_created
 
@@ -542,6 +545,34 @@ class ContentQualityDetector(BaseDetector):
             logger.error(f"Error in cannibalization detection: {e}", exc_info=True)
             return 0
 
+    def _get_keyword_matrix(self, property: str) -> KeywordMatrix:
+        """
+        Page x ranking-keyword matrix for a property, loaded once per run
+
+        Rows are keyed by page path to match page_snapshots.
+
+        Args:
+            property: Property URL
+
+        Returns:
+            KeywordMatrix of queries ranking in the top 20 over 30 days
+        """
+        matrix = self._keyword_matrices.get(property)
+        if matrix is None:
+            conn = self._get_db_connection()
+            try:
+                matrix = load_keyword_matrix(
+                    conn,
+                    property,
+                    days=30,
+                    max_position=self.MAX_RANKING_POSITION,
+                    page_key=url_path
+                )
+            finally:
+                conn.close()
+            self._keyword_matrices[property] = matrix
+        return matrix
+
     def _get_shared_keywords_count(
         self,
         property: str,
@@ -551,7 +582,8 @@ class ContentQualityDetector(BaseDetector):
         """
         Count shared ranking keywords between two pages
 
-        Checks GSC data to find queries that rank for both pages.
+        Served from the property's keyword matrix, so each candidate pair
+        costs a sparse row intersection instead of a query.
 
         Args:
             property: Property URL
@@ -562,36 +594,7 @@ class ContentQualityDetector(BaseDetector):
             Number of shared ranking keywords
         """
         try:
-            conn = self._get_db_connection()
-            with conn.cursor() as cur:
-                # Find queries that rank for both pages
-                cur.execute("""
-                    WITH page_a_queries AS (
-                        SELECT DISTINCT query
-                        FROM fact_gsc_daily
-                        WHERE property = %s
-                          AND page_path = %s
-                          AND date >= CURRENT_DATE - INTERVAL '30 days'
-                          AND position <= 20  -- Only consider ranking keywords
-                    ),
-                    page_b_queries AS (
-                        SELECT DISTINCT query
-                        FROM fact_gsc_daily
-                        WHERE property = %s
-                          AND page_path = %s
-                          AND date >= CURRENT_DATE - INTERVAL '30 days'
-                          AND position <= 20
-                    )
-                    SELECT COUNT(*) as shared_count
-                    FROM page_a_queries
-                    INNER JOIN page_b_queries
-                    ON page_a_queries.query = page_b_queries.query
-                """, (property, page_a, property, page_b))
-
-                result = cur.fetchone()
-                conn.close()
-
-                return result[0] if result else 0
+            return self._get_keyword_matrix(property).shared_count(page_a, page_b)
 
         except Exception as e:
             logger.error(f"Error counting shared keywords: {e}")
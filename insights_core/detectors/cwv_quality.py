@@ -138,7 +138,7 @@ class CWVQualityDetector(BaseDetector):
 
             logger.info(f"Analyzing {len(cwv_data)} CWV records for quality issues")
 
-            insights_created = 0
+            insights = []
 
             for record in cwv_data:
                 page_path = record.get('page_path', '/')
@@ -158,8 +158,7 @@ class CWVQualityDetector(BaseDetector):
                         device=strategy,
                         unit='ms'
                     )
-                    self.repository.create(insight)
-                    insights_created += 1
+                    insights.append(insight)
                     logger.info(f"Poor LCP detected: {page_path} ({strategy}): {lcp}ms > {LCP_POOR_THRESHOLD}ms")
 
                 # FID check (or INP as replacement)
@@ -175,8 +174,7 @@ class CWVQualityDetector(BaseDetector):
                         device=strategy,
                         unit='ms'
                     )
-                    self.repository.create(insight)
-                    insights_created += 1
+                    insights.append(insight)
                     logger.info(f"Poor {metric_name.upper()} detected: {page_path} ({strategy}): {fid}ms > {FID_POOR_THRESHOLD}ms")
 
                 # CLS check
@@ -191,10 +189,10 @@ class CWVQualityDetector(BaseDetector):
                         device=strategy,
                         unit=''  # CLS is unitless
                     )
-                    self.repository.create(insight)
-                    insights_created += 1
+                    insights.append(insight)
                     logger.info(f"Poor CLS detected: {page_path} ({strategy}): {cls} > {CLS_POOR_THRESHOLD}")
 
+            insights_created = self._persist_insights(insights)
             logger.info(f"CWV quality detection complete: {insights_created} insights created")
             return insights_created
 
@@ -249,28 +249,38 @@ class DiagnosisDetector(BaseDetector):
 
         logger.info(f"Found {len(risks)} new risks to diagnose")
 
-        insights_created = 0
+        diagnosed = []
 
         for risk in risks:
             try:
                 diagnosis = self._diagnose_risk(risk)
                 if diagnosis:
-                    # Create diagnosis insight
-                    created = self.repository.create(diagnosis)
-                    insights_created += 1
-
-                    # Update original risk to diagnosed status
-                    self.repository.update(
-                        risk.id,
-                        InsightUpdate(
-                            status=InsightStatus.DIAGNOSED,
-                            linked_insight_id=created.id
-                        )
-                    )
+                    diagnosed.append((risk, diagnosis))
                     logger.info(f"Diagnosed risk {risk.id}: {diagnosis.title}")
             except Exception as e:
                 logger.error(f"Failed to diagnose risk {risk.id}: {e}")
 
+        if not diagnosed:
+            return 0
+
+        try:
+            # Create diagnosis insights, then mark the original risks as
+            # diagnosed and link them (diagnosis IDs are deterministic)
+            insights_created = self._persist_insights([diagnosis for _, diagnosis in diagnosed])
+            self.repository.update_many([
+                (
+                    risk.id,
+                    InsightUpdate(
+                        status=InsightStatus.DIAGNOSED,
+                        linked_insight_id=diagnosis.to_insight().id
+                    )
+                )
+                for risk, diagnosis in diagnosed
+            ])
+        except Exception as e:
+            logger.error(f"Failed to persist {len(diagnosed)} diagnoses: {e}")
+            return 0
+
         return insights_created
 
     def _diagnose_risk(self, risk) -> Optional[InsightCreate]:
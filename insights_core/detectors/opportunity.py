@@ -2,6 +2,7 @@
 Opportunity Detector - Finds optimization opportunities
 """
 import logging
+from datetime import date, timedelta
 from typing import List
 from insights_core.detectors.base import BaseDetector
 from insights_core.models import (
@@ -14,6 +15,14 @@ from insights_core.models import (
 
 logger = logging.getLogger(__name__)
 
+# Snapshot metrics read by each strategy
+STRIKING_DISTANCE_COLUMNS = (
+    'gsc_position', 'gsc_impressions', 'gsc_clicks', 'gsc_ctr', 'ga_conversions', 'ga_engagement_rate'
+)
+CONTENT_GAP_COLUMNS = (
+    'gsc_impressions', 'gsc_clicks', 'gsc_ctr', 'ga_engagement_rate', 'ga_sessions', 'ga_bounce_rate'
+)
+
 
 class OpportunityDetector(BaseDetector):
     """
@@ -39,9 +48,56 @@ class OpportunityDetector(BaseDetector):
     
     def _find_striking_distance(self, property: str = None) -> int:
         """Find pages in "striking distance" (positions 11-20)"""
-        conn = self._get_db_connection()
-        insights_created = 0
+        rows = self._get_striking_distance_rows(property)
+        insights = []
+        
+        logger.info(f"Found {len(rows)} striking distance opportunities")
+        
+        for row in rows:
+            row = dict(row)
+            try:
+                insight = InsightCreate(
+                    property=row['property'],
+                    entity_type=EntityType.PAGE,
+                    entity_id=row['page_path'],
+                    category=InsightCategory.OPPORTUNITY,
+                    title="Striking Distance Opportunity",
+                    description=(
+                        f"Page ranks in position {row['gsc_position']:.1f} "
+                        f"with {row['gsc_impressions']} impressions. "
+                        f"Small ranking improvement could yield significant traffic gains. "
+                        f"Current CTR: {row['gsc_ctr']*100:.2f}%."
+                    ),
+                    severity=InsightSeverity.MEDIUM,
+                    confidence=0.8,
+                    metrics=InsightMetrics(
+                        gsc_position=row['gsc_position'],
+                        gsc_impressions=row['gsc_impressions'],
+                        gsc_clicks=row['gsc_clicks'],
+                        gsc_ctr=row['gsc_ctr'],
+                        ga_conversions=row.get('ga_conversions'),
+                    ),
+                    window_days=7,
+                    source="OpportunityDetector",
+                )
+                insights.append(insight)
+            except Exception as e:
+                logger.warning(f"Failed to create striking distance insight: {e}")
         
+        return self._persist_insights(insights)
+    
+    def _get_striking_distance_rows(self, property: str = None) -> List[dict]:
+        """Latest striking distance row per page over the last 7 days"""
+        snapshot = self._get_snapshot(property)
+        if snapshot is not None:
+            position = snapshot.metric('gsc_position')
+            return snapshot.latest_records(
+                STRIKING_DISTANCE_COLUMNS,
+                since=date.today() - timedelta(days=7),
+                where=(position >= 11) & (position <= 20) & (snapshot.metric('gsc_impressions') > 100)
+            )
+        
+        conn = self._get_db_connection()
         try:
             from psycopg2.extras import RealDictCursor
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -70,52 +126,65 @@ class OpportunityDetector(BaseDetector):
                 query += " ORDER BY property, page_path, date DESC"
                 cur.execute(query, params)
                 
-                rows = cur.fetchall()
-            
-            logger.info(f"Found {len(rows)} striking distance opportunities")
-            
-            for row in rows:
-                row = dict(row)
-                try:
-                    insight = InsightCreate(
-                        property=row['property'],
-                        entity_type=EntityType.PAGE,
-                        entity_id=row['page_path'],
-                        category=InsightCategory.OPPORTUNITY,
-                        title="Striking Distance Opportunity",
-                        description=(
-                            f"Page ranks in position {row['gsc_position']:.1f} "
-                            f"with {row['gsc_impressions']} impressions. "
-                            f"Small ranking improvement could yield significant traffic gains. "
-                            f"Current CTR: {row['gsc_ctr']*100:.2f}%."
-                        ),
-                        severity=InsightSeverity.MEDIUM,
-                        confidence=0.8,
-                        metrics=InsightMetrics(
-                            gsc_position=row['gsc_position'],
-                            gsc_impressions=row['gsc_impressions'],
-                            gsc_clicks=row['gsc_clicks'],
-                            gsc_ctr=row['gsc_ctr'],
-                            ga_conversions=row.get('ga_conversions'),
-                        ),
-                        window_days=7,
-                        source="OpportunityDetector",
-                    )
-                    self.repository.create(insight)
-                    insights_created += 1
-                except Exception as e:
-                    logger.warning(f"Failed to create striking distance insight: {e}")
-            
-            return insights_created
-            
+                return [dict(row) for row in cur.fetchall()]
         finally:
             conn.close()
     
     def _find_content_gaps(self, property: str = None) -> int:
         """Find pages with high impressions but low engagement"""
-        conn = self._get_db_connection()
-        insights_created = 0
+        rows = self._get_content_gap_rows(property)
+        insights = []
         
+        logger.info(f"Found {len(rows)} content gap opportunities")
+        
+        for row in rows:
+            row = dict(row)
+            try:
+                insight = InsightCreate(
+                    property=row['property'],
+                    entity_type=EntityType.PAGE,
+                    entity_id=row['page_path'],
+                    category=InsightCategory.OPPORTUNITY,
+                    title="Content Gap Opportunity",
+                    description=(
+                        f"Page receives {row['gsc_impressions']} impressions "
+                        f"but has low engagement rate ({row['ga_engagement_rate']*100:.1f}%). "
+                        f"Content may not match user intent. "
+                        f"Improving content relevance could increase conversions."
+                    ),
+                    severity=InsightSeverity.LOW,
+                    confidence=0.65,
+                    metrics=InsightMetrics(
+                        gsc_impressions=row['gsc_impressions'],
+                        gsc_clicks=row['gsc_clicks'],
+                        ga_engagement_rate=row['ga_engagement_rate'],
+                        ga_sessions=row['ga_sessions'],
+                        ga_bounce_rate=row.get('ga_bounce_rate'),
+                    ),
+                    window_days=7,
+                    source="OpportunityDetector",
+                )
+                insights.append(insight)
+            except Exception as e:
+                logger.warning(f"Failed to create content gap insight: {e}")
+
+        return self._persist_insights(insights)
+    
+    def _get_content_gap_rows(self, property: str = None) -> List[dict]:
+        """Latest high-visibility, low-engagement row per page over the last 7 days"""
+        snapshot = self._get_snapshot(property)
+        if snapshot is not None:
+            return snapshot.latest_records(
+                CONTENT_GAP_COLUMNS,
+                since=date.today() - timedelta(days=7),
+                where=(
+                    (snapshot.metric('gsc_impressions') > 500)
+                    & (snapshot.metric('ga_engagement_rate') < 0.4)
+                    & (snapshot.metric('ga_sessions') > 10)
+                )
+            )
+        
+        conn = self._get_db_connection()
         try:
             from psycopg2.extras import RealDictCursor
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -145,50 +214,13 @@ class OpportunityDetector(BaseDetector):
                 query += " ORDER BY property, page_path, date DESC"
                 cur.execute(query, params)
                 
-                rows = cur.fetchall()
-            
-            logger.info(f"Found {len(rows)} content gap opportunities")
-            
-            for row in rows:
-                row = dict(row)
-                try:
-                    insight = InsightCreate(
-                        property=row['property'],
-                        entity_type=EntityType.PAGE,
-                        entity_id=row['page_path'],
-                        category=InsightCategory.OPPORTUNITY,
-                        title="Content Gap Opportunity",
-                        description=(
-                            f"Page receives {row['gsc_impressions']} impressions "
-                            f"but has low engagement rate ({row['ga_engagement_rate']*100:.1f}%). "
-                            f"Content may not match user intent. "
-                            f"Improving content relevance could increase conversions."
-                        ),
-                        severity=InsightSeverity.LOW,
-                        confidence=0.65,
-                        metrics=InsightMetrics(
-                            gsc_impressions=row['gsc_impressions'],
-                            gsc_clicks=row['gsc_clicks'],
-                            ga_engagement_rate=row['ga_engagement_rate'],
-                            ga_sessions=row['ga_sessions'],
-                            ga_bounce_rate=row.get('ga_bounce_rate'),
-                        ),
-                        window_days=7,
-                        source="OpportunityDetector",
-                    )
-                    self.repository.create(insight)
-                    insights_created += 1
-                except Exception as e:
-                    logger.warning(f"Failed to create content gap insight: {e}")
-
-            return insights_created
-
+                return [dict(row) for row in cur.fetchall()]
         finally:
             conn.close()
 
     def _find_url_consolidation_opportunities(self, property: str = None) -> int:
         """Find URL consolidation opportunities using URLConsolidator"""
-        insights_created = 0
+        insights = []
 
         try:
             from insights_core.url_consolidator import URLConsolidator
@@ -196,8 +228,11 @@ class OpportunityDetector(BaseDetector):
             consolidator = URLConsolidator(db_dsn=self.conn_string)
 
             # Get properties to analyze
+            snapshot = None if property else self._get_snapshot()
             if property:
                 properties = [property]
+            elif snapshot is not None:
+                properties = snapshot.properties(since=date.today() - timedelta(days=30))
             else:
                 # Get all properties from database
                 conn = self._get_db_connection()
@@ -229,15 +264,14 @@ class OpportunityDetector(BaseDetector):
                         # Only create insights for medium+ priority
                         if candidate.get('consolidation_score', 0) >= consolidator.MEDIUM_PRIORITY_SCORE:
                             try:
-                                insight = consolidator.create_consolidation_insight(candidate, prop)
-                                self.repository.create(insight)
-                                insights_created += 1
+                                insights.append(consolidator.create_consolidation_insight(candidate, prop))
                             except Exception as e:
                                 logger.warning(f"Failed to create consolidation insight for {candidate.get('canonical_url')}: {e}")
 
                 except Exception as e:
                     logger.warning(f"Error analyzing consolidation for property {prop}: {e}")
 
+            insights_created = self._persist_insights(insights)
             logger.info(f"Created {insights_created} URL consolidation insights")
             return insights_created
 
@@ -3,7 +3,8 @@ Topic Strategy Detector - Generates insights about topic coverage and strategy
 
 Uses TopicClusterer to analyze topic performance and identify:
 1. Underrepresented topics (high impressions, low page count)
-2. Topic cannibalization (multiple pages competing for same keywords)
+2. Topic cannibalization (multiple pages competing for same keywords), with
+   the number of near-duplicate page pairs in the topic from the vector index
 
 Example:
     >>> from insights_core.detectors.topic_strategy import TopicStrategyDetector
@@ -40,6 +41,7 @@ OPPORTUNITY_MAX_PAGE_COUNT = 5      # Maximum pages for underrepresented topic
 CANNIBALIZATION_MIN_PAGE_COUNT = 3  # Minimum pages for cannibalization
 CANNIBALIZATION_MAX_CTR = 0.02      # Maximum CTR indicating cannibalization (2%)
 CANNIBALIZATION_THRESHOLD = 0.7     # Threshold for cannibalization score
+SIMILAR_PAGE_THRESHOLD = 0.85       # Content similarity for a near-duplicate page pair
 
 
 class TopicStrategyDetector(BaseDetector):
@@ -143,29 +145,36 @@ class TopicStrategyDetector(BaseDetector):
 
             logger.info(f"Analyzing {len(topic_performance)} topics for {property}")
 
-            insights_created = 0
+            insights = []
+            cannibalized = []
 
             for topic in topic_performance:
                 # Check for underrepresented topic (opportunity)
                 opportunity_insight = self._check_underrepresented_topic(topic, property)
                 if opportunity_insight:
-                    self.repository.create(opportunity_insight)
-                    insights_created += 1
+                    insights.append(opportunity_insight)
                     logger.info(f"Created opportunity insight for topic: {topic['name']}")
 
                 # Check for topic cannibalization (diagnosis)
                 cannibalization_score = self._calculate_cannibalization_score(topic)
                 if cannibalization_score > CANNIBALIZATION_THRESHOLD:
-                    cannibalization_insight = self._create_cannibalization_insight(
-                        topic, property, cannibalization_score
-                    )
-                    self.repository.create(cannibalization_insight)
-                    insights_created += 1
-                    logger.info(
-                        f"Created cannibalization insight for topic: {topic['name']} "
-                        f"(score: {cannibalization_score:.2f})"
-                    )
+                    cannibalized.append((topic, cannibalization_score))
 
+            similar_pairs = await self._similar_page_pairs(
+                property, [topic.get('topic_id') for topic, _ in cannibalized]
+            )
+            for topic, cannibalization_score in cannibalized:
+                cannibalization_insight = self._create_cannibalization_insight(
+                    topic, property, cannibalization_score,
+                    similar_page_pairs=similar_pairs.get(topic.get('topic_id'))
+                )
+                insights.append(cannibalization_insight)
+                logger.info(
+                    f"Created cannibalization insight for topic: {topic['name']} "
+                    f"(score: {cannibalization_score:.2f})"
+                )
+
+            insights_created = self._persist_insights(insights)
             logger.info(f"Topic strategy detection complete: {insights_created} insights created")
             return insights_created
 
@@ -173,6 +182,29 @@ class TopicStrategyDetector(BaseDetector):
             logger.error(f"Error in async topic detection: {e}")
             return 0
 
+    async def _similar_page_pairs(self, property: str, topic_ids: List[int]) -> Dict[int, int]:
+        """
+        Near-duplicate page pairs per topic from the property's vector index.
+
+        Args:
+            property: Property URL
+            topic_ids: Topics flagged for cannibalization
+
+        Returns:
+            Pair count per topic ID ({} if the index is unavailable)
+        """
+        topic_ids = [topic_id for topic_id in topic_ids if topic_id is not None]
+        if not topic_ids:
+            return {}
+
+        try:
+            return await self.topic_clusterer.similar_page_pairs(
+                property, topic_ids, threshold=SIMILAR_PAGE_THRESHOLD
+            )
+        except Exception as e:
+            logger.warning(f"Similar page pairs unavailable for {property}: {e}")
+            return {}
+
     def _check_underrepresented_topic(
         self,
         topic: Dict[str, Any],
@@ -309,7 +341,8 @@ class TopicStrategyDetector(BaseDetector):
         self,
         topic: Dict[str, Any],
         property: str,
-        cannibalization_score: float
+        cannibalization_score: float,
+        similar_page_pairs: Optional[int] = None
     ) -> InsightCreate:
         """
         Create a diagnosis insight for topic cannibalization.
@@ -318,6 +351,7 @@ class TopicStrategyDetector(BaseDetector):
             topic: Topic performance data
             property: Property URL
             cannibalization_score: Calculated cannibalization score
+            similar_page_pairs: Near-duplicate page pairs in the topic (None if unknown)
 
         Returns:
             InsightCreate for cannibalization diagnosis
@@ -337,6 +371,13 @@ class TopicStrategyDetector(BaseDetector):
         else:
             severity = InsightSeverity.LOW
 
+        duplicates = ""
+        if similar_page_pairs:
+            duplicates = (
+                f"{similar_page_pairs} page pair(s) have near-duplicate content "
+                f"(similarity >= {SIMILAR_PAGE_THRESHOLD:.0%}). "
+            )
+
         return InsightCreate(
             property=property,
             entity_type=EntityType.DIRECTORY,
@@ -347,6 +388,7 @@ class TopicStrategyDetector(BaseDetector):
                 f"Topic '{topic_name}' shows signs of keyword cannibalization. "
                 f"With {page_count} pages competing for similar keywords, performance is diluted. "
                 f"Average CTR: {avg_ctr * 100:.2f}%, Average Position: {avg_position:.1f}. "
+                f"{duplicates}"
                 f"Consider consolidating content or differentiating page focus. "
                 f"Cannibalization score: {cannibalization_score:.0%}."
             ),
@@ -361,6 +403,7 @@ class TopicStrategyDetector(BaseDetector):
                 avg_ctr=avg_ctr,
                 cannibalization_score=round(cannibalization_score, 2),
                 avg_quality=topic.get('avg_quality'),
+                similar_page_pairs=similar_page_pairs,
             ),
             window_days=30,
             source="TopicStrategyDetector",
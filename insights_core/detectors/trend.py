@@ -83,7 +83,7 @@ class TrendDetector(BaseDetector):
 
             logger.debug(f"Analyzing trends for {len(pages_data)} pages")
 
-            insights_created = 0
+            insights = []
 
             # Analyze each page for trends
             for (page_property, page_path), daily_traffic in pages_data.items():
@@ -113,8 +113,7 @@ class TrendDetector(BaseDetector):
                             page_path,
                             trend_result
                         )
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(
                             f"Trend detected: {page_path}, decline, "
                             f"slope={slope:.4f}, r²={r_squared:.4f}"
@@ -127,8 +126,7 @@ class TrendDetector(BaseDetector):
                             page_path,
                             trend_result
                         )
-                        self.repository.create(insight)
-                        insights_created += 1
+                        insights.append(insight)
                         logger.info(
                             f"Trend detected: {page_path}, growth, "
                             f"slope={slope:.4f}, r²={r_squared:.4f}"
@@ -138,6 +136,7 @@ class TrendDetector(BaseDetector):
                     logger.warning(f"Error analyzing trend for {page_path}: {e}")
                     continue
 
+            insights_created = self._persist_insights(insights)
             logger.info(f"TrendDetector created {insights_created} insights")
             return insights_created
 
@@ -155,6 +154,24 @@ class TrendDetector(BaseDetector):
         Returns:
             List of daily traffic records
         """
+        snapshot = self._get_snapshot(property)
+        if snapshot is not None:
+            today = datetime.now().date()
+            return [
+                {
+                    'property': row['property'],
+                    'page_path': row['page_path'],
+                    'date': row['date'],
+                    'clicks': row['gsc_clicks'] or 0,
+                    'impressions': row['gsc_impressions'] or 0,
+                }
+                for row in snapshot.records(
+                    ('gsc_clicks', 'gsc_impressions'),
+                    since=today - timedelta(days=self.LOOKBACK_DAYS),
+                    until=today
+                )
+            ]
+
         conn = None
         try:
             conn = self._get_db_connection()
@@ -1,9 +1,10 @@
 """
 Insight Dispatcher - Routes insights to appropriate channels
 """
+import asyncio
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from insights_core.channels import (
@@ -14,6 +15,7 @@ from insights_core.channels import (
     EmailChannel,
     WebhookChannel
 )
+from insights_core.delivery import DeliveryEngine
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,9 @@ class InsightDispatcher:
     - Configurable routing rules
     - Retry logic with exponential backoff
     - Dry-run mode for testing
+    - Concurrent delivery with per-channel limits and keep-alive clients
+      (concurrent=True), optionally combining a batch into one digest
+      message per channel (digest=True)
     """
     
     # Default routing rules
@@ -62,6 +67,11 @@ class InsightDispatcher:
         self.dry_run = config.get('dry_run', False)
         self.max_retries = config.get('max_retries', 3)
         self.retry_delays = config.get('retry_delays', [1, 2, 4])  # seconds
+        self.concurrent = config.get('concurrent', False)
+        self.digest = config.get('digest', False)
+        
+        # Concurrency limits, endpoint clients and latency histograms
+        self.delivery = DeliveryEngine(config.get('channel_concurrency'))
         
         # Load routing rules
         self.routing_rules = config.get('routing_rules', self.DEFAULT_ROUTING_RULES)
@@ -120,9 +130,22 @@ class InsightDispatcher:
         
         logger.info(f"Dispatching insight '{insight.title}' to channels: {target_channels}")
         
+        if self.concurrent:
+            return asyncio.run(self.dispatch_async(insight))
+        
         # Dispatch to each channel
         results = {}
-        for channel_name in target_channels:
+        for channel_name, channel in self._resolve_channels(target_channels):
+            # Send with retry logic
+            result = self._send_with_retry(channel, insight)
+            results[channel_name] = result
+        
+        return results
+    
+    def _resolve_channels(self, channel_names: List[str]) -> List[Tuple[str, Channel]]:
+        """Initialized, valid channels among channel_names"""
+        channels = []
+        for channel_name in channel_names:
             if channel_name not in self.channels:
                 logger.warning(f"Channel '{channel_name}' not initialized, skipping")
                 continue
@@ -134,11 +157,8 @@ class InsightDispatcher:
                 logger.warning(f"Channel '{channel_name}' config invalid, skipping")
                 continue
             
-            # Send with retry logic
-            result = self._send_with_retry(channel, insight)
-            results[channel_name] = result
-        
-        return results
+            channels.append((channel_name, channel))
+        return channels
     
     def dispatch_batch(self, insights: List[Any]) -> Dict[str, Any]:
         """
@@ -152,6 +172,9 @@ class InsightDispatcher:
         """
         logger.info(f"Dispatching batch of {len(insights)} insights")
         
+        if self.concurrent or self.digest:
+            return asyncio.run(self.dispatch_batch_async(insights, digest=self.digest))
+        
         start_time = time.time()
         
         all_results = []
@@ -184,6 +207,94 @@ class InsightDispatcher:
         
         return stats
     
+    async def dispatch_async(self, insight: Any) -> Dict[str, DispatchResult]:
+        """
+        Dispatch a single insight to its channels concurrently
+        
+        Args:
+            insight: Insight to dispatch
+            
+        Returns:
+            Dict mapping channel names to DispatchResult
+        """
+        channels = self._resolve_channels(self._get_target_channels(insight))
+        try:
+            results = await asyncio.gather(*(
+                self._send_with_retry_async(name, channel, insight) for name, channel in channels
+            ))
+        finally:
+            await self.delivery.aclose()
+        
+        return {name: result for (name, _), result in zip(channels, results)}
+    
+    async def dispatch_batch_async(self, insights: List[Any], digest: bool = False) -> Dict[str, Any]:
+        """
+        Dispatch multiple insights concurrently
+        
+        Every (insight, channel) delivery runs at once, limited per channel
+        by the delivery engine, so a slow endpoint only delays its own
+        channel. With digest=True, channels that support it get one message
+        listing all of their insights instead of one message each.
+        
+        Args:
+            insights: Insights to dispatch
+            digest: Combine each digest-capable channel's insights into one message
+            
+        Returns:
+            Summary statistics (as dispatch_batch, plus messages and latency)
+        """
+        start_time = time.time()
+        
+        # Insights per channel, in routing order
+        routed: Dict[str, List[Any]] = {}
+        channels: Dict[str, Channel] = {}
+        for insight in insights:
+            for name, channel in self._resolve_channels(self._get_target_channels(insight)):
+                channels[name] = channel
+                routed.setdefault(name, []).append(insight)
+        
+        deliveries = []
+        for name, channel_insights in routed.items():
+            channel = channels[name]
+            if digest and channel.supports_digest and len(channel_insights) > 1:
+                deliveries.append(self._send_digest_with_retry_async(name, channel, channel_insights))
+            else:
+                deliveries.extend(
+                    self._send_with_retry_async(name, channel, insight) for insight in channel_insights
+                )
+        
+        try:
+            sent = await asyncio.gather(*deliveries)
+        finally:
+            await self.delivery.aclose()
+        
+        # A digest's outcome counts once per insight it carried
+        all_results = []
+        for result in sent:
+            all_results.extend(result if isinstance(result, list) else [result])
+        
+        successes = sum(1 for result in all_results if result.success)
+        failures = len(all_results) - successes
+        duration = time.time() - start_time
+        
+        stats = {
+            'total_insights': len(insights),
+            'total_dispatches': len(all_results),
+            'messages': len(sent),
+            'successes': successes,
+            'failures': failures,
+            'duration_seconds': duration,
+            'results': all_results,
+            'latency': self.delivery.get_stats()
+        }
+        
+        logger.info(
+            f"Batch dispatch complete: {successes} successes, {failures} failures "
+            f"in {len(sent)} messages, {duration:.2f}s"
+        )
+        
+        return stats
+    
     def _get_target_channels(self, insight: Any) -> List[str]:
         """
         Determine which channels to dispatch to based on routing rules
@@ -246,6 +357,83 @@ class InsightDispatcher:
         logger.error(f"All {self.max_retries} retries exhausted for {channel}")
         return last_result
     
+    async def _attempt_with_retry(self, channel_name: str, send) -> DispatchResult:
+        """
+        Run delivery attempts through the engine, sleeping between retries
+        without holding a channel slot
+        
+        Args:
+            channel_name: Channel (selects the concurrency limit and histogram)
+            send: Starts one attempt, returning an awaitable DispatchResult
+            
+        Returns:
+            DispatchResult of the last attempt
+        """
+        result = None
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self.delivery.deliver(channel_name, send)
+            except Exception as e:
+                result = DispatchResult(
+                    success=False,
+                    channel=channel_name,
+                    insight_id='',
+                    timestamp=datetime.utcnow(),
+                    error=str(e)
+                )
+            result.retry_count = attempt
+            
+            if result.success:
+                if attempt > 0:
+                    logger.info(f"Retry succeeded on attempt {attempt + 1} for {channel_name}")
+                return result
+            
+            logger.warning(f"Dispatch failed on attempt {attempt + 1}/{self.max_retries + 1}: {result.error}")
+            
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delays[min(attempt, len(self.retry_delays) - 1)])
+        
+        logger.error(f"All {self.max_retries} retries exhausted for {channel_name}")
+        return result
+    
+    def _client(self, channel: Channel):
+        """Keep-alive client for the channel's endpoint, if it has one"""
+        return self.delivery.client(channel.endpoint) if channel.endpoint else None
+    
+    async def _send_with_retry_async(self, channel_name: str, channel: Channel, insight: Any) -> DispatchResult:
+        """Send one insight with retries (async)"""
+        result = await self._attempt_with_retry(
+            channel_name,
+            lambda: channel.send_async(insight, client=self._client(channel))
+        )
+        result.insight_id = result.insight_id or insight.id
+        return result
+    
+    async def _send_digest_with_retry_async(
+        self,
+        channel_name: str,
+        channel: Channel,
+        insights: List[Any]
+    ) -> List[DispatchResult]:
+        """Send a digest with retries; returns one result per insight it carried"""
+        result = await self._attempt_with_retry(
+            channel_name,
+            lambda: channel.send_digest_async(insights, client=self._client(channel))
+        )
+        return [
+            DispatchResult(
+                success=result.success,
+                channel=result.channel,
+                insight_id=insight.id,
+                timestamp=result.timestamp,
+                error=result.error,
+                retry_count=result.retry_count,
+                response={**(result.response or {}), 'digest_size': len(insights)}
+            )
+            for insight in insights
+        ]
+    
     def dispatch_recent_insights(
         self,
         repository: Any,
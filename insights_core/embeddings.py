@@ -7,23 +7,52 @@ Generates and stores vector embeddings for content using:
 
 Features:
 - Generate embeddings for page content
+- Batched generation for whole properties: mini-batch encoding, content-hash
+  dedup against stored embeddings, one bulk write per chunk of pages
 - Store in PostgreSQL with pgvector
 - Semantic similarity search
 - Cannibalization detection
+- In-process ANN index per property (insights_core.vector_index) for the
+  similarity and cannibalization queries, updated as embeddings are written
 - Topic clustering
 """
+import asyncio
 import hashlib
 import logging
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import asyncpg
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from insights_core.vector_index import EMBEDDING_DIM, VectorIndex, open_property_index
+
 logger = logging.getLogger(__name__)
 
+# Batched generation defaults: texts per model.encode / Ollama call, and pages
+# per read + bulk write
+ENCODE_BATCH_SIZE = 64
+PAGE_CHUNK_SIZE = 1000
+
+# Throughput mode (large re-embeds, e.g. after a model change)
+THROUGHPUT_ENCODE_BATCH_SIZE = 256
+THROUGHPUT_PAGE_CHUNK_SIZE = 5000
+
+# Most similar pairs returned (and recorded) per cannibalization scan
+CANNIBALIZATION_PAIR_LIMIT = 100
+
+
+def _content_hash(text: str) -> str:
+    """SHA-256 of page text, as stored in page_snapshots.content_hash"""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _vector_literal(vector: np.ndarray) -> str:
+    """pgvector text representation of an embedding"""
+    return '[' + ','.join('%.7g' % x for x in vector.tolist()) + ']'
+
 
 class EmbeddingGenerator:
     """
@@ -34,7 +63,8 @@ class EmbeddingGenerator:
         self,
         db_dsn: str = None,
         model_name: str = 'all-MiniLM-L6-v2',
-        use_ollama: bool = False
+        use_ollama: bool = False,
+        index_dir: str = None
     ):
         """
         Initialize embedding generator
@@ -43,11 +73,15 @@ class EmbeddingGenerator:
             db_dsn: Database connection string
             model_name: Sentence transformer model name
             use_ollama: Use Ollama instead of sentence-transformers
+            index_dir: Root directory for persisted vector indexes (default:
+                EMBEDDING_INDEX_DIR; unset = in-memory indexes)
         """
         self.db_dsn = db_dsn or os.getenv('WAREHOUSE_DSN')
         self.model_name = model_name
         self.use_ollama = use_ollama
+        self.index_dir = index_dir
         self._pool: Optional[asyncpg.Pool] = None
+        self._indexes: Dict[str, VectorIndex] = {}
 
         # Initialize model
         if use_ollama:
@@ -70,6 +104,28 @@ class EmbeddingGenerator:
         if self._pool:
             await self._pool.close()
 
+    async def get_index(self, property: str) -> Optional[VectorIndex]:
+        """
+        ANN index over the property's page embeddings
+
+        Opened (and synced with the warehouse) once per generator, then kept up
+        to date by store_embedding and generate_for_property.
+
+        Returns:
+            VectorIndex, or None if it cannot be loaded (queries then fall
+            back to pgvector)
+        """
+        if property not in self._indexes:
+            try:
+                pool = await self.get_pool()
+                self._indexes[property] = await open_property_index(
+                    pool, property, EMBEDDING_DIM, self.index_dir
+                )
+            except Exception as e:
+                logger.warning(f"Vector index unavailable for {property}: {e}")
+                return None
+        return self._indexes[property]
+
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for text
@@ -128,6 +184,81 @@ class EmbeddingGenerator:
             logger.error(f"Error generating Ollama embedding: {e}")
             return np.zeros(768)
 
+    def generate_embeddings(
+        self,
+        texts: Sequence[str],
+        batch_size: int = ENCODE_BATCH_SIZE
+    ) -> np.ndarray:
+        """
+        Generate embeddings for many texts in mini-batches
+
+        Args:
+            texts: Input texts
+            batch_size: Texts per model call
+
+        Returns:
+            (len(texts), dim) array; empty texts get zero vectors
+        """
+        non_empty = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not non_empty:
+            return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+
+        inputs = [texts[i] for i in non_empty]
+        if self.use_ollama:
+            encoded = self._generate_ollama_embeddings(inputs, batch_size)
+        else:
+            encoded = self._generate_transformer_embeddings(inputs, batch_size)
+
+        embeddings = np.zeros((len(texts), encoded.shape[1]), dtype=np.float32)
+        embeddings[non_empty] = encoded
+        return embeddings
+
+    def _generate_transformer_embeddings(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Generate embeddings for non-empty texts using sentence-transformers"""
+        try:
+            return np.asarray(self.model.encode(
+                [text[:5000] for text in texts],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            ), dtype=np.float32)
+
+        except Exception as e:
+            logger.error(f"Error generating transformer embeddings: {e}")
+            return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+
+    def _generate_ollama_embeddings(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Generate embeddings for non-empty texts using Ollama
+
+        Sends batch_size texts per /api/embed request over one connection; a
+        batch the server rejects falls back to one /api/embeddings call per text.
+        """
+        import httpx
+
+        embeddings = []
+        with httpx.Client(timeout=120.0) as client:
+            for start in range(0, len(texts), batch_size):
+                batch = [text[:2000] for text in texts[start:start + batch_size]]
+                try:
+                    response = client.post(
+                        f"{self.ollama_url}/api/embed",
+                        json={"model": "nomic-embed-text", "input": batch}
+                    )
+                    if response.status_code == 200:
+                        embeddings.extend(
+                            np.array(e, dtype=np.float32) for e in response.json()['embeddings']
+                        )
+                        continue
+                    logger.warning(f"Ollama batch embed error: {response.status_code}, embedding one by one")
+                except Exception as e:
+                    logger.warning(f"Ollama batch embed failed ({e}), embedding one by one")
+
+                embeddings.extend(self._generate_ollama_embedding(text) for text in batch)
+
+        width = max(len(e) for e in embeddings)
+        return np.stack([e if len(e) == width else np.zeros(width, dtype=np.float32) for e in embeddings])
+
     async def store_embedding(
         self,
         property: str,
@@ -206,6 +337,8 @@ class EmbeddingGenerator:
                     datetime.utcnow().date()
                 )
 
+            await self._update_index(property, [page_path], [content_embedding])
+
             logger.info(f"Stored embedding for {property}{page_path}")
             return True
 
@@ -223,6 +356,9 @@ class EmbeddingGenerator:
         """
         Find similar pages using vector similarity
 
+        Served from the property's vector index; pages not in the index (or
+        no index) are looked up with pgvector.
+
         Args:
             property: Property URL
             page_path: Reference page path
@@ -235,6 +371,20 @@ class EmbeddingGenerator:
         try:
             pool = await self.get_pool()
 
+            index = await self.get_index(property)
+            if index is not None and page_path in index:
+                matches = await asyncio.to_thread(index.search, page_path, limit, threshold)
+                details = await self._page_details(pool, property, [path for path, _ in matches])
+                return [
+                    {
+                        'page_path': path,
+                        'title': details.get(path, {}).get('title'),
+                        'word_count': details.get(path, {}).get('word_count'),
+                        'similarity': similarity
+                    }
+                    for path, similarity in matches
+                ]
+
             async with pool.acquire() as conn:
                 results = await conn.fetch("""
                     SELECT
@@ -274,6 +424,9 @@ class EmbeddingGenerator:
         """
         Detect content cannibalization (pages with very similar content)
 
+        Pairs come from the property's vector index (pgvector self-join if it
+        cannot be loaded) and are recorded in content.cannibalization_pairs.
+
         Args:
             property: Property URL
             similarity_threshold: Minimum similarity to flag (0-1)
@@ -284,34 +437,56 @@ class EmbeddingGenerator:
         try:
             pool = await self.get_pool()
 
-            async with pool.acquire() as conn:
-                # Find pairs with high similarity
-                results = await conn.fetch("""
-                    SELECT
-                        s1.page_path AS page_a,
-                        s2.page_path AS page_b,
-                        1 - (s1.content_embedding <=> s2.content_embedding) AS similarity,
-                        s1.title AS title_a,
-                        s2.title AS title_b,
-                        s1.word_count AS words_a,
-                        s2.word_count AS words_b
-                    FROM content.vw_latest_snapshots s1
-                    JOIN content.vw_latest_snapshots s2
-                        ON s1.property = s2.property
-                        AND s1.page_path < s2.page_path  -- Avoid duplicates
-                        AND s1.content_embedding IS NOT NULL
-                        AND s2.content_embedding IS NOT NULL
-                    WHERE s1.property = $1
-                        AND (1 - (s1.content_embedding <=> s2.content_embedding)) >= $2
-                    ORDER BY similarity DESC
-                    LIMIT 100
-                """, property, similarity_threshold)
-
-                cannibalization_pairs = []
-
-                for row in results:
+            index = await self.get_index(property)
+            if index is not None:
+                pairs = await asyncio.to_thread(
+                    index.pairs_above, similarity_threshold, CANNIBALIZATION_PAIR_LIMIT
+                )
+                details = await self._page_details(
+                    pool, property, {path for page_a, page_b, _ in pairs for path in (page_a, page_b)}
+                )
+                cannibalization_pairs = [
+                    {
+                        'page_a': page_a,
+                        'page_b': page_b,
+                        'similarity': similarity,
+                        'title_a': details.get(page_a, {}).get('title'),
+                        'title_b': details.get(page_b, {}).get('title'),
+                        'words_a': details.get(page_a, {}).get('word_count'),
+                        'words_b': details.get(page_b, {}).get('word_count')
+                    }
+                    for page_a, page_b, similarity in pairs
+                ]
+            else:
+                async with pool.acquire() as conn:
+                    # Find pairs with high similarity
+                    results = await conn.fetch("""
+                        SELECT
+                            s1.page_path AS page_a,
+                            s2.page_path AS page_b,
+                            1 - (s1.content_embedding <=> s2.content_embedding) AS similarity,
+                            s1.title AS title_a,
+                            s2.title AS title_b,
+                            s1.word_count AS words_a,
+                            s2.word_count AS words_b
+                        FROM content.vw_latest_snapshots s1
+                        JOIN content.vw_latest_snapshots s2
+                            ON s1.property = s2.property
+                            AND s1.page_path < s2.page_path  -- Avoid duplicates
+                            AND s1.content_embedding IS NOT NULL
+                            AND s2.content_embedding IS NOT NULL
+                        WHERE s1.property = $1
+                            AND (1 - (s1.content_embedding <=> s2.content_embedding)) >= $2
+                        ORDER BY similarity DESC
+                        LIMIT $3
+                    """, property, similarity_threshold, CANNIBALIZATION_PAIR_LIMIT)
+                cannibalization_pairs = [dict(row) for row in results]
+
+            if cannibalization_pairs:
+                now = datetime.utcnow()
+                async with pool.acquire() as conn:
                     # Insert or update cannibalization table
-                    await conn.execute("""
+                    await conn.executemany("""
                         INSERT INTO content.cannibalization_pairs (
                             property,
                             page_a,
@@ -325,25 +500,65 @@ class EmbeddingGenerator:
                         DO UPDATE SET
                             similarity_score = EXCLUDED.similarity_score,
                             last_checked = EXCLUDED.last_checked
-                    """,
-                        property,
-                        row['page_a'],
-                        row['page_b'],
-                        float(row['similarity']),
-                        'high' if row['similarity'] >= 0.9 else 'medium',
-                        datetime.utcnow(),
-                        datetime.utcnow()
-                    )
-
-                    cannibalization_pairs.append(dict(row))
-
-                logger.info(f"Found {len(cannibalization_pairs)} cannibalization pairs for {property}")
-                return cannibalization_pairs
+                    """, [
+                        (
+                            property,
+                            pair['page_a'],
+                            pair['page_b'],
+                            float(pair['similarity']),
+                            'high' if pair['similarity'] >= 0.9 else 'medium',
+                            now,
+                            now
+                        )
+                        for pair in cannibalization_pairs
+                    ])
+
+            logger.info(f"Found {len(cannibalization_pairs)} cannibalization pairs for {property}")
+            return cannibalization_pairs
 
         except Exception as e:
             logger.error(f"Error detecting cannibalization: {e}")
             return []
 
+    async def _page_details(
+        self,
+        pool: asyncpg.Pool,
+        property: str,
+        page_paths
+    ) -> Dict[str, Dict]:
+        """Title and word count of the latest snapshot of each page"""
+        if not page_paths:
+            return {}
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT page_path, title, word_count
+                FROM content.vw_latest_snapshots
+                WHERE property = $1
+                    AND page_path = ANY($2::text[])
+            """, property, list(page_paths))
+        return {row['page_path']: dict(row) for row in rows}
+
+    async def _update_index(self, property: str, page_paths: List[str], vectors: List, save: bool = True):
+        """
+        Apply written embeddings to the property's index, if open in this process
+
+        A persisted index that is not open here picks the writes up (via
+        analyzed_at) the next time it is opened.
+        """
+        index = self._indexes.get(property)
+        if index is None or not page_paths:
+            return
+
+        def apply():
+            index.upsert_many(page_paths, vectors)
+            if save:
+                index.save()
+
+        try:
+            await asyncio.to_thread(apply)
+        except Exception as e:
+            logger.warning(f"Could not update vector index for {property}: {e}")
+
     async def cluster_content(
         self,
         property: str,
@@ -408,7 +623,10 @@ class EmbeddingGenerator:
     def generate_for_property(
         self,
         property: str,
-        page_paths: List[str] = None
+        page_paths: List[str] = None,
+        batch_size: int = ENCODE_BATCH_SIZE,
+        chunk_size: int = PAGE_CHUNK_SIZE,
+        force: bool = False
     ) -> Dict:
         """
         Sync wrapper for generating embeddings (for Celery)
@@ -416,58 +634,248 @@ class EmbeddingGenerator:
         Args:
             property: Property URL
             page_paths: Optional specific pages
+            batch_size: Texts per model call
+            chunk_size: Pages read and written per bulk statement
+            force: Re-embed pages whose stored embedding is up to date
 
         Returns:
             Results dict
         """
-        import asyncio
-        return asyncio.run(self._generate_for_property_async(property, page_paths))
+        return asyncio.run(self._generate_for_property_async(
+            property, page_paths, batch_size=batch_size, chunk_size=chunk_size, force=force
+        ))
 
     async def _generate_for_property_async(
         self,
         property: str,
-        page_paths: List[str] = None
+        page_paths: List[str] = None,
+        batch_size: int = ENCODE_BATCH_SIZE,
+        chunk_size: int = PAGE_CHUNK_SIZE,
+        force: bool = False
     ) -> Dict:
-        """Async implementation of generate_for_property"""
+        """
+        Async implementation of generate_for_property
+
+        Pages (the latest snapshot of each) are read in chunks. Per chunk, pages
+        whose content hash already has an embedding from the current model are
+        skipped (their own row) or reuse the stored vector (another row with
+        the same text); the remaining distinct texts are encoded in mini-batches
+        off the event loop and the chunk is written back with one UPDATE, while
+        the next chunk is read and encoded. Written vectors are applied to the
+        property's vector index if it is open.
+        """
         try:
             pool = await self.get_pool()
-
-            # Get pages to process
-            async with pool.acquire() as conn:
-                if page_paths:
-                    query = """
-                        SELECT page_path, title, text_content
-                        FROM content.page_snapshots
-                        WHERE property = $1 AND page_path = ANY($2)
-                    """
-                    results = await conn.fetch(query, property, page_paths)
-                else:
-                    query = """
-                        SELECT DISTINCT ON (page_path) page_path, title, text_content
-                        FROM content.page_snapshots
-                        WHERE property = $1
-                        ORDER BY page_path, snapshot_date DESC
-                    """
-                    results = await conn.fetch(query, property)
-
-            embeddings_created = 0
-
-            for row in results:
-                success = await self.store_embedding(
-                    property,
-                    row['page_path'],
-                    row['text_content'] or '',
-                    row['title']
-                )
-                if success:
-                    embeddings_created += 1
-
-            return {
-                'property': property,
-                'pages_processed': len(results),
-                'embeddings_created': embeddings_created
+            model = self._embedding_model_name()
+
+            stats = {
+                'pages_processed': 0,
+                'pages_skipped': 0,
+                'embeddings_reused': 0,
+                'texts_encoded': 0,
+                'embeddings_created': 0
             }
+            pending_write: Optional[asyncio.Task] = None
+            last_path = ''
+
+            try:
+                while True:
+                    rows = await self._fetch_page_chunk(pool, property, page_paths, last_path, chunk_size)
+                    if not rows:
+                        break
+                    last_path = rows[-1]['page_path']
+                    stats['pages_processed'] += len(rows)
+
+                    updates = await self._embed_chunk(pool, property, rows, model, batch_size, force, stats)
+                    paths_by_id = {row['id']: row['page_path'] for row in rows}
+
+                    if pending_write is not None:
+                        stats['embeddings_created'] += await pending_write
+                    pending_write = asyncio.create_task(
+                        self._write_chunk(pool, property, updates, paths_by_id, model)
+                    )
+
+                    if len(rows) < chunk_size:
+                        break
+            finally:
+                if pending_write is not None:
+                    stats['embeddings_created'] += await pending_write
+                if property in self._indexes:
+                    await asyncio.to_thread(self._indexes[property].save)
+
+            logger.info(
+                f"Embedded {property}: {stats['pages_processed']} pages, "
+                f"{stats['pages_skipped']} unchanged, {stats['embeddings_reused']} reused, "
+                f"{stats['texts_encoded']} texts encoded"
+            )
+            return {'property': property, **stats}
 
         except Exception as e:
             logger.error(f"Error generating embeddings for property: {e}")
             return {'error': str(e)}
+
+    def _embedding_model_name(self) -> str:
+        """Model name stored in page_snapshots.embedding_model"""
+        return 'nomic-embed-text' if self.use_ollama else self.model_name
+
+    async def _fetch_page_chunk(
+        self,
+        pool: asyncpg.Pool,
+        property: str,
+        page_paths: Optional[List[str]],
+        after_path: str,
+        limit: int
+    ) -> List[asyncpg.Record]:
+        """Latest snapshot of the next `limit` pages after after_path (keyset pagination)"""
+        async with pool.acquire() as conn:
+            return await conn.fetch("""
+                SELECT DISTINCT ON (page_path)
+                    id,
+                    page_path,
+                    title,
+                    text_content,
+                    content_hash,
+                    embedding_model,
+                    content_embedding IS NOT NULL AS has_content_embedding,
+                    title_embedding IS NOT NULL AS has_title_embedding
+                FROM content.page_snapshots
+                WHERE property = $1
+                    AND page_path > $2
+                    AND ($3::text[] IS NULL OR page_path = ANY($3))
+                ORDER BY page_path, snapshot_date DESC
+                LIMIT $4
+            """, property, after_path, page_paths, limit)
+
+    async def _embed_chunk(
+        self,
+        pool: asyncpg.Pool,
+        property: str,
+        rows: List[asyncpg.Record],
+        model: str,
+        batch_size: int,
+        force: bool,
+        stats: Dict
+    ) -> List[Tuple[int, str, str, Optional[str]]]:
+        """
+        Compute embeddings for one chunk of pages
+
+        Returns:
+            (snapshot id, content hash, content vector, title vector) per page
+            to write, vectors in pgvector text form
+        """
+        pages = []
+        for row in rows:
+            text = row['text_content'] or ''
+            text_hash = _content_hash(text)
+            up_to_date = (
+                row['has_content_embedding']
+                and row['content_hash'] == text_hash
+                and row['embedding_model'] == model
+                and (not row['title'] or row['has_title_embedding'])
+            )
+            if up_to_date and not force:
+                stats['pages_skipped'] += 1
+                continue
+            pages.append((row, text, text_hash))
+
+        if not pages:
+            return []
+
+        # Vectors already stored for the same text (other pages or snapshots)
+        stored = {} if force else await self._find_stored_embeddings(
+            pool, property, [text_hash for _, _, text_hash in pages], model
+        )
+
+        # Encode each distinct text and title once
+        texts = list(dict.fromkeys(text for _, text, text_hash in pages if text_hash not in stored))
+        titles = list(dict.fromkeys(row['title'] for row, _, _ in pages if row['title']))
+        vectors = await asyncio.to_thread(self.generate_embeddings, texts + titles, batch_size)
+        stats['texts_encoded'] += len(texts) + len(titles)
+
+        encoded = {text: _vector_literal(vectors[i]) for i, text in enumerate(texts)}
+        title_vectors = {title: _vector_literal(vectors[len(texts) + i]) for i, title in enumerate(titles)}
+
+        updates = []
+        for row, text, text_hash in pages:
+            if text_hash in stored:
+                stats['embeddings_reused'] += 1
+                content_vector = stored[text_hash]
+            else:
+                content_vector = encoded[text]
+            updates.append((
+                row['id'],
+                text_hash,
+                content_vector,
+                title_vectors.get(row['title']) if row['title'] else None
+            ))
+        return updates
+
+    async def _find_stored_embeddings(
+        self,
+        pool: asyncpg.Pool,
+        property: str,
+        content_hashes: List[str],
+        model: str
+    ) -> Dict[str, str]:
+        """Stored content vectors (pgvector text) by content hash, for the current model"""
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT DISTINCT ON (content_hash)
+                    content_hash,
+                    content_embedding::text AS content_embedding
+                FROM content.page_snapshots
+                WHERE property = $1
+                    AND content_hash = ANY($2::text[])
+                    AND embedding_model = $3
+                    AND content_embedding IS NOT NULL
+            """, property, list(set(content_hashes)), model)
+        return {row['content_hash']: row['content_embedding'] for row in rows}
+
+    async def _write_chunk(
+        self,
+        pool: asyncpg.Pool,
+        property: str,
+        updates: List[Tuple[int, str, str, Optional[str]]],
+        paths_by_id: Dict[int, str],
+        model: str
+    ) -> int:
+        """Write a chunk of embeddings, then apply them to the open vector index"""
+        written = await self._write_embeddings(pool, updates, model)
+        await self._update_index(
+            property,
+            [paths_by_id[snapshot_id] for snapshot_id, _, _, _ in updates],
+            [content_vector for _, _, content_vector, _ in updates],
+            save=False
+        )
+        return written
+
+    async def _write_embeddings(
+        self,
+        pool: asyncpg.Pool,
+        updates: List[Tuple[int, str, str, Optional[str]]],
+        model: str
+    ) -> int:
+        """
+        Write a chunk of embeddings to their snapshot rows in one statement
+
+        Returns:
+            Number of rows updated
+        """
+        if not updates:
+            return 0
+
+        ids, hashes, content_vectors, title_vectors = (list(column) for column in zip(*updates))
+        async with pool.acquire() as conn:
+            status = await conn.execute("""
+                UPDATE content.page_snapshots AS s
+                SET content_embedding = v.content_embedding::vector,
+                    title_embedding = v.title_embedding::vector,
+                    content_hash = v.content_hash,
+                    embedding_model = $5,
+                    analyzed_at = $6
+                FROM unnest($1::bigint[], $2::text[], $3::text[], $4::text[])
+                    AS v(id, content_hash, content_embedding, title_embedding)
+                WHERE s.id = v.id
+            """, ids, hashes, content_vectors, title_vectors, model, datetime.utcnow())
+
+        return int(status.split()[-1])
@@ -2,9 +2,13 @@
 Insight Engine - Orchestrates all detectors
 """
 import logging
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 
+import psycopg2
+
+from insights_core.data_snapshot import SnapshotStore
+from insights_core.detector_dag import DetectorDAG
 from insights_core.models import Insight
 from insights_core.repository import InsightRepository
 from insights_core.config import InsightsConfig
@@ -26,12 +30,13 @@ class InsightEngine:
     """
     Main orchestration engine for insight detection
 
-    Runs detectors in sequence:
+    Runs detectors concurrently (see DetectorDAG), sharing one read of the
+    unified view per property (see SnapshotStore):
     1. AnomalyDetector - finds traffic anomalies
     2. CannibalizationDetector - detects keyword cannibalization issues
     3. ContentQualityDetector - detects content quality issues
     4. CWVQualityDetector - detects Core Web Vitals performance issues
-    5. DiagnosisDetector - diagnoses existing risks
+    5. DiagnosisDetector - diagnoses existing risks (after the risk detectors)
     6. OpportunityDetector - finds optimization opportunities
     7. TopicStrategyDetector - analyzes topic coverage and cannibalization
     8. TrendDetector - identifies gradual traffic trends
@@ -86,33 +91,66 @@ class InsightEngine:
             'detectors_run': 0,
             'detectors_succeeded': 0,
             'detectors_failed': 0,
+            'detectors_timed_out': 0,
             'total_insights_created': 0,
             'insights_by_detector': {},
+            'detector_duration_seconds': {},
             'errors': []
         }
 
-        for detector in self.detectors:
-            detector_name = detector.__class__.__name__
-            logger.info(f"\n--- Running {detector_name} ---")
+        snapshots = SnapshotStore(self.config.warehouse_dsn) if self.config.engine_data_snapshot else None
 
-            try:
-                insights_created = detector.detect(property=property)
-                stats['detectors_run'] += 1
-                stats['detectors_succeeded'] += 1
-                stats['total_insights_created'] += insights_created
-                stats['insights_by_detector'][detector_name] = insights_created
+        properties = [property]
+        fanout = property is None and self.config.engine_property_fanout
+        if fanout:
+            properties = self._get_properties(snapshots)
+            stats['properties'] = properties
+            stats['insights_by_property'] = {p: 0 for p in properties}
+            logger.info(f"Fanning out over {len(properties)} properties")
 
-                logger.info(f"{detector_name} created {insights_created} insights")
+        dag = DetectorDAG(
+            self.detectors,
+            max_workers=self.config.engine_max_workers,
+            timeout_seconds=self.config.engine_detector_timeout_seconds
+        )
 
-            except Exception as e:
-                stats['detectors_run'] += 1
+        for detector in self.detectors:
+            detector.snapshots = snapshots
+        try:
+            runs = dag.run(properties)
+        finally:
+            for detector in self.detectors:
+                detector.snapshots = None
+
+        if snapshots is not None:
+            stats['snapshot'] = snapshots.stats()
+
+        for run in runs:
+            stats['detectors_run'] += 1
+            stats['insights_by_detector'][run.detector] = (
+                stats['insights_by_detector'].get(run.detector, 0) + run.insights_created
+            )
+            stats['detector_duration_seconds'][run.detector] = (
+                stats['detector_duration_seconds'].get(run.detector, 0.0) + run.duration_seconds
+            )
+
+            if run.error is None:
+                stats['detectors_succeeded'] += 1
+                stats['total_insights_created'] += run.insights_created
+                if fanout:
+                    stats['insights_by_property'][run.property] += run.insights_created
+                logger.info(
+                    f"{run.detector} created {run.insights_created} insights "
+                    f"in {run.duration_seconds:.2f}s"
+                )
+            else:
                 stats['detectors_failed'] += 1
-                stats['insights_by_detector'][detector_name] = 0
-                stats['errors'].append({
-                    'detector': detector_name,
-                    'error': str(e)
-                })
-                logger.error(f"{detector_name} failed: {e}", exc_info=True)
+                if run.timed_out:
+                    stats['detectors_timed_out'] += 1
+                error = {'detector': run.detector, 'error': run.error}
+                if fanout:
+                    error['property'] = run.property
+                stats['errors'].append(error)
 
         # Generate actions if enabled and insights were created
         if generate_actions and stats['total_insights_created'] > 0:
@@ -169,6 +207,34 @@ class InsightEngine:
 
         return stats
     
+    def _get_properties(self, snapshots: Optional[SnapshotStore] = None) -> List[str]:
+        """
+        Get properties with recent data (for per-property fan-out)
+
+        Args:
+            snapshots: Refresh snapshot store; when given, the all-property
+                snapshot is loaded once and per-property snapshots are cut from it
+
+        Returns:
+            Property URLs, sorted
+        """
+        snapshot = snapshots.get() if snapshots is not None else None
+        if snapshot is not None:
+            return snapshot.properties(since=date.today() - timedelta(days=30))
+
+        conn = psycopg2.connect(self.config.warehouse_dsn)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT property
+                    FROM gsc.vw_unified_page_performance
+                    WHERE date >= CURRENT_DATE - INTERVAL '30 days'
+                    ORDER BY property
+                """)
+                return [row[0] for row in cur.fetchall()]
+        finally:
+            conn.close()
+    
     def get_detector_stats(self) -> dict:
         """Get statistics about available detectors"""
         return {
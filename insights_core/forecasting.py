@@ -188,8 +188,9 @@ class ProphetForecaster:
             future = model.make_future_dataframe(periods=periods)
             forecast = model.predict(future)
 
-            return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper',
-                           'trend', 'weekly', 'yearly']]
+            # Components are only present when enabled (yearly needs a year of data)
+            columns = ['ds', 'yhat', 'yhat_lower', 'yhat_upper', 'trend', 'weekly', 'yearly']
+            return forecast[[c for c in columns if c in forecast.columns]]
 
         except Exception as e:
             logger.error(f"Error making predictions: {e}")
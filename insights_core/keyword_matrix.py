@@ -0,0 +1,315 @@
+"""
+Keyword Matrix - Sparse page x query incidence matrix
+=====================================================
+In-process engine for keyword overlap (cannibalization) between pages.
+
+One scan of gsc.search_performance builds a CSR matrix A with a row per page
+and a column per query (A[p, q] = 1 when page p ranks for query q under the
+caller's filters). Shared-keyword counts for every page pair are the entries
+of A @ A.T, computed in row blocks so memory stays bounded, thresholded on
+the shared count and Jaccard overlap, and trimmed to the top-k partners per
+page. Single pair lookups are a sparse row intersection.
+
+Served to:
+- CannibalizationDetector._find_keyword_overlaps (all overlapping pairs)
+- ContentQualityDetector._get_shared_keywords_count (pairs proposed by
+  embedding similarity)
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+from psycopg2.extras import RealDictCursor
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Page rows multiplied against the whole matrix at a time; a query shared by
+# every page makes each product row dense, so this bounds temporary memory
+PAIR_BLOCK = 256
+
+# Rows fetched per round trip while streaming the scan
+FETCH_BATCH = 10000
+
+# (page_a, page_b, shared_count, overlap) with page_a < page_b
+KeywordPair = Tuple[str, str, int, float]
+
+
+def url_path(page: str) -> str:
+    """Path of a page URL (page_snapshots keys pages by path)"""
+    if '://' not in page:
+        return page
+    return urlparse(page).path or '/'
+
+
+class KeywordMatrix:
+    """
+    Sparse page x query incidence matrix
+
+    Example:
+        >>> matrix = KeywordMatrix.from_rows([
+        ...     {'page': '/a', 'query': 'x'}, {'page': '/b', 'query': 'x'}])
+        >>> matrix.shared_count('/a', '/b')
+        1
+    """
+
+    def __init__(
+        self,
+        pages: List[str],
+        queries: List[str],
+        matrix: sparse.csr_matrix,
+        clicks: Optional[np.ndarray] = None,
+        impressions: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize from prepared arrays
+
+        Args:
+            pages: Page of each row
+            queries: Query of each column
+            matrix: (pages x queries) CSR matrix with sorted indices
+            clicks: Total clicks per page over its counted queries
+            impressions: Total impressions per page over its counted queries
+        """
+        self.pages = pages
+        self.queries = queries
+        self.matrix = matrix
+        self.clicks = clicks if clicks is not None else np.zeros(len(pages), dtype=np.int64)
+        self.impressions = impressions if impressions is not None else np.zeros(len(pages), dtype=np.int64)
+        self._rows = {page: i for i, page in enumerate(pages)}
+        self._degrees = np.diff(matrix.indptr)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping],
+        page_key: Optional[Callable[[str], str]] = None
+    ) -> 'KeywordMatrix':
+        """
+        Build from (page, query[, clicks, impressions]) rows
+
+        Args:
+            rows: Mappings with 'page' and 'query' and optional 'clicks'/'impressions'
+            page_key: Maps a page to its row key (e.g. url_path); rows
+                with the same key are merged
+
+        Returns:
+            KeywordMatrix
+        """
+        page_ids: Dict[str, int] = {}
+        query_ids: Dict[str, int] = {}
+        row_idx: List[int] = []
+        col_idx: List[int] = []
+        clicks: List[int] = []
+        impressions: List[int] = []
+
+        for row in rows:
+            page = page_key(row['page']) if page_key else row['page']
+            p = page_ids.setdefault(page, len(page_ids))
+            q = query_ids.setdefault(row['query'], len(query_ids))
+            if p == len(clicks):
+                clicks.append(0)
+                impressions.append(0)
+            row_idx.append(p)
+            col_idx.append(q)
+            clicks[p] += row.get('clicks') or 0
+            impressions[p] += row.get('impressions') or 0
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(row_idx), dtype=np.int32), (row_idx, col_idx)),
+            shape=(len(page_ids), len(query_ids))
+        )
+        # Duplicate (page, query) cells are summed on conversion; keep incidence
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+
+        return cls(
+            list(page_ids),
+            list(query_ids),
+            matrix,
+            np.array(clicks, dtype=np.int64),
+            np.array(impressions, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, page: str) -> bool:
+        return page in self._rows
+
+    def _columns(self, page: str) -> np.ndarray:
+        """Query columns of a page (empty if unknown)"""
+        i = self._rows.get(page)
+        if i is None:
+            return np.empty(0, dtype=self.matrix.indices.dtype)
+        return self.matrix.indices[self.matrix.indptr[i]:self.matrix.indptr[i + 1]]
+
+    def keywords(self, page: str) -> List[str]:
+        """Queries a page ranks for"""
+        return [self.queries[q] for q in self._columns(page)]
+
+    def shared_keywords(self, page_a: str, page_b: str) -> List[str]:
+        """Queries both pages rank for"""
+        shared = np.intersect1d(self._columns(page_a), self._columns(page_b), assume_unique=True)
+        return [self.queries[q] for q in shared]
+
+    def shared_count(self, page_a: str, page_b: str) -> int:
+        """Number of queries both pages rank for"""
+        return len(np.intersect1d(self._columns(page_a), self._columns(page_b), assume_unique=True))
+
+    def page_clicks(self, page: str) -> int:
+        i = self._rows.get(page)
+        return int(self.clicks[i]) if i is not None else 0
+
+    def page_impressions(self, page: str) -> int:
+        i = self._rows.get(page)
+        return int(self.impressions[i]) if i is not None else 0
+
+    def restrict(self, min_page_clicks: int = 0) -> 'KeywordMatrix':
+        """
+        Matrix without pages below a click total
+
+        Args:
+            min_page_clicks: Minimum clicks summed over the page's queries
+
+        Returns:
+            New KeywordMatrix sharing the query vocabulary
+        """
+        keep = np.flatnonzero(self.clicks >= min_page_clicks)
+        if len(keep) == len(self.pages):
+            return self
+        return KeywordMatrix(
+            [self.pages[i] for i in keep],
+            self.queries,
+            self.matrix[keep],
+            self.clicks[keep],
+            self.impressions[keep]
+        )
+
+    def overlapping_pairs(
+        self,
+        min_shared: int = 1,
+        min_overlap: float = 0.0,
+        top_k: Optional[int] = None
+    ) -> List[KeywordPair]:
+        """
+        Page pairs sharing keywords
+
+        Args:
+            min_shared: Minimum shared queries
+            min_overlap: Minimum Jaccard overlap (shared / union)
+            top_k: Keep each page's k partners with the most shared queries
+                (a pair survives if it is in either page's top k)
+
+        Returns:
+            (page_a, page_b, shared_count, overlap) tuples with page_a < page_b,
+            most shared first
+        """
+        n = len(self.pages)
+        if n < 2:
+            return []
+
+        transposed = self.matrix.T.tocsr()
+        kept: Dict[Tuple[int, int], Tuple[int, float]] = {}
+
+        for start in range(0, n, PAIR_BLOCK):
+            block = (self.matrix[start:start + PAIR_BLOCK] @ transposed).tocsr()
+
+            for offset in range(block.shape[0]):
+                i = start + offset
+                lo, hi = block.indptr[offset], block.indptr[offset + 1]
+                partners = block.indices[lo:hi]
+                shared = block.data[lo:hi]
+
+                mask = (partners != i) & (shared >= min_shared)
+                if not mask.any():
+                    continue
+                partners, shared = partners[mask], shared[mask]
+
+                overlap = shared / (self._degrees[i] + self._degrees[partners] - shared)
+                if min_overlap > 0:
+                    mask = overlap >= min_overlap
+                    partners, shared, overlap = partners[mask], shared[mask], overlap[mask]
+
+                if top_k is not None and len(partners) > top_k:
+                    best = np.lexsort((-overlap, -shared))[:top_k]
+                    partners, shared, overlap = partners[best], shared[best], overlap[best]
+
+                for j, count, score in zip(partners.tolist(), shared.tolist(), overlap.tolist()):
+                    kept[(i, j) if i < j else (j, i)] = (count, score)
+
+        pairs = []
+        for (i, j), (count, score) in kept.items():
+            page_a, page_b = sorted((self.pages[i], self.pages[j]))
+            pairs.append((page_a, page_b, count, score))
+        pairs.sort(key=lambda pair: (-pair[2], -pair[3], pair[0], pair[1]))
+        return pairs
+
+
+def load_keyword_matrix(
+    conn,
+    property: str,
+    days: int = 30,
+    min_impressions: Optional[int] = None,
+    max_position: Optional[float] = None,
+    page_key: Optional[Callable[[str], str]] = None
+) -> KeywordMatrix:
+    """
+    Build a property's matrix from one scan of gsc.search_performance
+
+    A query counts for a page if any daily row in the window passes the
+    filters; the page's clicks/impressions are summed over those rows.
+
+    Args:
+        conn: psycopg2 connection
+        property: Property to load
+        days: Trailing window in days
+        min_impressions: Minimum impressions on a daily row
+        max_position: Maximum (best is 1) position on a daily row
+        page_key: Maps pages to row keys (see KeywordMatrix.from_rows)
+
+    Returns:
+        KeywordMatrix
+    """
+    conditions = ["property = %s", "date >= CURRENT_DATE - %s * INTERVAL '1 day'"]
+    params: List = [property, days]
+    if min_impressions is not None:
+        conditions.append("impressions >= %s")
+        params.append(min_impressions)
+    if max_position is not None:
+        conditions.append("position <= %s")
+        params.append(max_position)
+
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cursor.execute(f"""
+            SELECT
+                page,
+                query,
+                SUM(clicks) as clicks,
+                SUM(impressions) as impressions
+            FROM gsc.search_performance
+            WHERE {' AND '.join(conditions)}
+            GROUP BY page, query
+        """, tuple(params))
+
+        def stream():
+            while True:
+                batch = cursor.fetchmany(FETCH_BATCH)
+                if not batch:
+                    return
+                yield from batch
+
+        matrix = KeywordMatrix.from_rows(stream(), page_key=page_key)
+    finally:
+        cursor.close()
+
+    logger.info(
+        f"Keyword matrix for {property}: {len(matrix.pages)} pages x "
+        f"{len(matrix.queries)} queries, {matrix.matrix.nnz} rankings"
+    )
+    return matrix
+
+
+__all__ = ['KeywordMatrix', 'load_keyword_matrix', 'url_path']
@@ -3,9 +3,12 @@ Repository for managing insights in PostgreSQL database
 Handles CRUD operations and querying for insights
 """
 import json
+import logging
+from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import List, Optional
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from typing import Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 
 from insights_core.models import (
@@ -19,75 +22,148 @@ from insights_core.models import (
     InsightMetrics
 )
 
+logger = logging.getLogger(__name__)
+
+INSERT_COLUMNS = (
+    'id', 'generated_at', 'property', 'entity_type', 'entity_id',
+    'category', 'title', 'description', 'severity', 'confidence',
+    'metrics', 'window_days', 'source', 'status', 'linked_insight_id',
+)
+
 
 class InsightRepository:
     """Repository for insight persistence"""
     
-    def __init__(self, dsn: str):
-        """Initialize repository with database connection"""
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 10):
+        """
+        Initialize repository
+
+        Connections come from a thread-safe pool that is opened on first use.
+
+        Args:
+            dsn: Database connection string
+            min_connections: Connections kept open by the pool
+            max_connections: Upper bound on concurrent connections
+        """
         self.dsn = dsn
-        # Test connection
-        conn = self._get_connection()
-        conn.close()
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self._pool: Optional[ThreadedConnectionPool] = None
+    
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Get or create the connection pool"""
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(self.min_connections, self.max_connections, self.dsn)
+        return self._pool
     
     def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.dsn)
+        """Get a pooled database connection (return it with _release_connection)"""
+        return self._get_pool().getconn()
+    
+    def _release_connection(self, conn) -> None:
+        """Return a connection to the pool (the pool rolls back open transactions)"""
+        self._get_pool().putconn(conn)
+    
+    @contextmanager
+    def _connection(self) -> Iterator:
+        """Borrow a pooled connection for the duration of a block"""
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            self._release_connection(conn)
+    
+    def close(self) -> None:
+        """Close all pooled connections"""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
     
     def create(self, insight_create: InsightCreate) -> Insight:
         """
         Create a new insight or return existing if duplicate
         Uses deterministic ID to prevent duplicates
         """
-        insight = insight_create.to_insight()
-        
-        conn = self._get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    INSERT INTO gsc.insights (
-                        id, generated_at, property, entity_type, entity_id,
-                        category, title, description, severity, confidence,
-                        metrics, window_days, source, status, linked_insight_id,
-                        created_at, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s,
-                        CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        created = self.create_many([insight_create])
+        return created[0] if created else None
+    
+    def create_many(self, insight_creates: Sequence[InsightCreate]) -> List[Insight]:
+        """
+        Create many insights in one round trip
+
+        Uses a multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING. Insights
+        whose deterministic ID already exists are read back instead, so the
+        result always has one Insight per distinct input ID, in input order.
+
+        Args:
+            insight_creates: Insights to create
+
+        Returns:
+            Created or existing insights
+        """
+        insights = {}
+        for insight_create in insight_creates:
+            insight = insight_create.to_insight()
+            insights.setdefault(insight.id, (insight, insight_create.linked_insight_id))
+        if not insights:
+            return []
+
+        rows = [
+            (
+                insight.id,
+                insight.generated_at,
+                insight.property,
+                insight.entity_type.value,
+                insight.entity_id,
+                insight.category.value,
+                insight.title,
+                insight.description,
+                insight.severity.value,
+                insight.confidence,
+                json.dumps(insight.metrics.model_dump(exclude_none=True)),
+                insight.window_days,
+                insight.source,
+                insight.status.value,
+                linked_insight_id
+            )
+            for insight, linked_insight_id in insights.values()
+        ]
+
+        with self._connection() as conn:
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    returned = execute_values(cur, f"""
+                        INSERT INTO gsc.insights (
+                            {', '.join(INSERT_COLUMNS)},
+                            created_at, updated_at
+                        ) VALUES %s
+                        ON CONFLICT (id) DO NOTHING
+                        RETURNING *
+                    """, rows,
+                        template=f"({', '.join(['%s'] * len(INSERT_COLUMNS))}, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+                        page_size=max(len(rows), 1),
+                        fetch=True
                     )
-                    RETURNING *
-                """, (
-                    insight.id,
-                    insight.generated_at,
-                    insight.property,
-                    insight.entity_type.value,
-                    insight.entity_id,
-                    insight.category.value,
-                    insight.title,
-                    insight.description,
-                    insight.severity.value,
-                    insight.confidence,
-                    json.dumps(insight.metrics.model_dump(exclude_none=True)),
-                    insight.window_days,
-                    insight.source,
-                    insight.status.value,
-                    insight_create.linked_insight_id
-                ))
-                row = cur.fetchone()
+                    by_id = {row['id']: dict(row) for row in returned}
+
+                    # Duplicates - return existing insights
+                    existing = [insight_id for insight_id in insights if insight_id not in by_id]
+                    if existing:
+                        cur.execute("""
+                            SELECT * FROM gsc.insights WHERE id = ANY(%s)
+                        """, (existing,))
+                        by_id.update((row['id'], dict(row)) for row in cur.fetchall())
                 conn.commit()
-                return self._row_to_insight(dict(row))
-        except psycopg2.IntegrityError:
-            # Duplicate key - return existing insight
-            conn.rollback()
-            return self.get_by_id(insight.id)
-        finally:
-            conn.close()
+            except Exception:
+                conn.rollback()
+                raise
+
+        logger.debug(f"Wrote {len(returned)} new insights ({len(insights) - len(returned)} existing)")
+        return [self._row_to_insight(by_id[insight_id]) for insight_id in insights if insight_id in by_id]
     
     def get_by_id(self, insight_id: str) -> Optional[Insight]:
         """Get insight by ID"""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT * FROM gsc.insights WHERE id = %s
@@ -96,53 +172,67 @@ class InsightRepository:
                 if row:
                     return self._row_to_insight(dict(row))
                 return None
-        finally:
-            conn.close()
     
     def update(self, insight_id: str, update: InsightUpdate) -> Optional[Insight]:
         """Update an existing insight"""
-        conn = self._get_connection()
-        try:
-            # Build update query dynamically based on provided fields
-            update_fields = []
-            values = []
-            
-            if update.status is not None:
-                update_fields.append("status = %s")
-                values.append(update.status.value)
-            
-            if update.description is not None:
-                update_fields.append("description = %s")
-                values.append(update.description)
-            
-            if update.linked_insight_id is not None:
-                update_fields.append("linked_insight_id = %s")
-                values.append(update.linked_insight_id)
-            
-            if not update_fields:
-                # No fields to update
-                return self.get_by_id(insight_id)
-            
-            # Add updated_at
-            update_fields.append("updated_at = CURRENT_TIMESTAMP")
-            values.append(insight_id)
-            
-            query = f"""
-                UPDATE gsc.insights
-                SET {', '.join(update_fields)}
-                WHERE id = %s
-                RETURNING *
-            """
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, values)
-                row = cur.fetchone()
+        if update.status is None and update.description is None and update.linked_insight_id is None:
+            # No fields to update
+            return self.get_by_id(insight_id)
+
+        updated = self.update_many([(insight_id, update)])
+        return updated[0] if updated else None
+    
+    def update_many(self, updates: Sequence[Tuple[str, InsightUpdate]]) -> List[Insight]:
+        """
+        Apply many insight updates in one round trip
+
+        Fields left as None in an InsightUpdate are not changed; updates
+        without any field set are skipped.
+
+        Args:
+            updates: (insight_id, InsightUpdate) pairs
+
+        Returns:
+            Updated insights (missing IDs are omitted)
+        """
+        rows = [
+            (
+                insight_id,
+                update.status.value if update.status is not None else None,
+                update.description,
+                update.linked_insight_id
+            )
+            for insight_id, update in updates
+            if update.status is not None
+            or update.description is not None
+            or update.linked_insight_id is not None
+        ]
+        if not rows:
+            return []
+
+        with self._connection() as conn:
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    returned = execute_values(cur, """
+                        UPDATE gsc.insights AS i
+                        SET status = COALESCE(v.status, i.status),
+                            description = COALESCE(v.description, i.description),
+                            linked_insight_id = COALESCE(v.linked_insight_id, i.linked_insight_id),
+                            updated_at = CURRENT_TIMESTAMP
+                        FROM (VALUES %s) AS v(id, status, description, linked_insight_id)
+                        WHERE i.id = v.id
+                        RETURNING i.*
+                    """, rows,
+                        template="(%s, %s::VARCHAR, %s::TEXT, %s::VARCHAR)",
+                        page_size=len(rows),
+                        fetch=True
+                    )
                 conn.commit()
-                if row:
-                    return self._row_to_insight(dict(row))
-                return None
-        finally:
-            conn.close()
+            except Exception:
+                conn.rollback()
+                raise
+
+        return [self._row_to_insight(dict(row)) for row in returned]
     
     def query(
         self,
@@ -155,8 +245,7 @@ class InsightRepository:
         offset: int = 0
     ) -> List[Insight]:
         """Query insights with filters"""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             where_clauses = []
             values = []
             
@@ -197,8 +286,6 @@ class InsightRepository:
                 cur.execute(query, values)
                 rows = cur.fetchall()
                 return [self._row_to_insight(dict(row)) for row in rows]
-        finally:
-            conn.close()
     
     def get_by_status(
         self,
@@ -236,8 +323,7 @@ class InsightRepository:
         days_back: int = 90
     ) -> List[Insight]:
         """Get all insights for a specific entity"""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT * FROM gsc.insights
@@ -254,8 +340,6 @@ class InsightRepository:
                 ))
                 rows = cur.fetchall()
                 return [self._row_to_insight(dict(row)) for row in rows]
-        finally:
-            conn.close()
     
     def query_recent(
         self,
@@ -263,8 +347,7 @@ class InsightRepository:
         property: Optional[str] = None
     ) -> List[Insight]:
         """Get insights generated in the last N hours"""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             where_clauses = [
                 "generated_at >= %s"
             ]
@@ -284,13 +367,10 @@ class InsightRepository:
                 """, values)
                 rows = cur.fetchall()
                 return [self._row_to_insight(dict(row)) for row in rows]
-        finally:
-            conn.close()
     
     def delete_old_insights(self, days: int = 90) -> int:
         """Delete insights older than specified days"""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     DELETE FROM gsc.insights
@@ -299,13 +379,10 @@ class InsightRepository:
                 deleted = cur.rowcount
                 conn.commit()
                 return deleted
-        finally:
-            conn.close()
     
     def get_stats(self) -> dict:
         """Get repository statistics"""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT
@@ -322,33 +399,36 @@ class InsightRepository:
                 """)
                 row = cur.fetchone()
                 return dict(row) if row else {}
-        finally:
-            conn.close()
     
     def _row_to_insight(self, row: dict) -> Insight:
         """Convert database row to Insight model"""
-        # Parse JSONB metrics
-        if isinstance(row['metrics'], str):
-            metrics_data = json.loads(row['metrics'])
-        else:
-            metrics_data = row['metrics']
-        
-        return Insight(
-            id=row['id'],
-            generated_at=row['generated_at'],
-            property=row['property'],
-            entity_type=EntityType(row['entity_type']),
-            entity_id=row['entity_id'],
-            category=InsightCategory(row['category']),
-            title=row['title'],
-            description=row['description'],
-            severity=InsightSeverity(row['severity']),
-            confidence=row['confidence'],
-            metrics=InsightMetrics(**metrics_data),
-            window_days=row['window_days'],
-            source=row['source'],
-            status=InsightStatus(row['status']),
-            linked_insight_id=row.get('linked_insight_id'),
-            created_at=row.get('created_at'),
-            updated_at=row.get('updated_at')
-        )
+        return row_to_insight(row)
+
+
+def row_to_insight(row: dict) -> Insight:
+    """Convert a gsc.insights row to an Insight model"""
+    # Parse JSONB metrics (asyncpg returns JSONB as text)
+    if isinstance(row['metrics'], str):
+        metrics_data = json.loads(row['metrics'])
+    else:
+        metrics_data = row['metrics']
+    
+    return Insight(
+        id=row['id'],
+        generated_at=row['generated_at'],
+        property=row['property'],
+        entity_type=EntityType(row['entity_type']),
+        entity_id=row['entity_id'],
+        category=InsightCategory(row['category']),
+        title=row['title'],
+        description=row['description'],
+        severity=InsightSeverity(row['severity']),
+        confidence=row['confidence'],
+        metrics=InsightMetrics(**metrics_data),
+        window_days=row['window_days'],
+        source=row['source'],
+        status=InsightStatus(row['status']),
+        linked_insight_id=row.get('linked_insight_id'),
+        created_at=row.get('created_at'),
+        updated_at=row.get('updated_at')
+    )
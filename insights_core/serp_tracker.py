@@ -24,6 +24,12 @@ from urllib.parse import urlparse
 import asyncpg
 import httpx
 
+from insights_core.collection_scheduler import (
+    DEFAULT_WRITE_BATCH_SIZE,
+    CollectionScheduler,
+    TokenBucket,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -472,84 +478,89 @@ class SerpTracker:
             logger.error(f"Error fetching queries: {e}")
             return []
 
-    async def track_query(self, query_data: Dict) -> Dict:
+    async def _search_query(self, query_data: Dict) -> Dict:
         """
-        Track position for a single query
+        Search a query and locate our result, without storing anything
 
         Args:
             query_data: Query dictionary from database
 
         Returns:
-            Tracking result
+            Position record for store_position_data_batch()/store_serp_features_batch()
         """
-        try:
-            # Execute search
-            logger.info(f"Tracking: {query_data['query_text']} ({query_data['device']})")
-
-            search_results = await self.provider.search(
-                query=query_data['query_text'],
-                location=query_data['location'],
-                device=query_data['device'],
-                num_results=100
-            )
-
-            # Find our position
-            our_domain = urlparse(query_data['property']).netloc
-            our_position = None
-            our_url = None
-            our_title = None
-            our_description = None
-
-            for result in search_results['organic_results']:
-                if result['domain'] == our_domain:
-                    # Check if target page matches (if specified)
-                    if query_data['target_page_path']:
-                        result_path = urlparse(result['url']).path
-                        if result_path == query_data['target_page_path']:
-                            our_position = result['position']
-                            our_url = result['url']
-                            our_title = result['title']
-                            our_description = result['description']
-                            break
-                    else:
-                        # Any page from our domain
-                        our_position = result['position']
-                        our_url = result['url']
-                        our_title = result['title']
-                        our_description = result['description']
+        logger.info(f"Tracking: {query_data['query_text']} ({query_data['device']})")
+
+        search_results = await self.provider.search(
+            query=query_data['query_text'],
+            location=query_data['location'],
+            device=query_data['device'],
+            num_results=100
+        )
+
+        # Find our position
+        our_domain = urlparse(query_data['property']).netloc
+        our_result = None
+
+        for result in search_results['organic_results']:
+            if result['domain'] == our_domain:
+                # Check if target page matches (if specified)
+                if query_data['target_page_path']:
+                    result_path = urlparse(result['url']).path
+                    if result_path == query_data['target_page_path']:
+                        our_result = result
                         break
+                else:
+                    # Any page from our domain
+                    our_result = result
+                    break
 
-            # Store results
-            await self.store_position_data(
-                query_id=query_data['query_id'],
-                check_date=date.today(),
-                position=our_position,
-                url=our_url,
-                domain=our_domain,
-                title=our_title,
-                description=our_description,
-                total_results=search_results['total_results'],
-                competitors=search_results['organic_results'][:10],
-                serp_features=search_results['serp_features'],
-                api_source=self.api_provider
-            )
+        our_result = our_result or {}
+        return {
+            'query_id': query_data['query_id'],
+            'query_text': query_data['query_text'],
+            'check_date': date.today(),
+            'position': our_result.get('position'),
+            'url': our_result.get('url'),
+            'domain': our_domain,
+            'title': our_result.get('title'),
+            'description': our_result.get('description'),
+            'total_results': search_results['total_results'],
+            'competitors': search_results['organic_results'][:10],
+            'serp_features': search_results['serp_features'],
+            'organic_results': search_results['organic_results'],
+            'api_source': self.api_provider
+        }
 
-            # Store SERP features
-            await self.store_serp_features(
-                query_id=query_data['query_id'],
-                check_date=date.today(),
-                serp_features=search_results['serp_features'],
-                organic_results=search_results['organic_results']
-            )
+    async def _store_query_results(self, records: List[Dict]):
+        """Store a batch of position records and their SERP features"""
+        await self.store_position_data_batch(records)
+        await self.store_serp_features_batch(records)
 
-            logger.info(f"Tracked: {query_data['query_text']} - Position: {our_position or 'Not found'}")
+    @staticmethod
+    def _tracking_result(record: Dict) -> Dict:
+        """Summary returned per tracked query"""
+        logger.info(f"Tracked: {record['query_text']} - Position: {record['position'] or 'Not found'}")
+        return {
+            'query_text': record['query_text'],
+            'position': record['position'],
+            'url': record['url'],
+            'success': True
+        }
 
-            return {
-                'query_text': query_data['query_text'],
-                'position': our_position,
-                'url': our_url,
-                'success': True
-            }
+    async def track_query(self, query_data: Dict) -> Dict:
+        """
+        Track position for a single query
+
+        Args:
+            query_data: Query dictionary from database
+
+        Returns:
+            Tracking result
+        """
+        try:
+            record = await self._search_query(query_data)
+            await self._store_query_results([record])
+            return self._tracking_result(record)
 
         except Exception as e:
             logger.error(f"Error tracking query {query_data['query_text']}: {e}")
@@ -574,11 +585,35 @@ class SerpTracker:
         api_source: str
     ):
         """Store position data in database"""
+        await self.store_position_data_batch([{
+            'query_id': query_id,
+            'check_date': check_date,
+            'position': position,
+            'url': url,
+            'domain': domain,
+            'title': title,
+            'description': description,
+            'total_results': total_results,
+            'competitors': competitors,
+            'serp_features': serp_features,
+            'api_source': api_source
+        }])
+
+    async def store_position_data_batch(self, records: List[Dict]):
+        """
+        Store position records in one round trip
+
+        Args:
+            records: Position records (see _search_query())
+        """
+        if not records:
+            return
+
         try:
             pool = await self.get_pool()
 
             async with pool.acquire() as conn:
-                await conn.execute("""
+                await conn.executemany("""
                     INSERT INTO serp.position_history (
                         query_id,
                         check_date,
@@ -601,19 +636,22 @@ class SerpTracker:
                         total_results = EXCLUDED.total_results,
                         competitors = EXCLUDED.competitors,
                         serp_features = EXCLUDED.serp_features
-                """,
-                    query_id,
-                    check_date,
-                    position,
-                    url,
-                    domain,
-                    title,
-                    description,
-                    total_results,
-                    competitors,
-                    serp_features,
-                    api_source
-                )
+                """, [
+                    (
+                        r['query_id'],
+                        r['check_date'],
+                        r['position'],
+                        r['url'],
+                        r['domain'],
+                        r['title'],
+                        r['description'],
+                        r['total_results'],
+                        r['competitors'],
+                        r['serp_features'],
+                        r['api_source']
+                    )
+                    for r in records
+                ])
 
         except Exception as e:
             logger.error(f"Error storing position data: {e}")
@@ -627,17 +665,56 @@ class SerpTracker:
         organic_results: List[Dict]
     ):
         """Store SERP features in database"""
+        await self.store_serp_features_batch([{
+            'query_id': query_id,
+            'check_date': check_date,
+            'serp_features': serp_features,
+            'organic_results': organic_results
+        }])
+
+    async def store_serp_features_batch(self, records: List[Dict]):
+        """
+        Store SERP features for a batch of position records
+
+        Args:
+            records: Records with query_id, check_date and serp_features
+        """
+        snippet_rows = []
+        feature_rows = []
+        for record in records:
+            serp_features = record['serp_features']
+
+            if serp_features.get('featured_snippet'):
+                snippet_data = serp_features.get('featured_snippet_data', {})
+                snippet_rows.append((
+                    record['query_id'],
+                    record['check_date'],
+                    'featured_snippet',
+                    snippet_data.get('domain', ''),
+                    snippet_data.get('link', ''),
+                    snippet_data,
+                    0  # Featured snippet is position 0
+                ))
+
+            # Other features (knowledge panel, PAA, etc.)
+            for feature_type in ['knowledge_panel', 'people_also_ask', 'top_stories', 'video_carousel', 'image_pack']:
+                if serp_features.get(feature_type):
+                    feature_rows.append((
+                        record['query_id'],
+                        record['check_date'],
+                        feature_type,
+                        {feature_type: serp_features.get(f'{feature_type}_data')}
+                    ))
+
+        if not snippet_rows and not feature_rows:
+            return
+
         try:
             pool = await self.get_pool()
 
             async with pool.acquire() as conn:
-                # Store each SERP feature
-                if serp_features.get('featured_snippet'):
-                    snippet_data = serp_features.get('featured_snippet_data', {})
-                    owner_domain = snippet_data.get('domain', '')
-                    owner_url = snippet_data.get('link', '')
-
-                    await conn.execute("""
+                if snippet_rows:
+                    await conn.executemany("""
                         INSERT INTO serp.serp_features (
                             query_id,
                             check_date,
@@ -652,34 +729,19 @@ class SerpTracker:
                             owner_url = EXCLUDED.owner_url,
                             content = EXCLUDED.content,
                             position = EXCLUDED.position
-                    """,
-                        query_id,
-                        check_date,
-                        'featured_snippet',
-                        owner_domain,
-                        owner_url,
-                        snippet_data,
-                        0  # Featured snippet is position 0
-                    )
+                    """, snippet_rows)
 
-                # Store other features (knowledge panel, PAA, etc.)
-                for feature_type in ['knowledge_panel', 'people_also_ask', 'top_stories', 'video_carousel', 'image_pack']:
-                    if serp_features.get(feature_type):
-                        await conn.execute("""
-                            INSERT INTO serp.serp_features (
-                                query_id,
-                                check_date,
-                                feature_type,
-                                content
-                            ) VALUES ($1, $2, $3, $4)
-                            ON CONFLICT (query_id, check_date, feature_type, owner_domain)
-                            DO NOTHING
-                        """,
+                if feature_rows:
+                    await conn.executemany("""
+                        INSERT INTO serp.serp_features (
                             query_id,
                             check_date,
                             feature_type,
-                            {feature_type: serp_features.get(f'{feature_type}_data')}
-                        )
+                            content
+                        ) VALUES ($1, $2, $3, $4)
+                        ON CONFLICT (query_id, check_date, feature_type, owner_domain)
+                        DO NOTHING
+                    """, feature_rows)
 
         except Exception as e:
             logger.error(f"Error storing SERP features: {e}")
@@ -689,15 +751,21 @@ class SerpTracker:
         self,
         property: str = None,
         device: str = None,
-        delay_seconds: float = 1.0
+        delay_seconds: Optional[float] = None,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE
     ) -> Dict:
         """
         Track all active queries
 
+        Queries are searched concurrently within the provider's quota
+        (see insights_core.collection_scheduler) and stored in batches.
+
         Args:
             property: Filter by property (optional)
             device: Filter by device (optional)
-            delay_seconds: Delay between requests (rate limiting)
+            delay_seconds: Minimum spacing between request starts
+                (None = use the provider quota)
+            batch_size: Results stored per database round trip
 
         Returns:
             Summary of tracking results
@@ -713,14 +781,30 @@ class SerpTracker:
                     'error_count': 0
                 }
 
-            results = []
-            for i, query_data in enumerate(queries):
-                result = await self.track_query(query_data)
-                results.append(result)
+            # Requests are paced by the provider's shared token bucket, or
+            # by delay_seconds when given
+            scheduler = CollectionScheduler(
+                self.api_provider or 'gsc',
+                bucket=TokenBucket(1.0 / delay_seconds) if delay_seconds else None
+            )
+            collected = await scheduler.run(
+                queries,
+                self._search_query,
+                on_batch=self._store_query_results,
+                batch_size=batch_size
+            )
 
-                # Rate limiting
-                if i < len(queries) - 1:
-                    await asyncio.sleep(delay_seconds)
+            results = []
+            for outcome in collected:
+                if outcome.success:
+                    results.append(self._tracking_result(outcome.value))
+                else:
+                    logger.error(f"Error tracking query {outcome.item['query_text']}: {outcome.error}")
+                    results.append({
+                        'query_text': outcome.item['query_text'],
+                        'success': False,
+                        'error': str(outcome.error)
+                    })
 
             success_count = sum(1 for r in results if r['success'])
             error_count = len(results) - success_count
@@ -9,26 +9,76 @@ Automatically clusters content into strategic topics using:
 - Topic-based recommendations
 
 Features:
-- Auto-discover optimal number of clusters
+- Auto-discover optimal number of clusters (exhaustive for small sites; a
+  scalable mode for large ones: PCA-reduced vectors, mini-batch k-means
+  warm-started across k, silhouette on a stratified sample)
 - Name topics using LLM
 - Track topic performance
 - Identify content gaps
 - Generate topic strategies
+
+Benchmark model selection on synthetic embeddings (no database needed):
+    python -m insights_core.topic_clustering --pages 5000 --topics 12
 """
+import argparse
 import logging
 import os
+import sys
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncpg
 import httpx
 import numpy as np
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.metrics import silhouette_score
+from sklearn.cluster import KMeans, MiniBatchKMeans, DBSCAN
+from sklearn.decomposition import PCA
+from sklearn.metrics import adjusted_rand_score, silhouette_score
 from collections import Counter
 
+from insights_core.vector_index import VectorIndex, open_property_index
+
 logger = logging.getLogger(__name__)
 
+# Pages from which cluster selection and fitting switch to the scalable mode
+SCALABLE_CLUSTERING_MIN_PAGES = 2000
+
+# Scalable mode: pages scored per silhouette, PCA dimensions (None = no PCA),
+# mini-batch size and rows used to fit the PCA projection
+SILHOUETTE_SAMPLE_SIZE = 2000
+PCA_COMPONENTS = 64
+MINIBATCH_SIZE = 1024
+PCA_FIT_SAMPLE_SIZE = 10000
+
+
+def _stratified_sample(labels: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Row indices sampling each cluster in proportion to its size
+
+    Every cluster keeps at least two rows (when it has them), so the sampled
+    silhouette still sees all clusters.
+    """
+    if len(labels) <= size:
+        return np.arange(len(labels))
+
+    sample = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        take = min(len(members), max(2, int(round(size * len(members) / len(labels)))))
+        sample.append(rng.choice(members, take, replace=False))
+    return np.sort(np.concatenate(sample))
+
+
+def _farthest_point(vectors: np.ndarray, centers: np.ndarray, rng: np.random.Generator, sample_size: int) -> np.ndarray:
+    """Point (of a random sample) farthest from its nearest center, to seed one more cluster"""
+    candidates = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+    distances = (
+        (candidates ** 2).sum(axis=1)[:, None]
+        - 2 * candidates @ centers.T
+        + (centers ** 2).sum(axis=1)[None, :]
+    ).min(axis=1)
+    return candidates[np.argmax(distances)]
+
 
 class TopicClusterer:
     """
@@ -46,6 +96,7 @@ class TopicClusterer:
         self.db_dsn = db_dsn or os.getenv('WAREHOUSE_DSN')
         self.ollama_url = ollama_url or os.getenv('OLLAMA_URL', 'http://localhost:11434')
         self._pool: Optional[asyncpg.Pool] = None
+        self._indexes: Dict[str, VectorIndex] = {}
 
         logger.info("TopicClusterer initialized")
 
@@ -105,7 +156,10 @@ class TopicClusterer:
         self,
         embeddings: np.ndarray,
         min_clusters: int = 5,
-        max_clusters: int = 20
+        max_clusters: int = 20,
+        scalable: Optional[bool] = None,
+        pca_components: Optional[int] = PCA_COMPONENTS,
+        sample_size: int = SILHOUETTE_SAMPLE_SIZE
     ) -> int:
         """
         Find optimal number of clusters using silhouette score
@@ -114,6 +168,10 @@ class TopicClusterer:
             embeddings: Embedding matrix
             min_clusters: Minimum clusters to test
             max_clusters: Maximum clusters to test
+            scalable: Use the scalable mode (default: from
+                SCALABLE_CLUSTERING_MIN_PAGES pages)
+            pca_components: Scalable mode: dimensions to reduce to first (None = keep all)
+            sample_size: Scalable mode: pages scored per silhouette
 
         Returns:
             Optimal number of clusters
@@ -121,6 +179,13 @@ class TopicClusterer:
         if len(embeddings) < min_clusters:
             return max(2, len(embeddings) // 2)
 
+        if scalable is None:
+            scalable = len(embeddings) >= SCALABLE_CLUSTERING_MIN_PAGES
+        if scalable:
+            return self._find_optimal_clusters_scalable(
+                embeddings, min_clusters, max_clusters, pca_components, sample_size
+            )
+
         best_score = -1
         best_k = min_clusters
 
@@ -140,10 +205,94 @@ class TopicClusterer:
         logger.info(f"Optimal clusters: {best_k} (silhouette score: {best_score:.3f})")
         return best_k
 
+    def _find_optimal_clusters_scalable(
+        self,
+        embeddings: np.ndarray,
+        min_clusters: int,
+        max_clusters: int,
+        pca_components: Optional[int],
+        sample_size: int
+    ) -> int:
+        """
+        Scalable model selection
+
+        Vectors are projected onto their top principal components, each k is
+        fitted with mini-batch k-means starting from the k - 1 solution plus
+        the point farthest from it, and the silhouette is computed on a sample
+        stratified by cluster, so no step is quadratic in the page count.
+        """
+        rng = np.random.default_rng(42)
+        vectors = self._reduce_dimensions(embeddings, pca_components)
+
+        best_score = -1
+        best_k = min_clusters
+        centers = None
+
+        for k in range(min_clusters, min(max_clusters + 1, len(vectors))):
+            if centers is None:
+                kmeans = MiniBatchKMeans(
+                    n_clusters=k, random_state=42, n_init=10, batch_size=MINIBATCH_SIZE
+                )
+            else:
+                init = np.vstack([centers, _farthest_point(vectors, centers, rng, sample_size)])
+                kmeans = MiniBatchKMeans(
+                    n_clusters=k, init=init, random_state=42, n_init=1, batch_size=MINIBATCH_SIZE
+                )
+            labels = kmeans.fit_predict(vectors)
+            centers = kmeans.cluster_centers_
+
+            try:
+                sample = _stratified_sample(labels, sample_size, rng)
+                score = silhouette_score(vectors[sample], labels[sample])
+                if score > best_score:
+                    best_score = score
+                    best_k = k
+            except Exception as e:
+                logger.warning(f"Silhouette score failed for k={k}: {e}")
+                continue
+
+        logger.info(
+            f"Optimal clusters: {best_k} (sampled silhouette score: {best_score:.3f}, "
+            f"{len(vectors)} pages, {vectors.shape[1]} dims)"
+        )
+        return best_k
+
+    def _reduce_dimensions(self, embeddings: np.ndarray, n_components: Optional[int]) -> np.ndarray:
+        """Project embeddings onto their top principal components (fitted on a sample)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not n_components or n_components >= min(embeddings.shape):
+            return embeddings
+
+        rng = np.random.default_rng(42)
+        fit_rows = rng.choice(len(embeddings), min(PCA_FIT_SAMPLE_SIZE, len(embeddings)), replace=False)
+        pca = PCA(n_components=n_components, svd_solver='randomized', random_state=42)
+        pca.fit(embeddings[fit_rows])
+        return pca.transform(embeddings)
+
+    def _initial_centroids(self, embeddings: np.ndarray, n_clusters: int) -> np.ndarray:
+        """
+        Full-dimension starting centroids from mini-batch k-means on PCA-reduced vectors
+
+        The restarts run in the reduced space, so the final full-dimension
+        k-means needs a single, short run from these centroids.
+        """
+        reduced = self._reduce_dimensions(embeddings, PCA_COMPONENTS)
+        labels = MiniBatchKMeans(
+            n_clusters=n_clusters, random_state=42, n_init=10, batch_size=MINIBATCH_SIZE
+        ).fit_predict(reduced)
+
+        rng = np.random.default_rng(42)
+        centroids = np.empty((n_clusters, embeddings.shape[1]), dtype=np.float64)
+        for c in range(n_clusters):
+            members = embeddings[labels == c]
+            centroids[c] = members.mean(axis=0) if len(members) else embeddings[rng.integers(len(embeddings))]
+        return centroids
+
     def cluster_embeddings(
         self,
         embeddings: np.ndarray,
-        n_clusters: int = None
+        n_clusters: int = None,
+        scalable: Optional[bool] = None
     ) -> Tuple[np.ndarray, np.ndarray, KMeans]:
         """
         Cluster embeddings using K-means
@@ -151,15 +300,29 @@ class TopicClusterer:
         Args:
             embeddings: Embedding matrix
             n_clusters: Number of clusters (auto-detect if None)
+            scalable: Seed k-means from mini-batch k-means on reduced vectors
+                and use scalable cluster selection (default: from
+                SCALABLE_CLUSTERING_MIN_PAGES pages)
 
         Returns:
             Tuple of (labels, centroids, model)
         """
         try:
-            if n_clusters is None:
-                n_clusters = self.find_optimal_clusters(embeddings)
+            if scalable is None:
+                scalable = len(embeddings) >= SCALABLE_CLUSTERING_MIN_PAGES
 
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+            if n_clusters is None:
+                n_clusters = self.find_optimal_clusters(embeddings, scalable=scalable)
+
+            if scalable:
+                kmeans = KMeans(
+                    n_clusters=n_clusters,
+                    init=self._initial_centroids(embeddings, n_clusters),
+                    n_init=1,
+                    random_state=42
+                )
+            else:
+                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
             labels = kmeans.fit_predict(embeddings)
             centroids = kmeans.cluster_centers_
 
@@ -425,6 +588,48 @@ Provide a concise response in JSON format:
             logger.error(f"Error analyzing topic performance: {e}")
             return []
 
+    async def similar_page_pairs(
+        self,
+        property: str,
+        topic_ids: List[int],
+        threshold: float = 0.85
+    ) -> Dict[int, int]:
+        """
+        Count near-duplicate page pairs within each topic
+
+        Uses the property's vector index (see insights_core.vector_index),
+        restricted to each topic's pages, instead of comparing embeddings in SQL.
+
+        Args:
+            property: Property URL
+            topic_ids: Topics to check
+            threshold: Minimum content similarity for a pair (0-1)
+
+        Returns:
+            Number of pairs per topic ID
+        """
+        pool = await self.get_pool()
+        if property not in self._indexes:
+            self._indexes[property] = await open_property_index(pool, property)
+        index = self._indexes[property]
+
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT topic_id, page_path
+                FROM content.page_topics
+                WHERE property = $1
+                    AND topic_id = ANY($2::int[])
+            """, property, list(topic_ids))
+
+        pages_by_topic: Dict[int, List[str]] = {topic_id: [] for topic_id in topic_ids}
+        for row in rows:
+            pages_by_topic[row['topic_id']].append(row['page_path'])
+
+        return {
+            topic_id: len(index.pairs_above(threshold, page_paths=pages))
+            for topic_id, pages in pages_by_topic.items()
+        }
+
     async def auto_cluster_property(
         self,
         property: str,
@@ -476,3 +681,136 @@ Provide a concise response in JSON format:
         """Sync wrapper for Celery"""
         import asyncio
         return asyncio.run(self.auto_cluster_property(property, n_clusters))
+
+
+def generate_synthetic_embeddings(
+    pages: int,
+    topics: int = 12,
+    dim: int = 768,
+    noise: float = 0.6,
+    seed: int = 42
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unit-length synthetic page embeddings drawn around topic centres
+
+    Topic sizes are uneven (Dirichlet shares), like real sites.
+
+    Args:
+        pages: Pages to generate
+        topics: True number of topics
+        dim: Embedding dimension
+        noise: Per-page noise relative to the topic centre spread
+        seed: Random seed
+
+    Returns:
+        Tuple of (embeddings, true topic per page)
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(topics, dim)) / np.sqrt(dim)
+    labels = rng.choice(topics, size=pages, p=rng.dirichlet(np.full(topics, 2.0)))
+    vectors = centres[labels] + noise * rng.normal(size=(pages, dim)) / np.sqrt(dim)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32), labels
+
+
+def benchmark(
+    embeddings: np.ndarray,
+    true_labels: np.ndarray,
+    min_clusters: int = 5,
+    max_clusters: int = 20,
+    modes: Tuple[str, ...] = ('exhaustive', 'scalable'),
+    pca_components: Optional[int] = PCA_COMPONENTS,
+    sample_size: int = SILHOUETTE_SAMPLE_SIZE
+) -> Dict[str, Any]:
+    """
+    Compare wall time and cluster quality of the selection modes
+
+    Each mode picks k and fits the final clustering, as auto_cluster_property
+    does. Quality is the adjusted Rand index against the true topics and the
+    silhouette of the final clustering (on a common sample of pages).
+
+    Args:
+        embeddings: Embedding matrix
+        true_labels: True topic per page
+        min_clusters: Minimum clusters to test
+        max_clusters: Maximum clusters to test
+        modes: Modes to run ('exhaustive' and/or 'scalable')
+        pca_components: Scalable mode PCA dimensions
+        sample_size: Scalable mode silhouette sample
+
+    Returns:
+        Benchmark results per mode
+    """
+    clusterer = TopicClusterer(db_dsn='')
+    quality_sample = np.random.default_rng(0).choice(
+        len(embeddings), min(len(embeddings), SILHOUETTE_SAMPLE_SIZE), replace=False
+    )
+
+    results: Dict[str, Any] = {
+        'pages': len(embeddings),
+        'dims': embeddings.shape[1],
+        'true_topics': int(len(np.unique(true_labels))),
+    }
+    for mode in modes:
+        scalable = mode == 'scalable'
+        started = time.perf_counter()
+        k = clusterer.find_optimal_clusters(
+            embeddings, min_clusters, max_clusters,
+            scalable=scalable, pca_components=pca_components, sample_size=sample_size
+        )
+        selection_seconds = time.perf_counter() - started
+        labels, _, _ = clusterer.cluster_embeddings(embeddings, k, scalable=scalable)
+        total_seconds = time.perf_counter() - started
+
+        results[mode] = {
+            'k': k,
+            'selection_seconds': round(selection_seconds, 3),
+            'total_seconds': round(total_seconds, 3),
+            'adjusted_rand': round(float(adjusted_rand_score(true_labels, labels)), 3),
+            'silhouette': round(float(silhouette_score(embeddings[quality_sample], labels[quality_sample])), 3),
+        }
+
+    if 'exhaustive' in results and 'scalable' in results and results['scalable']['total_seconds'] > 0:
+        results['speedup'] = round(results['exhaustive']['total_seconds'] / results['scalable']['total_seconds'], 1)
+    return results
+
+
+def main() -> int:
+    """Run the cluster selection benchmark on synthetic embeddings"""
+    parser = argparse.ArgumentParser(description='Benchmark exhaustive vs scalable topic cluster selection')
+    parser.add_argument('--pages', type=int, default=5000, help='Synthetic pages to cluster')
+    parser.add_argument('--topics', type=int, default=12, help='True number of topics')
+    parser.add_argument('--dim', type=int, default=768, help='Embedding dimension')
+    parser.add_argument('--noise', type=float, default=0.6, help='Page noise relative to topic spread')
+    parser.add_argument('--min-clusters', type=int, default=5)
+    parser.add_argument('--max-clusters', type=int, default=20)
+    parser.add_argument('--pca-components', type=int, default=PCA_COMPONENTS, help='0 = no PCA')
+    parser.add_argument('--sample-size', type=int, default=SILHOUETTE_SAMPLE_SIZE)
+    parser.add_argument('--skip-exhaustive', action='store_true', help='Only run the scalable mode')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    embeddings, true_labels = generate_synthetic_embeddings(
+        args.pages, args.topics, args.dim, args.noise, args.seed
+    )
+    modes = ('scalable',) if args.skip_exhaustive else ('exhaustive', 'scalable')
+    results = benchmark(
+        embeddings, true_labels, args.min_clusters, args.max_clusters, modes,
+        pca_components=args.pca_components or None, sample_size=args.sample_size
+    )
+
+    logger.info(f"{results['pages']} pages, {results['dims']} dims, {results['true_topics']} true topics")
+    for mode in modes:
+        r = results[mode]
+        logger.info(f"{mode:>10}: k={r['k']:<3} select {r['selection_seconds']:>8.2f}s  "
+                    f"total {r['total_seconds']:>8.2f}s  ARI {r['adjusted_rand']:.3f}  "
+                    f"silhouette {r['silhouette']:.3f}")
+    if 'speedup' in results:
+        logger.info(f"Speedup: {results['speedup']}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,20 +17,98 @@ Priority scoring formula:
         0.20 * position_score +
         0.15 * recency_score
     )
+
+Set-based mode (SyncConfig.set_based) COPYs all discovered URLs into a
+temporary staging table and applies them with one INSERT ... ON CONFLICT
+DO UPDATE, deactivating stale URLs in the same transaction.
 """
 
 import logging
+import math
 import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+import numpy as np
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
 
 logger = logging.getLogger(__name__)
 
+# Columns of the set-based sync staging table, in COPY order
+STAGE_COLUMNS = (
+    'seq', 'property', 'page_path', 'source', 'clicks', 'sessions',
+    'avg_position', 'priority_score',
+)
+
+STAGE_TABLE_SQL = """
+    CREATE TEMP TABLE monitored_pages_stage (
+        seq INTEGER NOT NULL,
+        property TEXT NOT NULL,
+        page_path TEXT NOT NULL,
+        source TEXT NOT NULL,
+        clicks INTEGER NOT NULL,
+        sessions INTEGER NOT NULL,
+        avg_position FLOAT,
+        priority_score FLOAT NOT NULL
+    ) ON COMMIT DROP
+"""
+
+# Staged rows are ranked by seq (priority order); only the first
+# max_new_urls_per_run URLs not yet monitored are inserted. The
+# discovery_source CASE mirrors the per-row merge in sync_to_monitored_pages.
+MERGE_STAGE_SQL = """
+    WITH ranked AS (
+        SELECT
+            s.*,
+            mp.page_id IS NOT NULL AS is_existing,
+            CASE WHEN mp.page_id IS NULL
+                 THEN row_number() OVER (PARTITION BY mp.page_id IS NULL ORDER BY s.seq)
+            END AS new_rank
+        FROM monitored_pages_stage s
+        LEFT JOIN performance.monitored_pages mp
+            ON mp.property = s.property AND mp.page_path = s.page_path
+    ),
+    upserted AS (
+        INSERT INTO performance.monitored_pages AS mp (
+            property, page_path, check_mobile, check_desktop,
+            is_active, discovery_source, first_discovered_at,
+            last_seen_at, total_clicks, total_sessions,
+            avg_position, priority_score
+        )
+        SELECT
+            property, page_path, %(check_mobile)s, %(check_desktop)s,
+            true, source, CURRENT_TIMESTAMP,
+            CURRENT_TIMESTAMP, clicks, sessions,
+            avg_position, priority_score
+        FROM ranked
+        WHERE is_existing OR new_rank <= %(max_new)s
+        ORDER BY seq
+        ON CONFLICT (property, page_path) DO UPDATE SET
+            discovery_source = CASE
+                WHEN EXCLUDED.discovery_source = 'gsc+ga4' THEN 'gsc+ga4'
+                WHEN COALESCE(mp.discovery_source, 'manual') = 'manual' THEN EXCLUDED.discovery_source
+                WHEN mp.discovery_source IN ('gsc', 'ga4')
+                     AND EXCLUDED.discovery_source IN ('gsc', 'ga4')
+                     AND mp.discovery_source <> EXCLUDED.discovery_source THEN 'gsc+ga4'
+                ELSE mp.discovery_source
+            END,
+            last_seen_at = CURRENT_TIMESTAMP,
+            total_clicks = GREATEST(mp.total_clicks, EXCLUDED.total_clicks),
+            total_sessions = GREATEST(mp.total_sessions, EXCLUDED.total_sessions),
+            avg_position = COALESCE(EXCLUDED.avg_position, mp.avg_position),
+            priority_score = EXCLUDED.priority_score,
+            is_active = true
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT
+        (SELECT COUNT(*) FROM upserted WHERE inserted) AS urls_new,
+        (SELECT COUNT(*) FROM upserted WHERE NOT inserted) AS urls_updated,
+        (SELECT COUNT(*) FROM ranked WHERE new_rank > %(max_new)s) AS urls_skipped
+"""
+
 
 @dataclass
 class SyncConfig:
@@ -42,6 +120,7 @@ class SyncConfig:
     check_mobile: bool = True
     check_desktop: bool = False
     max_new_urls_per_run: int = 100
+    set_based: bool = False
 
     @classmethod
     def from_dict(cls, config: Dict) -> 'SyncConfig':
@@ -54,6 +133,7 @@ class SyncConfig:
             check_mobile=config.get('check_mobile', True),
             check_desktop=config.get('check_desktop', False),
             max_new_urls_per_run=config.get('max_new_urls_per_run', 100),
+            set_based=config.get('set_based', False),
         )
 
 
@@ -396,8 +476,6 @@ class URLDiscoverySync:
         Returns:
             Priority score (0.0 to 1.0)
         """
-        import math
-
         # Normalize clicks (log scale, max at 10000)
         click_score = min(1.0, math.log(max(url.clicks, 1) + 1) / math.log(10001))
 
@@ -431,6 +509,41 @@ class URLDiscoverySync:
 
         return round(score, 4)
 
+    def calculate_priority_scores(self, urls: List[DiscoveredURL]) -> List[float]:
+        """
+        Vectorized calculate_priority_score over many URLs.
+
+        Args:
+            urls: Discovered URLs
+
+        Returns:
+            Priority scores in input order
+        """
+        if not urls:
+            return []
+
+        clicks = np.array([u.clicks for u in urls], dtype=float)
+        sessions = np.array([u.sessions for u in urls], dtype=float)
+        positions = np.array([u.avg_position or 0.0 for u in urls], dtype=float)
+        # Dates become midnight, so flooring gives whole days as for date objects
+        last_seen = np.array([u.last_seen_at for u in urls], dtype='datetime64[us]')
+
+        click_score = np.minimum(1.0, np.log(np.maximum(clicks, 1) + 1) / math.log(10001))
+        session_score = np.minimum(1.0, np.log(np.maximum(sessions, 1) + 1) / math.log(5001))
+        position_score = np.where(positions > 0, np.maximum(0, 1.0 - (positions - 1) / 100), 0.5)
+
+        days_since = np.floor((np.datetime64(datetime.now(), 'us') - last_seen) / np.timedelta64(1, 'D'))
+        recency_score = np.where(np.isnat(last_seen), 0.5, np.maximum(0, 1.0 - days_since / 90))
+
+        scores = (
+            0.40 * click_score +
+            0.25 * session_score +
+            0.20 * position_score +
+            0.15 * recency_score
+        )
+
+        return [round(score, 4) for score in scores.tolist()]
+
     def sync_to_monitored_pages(
         self,
         urls: List[DiscoveredURL],
@@ -568,26 +681,99 @@ class URLDiscoverySync:
 
         return stats
 
-    def deactivate_stale_urls(
+    def sync_to_monitored_pages_bulk(
         self,
+        urls: List[DiscoveredURL],
         property: str = None,
-        stale_days: int = None,
         dry_run: bool = False
-    ) -> int:
+    ) -> Dict:
         """
-        Deactivate URLs not seen in GSC/GA4 data for a long time.
+        Set-based sync of discovered URLs to performance.monitored_pages.
+
+        All URLs are COPYed into a temporary staging table and merged with a
+        single INSERT ... ON CONFLICT DO UPDATE (same source merge, limits and
+        statistics as sync_to_monitored_pages). Stale URLs are deactivated in
+        the same transaction. Duplicate (property, page_path) entries keep the
+        highest-priority one.
 
         Args:
-            property: Filter by property (optional)
-            stale_days: Days threshold for staleness
-            dry_run: If True, don't commit changes
+            urls: List of discovered URLs
+            property: Property filter for stale deactivation (optional)
+            dry_run: If True, roll back instead of committing
 
         Returns:
-            Number of URLs deactivated
+            Dict with sync statistics, including urls_deactivated
         """
-        stale_days = stale_days or self.config.stale_threshold_days
+        from ingestors.bulk_loader import CopyRowStream
+
+        stats = {
+            'urls_processed': len(urls),
+            'urls_new': 0,
+            'urls_updated': 0,
+            'urls_skipped': 0,
+            'urls_deactivated': 0,
+        }
+
+        for url, score in zip(urls, self.calculate_priority_scores(urls)):
+            url.priority_score = score
+        urls.sort(key=lambda u: u.priority_score, reverse=True)
+
+        rows = []
+        seen = set()
+        for url in urls:
+            key = (url.property, url.page_path)
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append((
+                len(rows), url.property, url.page_path, url.source,
+                url.clicks, url.sessions, url.avg_position, url.priority_score
+            ))
+
         conn = self.get_connection()
 
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if rows:
+                    cur.execute(STAGE_TABLE_SQL)
+                    cur.copy_expert(
+                        f"COPY monitored_pages_stage ({', '.join(STAGE_COLUMNS)}) FROM STDIN",
+                        CopyRowStream(rows)
+                    )
+                    cur.execute(MERGE_STAGE_SQL, {
+                        'check_mobile': self.config.check_mobile,
+                        'check_desktop': self.config.check_desktop,
+                        'max_new': self.config.max_new_urls_per_run,
+                    })
+                    counts = cur.fetchone()
+                    for key in ('urls_new', 'urls_updated', 'urls_skipped'):
+                        stats[key] = int(counts[key])
+
+                query, params = self._stale_urls_query(property, self.config.stale_threshold_days)
+                cur.execute(query, params)
+                stats['urls_deactivated'] = cur.rowcount
+
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+
+            logger.info(
+                f"Set-based sync complete: {stats['urls_new']} new, "
+                f"{stats['urls_updated']} updated, "
+                f"{stats['urls_skipped']} skipped, "
+                f"{stats['urls_deactivated']} deactivated"
+            )
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error syncing URLs: {e}")
+            raise
+
+        return stats
+
+    def _stale_urls_query(self, property: str, stale_days: int) -> Tuple[str, List]:
+        """UPDATE deactivating stale discovered URLs, with its parameters"""
         query = """
             UPDATE performance.monitored_pages
             SET is_active = false
@@ -601,6 +787,30 @@ class URLDiscoverySync:
             query += " AND property = %s"
             params.append(property)
 
+        return query, params
+
+    def deactivate_stale_urls(
+        self,
+        property: str = None,
+        stale_days: int = None,
+        dry_run: bool = False
+    ) -> int:
+        """
+        Deactivate URLs not seen in GSC/GA4 data for a long time.
+
+        Args:
+            property: Filter by property (optional)
+            stale_days: Days threshold for staleness
+            dry_run: If True, don't commit changes
+
+        Returns:
+            Number of URLs deactivated
+        """
+        stale_days = stale_days or self.config.stale_threshold_days
+        conn = self.get_connection()
+
+        query, params = self._stale_urls_query(property, stale_days)
+
         try:
             with conn.cursor() as cur:
                 if dry_run:
@@ -685,19 +895,30 @@ class URLDiscoverySync:
             merged_urls = self.merge_discovered_urls(gsc_urls, ga4_urls)
             result.urls_discovered = len(merged_urls)
 
-            # Sync to monitored_pages
-            logger.info("Syncing to monitored_pages...")
-            sync_stats = self.sync_to_monitored_pages(merged_urls, dry_run=dry_run)
+            if self.config.set_based:
+                # Merge and deactivate stale URLs in one transaction
+                logger.info("Syncing to monitored_pages (set-based)...")
+                sync_stats = self.sync_to_monitored_pages_bulk(
+                    merged_urls,
+                    property=property,
+                    dry_run=dry_run
+                )
+                result.urls_deactivated = sync_stats['urls_deactivated']
+            else:
+                # Sync to monitored_pages
+                logger.info("Syncing to monitored_pages...")
+                sync_stats = self.sync_to_monitored_pages(merged_urls, dry_run=dry_run)
+
+                # Deactivate stale URLs
+                logger.info("Checking for stale URLs...")
+                result.urls_deactivated = self.deactivate_stale_urls(
+                    property=property,
+                    dry_run=dry_run
+                )
+
             result.urls_new = sync_stats['urls_new']
             result.urls_updated = sync_stats['urls_updated']
 
-            # Deactivate stale URLs
-            logger.info("Checking for stale URLs...")
-            result.urls_deactivated = self.deactivate_stale_urls(
-                property=property,
-                dry_run=dry_run
-            )
-
             # Store details
             result.details = {
                 'gsc_urls_found': len(gsc_urls),
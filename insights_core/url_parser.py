@@ -15,15 +15,80 @@ Example:
 
     >>> variations = parser.extract_variations('/page#section?sort=desc')
     >>> print(variations['has_fragment'])  # True
+
+    >>> canonicals = parser.normalize_many(urls)  # memoized bulk normalization
+
+Benchmark (URLs/sec of bulk normalization against plain urlparse):
+    python -m insights_core.url_parser --urls 1000000 --distinct 50000
 """
+import argparse
 import logging
 import os
+import random
 import re
-from typing import Dict, List, Optional, Set, Tuple
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 logger = logging.getLogger(__name__)
 
+# Normalized URLs remembered per parser (LRU, so long scans stay bounded)
+NORMALIZE_CACHE_SIZE = 100000
+
+# Rows per multi-row INSERT when upserting variations
+UPSERT_PAGE_SIZE = 5000
+
+# Rows fetched per round trip when streaming URLs from gsc.fact_gsc_daily
+FETCH_BATCH = 10000
+
+# URLs containing any of these need the full urlparse path
+_SLOW_PATH_RE = re.compile(r'[?#;\[\]\s\x00-\x1f]')
+
+UPSERT_VARIATIONS_SQL = """
+    INSERT INTO analytics.url_variations
+        (property, canonical_url, variation_url, variation_type, occurrences)
+    VALUES %s
+    ON CONFLICT (property, canonical_url, variation_url)
+    DO UPDATE SET
+        last_seen = CURRENT_TIMESTAMP,
+        occurrences = analytics.url_variations.occurrences + EXCLUDED.occurrences
+"""
+
+FACT_URLS_SQL = """
+    SELECT DISTINCT url
+    FROM gsc.fact_gsc_daily
+    WHERE property = %s
+      AND date >= CURRENT_DATE - %s * INTERVAL '1 day'
+"""
+
+
+def _fast_path(url: str) -> Optional[str]:
+    """
+    Path of a query-less URL without calling urlparse
+
+    Only handles relative paths and plain http(s) URLs; returns None for
+    anything urlparse might treat differently (queries, fragments, params,
+    whitespace, IPv6 hosts, non-ASCII hosts, '//' paths).
+    """
+    if _SLOW_PATH_RE.search(url):
+        return None
+    if url[0] == '/':
+        path = url
+    elif url.startswith('https://') or url.startswith('http://'):
+        rest = url[url.index('//') + 2:]
+        slash = rest.find('/')
+        if slash < 0:
+            return '' if rest.isascii() else None
+        if not rest[:slash].isascii():
+            return None
+        path = rest[slash:]
+    else:
+        return None
+    return None if path.startswith('//') else path
+
 
 class URLParser:
     """
@@ -122,15 +187,17 @@ class URLParser:
         'date', 'year', 'month', 'day', 'from', 'to',
     }
 
-    def __init__(self, db_dsn: str = None):
+    def __init__(self, db_dsn: str = None, cache_size: int = NORMALIZE_CACHE_SIZE):
         """
         Initialize URL Parser
 
         Args:
             db_dsn: Database connection string for storing variations.
                    If not provided, will attempt to read from WAREHOUSE_DSN env var.
+            cache_size: Normalized URLs kept in the LRU memo (0 disables it)
         """
         self.db_dsn = db_dsn or os.getenv('WAREHOUSE_DSN')
+        self._normalize_cached = lru_cache(maxsize=cache_size)(self._normalize)
         logger.debug(f"URLParser initialized with DSN: {'configured' if self.db_dsn else 'not configured'}")
 
     def normalize(self, url: str, remove_fragment: bool = True) -> str:
@@ -166,7 +233,46 @@ class URLParser:
         """
         if not url:
             return ''
+        return self._normalize_cached(url, remove_fragment)
 
+    def normalize_many(self, urls: Iterable[str], remove_fragment: bool = True) -> List[str]:
+        """
+        Normalize many URLs, e.g. every URL of a fact_gsc_daily scan
+
+        Repeated URLs are served from the LRU memo and query-less URLs skip
+        urlparse entirely, so this is much faster than a plain loop over
+        urlparse for warehouse-sized inputs.
+
+        Args:
+            urls: URLs to normalize
+            remove_fragment: Whether to remove URL fragments (default True)
+
+        Returns:
+            Normalized URLs in input order
+        """
+        normalize = self._normalize_cached
+        return [normalize(url, remove_fragment) if url else '' for url in urls]
+
+    def cache_info(self):
+        """Hit/miss statistics of the normalization memo"""
+        return self._normalize_cached.cache_info()
+
+    def clear_cache(self) -> None:
+        """Drop memoized results (needed after changing TRACKING_PARAMS)"""
+        self._normalize_cached.cache_clear()
+
+    def _normalize(self, url: str, remove_fragment: bool = True) -> str:
+        """Normalize one non-empty URL, taking the fast path when possible"""
+        path = _fast_path(url)
+        if path is None:
+            return self._parse_normalize(url, remove_fragment)
+        path = path.lower()
+        if path != '/' and path.endswith('/'):
+            path = path.rstrip('/')
+        return path or '/'
+
+    def _parse_normalize(self, url: str, remove_fragment: bool = True) -> str:
+        """Normalize one non-empty URL with urlparse (see normalize)"""
         try:
             parsed = urlparse(url)
 
@@ -319,17 +425,18 @@ class URLParser:
              '/other': ['/other']}
         """
         groups: Dict[str, List[str]] = {}
+        seen: Set[str] = set()
 
         for url in urls:
-            if not url:
+            # Skip empties and avoid duplicates in the variation lists
+            if not url or url in seen:
                 continue
+            seen.add(url)
 
             canonical = self.normalize(url)
             if canonical not in groups:
                 groups[canonical] = []
-            # Avoid duplicates in the variation list
-            if url not in groups[canonical]:
-                groups[canonical].append(url)
+            groups[canonical].append(url)
 
         return groups
 
@@ -571,7 +678,9 @@ class URLParser:
         """
         Store multiple URL variations in a single transaction
 
-        More efficient than calling store_variation() multiple times.
+        Duplicate pairs are counted up front and written by multi-row
+        INSERT ... ON CONFLICT statements (UPSERT_PAGE_SIZE rows each), so
+        occurrences grows by the number of times each pair was passed in.
 
         Args:
             property: Property identifier
@@ -582,7 +691,6 @@ class URLParser:
         """
         conn = None
         cursor = None
-        stored_count = 0
 
         try:
             import psycopg2
@@ -591,40 +699,179 @@ class URLParser:
                 logger.warning("No database connection configured")
                 return 0
 
+            rows = self._variation_rows(property, url_pairs)
+            if not rows:
+                return 0
+
             conn = psycopg2.connect(self.db_dsn)
             cursor = conn.cursor()
+            self._upsert_variations(cursor, rows)
+            conn.commit()
 
-            for canonical, variation in url_pairs:
-                # Skip identical URLs
-                if canonical == variation:
-                    continue
+            stored_count = sum(row[4] for row in rows)
+            logger.info(f"Stored {stored_count} URL variations ({len(rows)} distinct) for {property}")
+            return stored_count
 
-                variation_type = self.detect_variation_type(canonical, variation)
+        except Exception as e:
+            logger.error(f"Error batch storing URL variations: {e}")
+            if conn:
+                conn.rollback()
+            return 0
 
-                cursor.execute("""
-                    INSERT INTO analytics.url_variations
-                        (property, canonical_url, variation_url, variation_type)
-                    VALUES (%s, %s, %s, %s)
-                    ON CONFLICT (property, canonical_url, variation_url)
-                    DO UPDATE SET
-                        last_seen = CURRENT_TIMESTAMP,
-                        occurrences = analytics.url_variations.occurrences + 1
-                """, (property, canonical, variation, variation_type))
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
 
-                stored_count += 1
+    def store_variations_from_facts(self, property: str, days: int = 30) -> int:
+        """
+        Normalize every URL of a property in gsc.fact_gsc_daily and store variations
 
+        Distinct URLs are streamed through a server-side cursor in FETCH_BATCH
+        chunks, normalized with normalize_many and upserted per chunk, all in
+        one transaction.
+
+        Args:
+            property: Property identifier
+            days: Number of days of fact data to scan
+
+        Returns:
+            Number of variations stored (0 on error)
+        """
+        conn = None
+
+        try:
+            import psycopg2
+
+            if not self.db_dsn:
+                logger.warning("No database connection configured")
+                return 0
+
+            conn = psycopg2.connect(self.db_dsn)
+            reader = conn.cursor(name='url_parser_fact_urls')
+            writer = conn.cursor()
+            reader.itersize = FETCH_BATCH
+            reader.execute(FACT_URLS_SQL, (property, days))
+
+            scanned = stored = 0
+            while True:
+                urls = [row[0] for row in reader.fetchmany(FETCH_BATCH)]
+                if not urls:
+                    break
+                scanned += len(urls)
+                rows = self._variation_rows(property, zip(self.normalize_many(urls), urls))
+                if rows:
+                    self._upsert_variations(writer, rows)
+                    stored += len(rows)
+
+            reader.close()
+            writer.close()
             conn.commit()
-            logger.info(f"Stored {stored_count} URL variations for {property}")
-            return stored_count
+            logger.info(f"Normalized {scanned} URLs for {property}: stored {stored} variations")
+            return stored
 
         except Exception as e:
-            logger.error(f"Error batch storing URL variations: {e}")
+            logger.error(f"Error storing URL variations from facts: {e}")
             if conn:
                 conn.rollback()
-            return stored_count
+            return 0
 
         finally:
-            if cursor:
-                cursor.close()
             if conn:
                 conn.close()
+
+    def _variation_rows(self, property: str, url_pairs: Iterable[Tuple[str, str]]) -> List[Tuple]:
+        """(property, canonical, variation, type, occurrences) per distinct non-identical pair"""
+        counts = Counter(pair for pair in url_pairs if pair[0] != pair[1])
+        return [
+            (property, canonical, variation, self.detect_variation_type(canonical, variation), count)
+            for (canonical, variation), count in counts.items()
+        ]
+
+    @staticmethod
+    def _upsert_variations(cursor: Any, rows: List[Tuple]) -> None:
+        """Upsert variation rows with multi-row INSERT ... ON CONFLICT statements"""
+        from psycopg2.extras import execute_values
+
+        execute_values(cursor, UPSERT_VARIATIONS_SQL, rows, page_size=UPSERT_PAGE_SIZE)
+
+
+def generate_synthetic_urls(count: int, distinct: int = 50000, seed: int = 42) -> List[str]:
+    """
+    Generate a fact_gsc_daily-like URL stream for a benchmark run
+
+    URLs repeat (one row per date x query x device in the warehouse); about
+    a third carry a query string, some with tracking parameters.
+    """
+    rng = random.Random(seed)
+    pool = []
+    for i in range(distinct):
+        url = f"https://www.example.com/Blog/Post-{i}/"
+        kind = i % 6
+        if kind == 0:
+            url += f"?utm_source=news&utm_medium=email&id={i}"
+        elif kind == 1:
+            url += f"?page={i % 7}&sort=desc"
+        pool.append(url)
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def benchmark(urls: List[str], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Compare URLs/sec of normalize_many against urlparse on every URL
+
+    Every run uses a fresh parser, so the memo starts cold.
+
+    Args:
+        urls: URLs to normalize on every run
+        repeat: Number of timed runs per method (best run is reported)
+
+    Returns:
+        Benchmark results per method
+    """
+    def plain():
+        parser = URLParser(db_dsn='', cache_size=0)
+        return [parser._parse_normalize(url) for url in urls]
+
+    methods = {
+        'urlparse': plain,
+        'normalize_many': lambda: URLParser(db_dsn='').normalize_many(urls),
+    }
+    results: Dict[str, Any] = {'urls': len(urls), 'distinct': len(set(urls)), 'repeat': repeat}
+    for name, run in methods.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        results[name] = {
+            'best_seconds': round(best, 4),
+            'urls_per_second': round(len(urls) / best, 1) if best > 0 else 0.0
+        }
+    baseline = results['urlparse']['urls_per_second']
+    results['speedup'] = round(results['normalize_many']['urls_per_second'] / baseline, 2) if baseline else None
+    return results
+
+
+def main() -> int:
+    """Run the URL normalization benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark bulk URL normalization against plain urlparse')
+    parser.add_argument('--urls', type=int, default=1000000, help='URLs per run')
+    parser.add_argument('--distinct', type=int, default=50000, help='Distinct URLs in the stream')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per method')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    results = benchmark(generate_synthetic_urls(args.urls, args.distinct), args.repeat)
+
+    for method in ('urlparse', 'normalize_many'):
+        logger.info(f"{method:>15}: {results[method]['urls_per_second']:>12,.1f} URLs/s "
+                    f"(best of {args.repeat}: {results[method]['best_seconds']}s)")
+    logger.info(f"Speedup: {results['speedup']}x for {results['urls']} URLs ({results['distinct']} distinct)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
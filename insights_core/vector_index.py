@@ -0,0 +1,540 @@
+"""
+Vector Index - In-process ANN index over page embeddings
+========================================================
+Per-property approximate-nearest-neighbour index for the 768-d content
+embeddings, so similarity and cannibalization queries do not scan
+content.page_snapshots with pgvector for every call.
+
+Layout (one directory per property):
+- vectors.f32: memory-mapped float32 (capacity x dim) matrix of unit vectors,
+  grown by doubling; cosine similarity is a dot product
+- meta.json: dim, row count and the page_path of each row (None = removed)
+- ivf.npz: IVF coarse quantizer (k-means centroids) and the list of each row
+
+Small indexes (< IVF_MIN_VECTORS rows) are searched exactly. Above that,
+queries only score the rows in the nprobe inverted lists closest to the
+query; the quantizer is retrained whenever the index doubles in size.
+
+open_property_index() loads a property's index (from EMBEDDING_INDEX_DIR when
+set, else in memory) and catches it up with embeddings written since it was
+last synced, using page_snapshots.analyzed_at.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import asyncpg
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Dimension of content.page_snapshots.content_embedding (vector(768))
+EMBEDDING_DIM = 768
+
+# Below this many rows, exact search is as fast as probing lists
+IVF_MIN_VECTORS = 2048
+
+# Inverted lists probed per query (and neighbouring lists per list for pairs)
+DEFAULT_NPROBE = 8
+
+# Query rows scored per matrix product (bounds temporary memory)
+SCORE_BLOCK = 1024
+
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 256
+
+# Re-read embeddings analyzed this long before the last sync, so rows
+# committed while the sync query ran are not missed (upserts are idempotent)
+SYNC_OVERLAP = timedelta(minutes=5)
+
+VECTORS_FILE = 'vectors.f32'
+META_FILE = 'meta.json'
+IVF_FILE = 'ivf.npz'
+
+VectorLike = Union[str, Sequence[float], np.ndarray]
+
+
+def parse_vector(value: VectorLike) -> np.ndarray:
+    """
+    Embedding as a float32 array
+
+    Accepts numpy arrays, lists and pgvector's text form ('[0.1,0.2,...]'),
+    which asyncpg returns when no vector codec is registered.
+    """
+    if isinstance(value, str):
+        return np.array(value.strip('[]').split(','), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _train_centroids(vectors: np.ndarray, n_lists: int, seed: int = 42) -> np.ndarray:
+    """Spherical k-means centroids of unit vectors"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        labels = _nearest_centroid(sample, centroids)
+        membership = sparse.csr_matrix(
+            (np.ones(sample_size, dtype=np.float32), (labels, np.arange(sample_size))),
+            shape=(n_lists, sample_size)
+        )
+        sums = np.asarray(membership @ sample)
+        empty = ~sums.any(axis=1)
+        # Reseed empty lists with random sample points
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each row"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), SCORE_BLOCK):
+        block = vectors[start:start + SCORE_BLOCK]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+class VectorIndex:
+    """
+    Approximate nearest-neighbour index over one property's page embeddings
+
+    Thread-safe; all public methods take the index lock. With a directory the
+    index is persisted there (call save() after updates), without one it
+    lives in memory only.
+    """
+
+    def __init__(self, dim: int, directory: Optional[str] = None):
+        """
+        Initialize an empty index, or open the one stored in directory
+
+        Args:
+            dim: Embedding dimension
+            directory: Persistence directory (None = in-memory)
+        """
+        self.dim = dim
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._page_paths: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+        # Caller metadata persisted with the index (e.g. last sync time)
+        self.info: Dict[str, str] = {}
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            if os.path.exists(os.path.join(directory, META_FILE)):
+                self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, page_path: str) -> bool:
+        return page_path in self._rows
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether queries go through the IVF lists (else exact search)"""
+        return self._centroids is not None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def build(self, page_paths: Sequence[str], vectors: Union[np.ndarray, Sequence[VectorLike]]) -> None:
+        """Replace the index contents with the given pages"""
+        matrix = np.stack([parse_vector(v) for v in vectors]) if len(vectors) else \
+            np.zeros((0, self.dim), dtype=np.float32)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-d vectors, got {matrix.shape[1]}-d")
+
+        with self._lock:
+            self._page_paths = []
+            self._rows = {}
+            self._centroids = None
+            self._trained_size = 0
+            self._allocate(len(page_paths))
+            self._vectors[:len(page_paths)] = _normalize(matrix)
+            self._page_paths = list(page_paths)
+            self._rows = {path: i for i, path in enumerate(self._page_paths)}
+            self._lists = np.full(len(self._vectors), -1, dtype=np.int32)
+            self._maybe_train()
+
+    def upsert(self, page_path: str, vector: VectorLike) -> None:
+        """Add a page or replace its vector"""
+        vector = parse_vector(vector)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Expected a {self.dim}-d vector, got shape {vector.shape}")
+        vector = _normalize(vector)
+
+        with self._lock:
+            row = self._rows.get(page_path)
+            if row is None:
+                row = len(self._page_paths)
+                self._allocate(row + 1)
+                self._page_paths.append(page_path)
+                self._rows[page_path] = row
+
+            self._vectors[row] = vector
+            if self.is_trained:
+                self._lists[row] = np.argmax(self._centroids @ vector)
+            self._maybe_train()
+
+    def upsert_many(self, page_paths: Sequence[str], vectors: Sequence[VectorLike]) -> None:
+        """upsert() for several pages"""
+        with self._lock:
+            for page_path, vector in zip(page_paths, vectors):
+                self.upsert(page_path, vector)
+
+    def remove(self, page_path: str) -> bool:
+        """Drop a page; returns False if it was not indexed"""
+        with self._lock:
+            row = self._rows.pop(page_path, None)
+            if row is None:
+                return False
+            self._page_paths[row] = None
+            self._vectors[row] = 0
+            self._lists[row] = -1
+            return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: Union[str, VectorLike],
+        k: int = 10,
+        threshold: float = -1.0,
+        nprobe: int = DEFAULT_NPROBE
+    ) -> List[Tuple[str, float]]:
+        """
+        Most similar pages to a vector or an indexed page
+
+        Args:
+            query: Query vector, or the page_path of an indexed page (which
+                is excluded from its own results)
+            k: Max results
+            threshold: Minimum cosine similarity
+            nprobe: Inverted lists to scan (ignored for exact search)
+
+        Returns:
+            (page_path, similarity) pairs, most similar first
+        """
+        with self._lock:
+            exclude = -1
+            if isinstance(query, str) and query in self._rows:
+                exclude = self._rows[query]
+                vector = np.array(self._vectors[exclude])
+            else:
+                vector = _normalize(parse_vector(query))
+
+            candidates = self._candidates(vector, nprobe)
+            candidates = candidates[candidates != exclude]
+            if not len(candidates) or k <= 0:
+                return []
+
+            scores = self._vectors[candidates] @ vector
+            keep = scores >= threshold
+            candidates, scores = candidates[keep], scores[keep]
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                candidates, scores = candidates[top], scores[top]
+            order = np.argsort(-scores, kind='stable')
+            return [(self._page_paths[candidates[i]], float(scores[i])) for i in order]
+
+    def pairs_above(
+        self,
+        threshold: float,
+        limit: Optional[int] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        page_paths: Optional[Sequence[str]] = None
+    ) -> List[Tuple[str, str, float]]:
+        """
+        All page pairs with similarity >= threshold
+
+        Exact for small indexes; otherwise each inverted list is compared with
+        itself and its nprobe - 1 closest lists, so pairs split across distant
+        lists can be missed (near-duplicates almost always share a list).
+
+        Args:
+            threshold: Minimum cosine similarity
+            limit: Max pairs (highest similarity first)
+            nprobe: Lists compared per list
+            page_paths: Only pairs where both pages are in this set
+
+        Returns:
+            (page_a, page_b, similarity) with page_a < page_b, most similar first
+        """
+        with self._lock:
+            if page_paths is not None:
+                rows = np.array(sorted(self._rows[p] for p in set(page_paths) if p in self._rows), dtype=np.int64)
+            else:
+                rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+
+            if self.is_trained and len(rows) >= IVF_MIN_VECTORS:
+                left, right, scores = self._ivf_pairs(rows, threshold, nprobe)
+            else:
+                left, right, scores = self._exact_pairs(rows, threshold)
+
+            order = np.argsort(-scores, kind='stable')
+            if limit is not None:
+                order = order[:limit]
+
+            pairs = []
+            for i in order:
+                a, b = self._page_paths[left[i]], self._page_paths[right[i]]
+                pairs.append((a, b, float(scores[i])) if a < b else (b, a, float(scores[i])))
+            return pairs
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Flush vectors and write metadata and IVF lists (no-op in memory)"""
+        if not self.directory:
+            return
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            self._write_atomic(META_FILE, lambda f: json.dump({
+                'dim': self.dim,
+                'count': len(self._page_paths),
+                'page_paths': self._page_paths,
+                'trained_size': self._trained_size,
+                'info': self.info
+            }, f), mode='w')
+            self._write_atomic(IVF_FILE, lambda f: np.savez(
+                f,
+                centroids=self._centroids if self.is_trained else np.zeros((0, self.dim), dtype=np.float32),
+                lists=self._lists[:len(self._page_paths)]
+            ), mode='wb')
+
+    def _write_atomic(self, name: str, write, mode: str) -> None:
+        """Write a file via a temp file and rename, so readers never see it half-written"""
+        path = os.path.join(self.directory, name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def _load(self) -> None:
+        """Read an index saved by save()"""
+        with open(os.path.join(self.directory, META_FILE)) as f:
+            meta = json.load(f)
+        if meta['dim'] != self.dim:
+            raise ValueError(f"Index in {self.directory} is {meta['dim']}-d, expected {self.dim}-d")
+
+        count = meta['count']
+        self._page_paths = meta['page_paths']
+        self._rows = {path: i for i, path in enumerate(self._page_paths) if path is not None}
+        self._trained_size = meta.get('trained_size', 0)
+        self.info = meta.get('info', {})
+        self._open_vectors(count)
+
+        ivf_path = os.path.join(self.directory, IVF_FILE)
+        self._lists = np.full(len(self._vectors), -1, dtype=np.int32)
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                if len(ivf['centroids']):
+                    self._centroids = ivf['centroids'].astype(np.float32)
+                lists = ivf['lists']
+                self._lists[:len(lists)] = lists[:count]
+        if self.is_trained:
+            # Rows written after the lists were last saved
+            stale = np.array([row for row in self._rows.values() if self._lists[row] < 0], dtype=np.int64)
+            if len(stale):
+                self._lists[stale] = _nearest_centroid(np.asarray(self._vectors[stale]), self._centroids)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _allocate(self, size: int) -> None:
+        """Ensure capacity for size rows, doubling the matrix when full"""
+        if size <= len(self._vectors):
+            return
+        capacity = max(size, 2 * len(self._vectors), 64)
+        lists = np.full(capacity, -1, dtype=np.int32)
+        lists[:len(self._lists)] = self._lists
+        self._lists = lists
+
+        if not self.directory:
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:len(self._vectors)] = self._vectors
+            self._vectors = grown
+            return
+
+        path = os.path.join(self.directory, VECTORS_FILE)
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+            del self._vectors
+        elif os.path.exists(path) and not len(self._page_paths):
+            # build() over a stale file
+            os.remove(path)
+        with open(path, 'ab') as f:
+            f.truncate(capacity * self.dim * np.dtype(np.float32).itemsize)
+        self._vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _open_vectors(self, count: int) -> None:
+        """Map the stored matrix"""
+        path = os.path.join(self.directory, VECTORS_FILE)
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        capacity = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+        if capacity < count:
+            raise ValueError(f"{path} holds {capacity} rows, metadata expects {count}")
+        if capacity:
+            self._vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _maybe_train(self) -> None:
+        """(Re)train the quantizer once the index is large enough or has doubled"""
+        size = len(self._rows)
+        if size < IVF_MIN_VECTORS or (self.is_trained and size < 2 * self._trained_size):
+            return
+
+        rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+        vectors = np.asarray(self._vectors[rows])
+        n_lists = int(np.clip(np.sqrt(size), 1, 4096))
+        self._centroids = _train_centroids(vectors, n_lists)
+        self._lists = np.full(len(self._vectors), -1, dtype=np.int32)
+        self._lists[rows] = _nearest_centroid(vectors, self._centroids)
+        self._trained_size = size
+        logger.info(f"Trained vector index: {size} vectors in {n_lists} lists")
+
+    def _candidates(self, vector: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows to score for a query vector"""
+        if not self.is_trained:
+            return np.array(sorted(self._rows.values()), dtype=np.int64)
+        probes = np.argsort(-(self._centroids @ vector))[:nprobe]
+        return np.flatnonzero(np.isin(self._lists, probes))
+
+    def _exact_pairs(self, rows: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All pairs among rows above threshold, by blockwise matrix products"""
+        vectors = np.asarray(self._vectors[rows])
+        left, right, scores = [], [], []
+        for start in range(0, len(rows), SCORE_BLOCK):
+            block = vectors[start:start + SCORE_BLOCK] @ vectors[start:].T
+            i, j = np.nonzero(np.triu(block >= threshold, k=1))
+            left.append(rows[start + i])
+            right.append(rows[start + j])
+            scores.append(block[i, j])
+        return self._concat_pairs(left, right, scores)
+
+    def _ivf_pairs(
+        self,
+        rows: np.ndarray,
+        threshold: float,
+        nprobe: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pairs above threshold within each list and its closest lists"""
+        lists = self._lists[rows]
+        members = {c: rows[lists == c] for c in np.unique(lists)}
+        n_lists = len(self._centroids)
+        nprobe = min(nprobe, n_lists)
+        closest = np.argpartition(-(self._centroids @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        adjacent = np.zeros((n_lists, n_lists), dtype=bool)
+        adjacent[np.arange(n_lists)[:, None], closest] = True
+        adjacent |= adjacent.T | np.eye(n_lists, dtype=bool)
+
+        left, right, scores = [], [], []
+        for c, list_rows in members.items():
+            # Each unordered pair of adjacent lists is scored once, from the lower id
+            nearby = [n for n in np.flatnonzero(adjacent[c, c:]) + c if n in members]
+            candidates = np.concatenate([members[n] for n in nearby])
+            for start in range(0, len(list_rows), SCORE_BLOCK):
+                block_rows = list_rows[start:start + SCORE_BLOCK]
+                block = np.asarray(self._vectors[block_rows]) @ np.asarray(self._vectors[candidates]).T
+                i, j = np.nonzero(block >= threshold)
+                a, b = block_rows[i], candidates[j]
+                keep = a != b
+                left.append(np.minimum(a, b)[keep])
+                right.append(np.maximum(a, b)[keep])
+                scores.append(block[i, j][keep])
+
+        left, right, scores = self._concat_pairs(left, right, scores)
+        # Pairs within one list are seen in both orders
+        _, unique = np.unique(left * len(self._page_paths) + right, return_index=True)
+        return left[unique], right[unique], scores[unique]
+
+    @staticmethod
+    def _concat_pairs(left, right, scores) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if not left:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(left), np.concatenate(right), np.concatenate(scores)
+
+
+def index_directory(root: Optional[str], property: str) -> Optional[str]:
+    """Directory of a property's index under root (None when root is unset)"""
+    if not root:
+        return None
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', property).strip('_')
+    return os.path.join(root, f"{slug}-{hashlib.sha1(property.encode()).hexdigest()[:8]}")
+
+
+async def open_property_index(
+    pool: asyncpg.Pool,
+    property: str,
+    dim: int = EMBEDDING_DIM,
+    index_dir: Optional[str] = None
+) -> VectorIndex:
+    """
+    Open a property's index and bring it up to date with the warehouse
+
+    A new index is built from every latest-snapshot embedding; a persisted
+    one only re-reads pages analyzed since its last sync.
+
+    Args:
+        pool: asyncpg pool
+        property: Property URL
+        dim: Embedding dimension (default: EMBEDDING_DIM)
+        index_dir: Root directory for persisted indexes (default:
+            EMBEDDING_INDEX_DIR; unset = in-memory index)
+
+    Returns:
+        VectorIndex
+    """
+    directory = index_directory(index_dir or os.getenv('EMBEDDING_INDEX_DIR'), property)
+    index = VectorIndex(dim, directory)
+
+    last_sync = index.info.get('synced_at')
+    since = datetime.fromisoformat(last_sync) - SYNC_OVERLAP if last_sync else None
+    synced_at = datetime.utcnow()
+
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT page_path, content_embedding::text AS content_embedding
+            FROM content.vw_latest_snapshots
+            WHERE property = $1
+                AND content_embedding IS NOT NULL
+                AND ($2::timestamp IS NULL OR analyzed_at >= $2)
+        """, property, since)
+
+    page_paths = [r['page_path'] for r in rows]
+    vectors = [r['content_embedding'] for r in rows]
+    if since is None:
+        await asyncio.to_thread(index.build, page_paths, vectors)
+    else:
+        await asyncio.to_thread(index.upsert_many, page_paths, vectors)
+
+    index.info['synced_at'] = synced_at.isoformat()
+    index.save()
+    logger.info(f"Vector index for {property}: {len(index)} pages ({len(rows)} synced)")
+    return index
@@ -17,6 +17,7 @@ import logging
 import json
 from datetime import datetime, timedelta
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 import yaml
 from prometheus_client import start_http_server, Gauge, Counter, Info
@@ -36,6 +37,53 @@ SCHEDULER_METRICS_FILE = os.environ.get('SCHEDULER_METRICS_FILE', '/logs/schedul
 CSE_METRICS_FILE = os.environ.get('CSE_METRICS_FILE', '/logs/cse_metrics.json')
 EXPORTER_PORT = int(os.environ.get('EXPORTER_PORT', '9090'))
 SCRAPE_INTERVAL = int(os.environ.get('SCRAPE_INTERVAL', '15'))
+# Fact table metrics mode: 'exact' (COUNT/GROUP BY over the whole table) or
+# 'estimated' (planner statistics plus per-partition incremental quality checks)
+FACT_METRICS_MODE = os.environ.get('FACT_METRICS_MODE', 'exact')
+# Seconds between recomputations of duplicate/null metrics (independent of SCRAPE_INTERVAL)
+FACT_QUALITY_REFRESH_INTERVAL = int(os.environ.get('FACT_QUALITY_REFRESH_INTERVAL', '300'))
+
+# Fields checked for NULLs in the fact table
+FACT_NULL_FIELDS = ['clicks', 'impressions', 'ctr', 'position']
+
+# Physical tables holding fact_gsc_daily rows (monthly partitions plus the
+# default partition, or the table itself before partitioning) with their
+# statistics: n_live_tup is kept current by the stats collector, reltuples
+# by ANALYZE; the modification counter changes whenever rows are written.
+FACT_PARTITION_STATS_SQL = """
+    SELECT c.relname AS partition,
+           GREATEST(COALESCE(s.n_live_tup, 0), c.reltuples, 0)::bigint AS estimated_rows,
+           COALESCE(s.n_tup_ins + s.n_tup_upd + s.n_tup_del, 0) AS modifications
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE n.nspname = 'gsc'
+      AND (
+          c.oid IN (
+              SELECT inhrelid FROM pg_inherits
+              WHERE inhparent = 'gsc.fact_gsc_daily'::regclass
+          )
+          OR (c.relname = 'fact_gsc_daily' AND c.relkind = 'r')
+      )
+"""
+
+# Duplicate and null counts for one physical table in a single scan
+FACT_PARTITION_QUALITY_SQL = """
+    SELECT COUNT(*) FILTER (WHERE n > 1) AS duplicates,
+           COALESCE(SUM(clicks), 0) AS clicks,
+           COALESCE(SUM(impressions), 0) AS impressions,
+           COALESCE(SUM(ctr), 0) AS ctr,
+           COALESCE(SUM(position), 0) AS position
+    FROM (
+        SELECT COUNT(*) AS n,
+               COUNT(*) FILTER (WHERE clicks IS NULL) AS clicks,
+               COUNT(*) FILTER (WHERE impressions IS NULL) AS impressions,
+               COUNT(*) FILTER (WHERE ctr IS NULL) AS ctr,
+               COUNT(*) FILTER (WHERE position IS NULL) AS position
+        FROM {table}
+        GROUP BY date, property, url, query, country, device
+    ) keys
+"""
 
 # =============================================================================
 # GSC (Google Search Console) Metrics
@@ -111,10 +159,22 @@ ingestor_info = Info('data_ingestors', 'Data ingestor configuration information'
 class MetricsCollector:
     """Collects metrics from warehouse database and scheduler for all data ingestors"""
 
-    def __init__(self, dsn, scheduler_metrics_file, cse_metrics_file=None):
+    def __init__(self, dsn, scheduler_metrics_file, cse_metrics_file=None,
+                 fact_metrics_mode=None, quality_refresh_interval=None):
         self.dsn = dsn
         self.scheduler_metrics_file = scheduler_metrics_file
         self.cse_metrics_file = cse_metrics_file or CSE_METRICS_FILE
+        self.fact_metrics_mode = fact_metrics_mode or FACT_METRICS_MODE
+        self.quality_refresh_interval = (
+            FACT_QUALITY_REFRESH_INTERVAL if quality_refresh_interval is None
+            else quality_refresh_interval
+        )
+
+        # Monotonic time of the last duplicate/null recomputation
+        self._quality_refreshed_at = None
+        # Per-partition quality results, keyed by partition name:
+        # (modification counter when scanned, {'duplicates': n, <field>: nulls})
+        self._partition_quality = {}
     
     def get_db_connection(self):
         """Get database connection"""
@@ -172,48 +232,125 @@ class MetricsCollector:
         except Exception as e:
             logger.error(f"Failed to collect warehouse info: {e}")
     
+    def _quality_refresh_due(self):
+        """Check whether duplicate/null metrics should be recomputed"""
+        if self._quality_refreshed_at is None:
+            return True
+        return time.monotonic() - self._quality_refreshed_at >= self.quality_refresh_interval
+
     def collect_fact_table_metrics(self):
-        """Collect metrics about fact table"""
+        """Collect metrics about fact table
+
+        In 'exact' mode the row count, duplicate scan and null scans run over
+        the whole table. In 'estimated' mode the row count comes from planner
+        statistics on every scrape and duplicate/null checks only rescan
+        partitions written since they were last scanned. Either way the
+        expensive checks run at most once per quality refresh interval and the
+        gauges keep their last values in between.
+        """
         try:
+            if self.fact_metrics_mode != 'estimated' and not self._quality_refresh_due():
+                return
+
             conn = self.get_db_connection()
             if not conn:
                 return
             
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Total rows
-                cur.execute("SELECT COUNT(*) as total FROM gsc.fact_gsc_daily")
-                total = cur.fetchone()['total']
-                fact_table_rows.set(total)
-                
-                # Duplicate check
-                cur.execute("""
-                    SELECT COUNT(*) as duplicates
-                    FROM (
-                        SELECT date, property, url, query, country, device, COUNT(*)
-                        FROM gsc.fact_gsc_daily
-                        GROUP BY date, property, url, query, country, device
-                        HAVING COUNT(*) > 1
-                    ) dup
-                """)
-                dups = cur.fetchone()['duplicates']
-                duplicate_records.set(dups)
-                
-                # Null value checks
-                null_fields = ['clicks', 'impressions', 'ctr', 'position']
-                for field in null_fields:
-                    cur.execute(f"""
-                        SELECT COUNT(*) as null_count
-                        FROM gsc.fact_gsc_daily
-                        WHERE {field} IS NULL
-                    """)
-                    null_count = cur.fetchone()['null_count']
-                    null_values_count.labels(field=field).set(null_count)
+                if self.fact_metrics_mode == 'estimated':
+                    total, dups = self._collect_estimated_fact_table_metrics(cur)
+                else:
+                    total, dups = self._collect_exact_fact_table_metrics(cur)
             
             conn.close()
             logger.debug(f"Fact table metrics: {total} rows, {dups} duplicates")
             
         except Exception as e:
             logger.error(f"Failed to collect fact table metrics: {e}")
+
+    def _collect_exact_fact_table_metrics(self, cur):
+        """Count rows, duplicates and nulls over the whole fact table"""
+        # Total rows
+        cur.execute("SELECT COUNT(*) as total FROM gsc.fact_gsc_daily")
+        total = cur.fetchone()['total']
+        fact_table_rows.set(total)
+        
+        # Duplicate check
+        cur.execute("""
+            SELECT COUNT(*) as duplicates
+            FROM (
+                SELECT date, property, url, query, country, device, COUNT(*)
+                FROM gsc.fact_gsc_daily
+                GROUP BY date, property, url, query, country, device
+                HAVING COUNT(*) > 1
+            ) dup
+        """)
+        dups = cur.fetchone()['duplicates']
+        duplicate_records.set(dups)
+        
+        # Null value checks
+        for field in FACT_NULL_FIELDS:
+            cur.execute(f"""
+                SELECT COUNT(*) as null_count
+                FROM gsc.fact_gsc_daily
+                WHERE {field} IS NULL
+            """)
+            null_count = cur.fetchone()['null_count']
+            null_values_count.labels(field=field).set(null_count)
+
+        self._quality_refreshed_at = time.monotonic()
+        return total, dups
+
+    def _collect_estimated_fact_table_metrics(self, cur):
+        """Estimate the row count and incrementally refresh quality metrics
+
+        Partitions whose modification counter is unchanged since their last
+        scan reuse the cached counts; dropped partitions fall out of the
+        totals. Before the table is partitioned it is treated as a single
+        partition, so any write triggers a full rescan.
+        """
+        cur.execute(FACT_PARTITION_STATS_SQL)
+        partitions = cur.fetchall()
+
+        total = sum(int(row['estimated_rows']) for row in partitions)
+        fact_table_rows.set(total)
+
+        if not self._quality_refresh_due():
+            return total, None
+
+        refreshed = {}
+        rescanned = 0
+        for row in partitions:
+            name = row['partition']
+            modifications = int(row['modifications'])
+            cached = self._partition_quality.get(name)
+            if cached is not None and cached[0] == modifications:
+                refreshed[name] = cached
+                continue
+
+            cur.execute(sql.SQL(FACT_PARTITION_QUALITY_SQL).format(
+                table=sql.Identifier('gsc', name)
+            ))
+            counts = cur.fetchone()
+            refreshed[name] = (modifications, {
+                key: int(counts[key]) for key in ['duplicates'] + FACT_NULL_FIELDS
+            })
+            rescanned += 1
+
+        self._partition_quality = refreshed
+        self._quality_refreshed_at = time.monotonic()
+
+        dups = sum(counts['duplicates'] for _, counts in refreshed.values())
+        duplicate_records.set(dups)
+        for field in FACT_NULL_FIELDS:
+            null_values_count.labels(field=field).set(
+                sum(counts[field] for _, counts in refreshed.values())
+            )
+
+        logger.debug(
+            f"Fact table quality refreshed: {rescanned}/{len(partitions)} partitions rescanned"
+        )
+        return total, dups
     
     def collect_data_freshness(self):
         """Collect data freshness metrics"""
@@ -825,6 +962,8 @@ def main():
     logger.info("=" * 60)
     logger.info(f"Exporter port: {EXPORTER_PORT}")
     logger.info(f"Scrape interval: {SCRAPE_INTERVAL}s")
+    logger.info(f"Fact table metrics: {FACT_METRICS_MODE} mode, "
+                f"quality refresh every {FACT_QUALITY_REFRESH_INTERVAL}s")
     logger.info("")
     logger.info("Configured Data Ingestors:")
     logger.info("  - GSC (Google Search Console)")
@@ -9,6 +9,7 @@ Features:
 - Alert suppression and rate limiting
 - Alert aggregation to prevent spam
 - Delivery retry logic
+- Concurrent delivery with per-channel limits and keep-alive clients
 """
 import asyncio
 import logging
@@ -19,6 +20,8 @@ from uuid import UUID
 
 import asyncpg
 
+from insights_core.delivery import DeliveryEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,16 +30,18 @@ class AlertManager:
     Central alert management and notification orchestration
     """
 
-    def __init__(self, db_dsn: str = None):
+    def __init__(self, db_dsn: str = None, channel_concurrency: Dict[str, int] = None):
         """
         Initialize Alert Manager
 
         Args:
             db_dsn: Database connection string
+            channel_concurrency: Per-channel delivery limits (see insights_core.delivery)
         """
         self.db_dsn = db_dsn or os.getenv('WAREHOUSE_DSN')
         self._pool: Optional[asyncpg.Pool] = None
         self._notifiers = {}  # Will be populated with channel notifiers
+        self._delivery = DeliveryEngine(channel_concurrency)
 
         logger.info("AlertManager initialized")
 
@@ -476,19 +481,30 @@ Please review and optimize this page.
 
             logger.info(f"Processing {len(pending)} pending notifications")
 
-            for notif in pending:
-                await self._send_notification(
-                    queue_id=str(notif['queue_id']),
-                    alert_id=str(notif['alert_id']),
-                    channel_type=notif['channel_type'],
-                    channel_config=notif['channel_config'],
-                    payload=notif['payload'],
-                    attempts=notif['attempts']
-                )
+            # All notifications are sent at once; the delivery engine caps
+            # in-flight sends per channel
+            try:
+                await asyncio.gather(*(
+                    self._send_notification(
+                        queue_id=str(notif['queue_id']),
+                        alert_id=str(notif['alert_id']),
+                        channel_type=notif['channel_type'],
+                        channel_config=notif['channel_config'],
+                        payload=notif['payload'],
+                        attempts=notif['attempts']
+                    )
+                    for notif in pending
+                ))
+            finally:
+                await self._delivery.aclose()
 
         except Exception as e:
             logger.error(f"Error processing notification queue: {e}")
 
+    def get_delivery_stats(self) -> Dict:
+        """Per-channel delivery latency histograms and error counts"""
+        return self._delivery.get_stats()
+
     async def _send_notification(
         self,
         queue_id: str,
@@ -533,8 +549,16 @@ Please review and optimize this page.
                     WHERE queue_id = $1
                 """, queue_id)
 
-            # Send notification
-            success = await notifier.send(payload, channel_config)
+            # Send notification (HTTP notifiers reuse a keep-alive client
+            # per endpoint)
+            endpoint = getattr(notifier, 'endpoint', None)
+            url = endpoint(channel_config) if endpoint else None
+            if isinstance(url, str) and url:
+                client = self._delivery.client(url)
+                send = lambda: notifier.send(payload, channel_config, client=client)
+            else:
+                send = lambda: notifier.send(payload, channel_config)
+            success = await self._delivery.deliver(channel_type, send)
 
             if success:
                 # Mark as sent
@@ -48,10 +48,15 @@ class SlackNotifier:
         self.default_webhook_url = default_webhook_url
         logger.info("SlackNotifier initialized")
 
+    def endpoint(self, channel_config: Dict) -> Optional[str]:
+        """Webhook URL a notification with this config is posted to"""
+        return channel_config.get('webhook_url', self.default_webhook_url)
+
     async def send(
         self,
         payload: Dict,
-        channel_config: Dict
+        channel_config: Dict,
+        client: Optional[httpx.AsyncClient] = None
     ) -> bool:
         """
         Send notification to Slack
@@ -59,13 +64,14 @@ class SlackNotifier:
         Args:
             payload: Alert payload with title, message, severity, etc.
             channel_config: Slack configuration (webhook_url, channel, etc.)
+            client: Shared keep-alive client (a one-off client if None)
 
         Returns:
             True if sent successfully
         """
         try:
             # Get webhook URL
-            webhook_url = channel_config.get('webhook_url', self.default_webhook_url)
+            webhook_url = self.endpoint(channel_config)
 
             if not webhook_url:
                 logger.error("No Slack webhook URL configured")
@@ -75,7 +81,10 @@ class SlackNotifier:
             slack_message = self._build_message(payload, channel_config)
 
             # Send to Slack
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.post(webhook_url, json=slack_message)
+            else:
                 response = await client.post(webhook_url, json=slack_message)
 
             if response.status_code == 200:
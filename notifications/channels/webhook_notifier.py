@@ -28,10 +28,15 @@ class WebhookNotifier:
         """Initialize Webhook notifier"""
         logger.info("WebhookNotifier initialized")
 
+    def endpoint(self, channel_config: Dict) -> Optional[str]:
+        """URL a notification with this config is posted to"""
+        return channel_config.get('url')
+
     async def send(
         self,
         payload: Dict,
-        channel_config: Dict
+        channel_config: Dict,
+        client: Optional[httpx.AsyncClient] = None
     ) -> bool:
         """
         Send webhook notification
@@ -39,12 +44,13 @@ class WebhookNotifier:
         Args:
             payload: Alert payload
             channel_config: Webhook configuration (url, headers, format)
+            client: Shared keep-alive client (a one-off client if None)
 
         Returns:
             True if sent successfully
         """
         try:
-            webhook_url = channel_config.get('url')
+            webhook_url = self.endpoint(channel_config)
 
             if not webhook_url:
                 logger.error("No webhook URL configured")
@@ -68,7 +74,14 @@ class WebhookNotifier:
             headers.setdefault('Content-Type', 'application/json')
 
             # Send webhook
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.post(
+                        webhook_url,
+                        json=webhook_payload,
+                        headers=headers
+                    )
+            else:
                 response = await client.post(
                     webhook_url,
                     json=webhook_payload,
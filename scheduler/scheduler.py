@@ -5,7 +5,7 @@ Orchestrates API ingestion, transforms, insights, and maintenance tasks
 
 Schedules:
 - Daily: API ingestion, transforms, insights refresh, watermark advancement
-- Weekly: Reconciliation (re-check last 7 days via API), cannibalization refresh
+- Weekly: Reconciliation (re-check last 7 days via API), partition maintenance, cannibalization refresh
 
 Version: 2.1 (Config-driven schedules from scheduler_config.yaml)
 """
@@ -349,6 +349,7 @@ def run_url_discovery_sync():
             check_mobile=sync_config_dict.get('check_mobile', True),
             check_desktop=sync_config_dict.get('check_desktop', False),
             max_new_urls_per_run=sync_config_dict.get('max_new_urls_per_run', 100),
+            set_based=sync_config_dict.get('set_based', False),
         )
 
         # Initialize sync
@@ -787,6 +788,89 @@ def refresh_cannibalization_analysis():
         update_metrics('cannibalization_refresh', 'failed', error=str(e))
         return False
 
+def maintain_fact_partitions():
+    """
+    Maintain monthly partitions of gsc.fact_gsc_daily (weekly)
+
+    Creates partitions for the coming months (and for any month whose rows
+    landed in the default partition), then applies retention by dropping
+    whole partitions older than `retention_months` instead of running DELETE.
+    Retention is off unless `retention_months` is set in scheduler_config.yaml.
+    """
+    start_time = time.time()
+    logger.info("=" * 60)
+    logger.info("Starting fact table partition maintenance...")
+    logger.info("=" * 60)
+
+    if not check_warehouse_health():
+        logger.warning("Skipping partition maintenance - warehouse not healthy")
+        update_metrics('partition_maintenance', 'skipped', error='Warehouse unhealthy')
+        return False
+
+    config = load_scheduler_config()
+    task_config = config.get('weekly_maintenance', {}).get('tasks', {}).get('partition_maintenance', {})
+
+    if not task_config.get('enabled', True):
+        logger.info("Partition maintenance is disabled in config")
+        update_metrics('partition_maintenance', 'skipped', time.time() - start_time,
+                      error='Disabled in config')
+        return True
+
+    months_ahead = int(task_config.get('months_ahead', 3))
+    retention_months = int(task_config.get('retention_months', 0))
+
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT gsc.fact_gsc_daily_is_partitioned()")
+            if not cur.fetchone()[0]:
+                conn.close()
+                logger.warning(
+                    "gsc.fact_gsc_daily is not partitioned - "
+                    "run scripts/migrate_partition_fact_gsc_daily.py to migrate"
+                )
+                update_metrics('partition_maintenance', 'skipped', time.time() - start_time,
+                              error='Table not partitioned')
+                return True
+
+            cur.execute("SELECT gsc.ensure_fact_gsc_daily_partitions(%s)", (months_ahead,))
+            created = cur.fetchone()[0]
+
+            dropped = []
+            if retention_months > 0:
+                cur.execute("""
+                    SELECT * FROM gsc.drop_fact_gsc_daily_partitions_before(
+                        (date_trunc('month', CURRENT_DATE) - make_interval(months => %s))::date
+                    )
+                """, (retention_months,))
+                dropped = [row[0] for row in cur.fetchall()]
+        conn.commit()
+        conn.close()
+
+        duration = time.time() - start_time
+        logger.info(f"Partition maintenance completed in {duration:.2f}s")
+        logger.info(f"Partitions created: {created}, dropped: {len(dropped)}")
+        for name in dropped:
+            logger.info(f"  Dropped expired partition gsc.{name}")
+
+        update_metrics(
+            'partition_maintenance',
+            'success',
+            duration,
+            extra={
+                'partitions_created': created,
+                'partitions_dropped': len(dropped),
+                'retention_months': retention_months
+            }
+        )
+        return True
+
+    except Exception as e:
+        duration = time.time() - start_time
+        logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+        update_metrics('partition_maintenance', 'failed', duration, str(e))
+        return False
+
 def run_hugo_sync():
     """
     Sync Hugo content to database (daily)
@@ -1302,7 +1386,7 @@ def daily_pipeline():
     return critical_success == len(critical_tasks)
 
 def weekly_maintenance():
-    """Run weekly maintenance: watermark reconciliation, data reconciliation, cannibalization, content analysis (API-ONLY MODE)"""
+    """Run weekly maintenance: watermark reconciliation, data reconciliation, partition maintenance, cannibalization, content analysis (API-ONLY MODE)"""
     logger.info("=" * 60)
     logger.info("Starting WEEKLY maintenance - API-ONLY MODE")
     logger.info("=" * 60)
@@ -1315,6 +1399,7 @@ def weekly_maintenance():
         # to fetch the missing dates.
         ('Watermark Reconciliation', reconcile_watermarks),
         ('Data Reconciliation', reconcile_recent_data),
+        ('Partition Maintenance', maintain_fact_partitions),
         ('SQL Transforms Refresh', run_transforms),
         ('Cannibalization Refresh', refresh_cannibalization_analysis),
         ('Content Analysis', run_content_analysis)
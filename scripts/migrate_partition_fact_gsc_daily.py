@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+fact_gsc_daily Partitioning Migration
+Converts an existing non-partitioned gsc.fact_gsc_daily into the monthly
+range-partitioned layout defined in sql/32_fact_gsc_daily_partitioning.sql
+
+The conversion runs in a single transaction:
+    1. install the partition management functions (sql/32)
+    2. rename the old table to gsc.fact_gsc_daily_legacy and copy its rows
+       into the new partitioned table
+    3. re-apply the SQL files whose views read fact_gsc_daily, so they bind
+       to the new table instead of the legacy one
+    4. verify the row counts match
+
+Stop the scheduler and ingestors while it runs - the old table is locked
+ACCESS EXCLUSIVE until the transaction commits.
+"""
+import os
+import sys
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import psycopg2
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SQL_DIR = Path(__file__).resolve().parent.parent / 'sql'
+
+PARTITIONING_FILE = '32_fact_gsc_daily_partitioning.sql'
+
+# Files defining views over fact_gsc_daily, in application order.
+# 04_ga4_schema.sql is deliberately absent - it recreates fact_ga4_daily.
+VIEW_FILES = [
+    '03_transforms.sql',
+    '05_unified_view.sql',
+    '06_materialized_views.sql',
+]
+
+
+class PartitionMigration:
+    """Migrate gsc.fact_gsc_daily to monthly partitions"""
+
+    def __init__(self, dsn: str, sql_dir: Path = SQL_DIR):
+        """Initialize migration with database connection"""
+        self.sql_dir = sql_dir
+        self.conn = psycopg2.connect(dsn)
+        self.conn.autocommit = False
+
+    def _apply_file(self, cur, filename: str) -> None:
+        """Execute one SQL file inside the current transaction"""
+        path = self.sql_dir / filename
+        logger.info(f"Applying {path}")
+        cur.execute(path.read_text())
+
+    def is_partitioned(self) -> bool:
+        """Check whether fact_gsc_daily is already partitioned"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM pg_partitioned_table pt
+                    JOIN pg_class c ON c.oid = pt.partrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'gsc' AND c.relname = 'fact_gsc_daily'
+                )
+            """)
+            return cur.fetchone()[0]
+
+    def plan(self) -> List[str]:
+        """List the monthly partitions the migration will create"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT to_char(date_trunc('month', date), 'YYYY_MM')
+                FROM gsc.fact_gsc_daily
+                ORDER BY 1
+            """)
+            return [f"fact_gsc_daily_p{row[0]}" for row in cur.fetchall()]
+
+    def migrate(self) -> int:
+        """
+        Run the migration
+
+        Returns:
+            Number of rows copied into the partitioned table
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) FROM gsc.fact_gsc_daily")
+                expected = cur.fetchone()[0]
+                logger.info(f"Source table has {expected:,} rows")
+
+                self._apply_file(cur, PARTITIONING_FILE)
+
+                cur.execute("SELECT gsc.migrate_fact_gsc_daily_to_partitioned()")
+                copied = cur.fetchone()[0]
+                logger.info(f"Copied {copied:,} rows into partitioned table")
+
+                for filename in VIEW_FILES:
+                    self._apply_file(cur, filename)
+
+                cur.execute("SELECT COUNT(*) FROM gsc.fact_gsc_daily")
+                actual = cur.fetchone()[0]
+                if actual != expected:
+                    raise RuntimeError(
+                        f"Row count mismatch after migration: expected {expected}, found {actual}"
+                    )
+
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        # ANALYZE outside the migration transaction so the lock is released first
+        with self.conn.cursor() as cur:
+            cur.execute("ANALYZE gsc.fact_gsc_daily")
+        self.conn.commit()
+        return copied
+
+    def drop_legacy(self) -> bool:
+        """Drop gsc.fact_gsc_daily_legacy once the migration is verified"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('gsc.fact_gsc_daily_legacy') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                logger.info("No legacy table to drop")
+                return False
+            cur.execute("DROP TABLE gsc.fact_gsc_daily_legacy")
+        self.conn.commit()
+        logger.info("Dropped gsc.fact_gsc_daily_legacy")
+        return True
+
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            self.conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main migration routine"""
+    parser = argparse.ArgumentParser(description='Partition gsc.fact_gsc_daily by month')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show the partitions that would be created without migrating')
+    parser.add_argument('--drop-legacy', action='store_true',
+                        help='Drop gsc.fact_gsc_daily_legacy after a successful migration')
+    parser.add_argument('--sql-dir', type=Path, default=SQL_DIR,
+                        help='Directory containing the warehouse SQL files')
+    args = parser.parse_args(argv)
+
+    # Get database connection
+    dsn = os.environ.get('WAREHOUSE_DSN')
+    if not dsn:
+        print("Error: WAREHOUSE_DSN environment variable not set")
+        return 1
+
+    migration = PartitionMigration(dsn, args.sql_dir)
+
+    try:
+        if migration.is_partitioned():
+            logger.info("gsc.fact_gsc_daily is already partitioned")
+            if args.drop_legacy:
+                migration.drop_legacy()
+            return 0
+
+        partitions = migration.plan()
+        logger.info(f"{len(partitions)} monthly partitions needed for existing data")
+        for name in partitions:
+            logger.info(f"  {name}")
+
+        if args.dry_run:
+            logger.info("Dry run - no changes made")
+            return 0
+
+        migration.migrate()
+        if args.drop_legacy:
+            migration.drop_legacy()
+        else:
+            logger.info("Legacy table kept as gsc.fact_gsc_daily_legacy (re-run with --drop-legacy to remove)")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+
+    finally:
+        migration.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,9 @@ Alert Engine - Rule Evaluation and Alert Triggering
 ====================================================
 Phase 1: Threshold-based rules (>, <, =, between operators)
 
+EvaluationPlanner evaluates a batch of rules with one metrics fetch per
+(property, page_path) and a single deduplication query.
+
 Usage:
     from services.alert_engine import AlertRuleEvaluator
 
@@ -12,5 +15,6 @@ Usage:
 """
 
 from services.alert_engine.rule_evaluator import AlertRuleEvaluator
+from services.alert_engine.evaluation_planner import EvaluationPlanner
 
-__all__ = ['AlertRuleEvaluator']
+__all__ = ['AlertRuleEvaluator', 'EvaluationPlanner']
@@ -0,0 +1,572 @@
+"""
+Alert Evaluation Planner - Grouped, Vectorized Rule Evaluation
+==============================================================
+Evaluates a batch of alert rules with one metrics fetch per series.
+
+Rules are grouped by (property, page_path); each group's daily series is
+fetched once over a shared connection, covering the longest lookback any
+of its rules needs. Threshold, anomaly and pattern rules are then evaluated
+as NumPy operations over the series arrays, and the triggered rules are
+checked against notifications.alert_history in a single deduplication query
+before alerts are dispatched.
+
+Results match evaluating each rule on its own with AlertRuleEvaluator:
+- threshold: average of each metric over the last 7 days of rows
+  (fetch_current_metrics)
+- anomaly / pattern: per-day rows over the rule's lookback
+  (fetch_metrics_history)
+
+Usage:
+    from services.alert_engine import AlertRuleEvaluator, EvaluationPlanner
+
+    planner = EvaluationPlanner(AlertRuleEvaluator())
+    summary = planner.run(rules, property='sc-domain:example.com')
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from psycopg2.extras import RealDictCursor
+
+from services.alert_engine.rule_evaluator import AlertRuleEvaluator
+
+logger = logging.getLogger(__name__)
+
+# Metrics summed per day in history rows
+SUMMED_METRICS = ('gsc_clicks', 'gsc_impressions', 'ga4_sessions', 'ga4_page_views')
+
+# Metrics averaged per day in history rows
+AVERAGED_METRICS = ('gsc_ctr', 'gsc_position', 'ga4_bounce_rate')
+
+METRICS = SUMMED_METRICS + AVERAGED_METRICS
+
+# Days averaged for threshold rules (fetch_current_metrics)
+CURRENT_WINDOW_DAYS = 7
+
+# History fetched for anomaly rules
+ANOMALY_LOOKBACK_DAYS = 30
+
+# Minimum points (latest + history) for anomaly detection
+MIN_ANOMALY_POINTS = 3
+
+# Per-metric daily sums and non-null counts, so daily values (SUM or AVG)
+# and the row-level average over any trailing window can be derived from
+# one aggregation
+SERIES_SQL = """
+    SELECT
+        date,
+        CURRENT_DATE - date as age_days,
+        {columns}
+    FROM gsc.vw_unified_page_performance
+    WHERE property = %s
+      {page_filter}
+      AND date >= CURRENT_DATE - %s * INTERVAL '1 day'
+    GROUP BY date
+    ORDER BY date ASC
+""".format(
+    columns=',\n        '.join(
+        f"SUM({m}) as {m}_sum, COUNT({m}) as {m}_count" for m in METRICS
+    ),
+    page_filter='{page_filter}'
+)
+
+# Rules (by position in the arrays) with an unresolved alert inside their
+# own suppression window
+DEDUP_SQL = """
+    SELECT c.ord
+    FROM unnest(%s::uuid[], %s::text[], %s::int[])
+        WITH ORDINALITY AS c(rule_id, property, window_hours, ord)
+    WHERE EXISTS (
+        SELECT 1 FROM notifications.alert_history h
+        WHERE h.rule_id = c.rule_id
+          AND h.triggered_at > NOW() - c.window_hours * INTERVAL '1 hour'
+          AND (c.property IS NULL OR h.property = c.property)
+          AND h.status NOT IN ('resolved', 'false_positive')
+    )
+"""
+
+SeriesKey = Tuple[Optional[str], Optional[str]]
+
+_COMPARISONS = {
+    '>': np.greater,
+    '<': np.less,
+    '=': np.equal,
+    '==': np.equal,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '!=': np.not_equal,
+    '<>': np.not_equal,
+}
+
+_RANGE_OPERATORS = ('between', 'not_between')
+
+
+def rule_lookback_days(rule: Dict) -> int:
+    """Days of history a rule is evaluated over"""
+    rule_type = rule.get('rule_type')
+    if rule_type == 'anomaly':
+        return ANOMALY_LOOKBACK_DAYS
+    if rule_type == 'pattern':
+        duration = rule.get('condition', {}).get('duration', 3)
+        return max(duration + 7, 14)
+    return CURRENT_WINDOW_DAYS
+
+
+class MetricSeries:
+    """
+    Daily metric sums and counts for one (property, page_path)
+
+    Rows are ordered oldest first, so the window for a lookback is a suffix.
+    """
+
+    def __init__(self, dates: List[Any], ages: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+        """
+        Initialize from prepared arrays
+
+        Args:
+            dates: Date of each row
+            ages: Days before today of each row
+            sums: (rows x METRICS) daily sums
+            counts: (rows x METRICS) daily non-null counts
+        """
+        self.dates = dates
+        self.ages = ages
+        self.sums = sums
+        self.counts = counts
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            daily = sums.copy()
+            averaged = slice(len(SUMMED_METRICS), len(METRICS))
+            daily[:, averaged] = sums[:, averaged] / counts[:, averaged]
+        daily[counts == 0] = np.nan
+        self.daily = daily
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> 'MetricSeries':
+        """Build from SERIES_SQL rows"""
+        sums = np.array(
+            [[float(r[f'{m}_sum']) if r[f'{m}_sum'] is not None else 0.0 for m in METRICS] for r in rows],
+            dtype=float
+        ).reshape(len(rows), len(METRICS))
+        counts = np.array(
+            [[r[f'{m}_count'] or 0 for m in METRICS] for r in rows],
+            dtype=float
+        ).reshape(len(rows), len(METRICS))
+        ages = np.array([r['age_days'] for r in rows], dtype=np.int64)
+        return cls([r['date'] for r in rows], ages, sums, counts)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _start(self, lookback_days: int) -> int:
+        """First row inside a lookback (ages decrease along the series)"""
+        return int(np.count_nonzero(self.ages > lookback_days))
+
+    def values(self, metric: str, lookback_days: int) -> np.ndarray:
+        """Non-null daily values of a metric over a lookback, oldest first"""
+        column = self.daily[self._start(lookback_days):, METRICS.index(metric)]
+        return column[~np.isnan(column)]
+
+    def current(self, days: int = CURRENT_WINDOW_DAYS) -> Dict[str, float]:
+        """Average of each metric over the rows of the last `days` days"""
+        start = self._start(days)
+        totals = self.sums[start:].sum(axis=0)
+        counts = self.counts[start:].sum(axis=0)
+        return {m: float(totals[i] / counts[i]) for i, m in enumerate(METRICS) if counts[i] > 0}
+
+    def latest(self, lookback_days: int) -> Dict[str, Any]:
+        """Most recent history row inside a lookback (fetch_metrics_history shape)"""
+        if len(self) <= self._start(lookback_days):
+            return {}
+        row = {'date': self.dates[-1]}
+        for i, metric in enumerate(METRICS):
+            value = self.daily[-1, i]
+            row[metric] = None if np.isnan(value) else float(value)
+        return row
+
+
+def evaluate_threshold_rules(rules: List[Dict], current: Dict[str, float]) -> np.ndarray:
+    """
+    Evaluate threshold rules against the same current metrics
+
+    Args:
+        rules: Threshold rules
+        current: Metric averages (MetricSeries.current)
+
+    Returns:
+        Boolean array, one entry per rule
+    """
+    n = len(rules)
+    values = np.full(n, np.nan)
+    low = np.full(n, np.nan)
+    high = np.full(n, np.nan)
+    operators = np.empty(n, dtype=object)
+
+    for i, rule in enumerate(rules):
+        condition = rule.get('condition') or {}
+        threshold = condition.get('threshold')
+        operator = condition.get('operator', '>')
+        value = current.get(rule.get('metric'))
+        if value is None or threshold is None:
+            continue
+        try:
+            if operator in _RANGE_OPERATORS:
+                if not isinstance(threshold, (list, tuple)) or len(threshold) != 2:
+                    logger.warning(f"'{operator}' operator requires [min, max] threshold")
+                    continue
+                low[i], high[i] = float(threshold[0]), float(threshold[1])
+            elif operator in _COMPARISONS:
+                low[i] = float(threshold)
+            else:
+                logger.warning(f"Unknown operator: {operator}")
+                continue
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error comparing values: {e}")
+            continue
+        values[i] = value
+        operators[i] = operator
+
+    triggered = np.zeros(n, dtype=bool)
+    valid = ~np.isnan(values)
+    for operator in set(operators[valid]):
+        mask = valid & (operators == operator)
+        v, lo, hi = values[mask], low[mask], high[mask]
+        if operator == 'between':
+            triggered[mask] = (lo <= v) & (v <= hi)
+        elif operator == 'not_between':
+            triggered[mask] = (v < lo) | (v > hi)
+        else:
+            triggered[mask] = _COMPARISONS[operator](v, lo)
+    return triggered
+
+
+def evaluate_anomaly_rules(rules: List[Dict], series: MetricSeries) -> np.ndarray:
+    """
+    Evaluate anomaly rules with one Z-score per (metric, lookback)
+
+    The latest value is compared against the mean and population standard
+    deviation of the earlier values, as in AlertRuleEvaluator.evaluate_anomaly_rule.
+
+    Returns:
+        Boolean array, one entry per rule
+    """
+    triggered = np.zeros(len(rules), dtype=bool)
+    for (metric, lookback), indexes in _group_by_metric(rules).items():
+        values = series.values(metric, lookback)
+        if len(values) < MIN_ANOMALY_POINTS:
+            continue
+        history = values[:-1]
+        std = history.std()
+        if std == 0:
+            continue
+        z_score = abs(values[-1] - history.mean()) / std
+
+        thresholds = np.array([
+            AlertRuleEvaluator.Z_THRESHOLDS.get(
+                (rules[i].get('condition') or {}).get('sensitivity', 'medium'), 2.5
+            )
+            for i in indexes
+        ])
+        triggered[indexes] = z_score > thresholds
+
+    return triggered
+
+
+def _trailing_run(steps: np.ndarray) -> int:
+    """Length of the run of True at the end of a boolean array"""
+    breaks = np.flatnonzero(~steps)
+    return len(steps) - 1 - int(breaks[-1]) if len(breaks) else len(steps)
+
+
+def _trend(values: np.ndarray) -> int:
+    """+1 growth, -1 decline, 0 stable (AlertRuleEvaluator._calculate_trend)"""
+    steps = np.diff(values)
+    increases = np.count_nonzero(steps > 0)
+    decreases = np.count_nonzero(steps < 0)
+    if values[-1] > values[0] and increases > decreases:
+        return 1
+    if values[-1] < values[0] and decreases > increases:
+        return -1
+    return 0
+
+
+def evaluate_pattern_rules(rules: List[Dict], series: MetricSeries) -> np.ndarray:
+    """
+    Evaluate pattern rules over shared daily values
+
+    Consecutive decline/growth over `duration` points holds when the series
+    ends in a run of at least duration - 1 falling/rising steps, so one run
+    length per (metric, lookback) answers every duration at once.
+
+    Returns:
+        Boolean array, one entry per rule
+    """
+    triggered = np.zeros(len(rules), dtype=bool)
+
+    for (metric, lookback), indexes in _group_by_metric(rules).items():
+        values = series.values(metric, lookback)
+        steps = np.diff(values)
+        runs = {
+            'consecutive_decline': _trailing_run(steps < 0),
+            'consecutive_growth': _trailing_run(steps > 0),
+        }
+
+        for i in indexes:
+            condition = rules[i].get('condition') or {}
+            pattern = condition.get('pattern')
+            duration = condition.get('duration', 3)
+            if pattern not in AlertRuleEvaluator.PATTERN_TYPES:
+                logger.warning(f"Unsupported pattern type: {pattern}")
+                continue
+            if duration < 2 or len(values) < duration:
+                continue
+
+            if pattern in runs:
+                triggered[i] = runs[pattern] >= duration - 1
+            elif len(values) >= duration + 2:
+                prev_end = len(values) - duration
+                previous = values[max(0, prev_end - duration):prev_end]
+                recent = values[-duration:]
+                if len(previous) >= 2:
+                    prev_trend, recent_trend = _trend(previous), _trend(recent)
+                    triggered[i] = prev_trend != 0 and recent_trend == -prev_trend
+
+    return triggered
+
+
+def _group_by_metric(rules: List[Dict]) -> Dict[Tuple[str, int], List[int]]:
+    """Rule indexes by (metric, lookback), skipping unknown metrics"""
+    groups: Dict[Tuple[str, int], List[int]] = {}
+    for i, rule in enumerate(rules):
+        metric = rule.get('metric')
+        if metric not in METRICS:
+            if not metric:
+                logger.warning(f"Invalid {rule.get('rule_type')} rule: missing metric")
+            continue
+        groups.setdefault((metric, rule_lookback_days(rule)), []).append(i)
+    return groups
+
+
+@dataclass
+class SeriesPlan:
+    """Rules sharing one metrics fetch.
+
+    Attributes:
+        property: Property URL
+        page_path: Page path (None = whole property)
+        lookback_days: Longest lookback among the rules
+        rules: Rules evaluated against the series
+    """
+    property: Optional[str]
+    page_path: Optional[str]
+    lookback_days: int = 0
+    rules: List[Dict] = field(default_factory=list)
+
+
+class EvaluationPlanner:
+    """
+    Groups alert rules by series, evaluates them in bulk and triggers alerts
+
+    Example:
+        planner = EvaluationPlanner()
+        summary = planner.run(rules)
+        # {'rules_evaluated': 40, 'alerts_triggered': 2, 'series_fetched': 3, ...}
+    """
+
+    def __init__(self, evaluator: AlertRuleEvaluator = None):
+        """
+        Initialize planner
+
+        Args:
+            evaluator: Evaluator used for connections and alert dispatch
+        """
+        self.evaluator = evaluator or AlertRuleEvaluator()
+
+    def plan(self, rules: List[Dict], property: str = None) -> List[SeriesPlan]:
+        """
+        Group rules by (property, page_path) with the longest lookback
+
+        Args:
+            rules: Active alert rules
+            property: Property filter and default for rules without one
+
+        Returns:
+            One SeriesPlan per series to fetch
+        """
+        plans: Dict[SeriesKey, SeriesPlan] = {}
+        for rule in rules:
+            rule_property = rule.get('property')
+            if property and rule_property and rule_property != property:
+                continue
+
+            key = (rule_property or property, rule.get('page_path'))
+            series_plan = plans.get(key)
+            if series_plan is None:
+                series_plan = plans[key] = SeriesPlan(*key)
+            series_plan.rules.append(rule)
+            series_plan.lookback_days = max(series_plan.lookback_days, rule_lookback_days(rule))
+
+        return list(plans.values())
+
+    def fetch_series(self, conn, series_plan: SeriesPlan) -> MetricSeries:
+        """
+        Fetch the daily series for a plan
+
+        Args:
+            conn: Shared database connection
+            series_plan: Plan to fetch
+
+        Returns:
+            MetricSeries (empty on error)
+        """
+        params: List[Any] = [series_plan.property]
+        page_filter = ''
+        if series_plan.page_path:
+            page_filter = 'AND page_path = %s'
+            params.append(series_plan.page_path)
+        params.append(series_plan.lookback_days)
+
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(SERIES_SQL.format(page_filter=page_filter), params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return MetricSeries.from_rows(rows or [])
+        except Exception as e:
+            logger.error(f"Error fetching metrics series: {e}")
+            conn.rollback()
+            return MetricSeries.from_rows([])
+
+    def evaluate_plan(self, series_plan: SeriesPlan, series: MetricSeries) -> List[Tuple[Dict, Dict]]:
+        """
+        Evaluate a plan's rules against its series
+
+        Args:
+            series_plan: Rules to evaluate
+            series: Fetched series
+
+        Returns:
+            (rule, metrics) for each triggered rule; metrics is what the
+            alert reports (current averages or the latest history row)
+        """
+        by_type: Dict[str, List[Dict]] = {}
+        for rule in series_plan.rules:
+            by_type.setdefault(rule.get('rule_type'), []).append(rule)
+
+        triggered: List[Tuple[Dict, Dict]] = []
+
+        threshold_rules = by_type.get('threshold', [])
+        if threshold_rules:
+            current = series.current(CURRENT_WINDOW_DAYS)
+            for rule, hit in zip(threshold_rules, evaluate_threshold_rules(threshold_rules, current)):
+                if hit:
+                    triggered.append((rule, current))
+
+        for rule_type, evaluate in (('anomaly', evaluate_anomaly_rules), ('pattern', evaluate_pattern_rules)):
+            type_rules = by_type.get(rule_type, [])
+            if not type_rules:
+                continue
+            for rule, hit in zip(type_rules, evaluate(type_rules, series)):
+                if hit:
+                    triggered.append((rule, series.latest(rule_lookback_days(rule))))
+
+        return triggered
+
+    def find_duplicates(self, conn, candidates: List[Tuple[Dict, str]]) -> List[bool]:
+        """
+        Check triggered rules for recent alerts in one query
+
+        Args:
+            conn: Shared database connection
+            candidates: (rule, property) pairs
+
+        Returns:
+            One flag per candidate, True if an alert is inside its window
+        """
+        if not candidates:
+            return []
+
+        default_minutes = self.evaluator.DEFAULT_DEDUP_WINDOW_HOURS * 60
+        rule_ids = [str(rule.get('rule_id')) for rule, _ in candidates]
+        properties = [prop for _, prop in candidates]
+        windows = [rule.get('suppression_window_minutes', default_minutes) // 60 for rule, _ in candidates]
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(DEDUP_SQL, (rule_ids, properties, windows))
+            duplicates = {row[0] for row in cursor.fetchall()}
+            cursor.close()
+        except Exception as e:
+            logger.error(f"Error checking duplicate alerts: {e}")
+            conn.rollback()
+            return [False] * len(candidates)  # Allow alerts if check fails
+
+        return [i + 1 in duplicates for i in range(len(candidates))]
+
+    def run(self, rules: List[Dict], property: str = None) -> Dict[str, int]:
+        """
+        Evaluate rules and trigger alerts
+
+        Args:
+            rules: Active alert rules
+            property: Property URL (None = all properties)
+
+        Returns:
+            Dict with rules_evaluated, alerts_triggered, series_fetched and
+            duplicates_skipped
+        """
+        plans = self.plan(rules, property)
+        candidates: List[Tuple[Dict, Dict]] = []
+
+        conn = self.evaluator._get_connection()
+        try:
+            for series_plan in plans:
+                series = self.fetch_series(conn, series_plan)
+                for rule, metrics in self.evaluate_plan(series_plan, series):
+                    rule_type = rule.get('rule_type')
+                    alert_data = {
+                        'property': series_plan.property,
+                        'page_path': series_plan.page_path,
+                        'title': f"{rule_type.capitalize()} Alert: {rule.get('rule_name')}",
+                        'message': f"Metric '{rule.get('metric')}' triggered {rule_type} alert",
+                        'metrics': metrics
+                    }
+                    candidates.append((rule, alert_data))
+
+            duplicates = self.find_duplicates(
+                conn, [(rule, alert_data['property']) for rule, alert_data in candidates]
+            )
+        finally:
+            conn.close()
+
+        alerts_triggered = 0
+        for (rule, alert_data), duplicate in zip(candidates, duplicates):
+            if duplicate:
+                logger.info(f"Skipping duplicate alert for rule {rule.get('rule_id')}")
+                continue
+            if self.evaluator.trigger_alert(rule, alert_data, skip_dedup=True):
+                alerts_triggered += 1
+
+        rules_evaluated = sum(len(p.rules) for p in plans)
+        logger.info(
+            f"Evaluated {rules_evaluated} alert rules over {len(plans)} series, "
+            f"triggered {alerts_triggered} alerts"
+        )
+        return {
+            'rules_evaluated': rules_evaluated,
+            'alerts_triggered': alerts_triggered,
+            'series_fetched': len(plans),
+            'duplicates_skipped': sum(duplicates),
+        }
+
+
+__all__ = [
+    'EvaluationPlanner',
+    'MetricSeries',
+    'SeriesPlan',
+    'evaluate_anomaly_rules',
+    'evaluate_pattern_rules',
+    'evaluate_threshold_rules',
+    'rule_lookback_days',
+]
@@ -49,6 +49,13 @@ class AlertRuleEvaluator:
         'high': 0.05     # Most sensitive, more alerts
     }
 
+    # Z-score threshold per sensitivity level
+    Z_THRESHOLDS = {
+        'low': 3.0,      # Only extreme outliers
+        'medium': 2.5,   # Balanced
+        'high': 2.0      # More sensitive
+    }
+
     # Supported pattern types
     PATTERN_TYPES = ['consecutive_decline', 'consecutive_growth', 'trend_reversal']
 
@@ -252,12 +259,7 @@ class AlertRuleEvaluator:
         Returns:
             Z-score threshold
         """
-        thresholds = {
-            'low': 3.0,      # Only extreme outliers
-            'medium': 2.5,   # Balanced
-            'high': 2.0      # More sensitive
-        }
-        return thresholds.get(sensitivity, 2.5)
+        return self.Z_THRESHOLDS.get(sensitivity, 2.5)
 
     def fetch_metrics_history(
         self,
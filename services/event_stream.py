@@ -8,10 +8,18 @@ Enables real-time event-driven architecture:
 - Decoupled services
 
 Uses Redis Streams (lighter than Kafka, perfect for this scale)
+
+EventConsumer.run_pipelined() is the high-throughput consumer mode: it keeps
+XREADGROUP reads in flight while a bounded pool of workers runs
+process_event, acknowledges successes in batches, and reclaims entries left
+pending by crashed consumers with XAUTOCLAIM.
 """
+import asyncio
 import json
 import logging
 import os
+import time
+from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -19,6 +27,14 @@ import redis
 
 logger = logging.getLogger(__name__)
 
+# Pipelined consumer defaults
+DEFAULT_WORKERS = 8
+DEFAULT_READ_COUNT = 100
+DEFAULT_ACK_INTERVAL = 0.2
+
+# Pending entries idle longer than this are reclaimed from other consumers
+DEFAULT_CLAIM_IDLE_MS = 60000
+
 
 class EventStream:
     """
@@ -48,6 +64,9 @@ class EventStream:
             decode_responses=True  # Auto-decode to strings
         )
 
+        # Consumer groups already created by this instance
+        self._groups = set()
+
         logger.info(f"EventStream connected to {self.redis_url}")
 
     def publish_event(
@@ -239,17 +258,7 @@ class EventStream:
             List of events
         """
         try:
-            # Create consumer group if not exists
-            try:
-                self.redis.xgroup_create(
-                    stream,
-                    consumer_group,
-                    id='0',
-                    mkstream=True
-                )
-            except redis.ResponseError as e:
-                # Group already exists
-                pass
+            self.ensure_group(stream, consumer_group)
 
             # Read events
             events = self.redis.xreadgroup(
@@ -264,15 +273,7 @@ class EventStream:
 
             for stream_name, messages in events:
                 for message_id, message_data in messages:
-                    # Parse event
-                    event = {
-                        'event_id': message_id,
-                        'stream': stream_name,
-                        'event_type': message_data.get('event_type'),
-                        'timestamp': message_data.get('timestamp'),
-                        'data': json.loads(message_data.get('data', '{}'))
-                    }
-                    parsed_events.append(event)
+                    parsed_events.append(self._parse_event(stream_name, message_id, message_data))
 
                     # Acknowledge event
                     self.redis.xack(stream, consumer_group, message_id)
@@ -283,6 +284,145 @@ class EventStream:
             logger.error(f"Error consuming events: {e}")
             return []
 
+    def ensure_group(self, stream: str, consumer_group: str):
+        """
+        Create a consumer group (and the stream) once per EventStream instance
+
+        Args:
+            stream: Stream name
+            consumer_group: Consumer group name
+        """
+        if (stream, consumer_group) in self._groups:
+            return
+
+        try:
+            self.redis.xgroup_create(
+                stream,
+                consumer_group,
+                id='0',
+                mkstream=True
+            )
+        except redis.ResponseError:
+            # Group already exists
+            pass
+
+        self._groups.add((stream, consumer_group))
+
+    @staticmethod
+    def _parse_event(stream_name: str, message_id: str, message_data: Dict) -> Dict:
+        """Convert a raw stream entry to an event dict"""
+        return {
+            'event_id': message_id,
+            'stream': stream_name,
+            'event_type': message_data.get('event_type'),
+            'timestamp': message_data.get('timestamp'),
+            'data': json.loads(message_data.get('data', '{}'))
+        }
+
+    def read_events(
+        self,
+        streams: List[str],
+        consumer_group: str,
+        consumer_name: str,
+        count: int = DEFAULT_READ_COUNT,
+        block: int = 1000
+    ) -> List[Dict]:
+        """
+        Read new events from several streams in one XREADGROUP without acknowledging them
+
+        Events stay pending until ack_events() is called, so a consumer that
+        dies mid-batch leaves them to be reclaimed by claim_stale_events().
+
+        Args:
+            streams: Stream names
+            consumer_group: Consumer group name
+            consumer_name: Consumer name
+            count: Max events to read per stream
+            block: Block time in milliseconds
+
+        Returns:
+            List of events
+        """
+        for stream in streams:
+            self.ensure_group(stream, consumer_group)
+
+        response = self.redis.xreadgroup(
+            consumer_group,
+            consumer_name,
+            {stream: '>' for stream in streams},
+            count=count,
+            block=block
+        )
+
+        return [
+            self._parse_event(stream_name, message_id, message_data)
+            for stream_name, messages in response or []
+            for message_id, message_data in messages
+        ]
+
+    def ack_events(self, stream: str, consumer_group: str, event_ids: List[str]) -> int:
+        """
+        Acknowledge a batch of events with a single XACK
+
+        Args:
+            stream: Stream name
+            consumer_group: Consumer group name
+            event_ids: Event IDs to acknowledge
+
+        Returns:
+            Number of events acknowledged
+        """
+        if not event_ids:
+            return 0
+        return self.redis.xack(stream, consumer_group, *event_ids)
+
+    def claim_stale_events(
+        self,
+        stream: str,
+        consumer_group: str,
+        consumer_name: str,
+        min_idle_ms: int = DEFAULT_CLAIM_IDLE_MS,
+        count: int = DEFAULT_READ_COUNT
+    ) -> List[Dict]:
+        """
+        Claim events left pending by other consumers for at least min_idle_ms
+
+        Walks the pending entries list with XAUTOCLAIM until it has `count`
+        events or reaches the end.
+
+        Args:
+            stream: Stream name
+            consumer_group: Consumer group name
+            consumer_name: Consumer taking ownership
+            min_idle_ms: Minimum idle time in milliseconds
+            count: Max events to claim
+
+        Returns:
+            List of claimed events
+        """
+        self.ensure_group(stream, consumer_group)
+
+        claimed = []
+        start_id = '0-0'
+        while len(claimed) < count:
+            response = self.redis.xautoclaim(
+                stream,
+                consumer_group,
+                consumer_name,
+                min_idle_time=min_idle_ms,
+                start_id=start_id,
+                count=count - len(claimed)
+            )
+            start_id, messages = response[0], response[1]
+            for message_id, message_data in messages:
+                # Entries trimmed from the stream come back without data
+                if message_data:
+                    claimed.append(self._parse_event(stream, message_id, message_data))
+            if start_id in ('0-0', b'0-0'):
+                break
+
+        return claimed
+
     def get_stream_length(self, stream: str) -> int:
         """Get number of events in stream"""
         try:
@@ -424,9 +564,127 @@ class EventConsumer:
 
             # Small delay to avoid tight loop
             if not events:
-                import asyncio
                 await asyncio.sleep(0.1)
 
+    async def run_pipelined(
+        self,
+        streams: List[str],
+        stop_after: int = None,
+        workers: int = DEFAULT_WORKERS,
+        read_count: int = DEFAULT_READ_COUNT,
+        block: int = 1000,
+        ack_interval: float = DEFAULT_ACK_INTERVAL,
+        claim_idle_ms: int = DEFAULT_CLAIM_IDLE_MS
+    ) -> int:
+        """
+        Run the high-throughput consumer loop
+
+        A reader keeps the next XREADGROUP in flight while up to `workers`
+        process_event calls run concurrently. Successfully processed events are
+        acknowledged in batches every `ack_interval` seconds; failed events are
+        left pending and are reclaimed (by this or another consumer) once idle
+        for `claim_idle_ms`.
+
+        Args:
+            streams: List of streams to consume from
+            stop_after: Stop after processing N events (None = run forever)
+            workers: Number of concurrent process_event calls
+            read_count: Max events per stream per XREADGROUP
+            block: XREADGROUP block time in milliseconds
+            ack_interval: Seconds between batched XACKs
+            claim_idle_ms: Idle time before pending entries are reclaimed
+                (0 disables reclaiming)
+
+        Returns:
+            Number of events processed successfully
+        """
+        # Bounded so the reader stops fetching when workers fall behind
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(workers, read_count) * 2)
+        to_ack: Dict[str, List[str]] = defaultdict(list)
+        done = asyncio.Event()
+        processed = 0
+
+        logger.info(f"Starting pipelined consumer for streams: {streams} ({workers} workers)")
+
+        async def flush_acks():
+            pending = dict(to_ack)
+            to_ack.clear()
+            for stream_name, event_ids in pending.items():
+                try:
+                    await asyncio.to_thread(
+                        self.stream.ack_events, stream_name, self.consumer_group, event_ids
+                    )
+                except Exception as e:
+                    logger.error(f"Error acknowledging {len(event_ids)} events on {stream_name}: {e}")
+
+        async def reader():
+            last_claim = 0.0
+            while not done.is_set():
+                try:
+                    if claim_idle_ms and time.monotonic() - last_claim >= claim_idle_ms / 1000:
+                        last_claim = time.monotonic()
+                        for stream_name in streams:
+                            claimed = await asyncio.to_thread(
+                                self.stream.claim_stale_events,
+                                stream_name, self.consumer_group, self.consumer_name,
+                                claim_idle_ms, read_count
+                            )
+                            if claimed:
+                                logger.info(f"Reclaimed {len(claimed)} stale events from {stream_name}")
+                            for event in claimed:
+                                await queue.put(event)
+
+                    events = await asyncio.to_thread(
+                        self.stream.read_events,
+                        streams, self.consumer_group, self.consumer_name, read_count, block
+                    )
+                except Exception as e:
+                    logger.error(f"Error reading events: {e}")
+                    await asyncio.sleep(1.0)
+                    continue
+
+                for event in events:
+                    await queue.put(event)
+
+        async def worker():
+            nonlocal processed
+            while True:
+                event = await queue.get()
+                try:
+                    success = await self.process_event(event)
+                except Exception as e:
+                    logger.error(f"Error processing event {event['event_id']}: {e}")
+                    success = False
+
+                if success:
+                    to_ack[event['stream']].append(event['event_id'])
+                    processed += 1
+                    if stop_after and processed >= stop_after:
+                        done.set()
+                else:
+                    logger.warning(f"Failed to process event {event['event_id']}, leaving it pending")
+                queue.task_done()
+
+        async def acker():
+            while not done.is_set():
+                await asyncio.sleep(ack_interval)
+                await flush_acks()
+
+        tasks = [asyncio.create_task(reader()), asyncio.create_task(acker())]
+        tasks += [asyncio.create_task(worker()) for _ in range(workers)]
+
+        try:
+            await done.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Events still queued stay pending and will be reclaimed later
+            await flush_acks()
+
+        logger.info(f"Processed {processed} events, stopping")
+        return processed
+
 
 # Example consumer implementations
 class AnomalyAlertConsumer(EventConsumer):
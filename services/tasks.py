@@ -62,19 +62,45 @@ logger = logging.getLogger(__name__)
 # =============================================
 
 @celery_app.task(name='generate_embeddings', bind=True, max_retries=3)
-def generate_embeddings_task(self, property: str, page_paths: List[str] = None):
+def generate_embeddings_task(
+    self,
+    property: str,
+    page_paths: List[str] = None,
+    throughput: bool = False,
+    force: bool = False
+):
     """
     Generate embeddings for pages
 
+    Pages whose text already has an embedding from the current model are
+    skipped. Throughput mode encodes in larger batches and writes larger
+    chunks, for re-embedding whole properties (e.g. after a model change).
+
     Args:
         property: Property URL
         page_paths: Optional list of specific pages (None = all pages)
+        throughput: Use large encode batches and write chunks
+        force: Re-embed pages even if their stored embedding is up to date
     """
     try:
-        from insights_core.embeddings import EmbeddingGenerator
+        from insights_core.embeddings import (
+            EmbeddingGenerator,
+            ENCODE_BATCH_SIZE,
+            PAGE_CHUNK_SIZE,
+            THROUGHPUT_ENCODE_BATCH_SIZE,
+            THROUGHPUT_PAGE_CHUNK_SIZE,
+        )
 
         generator = EmbeddingGenerator()
-        result = generator.generate_for_property(property, page_paths)
+        result = generator.generate_for_property(
+            property,
+            page_paths,
+            batch_size=THROUGHPUT_ENCODE_BATCH_SIZE if throughput else ENCODE_BATCH_SIZE,
+            chunk_size=THROUGHPUT_PAGE_CHUNK_SIZE if throughput else PAGE_CHUNK_SIZE,
+            force=force
+        )
+        if 'error' in result:
+            raise RuntimeError(result['error'])
 
         logger.info(f"Generated {result['embeddings_created']} embeddings for {property}")
         return result
@@ -812,90 +838,24 @@ def evaluate_alert_rules_task(self, property: str = None):
     """
     try:
         from notifications.alert_manager import AlertManager
-        from services.alert_engine import AlertRuleEvaluator
+        from services.alert_engine import AlertRuleEvaluator, EvaluationPlanner
 
         manager = AlertManager()
-        evaluator = AlertRuleEvaluator()
+        planner = EvaluationPlanner(AlertRuleEvaluator())
         import asyncio
 
         # Get active rules
         rules = asyncio.run(manager.get_alert_rules(is_active=True))
 
-        alerts_triggered = 0
-        rules_evaluated = 0
-
-        for rule in rules:
-            rule_property = rule.get('property')
-
-            # Skip if property filter doesn't match
-            if property and rule_property and rule_property != property:
-                continue
-
-            # Evaluate rule based on type
-            rule_type = rule['rule_type']
-            rules_evaluated += 1
-
-            eval_property = rule_property or property
-            triggered = False
-            current_metrics = {}
-
-            if rule_type == 'threshold':
-                # Fetch current metrics for evaluation
-                current_metrics = evaluator.fetch_current_metrics(
-                    property=eval_property,
-                    page_path=rule.get('page_path')
-                )
-
-                # Evaluate the threshold rule
-                triggered = evaluator.evaluate_threshold_rule(rule, current_metrics)
-
-            elif rule_type == 'anomaly':
-                # Phase 2: Anomaly-based rules
-                # Fetch historical metrics for anomaly detection
-                metrics_history = evaluator.fetch_metrics_history(
-                    property=eval_property,
-                    page_path=rule.get('page_path'),
-                    lookback_days=30
-                )
-
-                # Evaluate the anomaly rule
-                triggered = evaluator.evaluate_anomaly_rule(rule, metrics_history)
-
-                # Get current metrics for alert data
-                if triggered and metrics_history:
-                    current_metrics = metrics_history[-1] if metrics_history else {}
-
-            elif rule_type == 'pattern':
-                # Phase 3: Pattern-based rules
-                # Fetch historical metrics for pattern detection
-                duration = rule.get('condition', {}).get('duration', 3)
-                metrics_history = evaluator.fetch_metrics_history(
-                    property=eval_property,
-                    page_path=rule.get('page_path'),
-                    lookback_days=max(duration + 7, 14)  # Enough history for pattern detection
-                )
-
-                # Evaluate the pattern rule
-                triggered = evaluator.evaluate_pattern_rule(rule, metrics_history)
-
-                # Get current metrics for alert data
-                if triggered and metrics_history:
-                    current_metrics = metrics_history[-1] if metrics_history else {}
-
-            if triggered:
-                alert_data = {
-                    'property': eval_property,
-                    'page_path': rule.get('page_path'),
-                    'title': f"{rule_type.capitalize()} Alert: {rule.get('rule_name')}",
-                    'message': f"Metric '{rule.get('metric')}' triggered {rule_type} alert",
-                    'metrics': current_metrics
-                }
-                alert_id = evaluator.trigger_alert(rule, alert_data)
-                if alert_id:
-                    alerts_triggered += 1
-
-        logger.info(f"Evaluated {rules_evaluated} alert rules, triggered {alerts_triggered} alerts")
-        return {'rules_evaluated': rules_evaluated, 'alerts_triggered': alerts_triggered}
+        # Rules sharing a property/page are evaluated against one fetch of
+        # their series; triggered rules are deduplicated in one query
+        summary = planner.run(rules, property=property)
+
+        logger.info(
+            f"Evaluated {summary['rules_evaluated']} alert rules, "
+            f"triggered {summary['alerts_triggered']} alerts"
+        )
+        return summary
 
     except Exception as e:
         logger.error(f"Error evaluating alert rules: {e}")
@@ -1,279 +1,677 @@
--- Materialized Views for Unified Page Performance
--- Pre-calculated aggregations for fast query performance
+-- Incremental Rollups for Unified Page Performance
+-- Pre-calculated daily / weekly / monthly aggregations for fast query performance
+--
+-- The rollups are plain tables keyed by (property, page_path, date|week|month)
+-- rather than materialized views, so a refresh only recomputes the dates whose
+-- fact rows changed since the previous refresh (fact updated_at), plus the
+-- trailing 28 days that their WoW/MoM columns feed into. Refresh cost scales
+-- with new data instead of total history.
+--
+-- The tables keep the mv_* names of the materialized views they replace, so
+-- existing readers are unchanged.
+--
+-- Time-series columns use calendar offsets: *_7d_ago / *_28d_ago are the
+-- values exactly 7 / 28 days earlier (NULL when the page had no row that day)
+-- and the rolling averages cover the trailing 7 / 28 calendar days.
 
 SET search_path TO gsc, public;
 
--- Drop existing materialized views if exist
-DROP MATERIALIZED VIEW IF EXISTS gsc.mv_unified_page_performance CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS gsc.mv_unified_page_performance_weekly CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS gsc.mv_unified_page_performance_monthly CASCADE;
+-- Drop the pre-rollup materialized views (replaced by the tables below)
+DO $$
+DECLARE
+    v_view TEXT;
+BEGIN
+    FOREACH v_view IN ARRAY ARRAY[
+        'mv_unified_page_performance_monthly',
+        'mv_unified_page_performance_weekly',
+        'mv_unified_page_performance'
+    ]
+    LOOP
+        IF EXISTS (SELECT 1 FROM pg_matviews WHERE schemaname = 'gsc' AND matviewname = v_view) THEN
+            EXECUTE format('DROP MATERIALIZED VIEW gsc.%I CASCADE', v_view);
+        END IF;
+    END LOOP;
+END $$;
+
+-- =============================================
+-- Refresh State
+-- =============================================
+
+-- One row per rollup family: fact rows updated at or after changes_since
+-- have not been folded into the rollups yet
+CREATE TABLE IF NOT EXISTS gsc.unified_rollup_state (
+    rollup_name VARCHAR(100) PRIMARY KEY,
+    changes_since TIMESTAMP,
+    last_from_date DATE,
+    last_to_date DATE,
+    rows_written BIGINT DEFAULT 0,
+    last_run_status VARCHAR(20) DEFAULT 'pending',
+    last_refreshed_at TIMESTAMP
+);
+
+-- Change detection: BRIN stays tiny because updated_at follows insertion order
+CREATE INDEX IF NOT EXISTS idx_fact_gsc_updated_at ON gsc.fact_gsc_daily USING BRIN (updated_at);
+CREATE INDEX IF NOT EXISTS idx_fact_ga4_updated_at ON gsc.fact_ga4_daily USING BRIN (updated_at);
 
 -- =============================================
--- Daily Materialized View
+-- Daily Rollup
 -- =============================================
 
-CREATE MATERIALIZED VIEW gsc.mv_unified_page_performance AS
-SELECT 
-    date,
-    property,
-    page_path,
+CREATE TABLE IF NOT EXISTS gsc.mv_unified_page_performance (
+    date DATE NOT NULL,
+    property VARCHAR(500) NOT NULL,
+    page_path TEXT NOT NULL,
     -- Current metrics
-    clicks,
-    impressions,
-    ctr,
-    avg_position,
-    sessions,
-    engagement_rate,
-    bounce_rate,
-    conversions,
-    avg_session_duration,
-    page_views,
+    clicks BIGINT,
+    impressions BIGINT,
+    ctr NUMERIC,
+    avg_position NUMERIC,
+    sessions INTEGER,
+    engagement_rate NUMERIC,
+    bounce_rate NUMERIC,
+    conversions INTEGER,
+    avg_session_duration NUMERIC,
+    page_views INTEGER,
     -- Historical values
-    gsc_clicks_7d_ago,
-    gsc_impressions_7d_ago,
-    gsc_position_7d_ago,
-    ga_conversions_7d_ago,
-    ga_engagement_rate_7d_ago,
-    gsc_clicks_28d_ago,
-    gsc_impressions_28d_ago,
-    ga_conversions_28d_ago,
+    gsc_clicks_7d_ago BIGINT,
+    gsc_impressions_7d_ago BIGINT,
+    gsc_position_7d_ago NUMERIC,
+    ga_conversions_7d_ago INTEGER,
+    ga_engagement_rate_7d_ago NUMERIC,
+    gsc_clicks_28d_ago BIGINT,
+    gsc_impressions_28d_ago BIGINT,
+    ga_conversions_28d_ago INTEGER,
     -- Rolling averages
-    gsc_clicks_7d_avg,
-    gsc_impressions_7d_avg,
-    ga_conversions_7d_avg,
-    gsc_clicks_28d_avg,
-    gsc_impressions_28d_avg,
-    ga_conversions_28d_avg,
-    -- WoW changes (NEW)
-    gsc_clicks_change_wow,
-    gsc_impressions_change_wow,
-    gsc_position_change_wow,
-    ga_conversions_change_wow,
-    ga_engagement_rate_change_wow,
-    -- MoM changes (NEW)
-    gsc_clicks_change_mom,
-    gsc_impressions_change_mom,
-    ga_conversions_change_mom,
+    gsc_clicks_7d_avg NUMERIC,
+    gsc_impressions_7d_avg NUMERIC,
+    ga_conversions_7d_avg NUMERIC,
+    gsc_clicks_28d_avg NUMERIC,
+    gsc_impressions_28d_avg NUMERIC,
+    ga_conversions_28d_avg NUMERIC,
+    -- WoW changes
+    gsc_clicks_change_wow NUMERIC,
+    gsc_impressions_change_wow NUMERIC,
+    gsc_position_change_wow NUMERIC,
+    ga_conversions_change_wow NUMERIC,
+    ga_engagement_rate_change_wow NUMERIC,
+    -- MoM changes
+    gsc_clicks_change_mom NUMERIC,
+    gsc_impressions_change_mom NUMERIC,
+    ga_conversions_change_mom NUMERIC,
     -- Composite metrics
-    search_to_conversion_rate,
-    session_conversion_rate,
-    performance_score,
-    opportunity_index,
-    conversion_efficiency,
-    quality_score,
+    search_to_conversion_rate NUMERIC,
+    session_conversion_rate NUMERIC,
+    performance_score NUMERIC,
+    opportunity_index NUMERIC,
+    conversion_efficiency NUMERIC,
+    quality_score NUMERIC,
     -- Metadata
-    CURRENT_TIMESTAMP as last_refreshed
-FROM gsc.vw_unified_page_performance;
+    last_refreshed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (property, page_path, date)
+);
 
--- Create indexes on materialized view
-CREATE INDEX idx_mv_unified_date ON gsc.mv_unified_page_performance(date DESC);
-CREATE INDEX idx_mv_unified_property ON gsc.mv_unified_page_performance(property);
-CREATE INDEX idx_mv_unified_page_path ON gsc.mv_unified_page_performance(page_path);
-CREATE INDEX idx_mv_unified_date_property ON gsc.mv_unified_page_performance(date DESC, property);
-CREATE INDEX idx_mv_unified_performance_score ON gsc.mv_unified_page_performance(performance_score DESC);
-CREATE INDEX idx_mv_unified_opportunity ON gsc.mv_unified_page_performance(opportunity_index DESC) WHERE opportunity_index > 0;
+-- Create indexes on daily rollup
+CREATE INDEX IF NOT EXISTS idx_mv_unified_date ON gsc.mv_unified_page_performance(date DESC);
+CREATE INDEX IF NOT EXISTS idx_mv_unified_page_path ON gsc.mv_unified_page_performance(page_path);
+CREATE INDEX IF NOT EXISTS idx_mv_unified_date_property ON gsc.mv_unified_page_performance(date DESC, property);
+CREATE INDEX IF NOT EXISTS idx_mv_unified_performance_score ON gsc.mv_unified_page_performance(performance_score DESC);
+CREATE INDEX IF NOT EXISTS idx_mv_unified_opportunity ON gsc.mv_unified_page_performance(opportunity_index DESC) WHERE opportunity_index > 0;
 
 -- Index on WoW changes for fast anomaly queries
-CREATE INDEX idx_mv_unified_wow_clicks ON gsc.mv_unified_page_performance(gsc_clicks_change_wow) 
+CREATE INDEX IF NOT EXISTS idx_mv_unified_wow_clicks ON gsc.mv_unified_page_performance(gsc_clicks_change_wow)
     WHERE gsc_clicks_change_wow IS NOT NULL;
-CREATE INDEX idx_mv_unified_wow_conversions ON gsc.mv_unified_page_performance(ga_conversions_change_wow) 
+CREATE INDEX IF NOT EXISTS idx_mv_unified_wow_conversions ON gsc.mv_unified_page_performance(ga_conversions_change_wow)
     WHERE ga_conversions_change_wow IS NOT NULL;
 
 -- =============================================
--- Weekly Aggregated Materialized View
+-- Weekly Rollup
 -- =============================================
 
-CREATE MATERIALIZED VIEW gsc.mv_unified_page_performance_weekly AS
-SELECT 
-    DATE_TRUNC('week', date)::DATE as week_start,
-    property,
-    page_path,
+CREATE TABLE IF NOT EXISTS gsc.mv_unified_page_performance_weekly (
+    week_start DATE NOT NULL,
+    property VARCHAR(500) NOT NULL,
+    page_path TEXT NOT NULL,
     -- Aggregated GSC metrics
-    SUM(clicks) as total_clicks,
-    SUM(impressions) as total_impressions,
-    ROUND(AVG(ctr), 2) as avg_ctr,
-    ROUND(AVG(avg_position), 2) as avg_position,
+    total_clicks BIGINT,
+    total_impressions BIGINT,
+    avg_ctr NUMERIC,
+    avg_position NUMERIC,
     -- Aggregated GA4 metrics
-    SUM(sessions) as total_sessions,
-    ROUND(AVG(engagement_rate), 4) as avg_engagement_rate,
-    ROUND(AVG(bounce_rate), 4) as avg_bounce_rate,
-    SUM(conversions) as total_conversions,
-    ROUND(AVG(avg_session_duration), 2) as avg_session_duration,
-    SUM(page_views) as total_page_views,
+    total_sessions BIGINT,
+    avg_engagement_rate NUMERIC,
+    avg_bounce_rate NUMERIC,
+    total_conversions BIGINT,
+    avg_session_duration NUMERIC,
+    total_page_views BIGINT,
     -- Calculated weekly metrics
-    CASE 
-        WHEN SUM(clicks) > 0 THEN 
-            ROUND((SUM(conversions)::NUMERIC / SUM(clicks)) * 100, 2)
-        ELSE 0 
-    END as weekly_search_to_conversion_rate,
-    ROUND(AVG(performance_score), 4) as avg_performance_score,
-    ROUND(AVG(opportunity_index), 2) as avg_opportunity_index,
-    COUNT(*) as days_in_week,
-    CURRENT_TIMESTAMP as last_refreshed
-FROM gsc.mv_unified_page_performance
-GROUP BY DATE_TRUNC('week', date), property, page_path;
-
--- Create indexes on weekly materialized view
-CREATE INDEX idx_mv_unified_weekly_week ON gsc.mv_unified_page_performance_weekly(week_start DESC);
-CREATE INDEX idx_mv_unified_weekly_property ON gsc.mv_unified_page_performance_weekly(property);
-CREATE INDEX idx_mv_unified_weekly_page_path ON gsc.mv_unified_page_performance_weekly(page_path);
+    weekly_search_to_conversion_rate NUMERIC,
+    avg_performance_score NUMERIC,
+    avg_opportunity_index NUMERIC,
+    days_in_week INTEGER,
+    last_refreshed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (property, page_path, week_start)
+);
+
+-- Create indexes on weekly rollup
+CREATE INDEX IF NOT EXISTS idx_mv_unified_weekly_week ON gsc.mv_unified_page_performance_weekly(week_start DESC);
+CREATE INDEX IF NOT EXISTS idx_mv_unified_weekly_page_path ON gsc.mv_unified_page_performance_weekly(page_path);
 
 -- =============================================
--- Monthly Aggregated Materialized View
+-- Monthly Rollup
 -- =============================================
 
-CREATE MATERIALIZED VIEW gsc.mv_unified_page_performance_monthly AS
-SELECT 
-    DATE_TRUNC('month', date)::DATE as month_start,
-    property,
-    page_path,
+CREATE TABLE IF NOT EXISTS gsc.mv_unified_page_performance_monthly (
+    month_start DATE NOT NULL,
+    property VARCHAR(500) NOT NULL,
+    page_path TEXT NOT NULL,
     -- Aggregated GSC metrics
-    SUM(clicks) as total_clicks,
-    SUM(impressions) as total_impressions,
-    ROUND(AVG(ctr), 2) as avg_ctr,
-    ROUND(AVG(avg_position), 2) as avg_position,
+    total_clicks BIGINT,
+    total_impressions BIGINT,
+    avg_ctr NUMERIC,
+    avg_position NUMERIC,
     -- Aggregated GA4 metrics
-    SUM(sessions) as total_sessions,
-    ROUND(AVG(engagement_rate), 4) as avg_engagement_rate,
-    ROUND(AVG(bounce_rate), 4) as avg_bounce_rate,
-    SUM(conversions) as total_conversions,
-    ROUND(AVG(avg_session_duration), 2) as avg_session_duration,
-    SUM(page_views) as total_page_views,
+    total_sessions BIGINT,
+    avg_engagement_rate NUMERIC,
+    avg_bounce_rate NUMERIC,
+    total_conversions BIGINT,
+    avg_session_duration NUMERIC,
+    total_page_views BIGINT,
     -- Calculated monthly metrics
-    CASE 
-        WHEN SUM(clicks) > 0 THEN 
-            ROUND((SUM(conversions)::NUMERIC / SUM(clicks)) * 100, 2)
-        ELSE 0 
-    END as monthly_search_to_conversion_rate,
-    ROUND(AVG(performance_score), 4) as avg_performance_score,
-    ROUND(AVG(opportunity_index), 2) as avg_opportunity_index,
-    COUNT(*) as days_in_month,
-    CURRENT_TIMESTAMP as last_refreshed
-FROM gsc.mv_unified_page_performance
-GROUP BY DATE_TRUNC('month', date), property, page_path;
-
--- Create indexes on monthly materialized view
-CREATE INDEX idx_mv_unified_monthly_month ON gsc.mv_unified_page_performance_monthly(month_start DESC);
-CREATE INDEX idx_mv_unified_monthly_property ON gsc.mv_unified_page_performance_monthly(property);
-CREATE INDEX idx_mv_unified_monthly_page_path ON gsc.mv_unified_page_performance_monthly(page_path);
+    monthly_search_to_conversion_rate NUMERIC,
+    avg_performance_score NUMERIC,
+    avg_opportunity_index NUMERIC,
+    days_in_month INTEGER,
+    last_refreshed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (property, page_path, month_start)
+);
+
+-- Create indexes on monthly rollup
+CREATE INDEX IF NOT EXISTS idx_mv_unified_monthly_month ON gsc.mv_unified_page_performance_monthly(month_start DESC);
+CREATE INDEX IF NOT EXISTS idx_mv_unified_monthly_page_path ON gsc.mv_unified_page_performance_monthly(page_path);
+
+-- =============================================
+-- Rollup Recompute Functions
+-- =============================================
+
+-- Recompute daily rollup rows for [p_from, p_to].
+-- Reads fact rows from p_from - 28 so the lookback columns are complete.
+CREATE OR REPLACE FUNCTION gsc.refresh_unified_rollup_daily(p_from DATE, p_to DATE)
+RETURNS BIGINT AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    DELETE FROM gsc.mv_unified_page_performance
+    WHERE date BETWEEN p_from AND p_to;
+
+    INSERT INTO gsc.mv_unified_page_performance
+    WITH
+    gsc_aggregated AS (
+        SELECT
+            date,
+            property,
+            REGEXP_REPLACE(url, '^https?://[^/]+', '') as page_path,
+            SUM(clicks) as clicks,
+            SUM(impressions) as impressions,
+            CASE
+                WHEN SUM(impressions) > 0 THEN
+                    ROUND((SUM(clicks)::NUMERIC / SUM(impressions)) * 100, 2)
+                ELSE 0
+            END as ctr,
+            ROUND(AVG(position), 2) as avg_position
+        FROM gsc.fact_gsc_daily
+        WHERE date BETWEEN p_from - 28 AND p_to
+        GROUP BY date, property, REGEXP_REPLACE(url, '^https?://[^/]+', '')
+    ),
+    ga4_window AS (
+        SELECT *
+        FROM gsc.fact_ga4_daily
+        WHERE date BETWEEN p_from - 28 AND p_to
+    ),
+    unified_base AS (
+        SELECT
+            COALESCE(g.date, ga.date) as date,
+            COALESCE(g.property, ga.property) as property,
+            COALESCE(g.page_path, ga.page_path) as page_path,
+            COALESCE(g.clicks, 0) as gsc_clicks,
+            COALESCE(g.impressions, 0) as gsc_impressions,
+            COALESCE(g.ctr, 0) as gsc_ctr,
+            COALESCE(g.avg_position, 0) as gsc_position,
+            COALESCE(ga.sessions, 0) as ga_sessions,
+            COALESCE(ga.engagement_rate, 0) as ga_engagement_rate,
+            COALESCE(ga.bounce_rate, 0) as ga_bounce_rate,
+            COALESCE(ga.conversions, 0) as ga_conversions,
+            COALESCE(ga.avg_session_duration, 0) as ga_avg_session_duration,
+            COALESCE(ga.page_views, 0) as ga_page_views
+        FROM gsc_aggregated g
+        FULL OUTER JOIN ga4_window ga
+            ON g.date = ga.date
+            AND g.property = ga.property
+            AND g.page_path = ga.page_path
+        WHERE COALESCE(g.property, ga.property) IS NOT NULL
+            AND COALESCE(g.page_path, ga.page_path) IS NOT NULL
+    ),
+    time_series_calcs AS (
+        SELECT
+            b.*,
+            w.gsc_clicks as gsc_clicks_7d_ago,
+            w.gsc_impressions as gsc_impressions_7d_ago,
+            w.gsc_position as gsc_position_7d_ago,
+            w.ga_conversions as ga_conversions_7d_ago,
+            w.ga_engagement_rate as ga_engagement_rate_7d_ago,
+            m.gsc_clicks as gsc_clicks_28d_ago,
+            m.gsc_impressions as gsc_impressions_28d_ago,
+            m.ga_conversions as ga_conversions_28d_ago,
+            AVG(b.gsc_clicks) OVER w_page_7d as gsc_clicks_7d_avg,
+            AVG(b.gsc_impressions) OVER w_page_7d as gsc_impressions_7d_avg,
+            AVG(b.ga_conversions) OVER w_page_7d as ga_conversions_7d_avg,
+            AVG(b.gsc_clicks) OVER w_page_28d as gsc_clicks_28d_avg,
+            AVG(b.gsc_impressions) OVER w_page_28d as gsc_impressions_28d_avg,
+            AVG(b.ga_conversions) OVER w_page_28d as ga_conversions_28d_avg
+        FROM unified_base b
+        LEFT JOIN unified_base w
+            ON w.property = b.property AND w.page_path = b.page_path AND w.date = b.date - 7
+        LEFT JOIN unified_base m
+            ON m.property = b.property AND m.page_path = b.page_path AND m.date = b.date - 28
+        WINDOW
+            w_page_7d AS (PARTITION BY b.property, b.page_path ORDER BY b.date
+                          RANGE BETWEEN INTERVAL '6 days' PRECEDING AND CURRENT ROW),
+            w_page_28d AS (PARTITION BY b.property, b.page_path ORDER BY b.date
+                           RANGE BETWEEN INTERVAL '27 days' PRECEDING AND CURRENT ROW)
+    )
+    SELECT
+        date,
+        property,
+        page_path,
+        -- Current metrics
+        gsc_clicks,
+        gsc_impressions,
+        gsc_ctr,
+        gsc_position,
+        ga_sessions,
+        ga_engagement_rate,
+        ga_bounce_rate,
+        ga_conversions,
+        ga_avg_session_duration,
+        ga_page_views,
+        -- Historical values
+        gsc_clicks_7d_ago,
+        gsc_impressions_7d_ago,
+        gsc_position_7d_ago,
+        ga_conversions_7d_ago,
+        ga_engagement_rate_7d_ago,
+        gsc_clicks_28d_ago,
+        gsc_impressions_28d_ago,
+        ga_conversions_28d_ago,
+        -- Rolling averages
+        ROUND(gsc_clicks_7d_avg, 2),
+        ROUND(gsc_impressions_7d_avg, 2),
+        ROUND(ga_conversions_7d_avg, 2),
+        ROUND(gsc_clicks_28d_avg, 2),
+        ROUND(gsc_impressions_28d_avg, 2),
+        ROUND(ga_conversions_28d_avg, 2),
+        -- WoW changes (same rules as vw_unified_page_performance)
+        CASE
+            WHEN gsc_clicks_7d_ago > 0 THEN
+                ROUND(((gsc_clicks - gsc_clicks_7d_ago)::NUMERIC / gsc_clicks_7d_ago) * 100, 2)
+            WHEN gsc_clicks_7d_ago = 0 AND gsc_clicks > 0 THEN 100.0
+            ELSE NULL
+        END,
+        CASE
+            WHEN gsc_impressions_7d_ago > 0 THEN
+                ROUND(((gsc_impressions - gsc_impressions_7d_ago)::NUMERIC / gsc_impressions_7d_ago) * 100, 2)
+            WHEN gsc_impressions_7d_ago = 0 AND gsc_impressions > 0 THEN 100.0
+            ELSE NULL
+        END,
+        CASE
+            WHEN gsc_position_7d_ago > 0 THEN
+                ROUND(gsc_position - gsc_position_7d_ago, 2)
+            ELSE NULL
+        END,
+        CASE
+            WHEN ga_conversions_7d_ago > 0 THEN
+                ROUND(((ga_conversions - ga_conversions_7d_ago)::NUMERIC / ga_conversions_7d_ago) * 100, 2)
+            WHEN ga_conversions_7d_ago = 0 AND ga_conversions > 0 THEN 100.0
+            ELSE NULL
+        END,
+        CASE
+            WHEN ga_engagement_rate_7d_ago > 0 THEN
+                ROUND(((ga_engagement_rate - ga_engagement_rate_7d_ago)::NUMERIC / ga_engagement_rate_7d_ago) * 100, 2)
+            WHEN ga_engagement_rate_7d_ago = 0 AND ga_engagement_rate > 0 THEN 100.0
+            ELSE NULL
+        END,
+        -- MoM changes
+        CASE
+            WHEN gsc_clicks_28d_ago > 0 THEN
+                ROUND(((gsc_clicks - gsc_clicks_28d_ago)::NUMERIC / gsc_clicks_28d_ago) * 100, 2)
+            WHEN gsc_clicks_28d_ago = 0 AND gsc_clicks > 0 THEN 100.0
+            ELSE NULL
+        END,
+        CASE
+            WHEN gsc_impressions_28d_ago > 0 THEN
+                ROUND(((gsc_impressions - gsc_impressions_28d_ago)::NUMERIC / gsc_impressions_28d_ago) * 100, 2)
+            WHEN gsc_impressions_28d_ago = 0 AND gsc_impressions > 0 THEN 100.0
+            ELSE NULL
+        END,
+        CASE
+            WHEN ga_conversions_28d_ago > 0 THEN
+                ROUND(((ga_conversions - ga_conversions_28d_ago)::NUMERIC / ga_conversions_28d_ago) * 100, 2)
+            WHEN ga_conversions_28d_ago = 0 AND ga_conversions > 0 THEN 100.0
+            ELSE NULL
+        END,
+        -- Composite metrics
+        CASE
+            WHEN gsc_clicks > 0 THEN
+                ROUND((ga_conversions::NUMERIC / gsc_clicks) * 100, 2)
+            ELSE 0
+        END,
+        CASE
+            WHEN ga_sessions > 0 THEN
+                ROUND((ga_conversions::NUMERIC / ga_sessions) * 100, 2)
+            ELSE 0
+        END,
+        ROUND(
+            (gsc_ctr * 0.003) +
+            (ga_engagement_rate * 0.4) +
+            ((1 - ga_bounce_rate) * 0.3),
+            4
+        ),
+        CASE
+            WHEN gsc_impressions > 100 AND gsc_ctr < 2 THEN
+                ROUND(gsc_impressions::NUMERIC * (2 - gsc_ctr) / 100, 2)
+            ELSE 0
+        END,
+        CASE
+            WHEN gsc_clicks > 0 THEN
+                ROUND((ga_conversions::NUMERIC / gsc_clicks) * 100, 2)
+            ELSE 0
+        END,
+        ROUND(
+            (CASE WHEN gsc_position <= 10 THEN 1.0 ELSE 0.5 END) *
+            ga_engagement_rate,
+            4
+        ),
+        CURRENT_TIMESTAMP
+    FROM time_series_calcs
+    WHERE date BETWEEN p_from AND p_to;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute the weekly rollup for every week overlapping [p_from, p_to]
+CREATE OR REPLACE FUNCTION gsc.refresh_unified_rollup_weekly(p_from DATE, p_to DATE)
+RETURNS BIGINT AS $$
+DECLARE
+    v_first DATE := DATE_TRUNC('week', p_from)::DATE;
+    v_last DATE := DATE_TRUNC('week', p_to)::DATE;
+    v_rows BIGINT;
+BEGIN
+    DELETE FROM gsc.mv_unified_page_performance_weekly
+    WHERE week_start BETWEEN v_first AND v_last;
+
+    INSERT INTO gsc.mv_unified_page_performance_weekly
+    SELECT
+        DATE_TRUNC('week', date)::DATE as week_start,
+        property,
+        page_path,
+        SUM(clicks),
+        SUM(impressions),
+        ROUND(AVG(ctr), 2),
+        ROUND(AVG(avg_position), 2),
+        SUM(sessions),
+        ROUND(AVG(engagement_rate), 4),
+        ROUND(AVG(bounce_rate), 4),
+        SUM(conversions),
+        ROUND(AVG(avg_session_duration), 2),
+        SUM(page_views),
+        CASE
+            WHEN SUM(clicks) > 0 THEN
+                ROUND((SUM(conversions)::NUMERIC / SUM(clicks)) * 100, 2)
+            ELSE 0
+        END,
+        ROUND(AVG(performance_score), 4),
+        ROUND(AVG(opportunity_index), 2),
+        COUNT(*),
+        CURRENT_TIMESTAMP
+    FROM gsc.mv_unified_page_performance
+    WHERE date >= v_first AND date < v_last + 7
+    GROUP BY DATE_TRUNC('week', date), property, page_path;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute the monthly rollup for every month overlapping [p_from, p_to]
+CREATE OR REPLACE FUNCTION gsc.refresh_unified_rollup_monthly(p_from DATE, p_to DATE)
+RETURNS BIGINT AS $$
+DECLARE
+    v_first DATE := DATE_TRUNC('month', p_from)::DATE;
+    v_last DATE := DATE_TRUNC('month', p_to)::DATE;
+    v_rows BIGINT;
+BEGIN
+    DELETE FROM gsc.mv_unified_page_performance_monthly
+    WHERE month_start BETWEEN v_first AND v_last;
+
+    INSERT INTO gsc.mv_unified_page_performance_monthly
+    SELECT
+        DATE_TRUNC('month', date)::DATE as month_start,
+        property,
+        page_path,
+        SUM(clicks),
+        SUM(impressions),
+        ROUND(AVG(ctr), 2),
+        ROUND(AVG(avg_position), 2),
+        SUM(sessions),
+        ROUND(AVG(engagement_rate), 4),
+        ROUND(AVG(bounce_rate), 4),
+        SUM(conversions),
+        ROUND(AVG(avg_session_duration), 2),
+        SUM(page_views),
+        CASE
+            WHEN SUM(clicks) > 0 THEN
+                ROUND((SUM(conversions)::NUMERIC / SUM(clicks)) * 100, 2)
+            ELSE 0
+        END,
+        ROUND(AVG(performance_score), 4),
+        ROUND(AVG(opportunity_index), 2),
+        COUNT(*),
+        CURRENT_TIMESTAMP
+    FROM gsc.mv_unified_page_performance
+    WHERE date >= v_first AND date < (v_last + INTERVAL '1 month')::DATE
+    GROUP BY DATE_TRUNC('month', date), property, page_path;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================
+-- Incremental Refresh
+-- =============================================
+
+-- Fold fact changes since the last refresh into all three rollups.
+-- p_full rebuilds every rollup from the complete fact history (use after
+-- dropping fact partitions or bulk deletes, which leave no updated_at trail).
+CREATE OR REPLACE FUNCTION gsc.refresh_unified_rollups(p_full BOOLEAN DEFAULT FALSE)
+RETURNS TABLE(
+    rollup_name TEXT,
+    status TEXT,
+    from_date DATE,
+    to_date DATE,
+    rows_written BIGINT,
+    refresh_time INTERVAL
+) AS $$
+DECLARE
+    v_since TIMESTAMP;
+    v_next_since TIMESTAMP;
+    v_changed_min DATE;
+    v_changed_max DATE;
+    v_data_max DATE;
+    v_from DATE;
+    v_to DATE;
+    v_total BIGINT := 0;
+    v_started TIMESTAMP;
+BEGIN
+    -- Serialize refreshes; a concurrent run would race on the same date ranges
+    PERFORM pg_advisory_xact_lock(hashtext('gsc.refresh_unified_rollups'));
+
+    -- Rows committed after this point may carry an updated_at as early as the
+    -- start of the oldest open transaction, so the next run resumes from there
+    SELECT LEAST(now(), MIN(a.xact_start))::TIMESTAMP INTO v_next_since
+    FROM pg_stat_activity a
+    WHERE a.xact_start IS NOT NULL AND a.pid <> pg_backend_pid();
+    v_next_since := COALESCE(v_next_since, now()::TIMESTAMP);
+
+    SELECT s.changes_since INTO v_since
+    FROM gsc.unified_rollup_state s
+    WHERE s.rollup_name = 'unified_page_performance';
+
+    SELECT MAX(d) INTO v_data_max FROM (
+        SELECT MAX(date) as d FROM gsc.fact_gsc_daily
+        UNION ALL
+        SELECT MAX(date) FROM gsc.fact_ga4_daily
+    ) maxes;
+
+    IF p_full OR v_since IS NULL THEN
+        SELECT MIN(d) INTO v_changed_min FROM (
+            SELECT MIN(date) as d FROM gsc.fact_gsc_daily
+            UNION ALL
+            SELECT MIN(date) FROM gsc.fact_ga4_daily
+        ) mins;
+        v_changed_max := v_data_max;
+        TRUNCATE gsc.mv_unified_page_performance,
+                 gsc.mv_unified_page_performance_weekly,
+                 gsc.mv_unified_page_performance_monthly;
+    ELSE
+        SELECT MIN(date), MAX(date) INTO v_changed_min, v_changed_max FROM (
+            SELECT date FROM gsc.fact_gsc_daily WHERE updated_at >= v_since
+            UNION ALL
+            SELECT date FROM gsc.fact_ga4_daily WHERE updated_at >= v_since
+        ) changed;
+    END IF;
+
+    IF v_changed_min IS NULL THEN
+        FOREACH rollup_name IN ARRAY ARRAY[
+            'mv_unified_page_performance',
+            'mv_unified_page_performance_weekly',
+            'mv_unified_page_performance_monthly'
+        ]
+        LOOP
+            status := 'unchanged';
+            from_date := NULL;
+            to_date := NULL;
+            rows_written := 0;
+            refresh_time := INTERVAL '0';
+            RETURN NEXT;
+        END LOOP;
+    ELSE
+        -- A changed day feeds the 7d/28d columns of the following 28 days
+        v_from := v_changed_min;
+        v_to := LEAST(v_changed_max + 28, GREATEST(v_data_max, v_changed_max));
+
+        rollup_name := 'mv_unified_page_performance';
+        v_started := clock_timestamp();
+        rows_written := gsc.refresh_unified_rollup_daily(v_from, v_to);
+        status := 'success';
+        from_date := v_from;
+        to_date := v_to;
+        refresh_time := clock_timestamp() - v_started;
+        v_total := v_total + rows_written;
+        RETURN NEXT;
+
+        rollup_name := 'mv_unified_page_performance_weekly';
+        v_started := clock_timestamp();
+        rows_written := gsc.refresh_unified_rollup_weekly(v_from, v_to);
+        refresh_time := clock_timestamp() - v_started;
+        v_total := v_total + rows_written;
+        RETURN NEXT;
+
+        rollup_name := 'mv_unified_page_performance_monthly';
+        v_started := clock_timestamp();
+        rows_written := gsc.refresh_unified_rollup_monthly(v_from, v_to);
+        refresh_time := clock_timestamp() - v_started;
+        v_total := v_total + rows_written;
+        RETURN NEXT;
+    END IF;
+
+    INSERT INTO gsc.unified_rollup_state AS s (
+        rollup_name, changes_since, last_from_date, last_to_date,
+        rows_written, last_run_status, last_refreshed_at
+    )
+    VALUES (
+        'unified_page_performance', v_next_since, v_from, v_to,
+        v_total, CASE WHEN p_full OR v_since IS NULL THEN 'full' ELSE 'incremental' END,
+        CURRENT_TIMESTAMP
+    )
+    ON CONFLICT ON CONSTRAINT unified_rollup_state_pkey
+    DO UPDATE SET
+        changes_since = EXCLUDED.changes_since,
+        last_from_date = EXCLUDED.last_from_date,
+        last_to_date = EXCLUDED.last_to_date,
+        rows_written = EXCLUDED.rows_written,
+        last_run_status = EXCLUDED.last_run_status,
+        last_refreshed_at = EXCLUDED.last_refreshed_at;
+END;
+$$ LANGUAGE plpgsql;
 
 -- =============================================
 -- Refresh Functions
 -- =============================================
+-- Kept for existing callers. The daily entry point runs the incremental
+-- refresh (which also maintains weekly/monthly); the weekly and monthly
+-- entry points rebuild their rollup from the daily rollup table.
 
--- Function to refresh daily materialized view
+-- Function to refresh daily rollup
 CREATE OR REPLACE FUNCTION gsc.refresh_mv_unified_daily()
 RETURNS void AS $$
 BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY gsc.mv_unified_page_performance;
-    
-    -- Update watermark
-    INSERT INTO gsc.ingest_watermarks (property, source_type, last_date, last_run_status, last_run_at)
-    VALUES ('mv_unified_daily', 'mv', CURRENT_DATE, 'success', CURRENT_TIMESTAMP)
-    ON CONFLICT (property, source_type) 
-    DO UPDATE SET 
-        last_date = EXCLUDED.last_date,
-        last_run_status = EXCLUDED.last_run_status,
-        last_run_at = EXCLUDED.last_run_at,
-        updated_at = CURRENT_TIMESTAMP;
-        
-    RAISE NOTICE '✓ Materialized view refreshed with time-series fields';
+    PERFORM gsc.refresh_unified_rollups();
+    RAISE NOTICE '✓ Unified rollups refreshed incrementally';
 END;
 $$ LANGUAGE plpgsql;
 
--- Function to refresh weekly materialized view
+-- Function to refresh weekly rollup
 CREATE OR REPLACE FUNCTION gsc.refresh_mv_unified_weekly()
 RETURNS void AS $$
+DECLARE
+    v_min DATE;
+    v_max DATE;
 BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY gsc.mv_unified_page_performance_weekly;
-    
-    -- Update watermark
-    INSERT INTO gsc.ingest_watermarks (property, source_type, last_date, last_run_status, last_run_at)
-    VALUES ('mv_unified_weekly', 'mv', CURRENT_DATE, 'success', CURRENT_TIMESTAMP)
-    ON CONFLICT (property, source_type) 
-    DO UPDATE SET 
-        last_date = EXCLUDED.last_date,
-        last_run_status = EXCLUDED.last_run_status,
-        last_run_at = EXCLUDED.last_run_at,
-        updated_at = CURRENT_TIMESTAMP;
+    SELECT MIN(date), MAX(date) INTO v_min, v_max FROM gsc.mv_unified_page_performance;
+    IF v_min IS NOT NULL THEN
+        PERFORM gsc.refresh_unified_rollup_weekly(v_min, v_max);
+    END IF;
 END;
 $$ LANGUAGE plpgsql;
 
--- Function to refresh monthly materialized view
+-- Function to refresh monthly rollup
 CREATE OR REPLACE FUNCTION gsc.refresh_mv_unified_monthly()
 RETURNS void AS $$
+DECLARE
+    v_min DATE;
+    v_max DATE;
 BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY gsc.mv_unified_page_performance_monthly;
-    
-    -- Update watermark
-    INSERT INTO gsc.ingest_watermarks (property, source_type, last_date, last_run_status, last_run_at)
-    VALUES ('mv_unified_monthly', 'mv', CURRENT_DATE, 'success', CURRENT_TIMESTAMP)
-    ON CONFLICT (property, source_type) 
-    DO UPDATE SET 
-        last_date = EXCLUDED.last_date,
-        last_run_status = EXCLUDED.last_run_status,
-        last_run_at = EXCLUDED.last_run_at,
-        updated_at = CURRENT_TIMESTAMP;
+    SELECT MIN(date), MAX(date) INTO v_min, v_max FROM gsc.mv_unified_page_performance;
+    IF v_min IS NOT NULL THEN
+        PERFORM gsc.refresh_unified_rollup_monthly(v_min, v_max);
+    END IF;
 END;
 $$ LANGUAGE plpgsql;
 
--- Function to refresh all unified materialized views
+-- Function to refresh all unified rollups
 CREATE OR REPLACE FUNCTION gsc.refresh_all_unified_views()
 RETURNS TABLE(view_name TEXT, status TEXT, refresh_time INTERVAL) AS $$
-DECLARE
-    start_time TIMESTAMP;
-    end_time TIMESTAMP;
 BEGIN
-    -- Refresh daily view
-    start_time := clock_timestamp();
-    BEGIN
-        PERFORM gsc.refresh_mv_unified_daily();
-        end_time := clock_timestamp();
-        view_name := 'mv_unified_page_performance';
-        status := 'success';
-        refresh_time := end_time - start_time;
-        RETURN NEXT;
-    EXCEPTION WHEN OTHERS THEN
-        end_time := clock_timestamp();
-        view_name := 'mv_unified_page_performance';
-        status := 'failed: ' || SQLERRM;
-        refresh_time := end_time - start_time;
-        RETURN NEXT;
-    END;
-    
-    -- Refresh weekly view
-    start_time := clock_timestamp();
-    BEGIN
-        PERFORM gsc.refresh_mv_unified_weekly();
-        end_time := clock_timestamp();
-        view_name := 'mv_unified_page_performance_weekly';
-        status := 'success';
-        refresh_time := end_time - start_time;
-        RETURN NEXT;
-    EXCEPTION WHEN OTHERS THEN
-        end_time := clock_timestamp();
-        view_name := 'mv_unified_page_performance_weekly';
-        status := 'failed: ' || SQLERRM;
-        refresh_time := end_time - start_time;
-        RETURN NEXT;
-    END;
-    
-    -- Refresh monthly view
-    start_time := clock_timestamp();
-    BEGIN
-        PERFORM gsc.refresh_mv_unified_monthly();
-        end_time := clock_timestamp();
-        view_name := 'mv_unified_page_performance_monthly';
-        status := 'success';
-        refresh_time := end_time - start_time;
-        RETURN NEXT;
-    EXCEPTION WHEN OTHERS THEN
-        end_time := clock_timestamp();
-        view_name := 'mv_unified_page_performance_monthly';
-        status := 'failed: ' || SQLERRM;
-        refresh_time := end_time - start_time;
-        RETURN NEXT;
-    END;
+    RETURN QUERY
+    SELECT r.rollup_name, r.status, r.refresh_time
+    FROM gsc.refresh_unified_rollups() r;
+EXCEPTION WHEN OTHERS THEN
+    view_name := 'unified_rollups';
+    status := 'failed: ' || SQLERRM;
+    refresh_time := NULL;
+    RETURN NEXT;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -339,18 +737,18 @@ BEGIN
     FROM gsc.vw_unified_page_performance
     WHERE performance_score < 0 OR performance_score > 1;
     
-    -- Check 6: Materialized view freshness (should be refreshed today)
+    -- Check 6: Rollup freshness (should be refreshed today)
     RETURN QUERY
     SELECT 
         'mv_freshness'::TEXT as check_name,
         CASE 
-            WHEN MAX(last_refreshed)::DATE = CURRENT_DATE THEN 'PASS'
-            WHEN MAX(last_refreshed)::DATE = CURRENT_DATE - 1 THEN 'WARN'
+            WHEN MAX(last_refreshed_at)::DATE = CURRENT_DATE THEN 'PASS'
+            WHEN MAX(last_refreshed_at)::DATE = CURRENT_DATE - 1 THEN 'WARN'
             ELSE 'FAIL'
         END::TEXT as check_status,
-        MAX(last_refreshed)::TEXT as check_value,
-        'Last materialized view refresh'::TEXT as check_message
-    FROM gsc.mv_unified_page_performance;
+        MAX(last_refreshed_at)::TEXT as check_value,
+        'Last unified rollup refresh'::TEXT as check_message
+    FROM gsc.unified_rollup_state;
     
     -- Check 7: Join completeness (both GSC and GA4 data present)
     RETURN QUERY
@@ -368,30 +766,27 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+
 -- Grant permissions
 GRANT SELECT ON gsc.mv_unified_page_performance TO gsc_user;
 GRANT SELECT ON gsc.mv_unified_page_performance_weekly TO gsc_user;
 GRANT SELECT ON gsc.mv_unified_page_performance_monthly TO gsc_user;
+GRANT SELECT ON gsc.unified_rollup_state TO gsc_user;
+GRANT EXECUTE ON FUNCTION gsc.refresh_unified_rollups(BOOLEAN) TO gsc_user;
 GRANT EXECUTE ON FUNCTION gsc.refresh_mv_unified_daily() TO gsc_user;
 GRANT EXECUTE ON FUNCTION gsc.refresh_mv_unified_weekly() TO gsc_user;
 GRANT EXECUTE ON FUNCTION gsc.refresh_mv_unified_monthly() TO gsc_user;
 GRANT EXECUTE ON FUNCTION gsc.refresh_all_unified_views() TO gsc_user;
 GRANT EXECUTE ON FUNCTION gsc.validate_unified_view_quality() TO gsc_user;
 
--- Create initial watermark entries for materialized views
-INSERT INTO gsc.ingest_watermarks (property, source_type, last_date, last_run_status)
-VALUES 
-    ('mv_unified_daily', 'mv', CURRENT_DATE, 'pending'),
-    ('mv_unified_weekly', 'mv', CURRENT_DATE, 'pending'),
-    ('mv_unified_monthly', 'mv', CURRENT_DATE, 'pending')
-ON CONFLICT (property, source_type) DO NOTHING;
-
 -- Analyze tables for query optimization
 ANALYZE gsc.mv_unified_page_performance;
 ANALYZE gsc.mv_unified_page_performance_weekly;
 ANALYZE gsc.mv_unified_page_performance_monthly;
 
 -- Add comments for documentation
-COMMENT ON MATERIALIZED VIEW gsc.mv_unified_page_performance IS 'Materialized cache of unified view with time-series calculations. Refresh daily after data ingestion.';
-COMMENT ON MATERIALIZED VIEW gsc.mv_unified_page_performance_weekly IS 'Weekly aggregated materialized view of unified page performance metrics';
-COMMENT ON MATERIALIZED VIEW gsc.mv_unified_page_performance_monthly IS 'Monthly aggregated materialized view of unified page performance metrics';
+COMMENT ON TABLE gsc.mv_unified_page_performance IS 'Daily rollup of the unified view with time-series calculations. Maintained incrementally by refresh_unified_rollups() after data ingestion.';
+COMMENT ON TABLE gsc.mv_unified_page_performance_weekly IS 'Weekly rollup of unified page performance metrics';
+COMMENT ON TABLE gsc.mv_unified_page_performance_monthly IS 'Monthly rollup of unified page performance metrics';
+COMMENT ON TABLE gsc.unified_rollup_state IS 'Change-detection watermark for the unified rollups (fact updated_at)';
+COMMENT ON FUNCTION gsc.refresh_unified_rollups(BOOLEAN) IS 'Recompute unified rollups for dates changed since the last refresh plus the trailing 28 days; p_full rebuilds everything';
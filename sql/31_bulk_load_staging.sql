@@ -0,0 +1,50 @@
+-- =====================================================
+-- Bulk Load Staging Tables
+-- =====================================================
+-- Purpose: Unlogged staging tables used by ingestors/bulk_loader.py.
+--          Rows are streamed in with COPY FROM STDIN and merged into the
+--          fact tables with one INSERT ... ON CONFLICT per load.
+-- Phase: 3
+-- Dependencies: 01_schema.sql (fact_gsc_daily), 04_ga4_schema.sql (fact_ga4_daily)
+-- =====================================================
+
+SET search_path TO gsc, public;
+
+-- UNLOGGED: staging content is transient, so it skips WAL entirely.
+-- Only the final merge into the fact table is WAL-logged.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS gsc.stg_fact_gsc_daily (
+    date DATE NOT NULL,
+    property VARCHAR(500) NOT NULL,
+    url TEXT NOT NULL,
+    query TEXT NOT NULL,
+    country VARCHAR(3) NOT NULL,
+    device VARCHAR(20) NOT NULL,
+    clicks INTEGER,
+    impressions INTEGER,
+    ctr NUMERIC(10,6),
+    position NUMERIC(10,2)
+);
+
+CREATE UNLOGGED TABLE IF NOT EXISTS gsc.stg_fact_ga4_daily (
+    date DATE NOT NULL,
+    property VARCHAR(255) NOT NULL,
+    page_path TEXT NOT NULL,
+    sessions INTEGER,
+    engaged_sessions INTEGER,
+    engagement_rate NUMERIC(5,4),
+    bounce_rate NUMERIC(5,4),
+    conversions INTEGER,
+    conversion_rate NUMERIC(5,4),
+    avg_session_duration NUMERIC(10,2),
+    page_views INTEGER,
+    avg_time_on_page NUMERIC(10,2),
+    exits INTEGER,
+    exit_rate NUMERIC(5,4)
+);
+
+COMMENT ON TABLE gsc.stg_fact_gsc_daily IS 'Unlogged COPY staging for fact_gsc_daily (truncated on every load)';
+COMMENT ON TABLE gsc.stg_fact_ga4_daily IS 'Unlogged COPY staging for fact_ga4_daily (truncated on every load)';
+
+GRANT ALL PRIVILEGES ON gsc.stg_fact_gsc_daily TO gsc_user;
+GRANT ALL PRIVILEGES ON gsc.stg_fact_ga4_daily TO gsc_user;
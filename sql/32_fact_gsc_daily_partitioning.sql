@@ -0,0 +1,278 @@
+-- =====================================================
+-- Monthly Partitioning for fact_gsc_daily
+-- =====================================================
+-- Purpose: Partition management for gsc.fact_gsc_daily (RANGE on date,
+--          one partition per calendar month plus a DEFAULT catch-all).
+--          - ensure_fact_gsc_daily_partitions(): creates upcoming months and
+--            any month that has rows sitting in the default partition
+--          - drop_fact_gsc_daily_partitions_before(): retention by DROP
+--            instead of DELETE + VACUUM
+--          - migrate_fact_gsc_daily_to_partitioned(): one-off conversion of
+--            an existing non-partitioned table
+--            (run via scripts/migrate_partition_fact_gsc_daily.py)
+-- Phase: 3
+-- Dependencies: 01_schema.sql (fact_gsc_daily)
+-- =====================================================
+
+SET search_path TO gsc, public;
+
+-- =============================================
+-- INSPECTION
+-- =============================================
+
+CREATE OR REPLACE FUNCTION gsc.fact_gsc_daily_is_partitioned()
+RETURNS BOOLEAN AS $$
+    SELECT EXISTS (
+        SELECT 1
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'gsc' AND c.relname = 'fact_gsc_daily'
+    );
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION gsc.fact_gsc_daily_partition_name(p_month DATE)
+RETURNS TEXT AS $$
+    SELECT 'fact_gsc_daily_p' || to_char(date_trunc('month', p_month), 'YYYY_MM');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Monthly partitions with their bounds (the default partition is excluded)
+CREATE OR REPLACE VIEW gsc.vw_fact_gsc_daily_partitions AS
+SELECT
+    c.relname AS partition_name,
+    to_date(substring(c.relname FROM '(\d{4}_\d{2})$'), 'YYYY_MM') AS month_start,
+    (to_date(substring(c.relname FROM '(\d{4}_\d{2})$'), 'YYYY_MM') + INTERVAL '1 month')::DATE AS month_end,
+    c.reltuples::BIGINT AS estimated_rows,
+    pg_total_relation_size(c.oid) AS total_bytes
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE i.inhparent = to_regclass('gsc.fact_gsc_daily')
+  AND n.nspname = 'gsc'
+  AND c.relname ~ '^fact_gsc_daily_p\d{4}_\d{2}$';
+
+-- =============================================
+-- MIGRATION
+-- =============================================
+
+-- Convert a non-partitioned gsc.fact_gsc_daily in place:
+--   1. rename it (and its indexes) to fact_gsc_daily_legacy
+--   2. create the partitioned table under the original name
+--   3. create a partition for every month with data, then copy the rows
+-- Views bound to the old table keep pointing at fact_gsc_daily_legacy until
+-- their SQL files are re-applied; the migration script does this in the same
+-- transaction. Returns the number of rows copied.
+CREATE OR REPLACE FUNCTION gsc.migrate_fact_gsc_daily_to_partitioned()
+RETURNS BIGINT AS $$
+DECLARE
+    v_index RECORD;
+    v_month DATE;
+    v_rows BIGINT;
+BEGIN
+    IF gsc.fact_gsc_daily_is_partitioned() THEN
+        RAISE NOTICE 'gsc.fact_gsc_daily is already partitioned';
+        RETURN 0;
+    END IF;
+
+    IF to_regclass('gsc.fact_gsc_daily_legacy') IS NOT NULL THEN
+        RAISE EXCEPTION 'gsc.fact_gsc_daily_legacy already exists - drop it before migrating again';
+    END IF;
+
+    LOCK TABLE gsc.fact_gsc_daily IN ACCESS EXCLUSIVE MODE;
+
+    ALTER TABLE gsc.fact_gsc_daily RENAME TO fact_gsc_daily_legacy;
+    ALTER TABLE gsc.fact_gsc_daily_legacy RENAME CONSTRAINT fact_gsc_daily_pkey TO fact_gsc_daily_legacy_pkey;
+    DROP TRIGGER IF EXISTS update_fact_gsc_daily_updated_at ON gsc.fact_gsc_daily_legacy;
+
+    -- Free the index names for the partitioned table
+    FOR v_index IN
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = 'gsc.fact_gsc_daily_legacy'::regclass
+          AND NOT i.indisprimary
+    LOOP
+        EXECUTE format('ALTER INDEX gsc.%I RENAME TO %I',
+                       v_index.relname, left(v_index.relname, 56) || '_legacy');
+    END LOOP;
+
+    CREATE TABLE gsc.fact_gsc_daily (
+        date DATE NOT NULL,
+        property VARCHAR(500) NOT NULL,
+        url TEXT NOT NULL,
+        query TEXT NOT NULL,
+        country VARCHAR(3) NOT NULL,
+        device VARCHAR(20) NOT NULL,
+        clicks INTEGER DEFAULT 0,
+        impressions INTEGER DEFAULT 0,
+        ctr NUMERIC(10,6) DEFAULT 0,
+        position NUMERIC(10,2) DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (date, property, url, query, country, device)
+    ) PARTITION BY RANGE (date);
+
+    CREATE TABLE gsc.fact_gsc_daily_default PARTITION OF gsc.fact_gsc_daily DEFAULT;
+
+    CREATE INDEX idx_fact_gsc_property ON gsc.fact_gsc_daily(property);
+    CREATE INDEX idx_fact_gsc_url ON gsc.fact_gsc_daily(url);
+    CREATE INDEX idx_fact_gsc_query ON gsc.fact_gsc_daily(query);
+    CREATE INDEX idx_fact_gsc_covering ON gsc.fact_gsc_daily(
+        date DESC,
+        property,
+        clicks,
+        impressions
+    ) INCLUDE (ctr, position);
+
+    CREATE TRIGGER update_fact_gsc_daily_updated_at BEFORE UPDATE ON gsc.fact_gsc_daily
+        FOR EACH ROW EXECUTE FUNCTION gsc.update_updated_at_column();
+
+    -- Partitions are created before the copy so no rows land in the default
+    FOR v_month IN
+        SELECT DISTINCT date_trunc('month', date)::DATE
+        FROM gsc.fact_gsc_daily_legacy
+        ORDER BY 1
+    LOOP
+        PERFORM gsc.create_fact_gsc_daily_partition(v_month);
+    END LOOP;
+    PERFORM gsc.ensure_fact_gsc_daily_partitions();
+
+    INSERT INTO gsc.fact_gsc_daily (
+        date, property, url, query, country, device,
+        clicks, impressions, ctr, position, created_at, updated_at
+    )
+    SELECT
+        date, property, url, query, country, device,
+        clicks, impressions, ctr, position, created_at, updated_at
+    FROM gsc.fact_gsc_daily_legacy;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+    GRANT ALL PRIVILEGES ON gsc.fact_gsc_daily TO gsc_user;
+
+    RAISE NOTICE 'Migrated % rows into partitioned gsc.fact_gsc_daily', v_rows;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================
+-- PARTITION CREATION
+-- =============================================
+
+-- Create the partition for the month containing p_month.
+-- Rows for that month already in the default partition are moved into the
+-- new partition (PostgreSQL refuses to create it while they are there).
+CREATE OR REPLACE FUNCTION gsc.create_fact_gsc_daily_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::DATE;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_name TEXT := gsc.fact_gsc_daily_partition_name(p_month);
+    v_move BOOLEAN := FALSE;
+BEGIN
+    IF to_regclass('gsc.' || v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    IF to_regclass('gsc.fact_gsc_daily_default') IS NOT NULL THEN
+        SELECT EXISTS (
+            SELECT 1 FROM gsc.fact_gsc_daily_default
+            WHERE date >= v_start AND date < v_end
+        ) INTO v_move;
+    END IF;
+
+    IF v_move THEN
+        CREATE TEMP TABLE fact_gsc_daily_partition_move
+            (LIKE gsc.fact_gsc_daily) ON COMMIT DROP;
+        WITH moved AS (
+            DELETE FROM gsc.fact_gsc_daily_default
+            WHERE date >= v_start AND date < v_end
+            RETURNING *
+        )
+        INSERT INTO fact_gsc_daily_partition_move SELECT * FROM moved;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE gsc.%I PARTITION OF gsc.fact_gsc_daily FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+
+    IF v_move THEN
+        INSERT INTO gsc.fact_gsc_daily SELECT * FROM fact_gsc_daily_partition_move;
+        DROP TABLE fact_gsc_daily_partition_move;
+    END IF;
+
+    RAISE NOTICE 'Created partition gsc.% for % to %', v_name, v_start, v_end;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create partitions for the current month through p_months_ahead months
+-- ahead, plus any month that currently has rows in the default partition.
+-- Returns the number of partitions created.
+CREATE OR REPLACE FUNCTION gsc.ensure_fact_gsc_daily_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    v_month DATE;
+    v_created INTEGER := 0;
+BEGIN
+    IF NOT gsc.fact_gsc_daily_is_partitioned() THEN
+        RAISE NOTICE 'gsc.fact_gsc_daily is not partitioned - nothing to do';
+        RETURN 0;
+    END IF;
+
+    FOR v_month IN
+        SELECT generate_series(
+            date_trunc('month', CURRENT_DATE),
+            date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead),
+            INTERVAL '1 month'
+        )::DATE
+        UNION
+        SELECT DISTINCT date_trunc('month', date)::DATE
+        FROM gsc.fact_gsc_daily_default
+        ORDER BY 1
+    LOOP
+        IF gsc.create_fact_gsc_daily_partition(v_month) THEN
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================
+-- RETENTION
+-- =============================================
+
+-- Drop every monthly partition whose whole range ends on or before p_cutoff.
+-- Returns the names of the dropped partitions.
+CREATE OR REPLACE FUNCTION gsc.drop_fact_gsc_daily_partitions_before(p_cutoff DATE)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    v_partition RECORD;
+BEGIN
+    FOR v_partition IN
+        SELECT partition_name
+        FROM gsc.vw_fact_gsc_daily_partitions
+        WHERE month_end <= p_cutoff
+        ORDER BY month_start
+    LOOP
+        EXECUTE format('DROP TABLE gsc.%I', v_partition.partition_name);
+        RAISE NOTICE 'Dropped partition gsc.%', v_partition.partition_name;
+        RETURN NEXT v_partition.partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================
+-- INITIAL PARTITIONS
+-- =============================================
+
+SELECT gsc.ensure_fact_gsc_daily_partitions();
+
+COMMENT ON FUNCTION gsc.ensure_fact_gsc_daily_partitions(INTEGER) IS 'Create upcoming monthly fact_gsc_daily partitions and drain the default partition (run weekly by the scheduler)';
+COMMENT ON FUNCTION gsc.drop_fact_gsc_daily_partitions_before(DATE) IS 'Retention: drop monthly fact_gsc_daily partitions that end on or before the cutoff';
+COMMENT ON FUNCTION gsc.migrate_fact_gsc_daily_to_partitioned() IS 'One-off conversion of a non-partitioned fact_gsc_daily (see scripts/migrate_partition_fact_gsc_daily.py)';
+COMMENT ON VIEW gsc.vw_fact_gsc_daily_partitions IS 'Monthly fact_gsc_daily partitions with bounds and size';
+
+GRANT SELECT ON gsc.vw_fact_gsc_daily_partitions TO gsc_user;
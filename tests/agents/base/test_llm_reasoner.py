@@ -10,10 +10,12 @@ Comprehensive test coverage for:
 - Specialized reasoners
 """
 import json
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from dataclasses import asdict
 
+from agents.base import llm_reasoner
 from agents.base.llm_reasoner import (
     LLMReasoner,
     ReasoningResult,
@@ -28,6 +30,7 @@ from agents.base.prompt_templates import (
     PromptTemplate,
 )
 from agents.base.model_selector import OllamaModelSelector
+from agents.base.response_cache import PersistentResponseCache
 
 
 # ============================================================================
@@ -515,6 +518,79 @@ class TestStatsTracking:
         assert stats['total_calls'] == 0
 
 
+# ============================================================================
+# Test Response Cache
+# ============================================================================
+
+class TestResponseCaching:
+    """Tests for the persistent response cache and shared HTTP client."""
+
+    @pytest.fixture
+    def cached_reasoner(self, mock_model_selector, tmp_path):
+        cache = PersistentResponseCache(str(tmp_path / 'llm.db'))
+        return LLMReasoner(
+            model_selector=mock_model_selector,
+            max_retries=0,
+            response_cache=cache
+        )
+
+    def test_no_cache_by_default(self, reasoner, monkeypatch):
+        monkeypatch.delenv('LLM_CACHE_PATH', raising=False)
+        assert reasoner.response_cache is None
+        assert reasoner.get_stats()['cache_enabled'] is False
+
+    def test_cache_from_env(self, mock_model_selector, tmp_path, monkeypatch):
+        monkeypatch.setenv('LLM_CACHE_PATH', str(tmp_path / 'env.db'))
+        first = LLMReasoner(model_selector=mock_model_selector)
+        second = LLMReasoner(model_selector=mock_model_selector)
+        assert first.response_cache is second.response_cache
+
+    def test_repeated_prompt_served_from_cache(self, cached_reasoner, valid_json_response):
+        with patch.object(cached_reasoner, '_call_ollama', return_value=valid_json_response) as mock_call:
+            first = cached_reasoner.reason("Analyze traffic")
+            second = cached_reasoner.reason("Analyze traffic")
+
+        assert mock_call.call_count == 1
+        assert second.success is True
+        assert second.content == first.content
+        stats = cached_reasoner.get_stats()
+        assert stats['cache_hits'] == 1
+        assert stats['cache_misses'] == 1
+        assert stats['successful_calls'] == 2
+
+    def test_cache_keyed_on_temperature_and_format(self, cached_reasoner, mock_model_selector, valid_json_response):
+        with patch.object(cached_reasoner, '_call_ollama', return_value=valid_json_response) as mock_call:
+            cached_reasoner.reason("Analyze traffic")
+            cached_reasoner.reason("Analyze traffic", response_format="text")
+            mock_model_selector.get_execution_config.return_value = {'temperature': 0.1}
+            cached_reasoner.reason("Analyze traffic")
+
+        assert mock_call.call_count == 3
+
+    def test_invalid_response_not_cached(self, cached_reasoner):
+        with patch.object(cached_reasoner, '_call_ollama', return_value="not json") as mock_call:
+            cached_reasoner.reason("Analyze traffic")
+            cached_reasoner.reason("Analyze traffic")
+
+        assert mock_call.call_count == 2
+
+    def test_latency_saved(self, cached_reasoner, valid_json_response):
+        def slow_call(**kwargs):
+            time.sleep(0.02)
+            return valid_json_response
+
+        with patch.object(cached_reasoner, '_call_ollama', side_effect=slow_call):
+            cached_reasoner.reason("Analyze traffic")
+            cached_reasoner.reason("Analyze traffic")
+
+        assert cached_reasoner.get_stats()['latency_saved_ms'] >= 20
+        cached_reasoner.reset_stats()
+        assert cached_reasoner.get_stats()['latency_saved_ms'] == 0
+
+    def test_http_client_is_shared(self):
+        assert llm_reasoner._get_http_client() is llm_reasoner._get_http_client()
+
+
 # ============================================================================
 # Test Helper Methods
 # ============================================================================
@@ -529,11 +605,11 @@ class TestHelperMethods:
     def test_is_available_when_ollama_up(self, reasoner):
         mock_response = Mock()
         mock_response.status_code = 200
-        with patch('httpx.get', return_value=mock_response):
+        with patch.object(llm_reasoner._get_http_client(), 'get', return_value=mock_response):
             assert reasoner.is_available() is True
 
     def test_is_available_when_ollama_down(self, reasoner):
-        with patch('httpx.get', side_effect=Exception("Connection refused")):
+        with patch.object(llm_reasoner._get_http_client(), 'get', side_effect=Exception("Connection refused")):
             assert reasoner.is_available() is False
 
     def test_build_prompt_adds_json_suffix(self, reasoner):
@@ -613,7 +689,7 @@ class TestOllamaAPICall:
         mock_response.json.return_value = {"response": "Test response"}
         mock_response.raise_for_status = Mock()
 
-        with patch('httpx.post', return_value=mock_response):
+        with patch.object(llm_reasoner._get_http_client(), 'post', return_value=mock_response):
             result = reasoner._call_ollama(
                 model="test-model",
                 prompt="Test prompt",
@@ -624,7 +700,7 @@ class TestOllamaAPICall:
 
     def test_call_ollama_timeout(self, reasoner):
         import httpx
-        with patch('httpx.post', side_effect=httpx.TimeoutException("Timeout")):
+        with patch.object(llm_reasoner._get_http_client(), 'post', side_effect=httpx.TimeoutException("Timeout")):
             with pytest.raises(TimeoutError):
                 reasoner._call_ollama(
                     model="test-model",
@@ -635,7 +711,7 @@ class TestOllamaAPICall:
 
     def test_call_ollama_connection_error(self, reasoner):
         import httpx
-        with patch('httpx.post', side_effect=httpx.ConnectError("Connection refused")):
+        with patch.object(llm_reasoner._get_http_client(), 'post', side_effect=httpx.ConnectError("Connection refused")):
             with pytest.raises(ConnectionError):
                 reasoner._call_ollama(
                     model="test-model",
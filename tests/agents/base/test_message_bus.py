@@ -9,12 +9,15 @@ from unittest.mock import Mock, MagicMock, patch, AsyncMock, mock_open
 from datetime import datetime, timedelta
 import asyncio
 import json
+import random
 from pathlib import Path
 
 from agents.base.message_bus import (
     Message,
     MessageBus,
-    MessageHandler
+    MessageHandler,
+    TopicIndex,
+    benchmark
 )
 
 
@@ -568,6 +571,68 @@ class TestMessageBusRouting:
             assert bus._topic_matches('test.anything', 'test.#') is True
 
 
+class TestTopicIndex:
+    """Test the subscription trie used for routing"""
+
+    def test_matches_agree_with_topic_matches(self):
+        """Trie results equal a linear scan with _topic_matches"""
+        rng = random.Random(7)
+        segments = ['a', 'b', 'c', '*', '#']
+        patterns = {
+            '.'.join(rng.choice(segments) for _ in range(rng.randint(1, 4)))
+            for _ in range(300)
+        }
+        patterns |= {'a.b#', '#', 'a.#.c'}
+        index = TopicIndex()
+        for pattern in patterns:
+            index.add(pattern)
+
+        with patch('agents.base.message_bus.Path.mkdir'):
+            bus = MessageBus()
+
+        for _ in range(300):
+            topic = '.'.join(rng.choice('abcd') for _ in range(rng.randint(1, 5)))
+            expected = {p for p in patterns if bus._topic_matches(topic, p)}
+            assert index.match(topic) == expected, topic
+
+    def test_remove_prunes_patterns(self):
+        index = TopicIndex()
+        index.add('a.b.c')
+        index.add('a.#')
+        index.add('a.*')
+
+        index.remove('a.#')
+        index.remove('a.b.c')
+
+        assert index.match('a.b.c') == set()
+        assert index.match('a.x') == {'a.*'}
+        assert len(index) == 1
+        assert 'b' not in index._root.children['a'].children
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_updates_index(self):
+        with patch('agents.base.message_bus.Path.mkdir'):
+            bus = MessageBus()
+
+            async def handler(msg: Message) -> bool:
+                return True
+
+            await bus.subscribe('agent-001', 'test.*', handler)
+            await bus.subscribe('agent-002', 'test.*', handler)
+            await bus.unsubscribe('agent-001', 'test.*')
+
+            assert 'test.*' in bus._topic_index
+            await bus.unsubscribe('agent-002', 'test.*')
+            assert 'test.*' not in bus._topic_index
+
+    @pytest.mark.asyncio
+    async def test_routing_benchmark(self):
+        rows = await benchmark(subscription_counts=(10, 300), messages=50)
+
+        assert [r['subscriptions'] for r in rows] == [10, 300]
+        assert all(r['trie_msgs_per_sec'] > 0 and r['linear_msgs_per_sec'] > 0 for r in rows)
+
+
 class TestMessageBusStartStop:
     """Test start and stop methods"""
 
@@ -739,46 +804,71 @@ class TestMessageBusPersistence:
     """Test persistence methods"""
 
     @pytest.mark.asyncio
-    async def test_persist_message_creates_file(self):
-        """Test _persist_message creates file"""
-        with patch('agents.base.message_bus.Path.mkdir'), \
-             patch('aiofiles.open', new_callable=mock_open) as mock_file:
+    async def test_persist_message_appends_to_log(self, mock_persistence_path):
+        """Test _persist_message appends to the segmented log"""
+        bus = MessageBus(persistence_path=mock_persistence_path)
 
-            bus = MessageBus()
+        msg = Message(
+            message_id='msg-001',
+            topic='test',
+            sender_id='sender',
+            payload={},
+            timestamp=datetime.now()
+        )
 
-            msg = Message(
-                message_id='msg-001',
-                topic='test',
-                sender_id='sender',
-                payload={},
-                timestamp=datetime.now()
-            )
+        await bus._persist_message(msg)
 
-            await bus._persist_message(msg)
+        assert list(Path(mock_persistence_path).glob('segment-*.log'))
+        history = await bus.query_history(topic='test')
+        assert [m.message_id for m in history] == ['msg-001']
 
-            # Should attempt to open file
-            mock_file.assert_called()
+    @pytest.mark.asyncio
+    async def test_persist_dead_letter_appends_to_log(self, mock_persistence_path):
+        """Test _persist_dead_letter appends a dead letter record"""
+        bus = MessageBus(persistence_path=mock_persistence_path)
+
+        msg = Message(
+            message_id='msg-002',
+            topic='test',
+            sender_id='sender',
+            payload={},
+            timestamp=datetime.now()
+        )
+
+        await bus._persist_dead_letter(msg, 'test reason')
+
+        assert await bus.query_history() == []
+        dead = await bus.query_history(dead_letters=True)
+        assert [m.message_id for m in dead] == ['msg-002']
 
     @pytest.mark.asyncio
-    async def test_persist_dead_letter_creates_file(self):
-        """Test _persist_dead_letter creates file"""
-        with patch('agents.base.message_bus.Path.mkdir'), \
-             patch('aiofiles.open', new_callable=mock_open) as mock_file:
+    async def test_custom_persistence_backend(self):
+        """Test a custom backend receives persisted messages"""
+        backend = AsyncMock()
 
-            bus = MessageBus()
+        with patch('agents.base.message_bus.Path.mkdir'):
+            bus = MessageBus(persistence=backend)
 
-            msg = Message(
-                message_id='msg-002',
-                topic='test',
-                sender_id='sender',
-                payload={},
-                timestamp=datetime.now()
-            )
+            await bus.publish('test.topic', 'sender', {'id': 1})
+
+        record = backend.append.call_args.args[0]
+        assert record['topic'] == 'test.topic'
+
+    @pytest.mark.asyncio
+    async def test_start_replays_history(self, mock_persistence_path):
+        """Test a restarted bus restores history from the log"""
+        bus = MessageBus(persistence_path=mock_persistence_path)
+        await bus.start()
+        for i in range(3):
+            await bus.publish('test.topic', 'sender', {'id': i})
+        await bus.stop()
 
-            await bus._persist_dead_letter(msg, 'test reason')
+        restarted = MessageBus(persistence_path=mock_persistence_path)
+        await restarted.start()
+        await restarted.stop()
 
-            # Should attempt to open file
-            mock_file.assert_called()
+        history = restarted.get_message_history()
+        assert [m.payload['id'] for m in history] == [0, 1, 2]
 
 
 class TestMessageBusEdgeCases:
@@ -0,0 +1,159 @@
+"""
+Tests for message bus persistence backends.
+
+Covers:
+- Group commit of concurrent appends
+- Segment rollover and retention
+- Topic/time-range history queries across segments
+- Recovery (index rebuild, torn-tail truncation) and replay
+- The legacy one-file-per-message backend
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.base.message_log import JsonFilePersistence, SegmentedLogPersistence
+
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0)
+
+
+def make_record(i, topic='test.topic'):
+    """Message record i seconds after BASE_TIME."""
+    return {
+        'message_id': f'msg-{i:04d}',
+        'topic': topic,
+        'sender_id': 'sender',
+        'payload': {'i': i},
+        'timestamp': (BASE_TIME + timedelta(seconds=i)).isoformat(),
+        'priority': 0,
+        'ttl_seconds': None,
+        'correlation_id': None,
+        'metadata': {},
+    }
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / 'log')
+
+
+class TestGroupCommit:
+    """Test batching of concurrent appends"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_commits(self, log_path):
+        log = SegmentedLogPersistence(log_path)
+
+        await asyncio.gather(*(log.append(make_record(i)) for i in range(200)))
+
+        stats = log.get_stats()
+        assert stats['records'] == 200
+        assert stats['commits'] < 10
+        assert len(await log.query(limit=1000)) == 200
+
+    @pytest.mark.asyncio
+    async def test_append_visible_once_awaited(self, log_path):
+        log = SegmentedLogPersistence(log_path, commit_interval=0)
+
+        await log.append(make_record(1))
+
+        assert [r['message_id'] for r in await log.query()] == ['msg-0001']
+
+
+class TestSegments:
+    """Test rollover, retention and cross-segment queries"""
+
+    @pytest.mark.asyncio
+    async def test_rolls_over_and_drops_oldest(self, log_path, tmp_path):
+        log = SegmentedLogPersistence(log_path, segment_bytes=1000, max_segments=3)
+
+        for i in range(60):
+            await log.append(make_record(i))
+
+        assert len(list((tmp_path / 'log').glob('segment-*.log'))) == 3
+        records = await log.query(limit=1000)
+        assert records[-1]['message_id'] == 'msg-0059'
+        assert records[0]['message_id'] != 'msg-0000'
+
+    @pytest.mark.asyncio
+    async def test_query_filters_across_segments(self, log_path):
+        log = SegmentedLogPersistence(log_path, segment_bytes=2000)
+        for i in range(100):
+            await log.append(make_record(i, topic='a' if i % 2 else 'b'))
+
+        records = await log.query(
+            topic='a',
+            since=BASE_TIME + timedelta(seconds=10),
+            until=BASE_TIME + timedelta(seconds=60),
+            limit=5
+        )
+
+        assert [r['payload']['i'] for r in records] == [51, 53, 55, 57, 59]
+
+    @pytest.mark.asyncio
+    async def test_dead_letters_indexed_separately(self, log_path):
+        log = SegmentedLogPersistence(log_path)
+        await log.append(make_record(1))
+        await log.append({**make_record(2), 'dead_letter_reason': 'expired'}, dead_letter=True)
+
+        assert [r['message_id'] for r in await log.query()] == ['msg-0001']
+        assert [r['message_id'] for r in await log.query(dead_letters=True)] == ['msg-0002']
+
+
+class TestRecovery:
+    """Test reopening an existing log"""
+
+    @pytest.mark.asyncio
+    async def test_reopen_rebuilds_index_and_replays(self, log_path):
+        log = SegmentedLogPersistence(log_path, segment_bytes=1000)
+        for i in range(20):
+            await log.append(make_record(i))
+        await log.close()
+
+        reopened = SegmentedLogPersistence(log_path, segment_bytes=1000)
+        replayed = [r['message_id'] async for r in reopened.replay(since=BASE_TIME + timedelta(seconds=15))]
+
+        assert replayed == [f'msg-{i:04d}' for i in range(15, 20)]
+        assert reopened.get_stats()['records'] == 20
+
+    @pytest.mark.asyncio
+    async def test_truncates_torn_tail(self, log_path, tmp_path):
+        log = SegmentedLogPersistence(log_path)
+        await log.append(make_record(1))
+        await log.close()
+
+        segment = next((tmp_path / 'log').glob('segment-*.log'))
+        with open(segment, 'ab') as f:
+            f.write(b'{"message_id": "partial')
+
+        reopened = SegmentedLogPersistence(log_path)
+        await reopened.append(make_record(2))
+
+        assert [r['message_id'] for r in await reopened.query()] == ['msg-0001', 'msg-0002']
+
+    @pytest.mark.asyncio
+    async def test_open_without_directory_creates_nothing(self, log_path, tmp_path):
+        log = SegmentedLogPersistence(log_path)
+
+        await log.open()
+
+        assert await log.query() == []
+        assert not (tmp_path / 'log').exists()
+
+
+class TestJsonFilePersistence:
+    """Test the legacy per-file backend"""
+
+    @pytest.mark.asyncio
+    async def test_append_and_query(self, tmp_path):
+        backend = JsonFilePersistence(str(tmp_path))
+        await backend.append(make_record(1, topic='a'))
+        await backend.append(make_record(2, topic='b'))
+        await backend.append({**make_record(3), 'dead_letter_reason': 'x'}, dead_letter=True)
+
+        assert (tmp_path / '20250101' / 'msg-0001.json').exists()
+        assert [r['message_id'] for r in await backend.query(topic='a')] == ['msg-0001']
+        assert [r['message_id'] for r in await backend.query(dead_letters=True)] == ['msg-0003']
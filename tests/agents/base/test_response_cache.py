@@ -0,0 +1,129 @@
+"""
+Tests for PersistentResponseCache.
+
+Covers:
+- Key construction from prompt, model, format and options
+- Hits, misses and latency-saved accounting
+- TTL expiry
+- Entry-count and byte-size eviction (least recently used first)
+- Persistence across reopen and the shared per-path instance
+"""
+import time
+
+import pytest
+
+from agents.base.response_cache import PersistentResponseCache, get_response_cache
+
+
+OPTIONS = {"temperature": 0.7, "num_ctx": 4096}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache backed by a temporary database file."""
+    cache = PersistentResponseCache(str(tmp_path / 'cache.db'))
+    yield cache
+    cache.close()
+
+
+class TestKeys:
+    """Tests for cache key construction."""
+
+    def test_same_input_same_key(self):
+        a = PersistentResponseCache._make_key("p", "m", "json", {"b": 1, "a": 2})
+        b = PersistentResponseCache._make_key("p", "m", "json", {"a": 2, "b": 1})
+        assert a == b
+
+    @pytest.mark.parametrize("args", [
+        ("other", "m", "json", OPTIONS),
+        ("p", "other", "json", OPTIONS),
+        ("p", "m", "text", OPTIONS),
+        ("p", "m", "json", {**OPTIONS, "temperature": 0.1}),
+    ])
+    def test_different_input_different_key(self, args):
+        assert PersistentResponseCache._make_key(*args) != \
+            PersistentResponseCache._make_key("p", "m", "json", OPTIONS)
+
+
+class TestGetSet:
+    """Tests for storing and retrieving responses."""
+
+    def test_miss_then_hit(self, cache):
+        assert cache.get("p", "m", "json", OPTIONS) is None
+
+        cache.set("p", "m", "json", OPTIONS, '{"a": 1}', latency_ms=900)
+        cached = cache.get("p", "m", "json", OPTIONS)
+
+        assert cached.response == '{"a": 1}'
+        assert cached.hit_count == 1
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['latency_saved_ms'] == 900
+        assert stats['hit_rate_percent'] == 50.0
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        cache = PersistentResponseCache(str(tmp_path / 'ttl.db'), ttl_hours=0.5 / 3600)
+        cache.set("p", "m", "json", OPTIONS, "r")
+        time.sleep(0.6)
+
+        assert cache.get("p", "m", "json", OPTIONS) is None
+        assert len(cache) == 0
+
+    def test_persists_across_reopen(self, tmp_path):
+        path = str(tmp_path / 'cache.db')
+        first = PersistentResponseCache(path)
+        first.set("p", "m", "text", None, "answer", latency_ms=10)
+        first.close()
+
+        reopened = PersistentResponseCache(path)
+        assert reopened.get("p", "m", "text", None).response == "answer"
+
+    def test_invalidate_and_clear(self, cache):
+        cache.set("p1", "m1", "json", OPTIONS, "r")
+        cache.set("p2", "m2", "json", OPTIONS, "r")
+
+        assert cache.invalidate_by_model("m1") == 1
+        assert cache.clear() == 1
+        assert cache.get_stats()['hits'] == 0
+
+
+class TestEviction:
+    """Tests for size-based eviction."""
+
+    def test_evicts_least_recently_used_over_max_entries(self, tmp_path):
+        cache = PersistentResponseCache(str(tmp_path / 'lru.db'), max_entries=2)
+        cache.set("a", "m", "text", None, "ra")
+        time.sleep(0.01)
+        cache.set("b", "m", "text", None, "rb")
+        time.sleep(0.01)
+        cache.get("a", "m", "text", None)
+        time.sleep(0.01)
+        cache.set("c", "m", "text", None, "rc")
+
+        assert len(cache) == 2
+        assert cache.get("b", "m", "text", None) is None
+        assert cache.get("a", "m", "text", None) is not None
+
+    def test_evicts_over_max_bytes(self, tmp_path):
+        cache = PersistentResponseCache(str(tmp_path / 'bytes.db'), max_bytes=250)
+        for i in range(5):
+            cache.set(f"p{i}", "m", "text", None, "x" * 100)
+            time.sleep(0.01)
+
+        assert cache.get_stats()['bytes'] <= 250
+        assert cache.get("p4", "m", "text", None) is not None
+
+    def test_skips_response_larger_than_limit(self, tmp_path):
+        cache = PersistentResponseCache(str(tmp_path / 'big.db'), max_bytes=10)
+        cache.set("p", "m", "text", None, "x" * 11)
+        assert len(cache) == 0
+
+
+class TestSharedCache:
+    """Tests for get_response_cache()."""
+
+    def test_one_instance_per_path(self, tmp_path):
+        path = str(tmp_path / 'shared.db')
+        assert get_response_cache(path) is get_response_cache(path)
+        assert get_response_cache(path) is not get_response_cache(str(tmp_path / 'other.db'))
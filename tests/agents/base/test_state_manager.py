@@ -0,0 +1,172 @@
+"""
+Tests for StateManager persistence.
+
+Covers:
+- Snapshot file plus append-only history log
+- Write-behind coalescing, interval flush and flush on close
+- Recovery from snapshot plus log tail, torn tails and legacy files
+- Log compaction
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from agents.base.state_manager import AgentState, StateManager
+
+
+async def bring_up(manager, agent_id='agent_001', data=None):
+    """Initialize an agent and move it to ACTIVE."""
+    await manager.initialize_agent(agent_id, data or {'counter': 0})
+    await manager.transition(agent_id, AgentState.INITIALIZING)
+    await manager.transition(agent_id, AgentState.READY)
+    await manager.transition(agent_id, AgentState.ACTIVE)
+
+
+class TestWriteThrough:
+    """Default mode writes every change"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_compact_and_history_is_logged(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path))
+        await bring_up(manager)
+
+        snapshot = json.loads((tmp_path / 'agent_001.json').read_text())
+        log_lines = (tmp_path / 'agent_001.history.jsonl').read_text().splitlines()
+
+        assert snapshot['state'] == 'active'
+        assert 'history' not in snapshot
+        assert len(log_lines) == 4
+        assert snapshot['log_offset'] == (tmp_path / 'agent_001.history.jsonl').stat().st_size
+        assert not list(tmp_path.glob('*.tmp'))
+
+    @pytest.mark.asyncio
+    async def test_recover_round_trip(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path))
+        await bring_up(manager)
+        await manager.update_state_data('agent_001', {'counter': 7})
+
+        recovered = StateManager(storage_path=str(tmp_path))
+        assert await recovered.recover_agent('agent_001') is True
+
+        assert await recovered.get_state('agent_001') == AgentState.ACTIVE
+        assert await recovered.get_state_data('agent_001') == {'counter': 7}
+        assert [s.state for s in await recovered.get_history('agent_001')] == [
+            AgentState.CREATED, AgentState.INITIALIZING, AgentState.READY, AgentState.ACTIVE
+        ]
+
+        # Recovered agents keep appending to the same log
+        await recovered.transition('agent_001', AgentState.IDLE)
+        assert len((tmp_path / 'agent_001.history.jsonl').read_text().splitlines()) == 6
+
+
+class TestWriteBehind:
+    """Write-behind mode coalesces changes"""
+
+    @pytest.mark.asyncio
+    async def test_changes_deferred_until_flush(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path), write_behind=True, flush_interval=60)
+        await bring_up(manager)
+        for i in range(50):
+            await manager.update_state_data('agent_001', {'counter': i})
+
+        assert not (tmp_path / 'agent_001.json').exists()
+
+        await manager.close()
+
+        snapshot = json.loads((tmp_path / 'agent_001.json').read_text())
+        assert snapshot['data'] == {'counter': 49}
+        assert len((tmp_path / 'agent_001.history.jsonl').read_text().splitlines()) == 54
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_interval(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path), write_behind=True, flush_interval=0.01)
+        await bring_up(manager)
+
+        await asyncio.sleep(0.05)
+
+        assert json.loads((tmp_path / 'agent_001.json').read_text())['state'] == 'active'
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_recover_flushes_pending_changes_first(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path), write_behind=True, flush_interval=60)
+        await bring_up(manager)
+
+        assert await manager.recover_agent('agent_001') is True
+        assert await manager.get_state('agent_001') == AgentState.ACTIVE
+        await manager.close()
+
+
+class TestRecovery:
+    """Recovery from snapshot plus log tail"""
+
+    @pytest.mark.asyncio
+    async def test_replays_log_tail_past_snapshot(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path))
+        await bring_up(manager)
+
+        # Simulate a crash after the log append but before the snapshot rename
+        log_file = tmp_path / 'agent_001.history.jsonl'
+        with open(log_file, 'a') as f:
+            f.write(json.dumps({'agent_id': 'agent_001', 'update': {'counter': 3},
+                                'timestamp': '2025-01-01T00:00:00'}) + '\n')
+            f.write('{"agent_id": "agent_001", "sta')
+
+        recovered = StateManager(storage_path=str(tmp_path))
+        assert await recovered.recover_agent('agent_001') is True
+
+        assert await recovered.get_state_data('agent_001') == {'counter': 3}
+        assert log_file.read_text().endswith('\n')
+
+    @pytest.mark.asyncio
+    async def test_recovers_from_log_without_snapshot(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path))
+        await bring_up(manager)
+        (tmp_path / 'agent_001.json').unlink()
+
+        recovered = StateManager(storage_path=str(tmp_path))
+        assert await recovered.recover_agent('agent_001') is True
+        assert await recovered.get_state('agent_001') == AgentState.ACTIVE
+
+    @pytest.mark.asyncio
+    async def test_recovers_legacy_state_file(self, tmp_path):
+        (tmp_path / 'agent_001.json').write_text(json.dumps({
+            'agent_id': 'agent_001',
+            'state': 'ready',
+            'data': {'x': 1},
+            'history': [{'agent_id': 'agent_001', 'state': 'created', 'data': {},
+                         'timestamp': '2025-01-01T00:00:00'}]
+        }))
+
+        manager = StateManager(storage_path=str(tmp_path))
+        assert await manager.recover_agent('agent_001') is True
+        assert await manager.get_state('agent_001') == AgentState.READY
+        assert len(await manager.get_history('agent_001')) == 1
+
+    @pytest.mark.asyncio
+    async def test_log_compaction(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path))
+        manager._max_history = 5
+        await bring_up(manager)
+        for i in range(20):
+            target = AgentState.IDLE if i % 2 == 0 else AgentState.ACTIVE
+            await manager.transition('agent_001', target, {'i': i})
+
+        assert len((tmp_path / 'agent_001.history.jsonl').read_text().splitlines()) <= 10
+
+        recovered = StateManager(storage_path=str(tmp_path))
+        recovered._max_history = 5
+        await recovered.recover_agent('agent_001')
+        assert await recovered.get_state_data('agent_001') == {'counter': 0, 'i': 19}
+        assert len(await recovered.get_history('agent_001')) == 5
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_files(self, tmp_path):
+        manager = StateManager(storage_path=str(tmp_path))
+        await bring_up(manager)
+
+        await manager.cleanup_agent('agent_001')
+
+        assert list(tmp_path.iterdir()) == []
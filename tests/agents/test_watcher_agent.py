@@ -16,10 +16,17 @@ from agents.base.agent_contract import AgentStatus
 from agents.base.llm_reasoner import ReasoningResult
 from agents.watcher.alert_manager import Alert, AlertManager
 from agents.watcher.anomaly_detector import Anomaly, AnomalyDetector
+from agents.watcher.page_history import build_page_histories
 from agents.watcher.trend_analyzer import Trend, TrendAnalyzer
 from agents.watcher.watcher_agent import AnomalyFinding, WatcherAgent
 
 
+def page_histories(histories):
+    """PageHistories from {page_path: [row, ...]}."""
+    rows = [dict(row, page_path=path) for path, history in histories.items() for row in history]
+    return build_page_histories(rows, list(histories))
+
+
 # ============================================================================
 # Test WatcherAgent Lifecycle
 # ============================================================================
@@ -274,7 +281,9 @@ class TestAnomalyDetection:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -305,7 +314,9 @@ class TestAnomalyDetection:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -322,23 +333,27 @@ class TestAnomalyDetection:
             {'page_path': '/page3', 'last_seen': datetime.now()}
         ]
 
-        # Return different historical data for each page
-        async def mock_historical_data(page_path, days, property_filter):
-            base_data = [
-                {'clicks': 100, 'impressions': 1000, 'ctr': 10.0, 'avg_position': 3.0,
-                 'engagement_rate': 0.5, 'conversion_rate': 2.0, 'sessions': 80}
-                for _ in range(days)
-            ]
-            return base_data
+        base_data = [
+            {'clicks': 100, 'impressions': 1000, 'ctr': 10.0, 'avg_position': 3.0,
+             'engagement_rate': 0.5, 'conversion_rate': 2.0, 'sessions': 80}
+            for _ in range(37)
+        ]
+        dropped = base_data[:30] + [dict(row, clicks=10) for row in base_data[30:]]
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(side_effect=mock_historical_data)
+        watcher_agent._get_page_histories = AsyncMock(return_value=page_histories({
+            '/page1': base_data, '/page2': dropped, '/page3': base_data
+        }))
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
 
-        # Should have processed all 3 pages
-        assert watcher_agent._get_page_historical_data.call_count == 3
+        # All 3 pages are loaded with a single query
+        watcher_agent._get_page_histories.assert_called_once_with(
+            ['/page1', '/page2', '/page3'], 37, None
+        )
+        assert [(a.page_path, a.metric_name) for a in anomalies] == [('/page2', 'clicks')]
+        watcher_agent._create_anomaly_alert.assert_called_once_with(anomalies[0], mock_pages[1])
 
     @pytest.mark.asyncio
     async def test_detect_anomalies_insufficient_data(self, watcher_agent):
@@ -353,7 +368,9 @@ class TestAnomalyDetection:
         ]
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -362,6 +379,84 @@ class TestAnomalyDetection:
         assert len(anomalies) == 0
 
 
+class TestBatchAnomalyDetection:
+    """Test AnomalyDetector.detect_batch against the per-page checks."""
+
+    @staticmethod
+    def scalar_anomalies(detector, history, days):
+        """Anomalies from the per-page methods, in detect_batch check order."""
+        baseline, current = history[:-days], history[-days:]
+        if len(baseline) < 7 or not current:
+            return []
+        last = current[-1]
+        engagement = [d['engagement_rate'] for d in baseline if d['engagement_rate']]
+        conversions = [d['conversion_rate'] for d in baseline if d['conversion_rate']]
+        found = [
+            detector.detect_traffic_drop(last['clicks'], [d['clicks'] for d in baseline]),
+            detector.detect_position_drop(last['avg_position'], [d['avg_position'] for d in baseline]),
+            detector.detect_ctr_anomaly(last['ctr'], [d['ctr'] for d in baseline if d['ctr']]),
+            detector.detect_engagement_change(last['engagement_rate'], engagement) if engagement else None,
+            detector.detect_conversion_drop(last['conversion_rate'], conversions) if conversions else None,
+            detector.detect_zero_traffic(last['clicks'], last['impressions'], [d['clicks'] for d in baseline]),
+        ]
+        return [a for a in found if a]
+
+    def test_matches_per_page_checks(self):
+        """Random ragged histories give the same anomalies as the scalar methods."""
+        rng = np.random.default_rng(7)
+        detector = AnomalyDetector(sensitivity=2.5, min_data_points=7)
+        histories = {}
+        for p in range(60):
+            length = int(rng.integers(0, 40))
+            drop = rng.random() < 0.5
+            histories[f'/page-{p}'] = [
+                {
+                    'clicks': 0 if drop and i >= length - 2 else int(rng.integers(0, 60)),
+                    'impressions': 0 if drop and i >= length - 1 else int(rng.integers(0, 600)),
+                    'ctr': float(rng.choice([0.0, rng.uniform(1, 10)])),
+                    'avg_position': float(rng.uniform(1, 30 if drop and i == length - 1 else 8)),
+                    'engagement_rate': float(rng.choice([0.0, rng.uniform(0.1, 0.9)])),
+                    'conversion_rate': float(rng.choice([0.0, rng.uniform(0.5, 3)])),
+                    'sessions': int(rng.integers(0, 50)),
+                }
+                for i in range(length)
+            ]
+
+        batch = detector.detect_batch(page_histories(histories), current_days=7)
+
+        expected = []
+        for path, history in histories.items():
+            for anomaly in self.scalar_anomalies(detector, history, 7):
+                anomaly.page_path = path
+                expected.append(anomaly)
+
+        assert len(expected) > 10
+        assert [(a.page_path, a.metric_name, a.severity) for a in batch] == [
+            (a.page_path, a.metric_name, a.severity) for a in expected
+        ]
+        for got, want in zip(batch, expected):
+            assert got.current_value == pytest.approx(want.current_value)
+            assert got.expected_value == pytest.approx(want.expected_value)
+            assert got.deviation_percent == pytest.approx(want.deviation_percent)
+
+    def test_null_metrics_are_skipped(self):
+        """NULL rates are left out of the baseline like zero rates."""
+        detector = AnomalyDetector(min_data_points=7)
+        history = [
+            {'clicks': 100, 'impressions': 1000, 'ctr': None, 'avg_position': 3.0,
+             'engagement_rate': None, 'conversion_rate': None, 'sessions': 80}
+            for _ in range(37)
+        ]
+
+        assert detector.detect_batch(page_histories({'/p': history}), current_days=7) == []
+
+    def test_empty(self):
+        detector = AnomalyDetector()
+
+        assert detector.detect_batch(page_histories({}), current_days=7) == []
+        assert detector.detect_batch(page_histories({'/p': []}), current_days=7) == []
+
+
 # ============================================================================
 # Test Trend Detection
 # ============================================================================
@@ -390,7 +485,9 @@ class TestTrendDetection:
         ]
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_time_series = AsyncMock(return_value=time_series_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: time_series_data})
+        )
         watcher_agent._create_trend_alert = AsyncMock()
 
         trends = await watcher_agent.detect_trends(days=7)
@@ -920,42 +1017,43 @@ class TestDatabaseQueries:
         assert pages[0]['page_path'] == '/page1'
 
     @pytest.mark.asyncio
-    async def test_get_page_historical_data_query(self, watcher_agent):
-        """Test getting page historical data."""
-        # Mock the full query execution with expected results
-        expected_data = [
-            {
-                'date': datetime.now() - timedelta(days=i),
-                'clicks': 100,
-                'impressions': 1000,
-                'ctr': 10.0,
-                'avg_position': 3.0,
-                'engagement_rate': 0.5,
-                'conversion_rate': 2.0,
-                'sessions': 80
-            }
-            for i in range(30)
+    async def test_get_page_histories_single_query(self, watcher_agent):
+        """Test all page histories come from one query, split per page."""
+        rows = [
+            {'page_path': '/a', 'date': datetime.now() - timedelta(days=1), 'clicks': 5,
+             'impressions': 50, 'ctr': 10.0, 'avg_position': 3.0, 'engagement_rate': 0.5,
+             'conversion_rate': None, 'sessions': 4},
+            {'page_path': '/a', 'date': datetime.now(), 'clicks': 7,
+             'impressions': 70, 'ctr': 10.0, 'avg_position': 2.0, 'engagement_rate': 0.5,
+             'conversion_rate': 1.0, 'sessions': 6},
         ]
+        conn = AsyncMock()
+        conn.fetch.return_value = rows
+        watcher_agent._pool = MagicMock()
+        watcher_agent._pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        watcher_agent._pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
 
-        # Mock _get_page_historical_data directly
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=expected_data)
-
-        data = await watcher_agent._get_page_historical_data('/page', 30, None)
+        histories = await watcher_agent._get_page_histories(['/b', '/a'], 37, 'sc-domain:example.com')
 
-        assert len(data) == 30
-        assert 'clicks' in data[0]
+        conn.fetch.assert_called_once()
+        query, *params = conn.fetch.call_args.args
+        assert 'ANY($1::text[])' in query
+        assert 'ORDER BY page_path, date' in query
+        assert params == [['/b', '/a'], 37, 'sc-domain:example.com']
+        assert histories.page_paths == ['/b', '/a']
+        assert list(histories.lengths) == [0, 2]
+        assert histories.series(1, 'clicks') == [5.0, 7.0]
+        assert histories.series(1, 'conversion_rate') == [None, 1.0]
 
     @pytest.mark.asyncio
-    async def test_get_page_time_series_delegates_to_historical(self, watcher_agent):
-        """Test that time series delegates to historical data method."""
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=[
-            {'clicks': 100, 'impressions': 1000}
-        ])
+    async def test_get_page_histories_no_pages(self, watcher_agent):
+        """Test no query is made without pages."""
+        watcher_agent._pool = MagicMock()
 
-        result = await watcher_agent._get_page_time_series('/page', 7, None)
+        histories = await watcher_agent._get_page_histories([], 37, None)
 
-        watcher_agent._get_page_historical_data.assert_called_once_with('/page', 7, None)
-        assert result == [{'clicks': 100, 'impressions': 1000}]
+        assert len(histories) == 0
+        watcher_agent._pool.acquire.assert_not_called()
 
 
 # ============================================================================
@@ -1078,7 +1176,9 @@ class TestAdditionalCoverage:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -1107,7 +1207,9 @@ class TestAdditionalCoverage:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -1136,7 +1238,9 @@ class TestAdditionalCoverage:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -1165,7 +1269,9 @@ class TestAdditionalCoverage:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=historical_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: historical_data})
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -1179,7 +1285,9 @@ class TestAdditionalCoverage:
         mock_pages = [{'page_path': '/no-history', 'last_seen': datetime.now()}]
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_historical_data = AsyncMock(return_value=[])  # Empty history
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({'/no-history': []})  # Empty history
+        )
         watcher_agent._create_anomaly_alert = AsyncMock()
 
         anomalies = await watcher_agent.detect_anomalies(days=7)
@@ -1201,7 +1309,9 @@ class TestAdditionalCoverage:
             })
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_time_series = AsyncMock(return_value=time_series_data)
+        watcher_agent._get_page_histories = AsyncMock(
+            return_value=page_histories({mock_pages[0]['page_path']: time_series_data})
+        )
         watcher_agent._create_trend_alert = AsyncMock()
 
         trends = await watcher_agent.detect_trends(days=7)
@@ -1215,7 +1325,7 @@ class TestAdditionalCoverage:
         mock_pages = [{'page_path': '/no-data', 'last_seen': datetime.now()}]
 
         watcher_agent._get_active_pages = AsyncMock(return_value=mock_pages)
-        watcher_agent._get_page_time_series = AsyncMock(return_value=[])
+        watcher_agent._get_page_histories = AsyncMock(return_value=page_histories({'/no-data': []}))
         watcher_agent._create_trend_alert = AsyncMock()
 
         trends = await watcher_agent.detect_trends(days=7)
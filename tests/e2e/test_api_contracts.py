@@ -8,7 +8,7 @@ Tests marked with @pytest.mark.e2e
 """
 import pytest
 from datetime import datetime
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 from jsonschema import validate, ValidationError
 from typing import Dict, Any
@@ -250,7 +250,7 @@ def client():
 class TestGetInsightsContract:
     """Contract tests for GET /api/insights endpoint"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insights_list_schema_valid(self, mock_repo, client, sample_insight_data):
         """Test that GET /api/insights returns valid schema"""
         from insights_core.models import Insight
@@ -271,7 +271,7 @@ class TestGetInsightsContract:
         assert isinstance(data["offset"], int)
         assert isinstance(data["data"], list)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insights_list_empty_response(self, mock_repo, client):
         """Test insights list with no results"""
         mock_repo.query.return_value = []
@@ -285,7 +285,7 @@ class TestGetInsightsContract:
         assert data["count"] == 0
         assert data["data"] == []
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insights_list_with_filters(self, mock_repo, client, sample_insight_data):
         """Test insights list with query parameters"""
         from insights_core.models import Insight
@@ -305,7 +305,7 @@ class TestGetInsightsContract:
         assert data["limit"] == 50
         assert data["offset"] == 10
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insights_list_validates_insight_objects(self, mock_repo, client, sample_insight_data):
         """Test that individual insights in list match schema"""
         from insights_core.models import Insight
@@ -336,7 +336,7 @@ class TestGetInsightsContract:
 class TestGetInsightByIdContract:
     """Contract tests for GET /api/insights/{id} endpoint"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insight_single_schema_valid(self, mock_repo, client, sample_insight_data):
         """Test that GET /api/insights/{id} returns valid schema"""
         from insights_core.models import Insight
@@ -356,7 +356,7 @@ class TestGetInsightByIdContract:
         assert "data" in data
         assert data["data"]["id"] == insight_id
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insight_single_all_required_fields(self, mock_repo, client, sample_insight_data):
         """Test that single insight has all required fields"""
         from insights_core.models import Insight
@@ -381,7 +381,7 @@ class TestGetInsightByIdContract:
         for field in required_fields:
             assert field in insight, f"Required field '{field}' missing"
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insight_metrics_schema(self, mock_repo, client, sample_insight_data):
         """Test that insight metrics follow schema"""
         from insights_core.models import Insight
@@ -397,7 +397,7 @@ class TestGetInsightByIdContract:
 
         validate(instance=metrics, schema=INSIGHT_METRICS_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_insight_not_found_error_schema(self, mock_repo, client):
         """Test 404 error response schema"""
         mock_repo.get_by_id.return_value = None
@@ -420,7 +420,7 @@ class TestGetInsightByIdContract:
 class TestHealthEndpointContract:
     """Contract tests for GET /api/health endpoint"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_health_healthy_schema(self, mock_repo, client):
         """Test health endpoint returns valid schema when healthy"""
         mock_repo.get_stats.return_value = {"total_insights": 100}
@@ -438,7 +438,7 @@ class TestHealthEndpointContract:
         assert isinstance(data["total_insights"], int)
         assert data["total_insights"] >= 0
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_health_required_fields(self, mock_repo, client):
         """Test health endpoint has all required fields"""
         mock_repo.get_stats.return_value = {"total_insights": 50}
@@ -465,7 +465,7 @@ class TestHealthEndpointContract:
             assert "status" in data
             assert data["status"] == "initializing"
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_health_error_schema(self, mock_repo, client):
         """Test health endpoint error response schema"""
         mock_repo.get_stats.side_effect = Exception("Database connection failed")
@@ -488,7 +488,7 @@ class TestHealthEndpointContract:
 class TestStatsEndpointContract:
     """Contract tests for GET /api/stats endpoint"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_stats_schema_valid(self, mock_repo, client):
         """Test stats endpoint returns valid schema"""
         mock_repo.get_stats.return_value = {"total_insights": 100}
@@ -504,7 +504,7 @@ class TestStatsEndpointContract:
         assert "data" in data
         assert isinstance(data["data"], dict)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_stats_error_schema(self, mock_repo, client):
         """Test stats endpoint error response"""
         mock_repo.get_stats.side_effect = Exception("Stats query failed")
@@ -525,7 +525,7 @@ class TestStatsEndpointContract:
 class TestGetByCategoryContract:
     """Contract tests for GET /api/insights/category/{category}"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_category_response_schema(self, mock_repo, client, sample_insight_data):
         """Test category endpoint response schema"""
         from insights_core.models import Insight
@@ -545,7 +545,7 @@ class TestGetByCategoryContract:
         assert isinstance(data["count"], int)
         assert isinstance(data["data"], list)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_category_all_categories(self, mock_repo, client, sample_insight_data):
         """Test all valid category values"""
         from insights_core.models import Insight
@@ -576,7 +576,7 @@ class TestGetByCategoryContract:
 class TestGetByStatusContract:
     """Contract tests for GET /api/insights/status/{status}"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_status_response_schema(self, mock_repo, client, sample_insight_data):
         """Test status endpoint response schema"""
         from insights_core.models import Insight
@@ -596,7 +596,7 @@ class TestGetByStatusContract:
         assert isinstance(data["count"], int)
         assert isinstance(data["data"], list)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_status_all_statuses(self, mock_repo, client, sample_insight_data):
         """Test all valid status values"""
         from insights_core.models import Insight
@@ -627,7 +627,7 @@ class TestGetByStatusContract:
 class TestUpdateInsightContract:
     """Contract tests for PATCH /api/insights/{id}"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_update_response_schema(self, mock_repo, client, sample_insight_data):
         """Test update endpoint response schema"""
         from insights_core.models import Insight
@@ -650,7 +650,7 @@ class TestUpdateInsightContract:
         assert "data" in data
         validate(instance=data["data"], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_update_not_found_error(self, mock_repo, client):
         """Test update endpoint 404 error schema"""
         mock_repo.update.return_value = None
@@ -673,7 +673,7 @@ class TestUpdateInsightContract:
 class TestErrorResponseContracts:
     """Contract tests for error responses across all endpoints"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_500_error_schema(self, mock_repo, client):
         """Test 500 error response schema"""
         mock_repo.query.side_effect = Exception("Database error")
@@ -686,7 +686,7 @@ class TestErrorResponseContracts:
         validate(instance=data, schema=ERROR_RESPONSE_SCHEMA)
         assert "detail" in data
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_404_error_schema(self, mock_repo, client):
         """Test 404 error response schema"""
         mock_repo.get_by_id.return_value = None
@@ -718,7 +718,7 @@ class TestErrorResponseContracts:
 class TestEnumContracts:
     """Contract tests for enum values in responses"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_entity_type_enum_values(self, mock_repo, client, sample_insight_data):
         """Test that entity_type only contains valid enum values"""
         from insights_core.models import Insight
@@ -738,7 +738,7 @@ class TestEnumContracts:
             assert data["data"][0]["entity_type"] == entity_type
             validate(instance=data["data"][0], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_severity_enum_values(self, mock_repo, client, sample_insight_data):
         """Test that severity only contains valid enum values"""
         from insights_core.models import Insight
@@ -758,7 +758,7 @@ class TestEnumContracts:
             assert data["data"][0]["severity"] == severity
             validate(instance=data["data"][0], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_category_enum_values(self, mock_repo, client, sample_insight_data):
         """Test that category only contains valid enum values"""
         from insights_core.models import Insight
@@ -778,7 +778,7 @@ class TestEnumContracts:
             assert data["data"][0]["category"] == category
             validate(instance=data["data"][0], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_status_enum_values(self, mock_repo, client, sample_insight_data):
         """Test that status only contains valid enum values"""
         from insights_core.models import Insight
@@ -807,7 +807,7 @@ class TestEnumContracts:
 class TestFieldConstraints:
     """Contract tests for field constraints and validation"""
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_confidence_range(self, mock_repo, client, sample_insight_data):
         """Test that confidence is between 0.0 and 1.0"""
         from insights_core.models import Insight
@@ -825,7 +825,7 @@ class TestFieldConstraints:
             assert 0.0 <= data["data"][0]["confidence"] <= 1.0
             validate(instance=data["data"][0], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_window_days_range(self, mock_repo, client, sample_insight_data):
         """Test that window_days is between 1 and 365"""
         from insights_core.models import Insight
@@ -843,7 +843,7 @@ class TestFieldConstraints:
             assert 1 <= data["data"][0]["window_days"] <= 365
             validate(instance=data["data"][0], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_id_max_length(self, mock_repo, client, sample_insight_data):
         """Test that id field respects max length"""
         from insights_core.models import Insight
@@ -857,7 +857,7 @@ class TestFieldConstraints:
         assert len(data["data"]["id"]) <= 64
         validate(instance=data["data"], schema=INSIGHT_SCHEMA)
 
-    @patch('insights_api.insights_api.repository')
+    @patch('insights_api.insights_api.repository', new_callable=AsyncMock)
     def test_title_max_length(self, mock_repo, client, sample_insight_data):
         """Test that title field respects max length"""
         from insights_core.models import Insight
@@ -621,3 +621,23 @@ def get_call_args_list(mock_obj: Mock, method: str = "call") -> List[tuple]:
         return [call[0] for call in mock_obj.call_args_list]
     else:
         return [call[0] for call in getattr(mock_obj, method).call_args_list]
+
+
+def persisted_insights(mock_repository: Mock) -> List[Any]:
+    """
+    Get all insights written through a mock repository's create_many().
+
+    Detectors persist each run with one create_many() call, so this flattens
+    the batches into a single list in write order.
+
+    Args:
+        mock_repository: Mock InsightRepository
+
+    Returns:
+        List of InsightCreate objects passed to create_many()
+    """
+    return [
+        insight
+        for call in mock_repository.create_many.call_args_list
+        for insight in call[0][0]
+    ]
@@ -0,0 +1,294 @@
+"""
+Tests for the COPY-based bulk loader
+
+Tests cover:
+- COPY text encoding and lazy row streaming
+- Staging and merge SQL generation
+- Load sequence on the connection
+- GSC and GA4 ingestor integration
+- Benchmark mode
+
+All tests use mocks - no real database.
+"""
+
+from datetime import date
+from typing import Any, Dict
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from ingestors.bulk_loader import (
+    GA4_DAILY,
+    GSC_DAILY,
+    BulkLoader,
+    CopyRowStream,
+    benchmark,
+    generate_synthetic_rows,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def mock_conn():
+    """Connection whose cursor drains COPY streams like psycopg2 does"""
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+    cursor.copied = []
+
+    def copy_expert(sql, stream, size=8192):
+        chunk = stream.read(size)
+        while chunk:
+            cursor.copied.append(chunk)
+            chunk = stream.read(size)
+
+    cursor.copy_expert = Mock(side_effect=copy_expert)
+    conn.cursor.return_value = cursor
+    return conn
+
+
+@pytest.fixture
+def gsc_rows():
+    """Rows in transform_api_row order"""
+    return [
+        (date(2025, 1, 15), 'https://example.com/', 'https://example.com/a', 'query a',
+         'usa', 'MOBILE', 10, 100, 0.1, 3.5),
+        (date(2025, 1, 15), 'https://example.com/', 'https://example.com/b', 'tab\there',
+         'gbr', 'DESKTOP', 0, 5, 0.0, None),
+    ]
+
+
+# =============================================================================
+# STREAM TESTS
+# =============================================================================
+
+class TestCopyRowStream:
+    """Test COPY text rendering"""
+
+    def test_encodes_values(self, gsc_rows):
+        """Dates, NULLs and control characters use COPY text escapes"""
+        text = CopyRowStream(gsc_rows).read()
+        lines = text.split('\n')
+
+        assert lines[0].startswith('2025-01-15\thttps://example.com/\t')
+        assert 'tab\\there' in lines[1]
+        assert lines[1].endswith('\\N')
+        assert lines[2] == ''
+
+    def test_streams_in_chunks(self, gsc_rows):
+        """Chunked reads reproduce the full payload and count rows"""
+        full = CopyRowStream(gsc_rows).read()
+        stream = CopyRowStream(iter(gsc_rows))
+        chunks = []
+        chunk = stream.read(7)
+        while chunk:
+            assert len(chunk) <= 7
+            chunks.append(chunk)
+            chunk = stream.read(7)
+
+        assert ''.join(chunks) == full
+        assert stream.rows_written == 2
+
+    def test_escapes_backslashes_and_newlines(self):
+        """Backslashes are escaped before other control characters"""
+        text = CopyRowStream([('a\\b', 'line\nbreak')]).read()
+
+        assert text == 'a\\\\b\tline\\nbreak\n'
+
+    def test_readline(self, gsc_rows):
+        """readline returns one encoded row at a time"""
+        stream = CopyRowStream(gsc_rows)
+
+        assert stream.readline().count('\t') == 9
+        assert stream.readline().endswith('\\N\n')
+        assert stream.readline() == ''
+
+
+# =============================================================================
+# LOADER TESTS
+# =============================================================================
+
+class TestBulkLoader:
+    """Test staging + merge load path"""
+
+    def test_merge_sql_gsc(self):
+        """Merge de-duplicates staging and only rewrites changed rows"""
+        sql = BulkLoader(Mock(), GSC_DAILY).merge_sql()
+
+        assert 'INSERT INTO gsc.fact_gsc_daily' in sql
+        assert 'FROM gsc.stg_fact_gsc_daily' in sql
+        assert 'DISTINCT ON (date, property, url, query, country, device)' in sql
+        assert 'ON CONFLICT (date, property, url, query, country, device)' in sql
+        assert 'fact_gsc_daily.clicks IS DISTINCT FROM EXCLUDED.clicks' in sql
+        assert 'updated_at = CURRENT_TIMESTAMP' in sql
+
+    def test_merge_sql_ga4_preserves_exit_columns(self):
+        """GA4 merge does not overwrite exits/exit_rate, matching the execute_batch path"""
+        sql = BulkLoader(Mock(), GA4_DAILY).merge_sql()
+        update_clause = sql.split('DO UPDATE SET')[1]
+
+        assert 'sessions = EXCLUDED.sessions' in update_clause
+        assert 'exits = EXCLUDED.exits' not in update_clause
+        assert 'exit_rate' not in update_clause
+
+    def test_copy_sql(self):
+        """COPY lists columns in row tuple order"""
+        sql = BulkLoader(Mock(), GSC_DAILY).copy_sql()
+
+        assert sql.startswith('COPY gsc.stg_fact_gsc_daily (date, property, url, query, country, device,')
+        assert 'FROM STDIN' in sql
+
+    def test_load_sequence(self, mock_conn, gsc_rows):
+        """Load creates staging, truncates, copies, merges and truncates again"""
+        loader = BulkLoader(mock_conn, GSC_DAILY)
+
+        loaded = loader.load(gsc_rows)
+
+        cursor = mock_conn.cursor.return_value
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert loaded == 2
+        assert 'CREATE UNLOGGED TABLE IF NOT EXISTS gsc.stg_fact_gsc_daily' in statements[0]
+        assert statements[1] == 'TRUNCATE gsc.stg_fact_gsc_daily'
+        assert 'INSERT INTO gsc.fact_gsc_daily' in statements[2]
+        assert statements[3] == 'TRUNCATE gsc.stg_fact_gsc_daily'
+        assert ''.join(cursor.copied).count('\n') == 2
+        mock_conn.commit.assert_not_called()
+
+    def test_load_empty_skips_merge(self, mock_conn):
+        """No merge is issued when nothing was copied"""
+        loader = BulkLoader(mock_conn, GSC_DAILY)
+
+        assert loader.load([]) == 0
+
+        statements = [c.args[0] for c in mock_conn.cursor.return_value.execute.call_args_list]
+        assert not any('INSERT INTO' in s for s in statements)
+
+    def test_staging_created_once(self, mock_conn, gsc_rows):
+        """Staging DDL is only issued on the first load"""
+        loader = BulkLoader(mock_conn, GSC_DAILY)
+        loader.load(gsc_rows)
+        loader.load(gsc_rows)
+
+        statements = [c.args[0] for c in mock_conn.cursor.return_value.execute.call_args_list]
+        assert sum('CREATE UNLOGGED TABLE' in s for s in statements) == 1
+
+    def test_failure_resets_staging_state(self, mock_conn, gsc_rows):
+        """A failed load re-checks the staging table next time (it may have been rolled back)"""
+        loader = BulkLoader(mock_conn, GSC_DAILY)
+        mock_conn.cursor.return_value.copy_expert.side_effect = Exception("copy failed")
+
+        with pytest.raises(Exception, match="copy failed"):
+            loader.load(gsc_rows)
+
+        assert loader._staging_ready is False
+
+
+# =============================================================================
+# INGESTOR INTEGRATION TESTS
+# =============================================================================
+
+class TestIngestorIntegration:
+    """Test the ingestors' copy load method"""
+
+    @pytest.fixture
+    def gsc_config(self) -> Dict[str, Any]:
+        return {'GSC_LOAD_METHOD': 'copy', 'BACKOFF_JITTER': 'false'}
+
+    def test_gsc_rejects_unknown_load_method(self):
+        """GSC_LOAD_METHOD is validated"""
+        from ingestors.api.gsc_api_ingestor import GSCAPIIngestor
+
+        with pytest.raises(ValueError):
+            GSCAPIIngestor({'GSC_LOAD_METHOD': 'bogus'})
+
+    def test_gsc_upsert_uses_bulk_loader(self, gsc_config, mock_conn, gsc_rows):
+        """upsert_data streams through COPY and commits"""
+        from ingestors.api.gsc_api_ingestor import GSCAPIIngestor
+
+        ingestor = GSCAPIIngestor(gsc_config)
+        ingestor.conn = mock_conn
+
+        with patch('ingestors.api.gsc_api_ingestor.execute_values') as mock_execute_values:
+            assert ingestor.upsert_data(gsc_rows) == 2
+
+        mock_execute_values.assert_not_called()
+        mock_conn.cursor.return_value.copy_expert.assert_called_once()
+        mock_conn.commit.assert_called_once()
+
+    def test_gsc_bulk_load_failure_rolls_back(self, gsc_config, mock_conn, gsc_rows):
+        """Failures roll back and report zero rows, like the insert path"""
+        from ingestors.api.gsc_api_ingestor import GSCAPIIngestor
+
+        ingestor = GSCAPIIngestor(gsc_config)
+        ingestor.conn = mock_conn
+        mock_conn.cursor.return_value.copy_expert.side_effect = Exception("boom")
+
+        assert ingestor.upsert_data(gsc_rows) == 0
+        mock_conn.rollback.assert_called_once()
+
+    def test_gsc_mock_connection_uses_insert_path(self, gsc_config, gsc_rows):
+        """The mock connection has no COPY support and keeps the insert path"""
+        from ingestors.api.gsc_api_ingestor import GSCAPIIngestor, MockDBConnection
+
+        ingestor = GSCAPIIngestor(gsc_config)
+        ingestor.conn = MockDBConnection()
+
+        with patch('ingestors.api.gsc_api_ingestor.execute_values') as mock_execute_values:
+            assert ingestor.upsert_data(gsc_rows) == 2
+        mock_execute_values.assert_called_once()
+
+    @patch('ingestors.ga4.ga4_extractor.psycopg2.connect')
+    @patch('ingestors.ga4.ga4_extractor.execute_batch')
+    def test_ga4_upsert_uses_bulk_loader(self, mock_execute_batch, mock_connect, mock_conn):
+        """GA4 extractor uses COPY when extraction.load_method is 'copy'"""
+        from ingestors.ga4.ga4_extractor import GA4Extractor
+
+        mock_connect.return_value = mock_conn
+        extractor = GA4Extractor(config_path='/nonexistent.yaml')
+        extractor.config['extraction']['load_method'] = 'copy'
+        data = [{
+            'date': date(2025, 1, 15), 'host_name': 'example.com', 'page_path': '/a',
+            'sessions': 10, 'engaged_sessions': 5, 'engagement_rate': 0.5, 'bounce_rate': 0.5,
+            'conversions': 1, 'conversion_rate': 0.1, 'avg_session_duration': 30.0,
+            'page_views': 20, 'avg_time_on_page': 12.0
+        }]
+
+        extractor.upsert_data('https://example.com/', data)
+
+        mock_execute_batch.assert_not_called()
+        mock_conn.cursor.return_value.copy_expert.assert_called_once()
+        mock_conn.commit.assert_called_once()
+        assert extractor.stats['rows_inserted'] == 1
+
+
+# =============================================================================
+# BENCHMARK TESTS
+# =============================================================================
+
+class TestBenchmark:
+    """Test benchmark mode"""
+
+    def test_synthetic_rows_match_spec(self):
+        """Synthetic rows have one value per column and unique keys"""
+        for spec in (GSC_DAILY, GA4_DAILY):
+            rows = generate_synthetic_rows(spec, 50)
+            keys = {row[:len(spec.key_columns)] for row in rows}
+            assert all(len(row) == len(spec.columns) for row in rows)
+            assert len(keys) == 50
+
+    def test_benchmark_rolls_back_each_run(self, mock_conn):
+        """Every timed run is rolled back and rows/sec is reported per method"""
+        rows = generate_synthetic_rows(GSC_DAILY, 20)
+
+        with patch('psycopg2.extras.execute_values'):
+            results = benchmark(mock_conn, GSC_DAILY, rows, repeat=2)
+
+        assert mock_conn.rollback.call_count == 4
+        assert results['rows'] == 20
+        assert results['execute_values']['rows_per_second'] > 0
+        assert results['copy_merge']['rows_per_second'] > 0
+        assert results['speedup'] is not None
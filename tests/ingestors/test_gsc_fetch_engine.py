@@ -0,0 +1,253 @@
+"""
+Tests for the concurrent GSC fetch engine
+
+Tests cover:
+- Fan-out of (property, date, page-offset) units across properties
+- Pagination continuations
+- Watermark advancing only over contiguous committed days
+- Data-delay and error handling holding the watermark back
+- Throughput reporting from GSCAPIIngestor.run
+
+All tests use mocks - no real API calls or credentials.
+"""
+
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from ingestors.api.fetch_engine import ConcurrentFetchEngine
+from ingestors.api.gsc_api_ingestor import GSCAPIIngestor, MockDBConnection
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def fast_config() -> Dict[str, Any]:
+    """Configuration with a rate limiter that never throttles"""
+    return {
+        'GSC_SVC_JSON': '/fake/path/gsc_sa.json',
+        'REQUESTS_PER_MINUTE': '100000',
+        'REQUESTS_PER_DAY': '100000',
+        'BURST_SIZE': '10000',
+        'API_COOLDOWN_SEC': '0',
+        'GSC_API_ROWS_PER_PAGE': '10',
+        'GSC_API_MAX_RETRIES': '3',
+        'BASE_BACKOFF': '0.01',
+        'MAX_BACKOFF': '0.1',
+        'BACKOFF_JITTER': 'false',
+        'INGEST_DAYS': '30',
+        'GSC_INITIAL_BACKFILL_DAYS': '10',
+        'GSC_FETCH_WORKERS': '4'
+    }
+
+
+def make_rows(day: str, count: int, offset: int = 0) -> List[Dict[str, Any]]:
+    """Build API rows for a day"""
+    return [
+        {
+            'keys': [f'https://example.com/p{offset + i}', f'q{offset + i}', 'usa', 'mobile', day],
+            'clicks': 1,
+            'impressions': 10,
+            'ctr': 0.1,
+            'position': 3.0
+        }
+        for i in range(count)
+    ]
+
+
+class RecordingService:
+    """Thread-safe mock service returning `rows_per_day` rows for every day"""
+
+    def __init__(self, rows_per_day: int = 3, fail_on: date = None):
+        self.rows_per_day = rows_per_day
+        self.fail_on = fail_on
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def query_search_analytics(self, property: str, request_body: Dict) -> Dict:
+        with self.lock:
+            self.calls.append((property, request_body['startDate'], request_body['startRow']))
+        if self.fail_on and request_body['startDate'] == self.fail_on.isoformat():
+            raise RuntimeError("boom")
+        start_row = request_body['startRow']
+        remaining = max(0, self.rows_per_day - start_row)
+        count = min(request_body['rowLimit'], remaining)
+        return {'rows': make_rows(request_body['startDate'], count, start_row)}
+
+
+@pytest.fixture
+def ingestor(fast_config):
+    """Ingestor with upsert and watermark writes recorded instead of executed"""
+    ingestor = GSCAPIIngestor(fast_config)
+    ingestor.service = RecordingService()
+    ingestor.upsert_data = Mock(side_effect=lambda rows: len(rows))
+    ingestor.update_watermark = Mock()
+    return ingestor
+
+
+# =============================================================================
+# ENGINE TESTS
+# =============================================================================
+
+class TestConcurrentFetchEngine:
+    """Test the bounded-concurrency fetch engine"""
+
+    def test_rejects_non_positive_workers(self, ingestor):
+        """Test worker count validation"""
+        with pytest.raises(ValueError):
+            ConcurrentFetchEngine(ingestor, max_workers=0)
+
+    def test_fans_out_all_properties_and_days(self, ingestor):
+        """Every (property, day) is fetched once and every day is committed"""
+        start = date(2025, 1, 1)
+        end = date(2025, 1, 5)
+        engine = ConcurrentFetchEngine(ingestor, max_workers=4)
+        engine.add_property('https://a.com/', start, end)
+        engine.add_property('https://b.com/', start, end)
+
+        results = engine.run()
+
+        assert len(ingestor.service.calls) == 10
+        assert results['https://a.com/']['rows_processed'] == 15
+        assert results['https://b.com/']['days_processed'] == 5
+        assert results['https://a.com/']['watermark'] == end.isoformat()
+        assert results['https://b.com/']['errors'] == []
+        assert 'rows_per_second' in results['https://a.com/']
+
+    def test_watermark_advances_in_date_order(self, ingestor):
+        """Watermark updates are issued in ascending date order per property"""
+        start = date(2025, 1, 1)
+        engine = ConcurrentFetchEngine(ingestor, max_workers=4)
+        engine.add_property('https://a.com/', start, start + timedelta(days=7))
+
+        engine.run()
+
+        dates = [c.args[1] for c in ingestor.update_watermark.call_args_list]
+        assert dates == [start + timedelta(days=i) for i in range(8)]
+
+    def test_pagination_continuations(self, ingestor):
+        """Full pages schedule the next offset and rows are upserted once per day"""
+        ingestor.service = RecordingService(rows_per_day=25)
+        day = date(2025, 1, 1)
+        engine = ConcurrentFetchEngine(ingestor, max_workers=2)
+        engine.add_property('https://a.com/', day, day)
+
+        results = engine.run()
+
+        offsets = sorted(call[2] for call in ingestor.service.calls)
+        assert offsets == [0, 10, 20]
+        assert ingestor.upsert_data.call_count == 1
+        assert len(ingestor.upsert_data.call_args.args[0]) == 25
+        assert results['https://a.com/']['requests'] == 3
+
+    def test_failed_day_holds_watermark(self, ingestor):
+        """A failed unit stops the watermark at the last contiguous committed day"""
+        start = date(2025, 1, 1)
+        ingestor.service = RecordingService(fail_on=date(2025, 1, 3))
+        engine = ConcurrentFetchEngine(ingestor, max_workers=1)
+        engine.add_property('https://a.com/', start, date(2025, 1, 6))
+
+        results = engine.run()
+
+        stats = results['https://a.com/']
+        assert stats['watermark'] == '2025-01-02'
+        assert len(stats['errors']) == 1
+        assert '2025-01-03' in stats['errors'][0]
+        dates = [c.args[1] for c in ingestor.update_watermark.call_args_list]
+        assert max(dates) == date(2025, 1, 2)
+
+    def test_recent_empty_day_holds_watermark(self, ingestor):
+        """Empty days inside the GSC data delay window are not committed"""
+        ingestor.service = RecordingService(rows_per_day=0)
+        yesterday = date.today() - timedelta(days=1)
+        start = yesterday - timedelta(days=9)
+        engine = ConcurrentFetchEngine(ingestor, max_workers=1)
+        engine.add_property('https://a.com/', start, yesterday)
+
+        results = engine.run()
+
+        cutoff = date.today() - timedelta(days=ingestor.gsc_data_delay_days)
+        dates = [c.args[1] for c in ingestor.update_watermark.call_args_list]
+        assert max(dates) == cutoff
+        assert results['https://a.com/']['watermark'] == cutoff.isoformat()
+        # Days after the first unavailable day are not requested with a single worker
+        assert len(ingestor.service.calls) == (cutoff - start).days + 2
+
+    def test_next_unit_rotates_properties(self, ingestor):
+        """Units are interleaved across properties"""
+        engine = ConcurrentFetchEngine(ingestor, max_workers=2)
+        engine.add_property('https://a.com/', date(2025, 1, 1), date(2025, 1, 2))
+        engine.add_property('https://b.com/', date(2025, 1, 1), date(2025, 1, 2))
+
+        units = [engine._next_unit() for _ in range(4)]
+
+        assert [u.property for u in units] == [
+            'https://a.com/', 'https://b.com/', 'https://a.com/', 'https://b.com/'
+        ]
+        assert engine._next_unit() is None
+
+
+# =============================================================================
+# INGESTOR INTEGRATION TESTS
+# =============================================================================
+
+class TestConcurrentIngestion:
+    """Test GSCAPIIngestor wiring of the fetch engine"""
+
+    def test_invalid_worker_count(self, fast_config):
+        """GSC_FETCH_WORKERS must be positive"""
+        fast_config['GSC_FETCH_WORKERS'] = '0'
+        with pytest.raises(ValueError):
+            GSCAPIIngestor(fast_config)
+
+    def test_fetch_search_analytics_page_raises(self, ingestor):
+        """Page fetches surface errors instead of returning partial data"""
+        ingestor.service = RecordingService(fail_on=date(2025, 1, 1))
+        with pytest.raises(RuntimeError):
+            ingestor.fetch_search_analytics_page('https://a.com/', date(2025, 1, 1))
+
+    def test_ingest_properties_concurrently_reports_planning_errors(self, ingestor):
+        """Properties that fail planning are reported without blocking others"""
+        def plan(property):
+            if property == 'https://bad.com/':
+                raise RuntimeError("db down")
+            return date(2025, 1, 1), date(2025, 1, 2)
+
+        with patch.object(ingestor, 'plan_ingestion_window', side_effect=plan):
+            stats = ingestor.ingest_properties_concurrently(['https://bad.com/', 'https://a.com/'])
+
+        by_property = {s['property']: s for s in stats}
+        assert 'db down' in by_property['https://bad.com/']['errors'][0]
+        assert by_property['https://a.com/']['rows_processed'] == 6
+
+    @patch('ingestors.api.gsc_api_ingestor.psycopg2.connect')
+    @patch('ingestors.api.gsc_api_ingestor.os.path.exists')
+    def test_run_uses_engine_and_reports_throughput(self, mock_exists, mock_connect, fast_config):
+        """run() fans out through the engine when more than one worker is configured"""
+        mock_exists.return_value = False
+        conn = MagicMock(spec=MockDBConnection)
+        cursor = MagicMock()
+        cursor.__enter__ = Mock(return_value=cursor)
+        cursor.__exit__ = Mock(return_value=False)
+        cursor.fetchone.return_value = None
+        cursor.fetchall.return_value = [('https://a.com/',), ('https://b.com/',)]
+        conn.cursor.return_value = cursor
+        mock_connect.return_value = conn
+
+        ingestor = GSCAPIIngestor(fast_config)
+        ingestor.upsert_data = Mock(side_effect=lambda rows: len(rows))
+
+        with patch.object(ConcurrentFetchEngine, 'run', autospec=True,
+                          side_effect=ConcurrentFetchEngine.run) as mock_run:
+            summary = ingestor.run()
+
+        assert mock_run.call_count == 1
+        assert set(summary['throughput']) == {'https://a.com/', 'https://b.com/'}
+        # MockGSCService returns 50 rows per day in pages of 10 across 10 backfill days
+        assert summary['total_rows'] == 2 * 10 * 50
+        assert summary['errors'] == []
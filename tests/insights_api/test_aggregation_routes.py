@@ -5,10 +5,20 @@ Comprehensive test suite for the aggregation endpoints using mocks
 to avoid requiring a real database connection.
 """
 import pytest
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import patch, MagicMock, Mock, AsyncMock
 from datetime import datetime
 from fastapi.testclient import TestClient
-import psycopg2
+import asyncpg
+
+
+def make_pool(rows=None, error=None):
+    """Mock asyncpg pool whose connections return rows from fetch()"""
+    mock_conn = MagicMock()
+    mock_conn.fetch = AsyncMock(return_value=rows or [], side_effect=error)
+    mock_pool = MagicMock()
+    mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return mock_pool, mock_conn
 
 
 class TestAggregationRoutes:
@@ -206,16 +216,12 @@ class TestAggregationRoutes:
             ]
         }
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_insights_by_page(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_insights_by_page(self, mock_get_pool, mock_db_rows):
         """Test by-page endpoint returns correct data"""
         # Setup mock connection and cursor
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['by_page']
+        mock_pool, mock_conn = make_pool(mock_db_rows['by_page'])
+        mock_get_pool.return_value = mock_pool
 
         # Import and test
         from insights_api.routes.aggregations import get_insights_by_page
@@ -236,20 +242,16 @@ class TestAggregationRoutes:
         assert result[1]['page_path'] == '/products/item-1'
 
         # Verify cursor execute was called with correct query
-        mock_cursor.execute.assert_called_once()
-        call_args = mock_cursor.execute.call_args
+        mock_conn.fetch.assert_called_once()
+        call_args = mock_conn.fetch.call_args
         assert 'vw_insights_by_page' in call_args[0][0]
-        assert call_args[0][1] == ('sc-domain:example.com', 100, 0)
+        assert call_args[0][1:] == ('sc-domain:example.com', 100, 0)
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_insights_by_subdomain(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_insights_by_subdomain(self, mock_get_pool, mock_db_rows):
         """Test by-subdomain endpoint returns correct data"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['by_subdomain']
+        mock_pool, mock_conn = make_pool(mock_db_rows['by_subdomain'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_subdomain
         import asyncio
@@ -266,15 +268,11 @@ class TestAggregationRoutes:
         assert result[0]['total_insights'] == 15
         assert result[1]['subdomain'] == 'products'
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_insights_by_subdomain_no_property_filter(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_insights_by_subdomain_no_property_filter(self, mock_get_pool, mock_db_rows):
         """Test by-subdomain endpoint without property filter"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['by_subdomain']
+        mock_pool, mock_conn = make_pool(mock_db_rows['by_subdomain'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_subdomain
         import asyncio
@@ -287,18 +285,14 @@ class TestAggregationRoutes:
 
         assert len(result) == 2
         # Verify the query doesn't include property filter
-        call_args = mock_cursor.execute.call_args
-        assert call_args[0][1] == (50, 0)  # Only limit and offset
+        call_args = mock_conn.fetch.call_args
+        assert call_args[0][1:] == (50, 0)  # Only limit and offset
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_insights_by_category(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_insights_by_category(self, mock_get_pool, mock_db_rows):
         """Test by-category endpoint returns correct data"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['by_category']
+        mock_pool, mock_conn = make_pool(mock_db_rows['by_category'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_category
         import asyncio
@@ -316,15 +310,11 @@ class TestAggregationRoutes:
         assert result[1]['category'] == 'opportunity'
         assert result[1]['total_insights'] == 30
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_dashboard_summary(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_dashboard_summary(self, mock_get_pool, mock_db_rows):
         """Test dashboard endpoint returns correct data"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['dashboard']
+        mock_pool, mock_conn = make_pool(mock_db_rows['dashboard'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_dashboard_summary
         import asyncio
@@ -338,15 +328,11 @@ class TestAggregationRoutes:
         assert result[0]['insights_last_7d'] == 35
         assert result[0]['high_severity_new'] == 5
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_dashboard_summary_all_properties(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_dashboard_summary_all_properties(self, mock_get_pool, mock_db_rows):
         """Test dashboard endpoint without property filter"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['dashboard']
+        mock_pool, mock_conn = make_pool(mock_db_rows['dashboard'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_dashboard_summary
         import asyncio
@@ -355,18 +341,14 @@ class TestAggregationRoutes:
 
         assert len(result) == 1
         # Verify no WHERE clause in query
-        call_args = mock_cursor.execute.call_args
+        call_args = mock_conn.fetch.call_args
         assert 'ORDER BY total_insights DESC' in call_args[0][0]
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_timeseries(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_timeseries(self, mock_get_pool, mock_db_rows):
         """Test timeseries endpoint returns correct data"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['timeseries']
+        mock_pool, mock_conn = make_pool(mock_db_rows['timeseries'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_timeseries
         import asyncio
@@ -383,15 +365,11 @@ class TestAggregationRoutes:
         assert result[0]['insight_count'] == 5
         assert result[1]['category'] == 'opportunity'
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_timeseries_with_category_filter(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_timeseries_with_category_filter(self, mock_get_pool, mock_db_rows):
         """Test timeseries endpoint with category filter"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = [mock_db_rows['timeseries'][0]]
+        mock_pool, mock_conn = make_pool([mock_db_rows['timeseries'][0]])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_timeseries
         import asyncio
@@ -406,18 +384,14 @@ class TestAggregationRoutes:
         assert result[0]['category'] == 'risk'
 
         # Verify category filter in query
-        call_args = mock_cursor.execute.call_args
-        assert call_args[0][1] == ('sc-domain:example.com', 'risk', 7)
+        call_args = mock_conn.fetch.call_args
+        assert call_args[0][1:] == ('sc-domain:example.com', 'risk', 7)
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_top_issues(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_top_issues(self, mock_get_pool, mock_db_rows):
         """Test top-issues endpoint returns correct data"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = mock_db_rows['top_issues']
+        mock_pool, mock_conn = make_pool(mock_db_rows['top_issues'])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_top_issues
         import asyncio
@@ -436,15 +410,11 @@ class TestAggregationRoutes:
         assert result[1]['id'] == 'def456'
         assert result[1]['severity'] == 'medium'
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_get_top_issues_with_filters(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_get_top_issues_with_filters(self, mock_get_pool, mock_db_rows):
         """Test top-issues endpoint with category and severity filters"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = [mock_db_rows['top_issues'][0]]
+        mock_pool, mock_conn = make_pool([mock_db_rows['top_issues'][0]])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_top_issues
         import asyncio
@@ -461,15 +431,15 @@ class TestAggregationRoutes:
         assert result[0]['category'] == 'risk'
 
         # Verify filters in query
-        call_args = mock_cursor.execute.call_args
-        assert 'category = %s' in call_args[0][0]
-        assert 'severity = %s' in call_args[0][0]
-        assert call_args[0][1] == ['sc-domain:example.com', 'risk', 'high', 10]
+        call_args = mock_conn.fetch.call_args
+        assert 'category = $2' in call_args[0][0]
+        assert 'severity = $3' in call_args[0][0]
+        assert call_args[0][1:] == ('sc-domain:example.com', 'risk', 'high', 10)
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_handles_database_error(self, mock_get_conn):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_handles_database_error(self, mock_get_pool):
         """Test error handling for database errors"""
-        mock_get_conn.side_effect = psycopg2.Error("Connection failed")
+        mock_get_pool.side_effect = OSError("Connection refused")
 
         from insights_api.routes.aggregations import get_insights_by_page
         from fastapi import HTTPException
@@ -485,29 +455,27 @@ class TestAggregationRoutes:
         assert exc_info.value.status_code == 500
         assert "Database error" in str(exc_info.value.detail)
 
-    @patch('insights_api.routes.aggregations.os.getenv')
+    @patch('insights_api.db._pool', None)
+    @patch('insights_api.db.os.getenv')
     def test_handles_missing_dsn(self, mock_getenv):
         """Test error handling when DSN not configured"""
         mock_getenv.return_value = None
 
-        from insights_api.routes.aggregations import get_db_connection
+        from insights_api.db import get_pool
         from fastapi import HTTPException
+        import asyncio
 
         with pytest.raises(HTTPException) as exc_info:
-            get_db_connection()
+            asyncio.run(get_pool())
 
         assert exc_info.value.status_code == 500
         assert "not configured" in exc_info.value.detail
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_connection_cleanup(self, mock_get_conn):
-        """Test that database connections are properly closed"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = []
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_connection_cleanup(self, mock_get_pool):
+        """Test that pooled connections are released"""
+        mock_pool, mock_conn = make_pool([])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_page
         import asyncio
@@ -518,18 +486,14 @@ class TestAggregationRoutes:
             offset=0
         ))
 
-        # Verify connection was closed
-        mock_conn.close.assert_called_once()
+        # Verify connection was returned to the pool
+        mock_pool.acquire.return_value.__aexit__.assert_awaited_once()
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_connection_cleanup_on_error(self, mock_get_conn):
-        """Test that connections are closed even when errors occur"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.side_effect = psycopg2.Error("Query failed")
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_connection_cleanup_on_error(self, mock_get_pool):
+        """Test that connections are released even when errors occur"""
+        mock_pool, mock_conn = make_pool(error=asyncpg.PostgresError("Query failed"))
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_page
         from fastapi import HTTPException
@@ -542,18 +506,14 @@ class TestAggregationRoutes:
                 offset=0
             ))
 
-        # Verify connection was still closed
-        mock_conn.close.assert_called_once()
+        # Verify connection was still returned to the pool
+        mock_pool.acquire.return_value.__aexit__.assert_awaited_once()
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_pagination_parameters(self, mock_get_conn, mock_db_rows):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_pagination_parameters(self, mock_get_pool, mock_db_rows):
         """Test that pagination parameters are correctly passed to queries"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = []
+        mock_pool, mock_conn = make_pool([])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_page
         import asyncio
@@ -564,18 +524,14 @@ class TestAggregationRoutes:
             offset=100
         ))
 
-        call_args = mock_cursor.execute.call_args
-        assert call_args[0][1] == ('sc-domain:example.com', 50, 100)
+        call_args = mock_conn.fetch.call_args
+        assert call_args[0][1:] == ('sc-domain:example.com', 50, 100)
 
-    @patch('insights_api.routes.aggregations.get_db_connection')
-    def test_empty_results(self, mock_get_conn):
+    @patch('insights_api.routes.aggregations.get_pool', new_callable=AsyncMock)
+    def test_empty_results(self, mock_get_pool):
         """Test handling of empty result sets"""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_conn.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        mock_cursor.fetchall.return_value = []
+        mock_pool, mock_conn = make_pool([])
+        mock_get_pool.return_value = mock_pool
 
         from insights_api.routes.aggregations import get_insights_by_page
         import asyncio
@@ -24,6 +24,7 @@ from insights_core.models import (
     EntityType,
 )
 from tests.fixtures.sample_data import generate_anomaly_scenario
+from tests.fixtures.conftest_helpers import persisted_insights
 
 # Base module path for patching psycopg2 (it's imported in base.py)
 BASE_PSYCOPG2_PATH = 'insights_core.detectors.base.psycopg2'
@@ -44,7 +45,7 @@ def mock_config():
 def mock_repository():
     """Mock InsightRepository"""
     repo = Mock()
-    repo.create = Mock(return_value=Mock(id="test-insight-id"))
+    repo.create_many = Mock(return_value=[])
     return repo
 
 
@@ -190,6 +191,42 @@ class TestAnomalyDetectorGetPages:
 
                 assert pages == []
 
+    def test_get_pages_uses_refresh_snapshot(
+        self,
+        mock_repository,
+        mock_config
+    ):
+        """Test pages come from the shared snapshot when one is set"""
+        from insights_core.data_snapshot import SNAPSHOT_METRICS, build_snapshot
+
+        end = date.today()
+        start = end - timedelta(days=90)
+        padding = (0,) * (len(SNAPSHOT_METRICS) - 1)
+        rows = []
+        for i in range(40):
+            day = start + timedelta(days=i)
+            rows.append(('sc-domain:example.com', '/busy', day, 10) + padding)
+            rows.append(('sc-domain:example.com', '/quiet', day, 1) + padding)
+        rows.append(('sc-domain:example.com', '/busy', end, 0) + padding)
+
+        with patch('insights_core.detectors.anomaly.ProphetForecaster'):
+            with patch(BASE_PSYCOPG2_PATH) as mock_psycopg2:
+                detector = AnomalyDetector(mock_repository, mock_config)
+                detector.snapshots = Mock()
+                detector.snapshots.get.return_value = build_snapshot(rows, start, end)
+
+                pages = detector._get_pages_to_analyze()
+
+                mock_psycopg2.connect.assert_not_called()
+                assert pages == [{
+                    'property': 'sc-domain:example.com',
+                    'page_path': '/busy',
+                    'data_points': 40,
+                    'total_clicks': 400,
+                    # Zero-click days don't count, like gsc_clicks > 0 in SQL
+                    'latest_date': start + timedelta(days=39),
+                }]
+
 
 class TestAnomalyDetectorForecastDetection:
     """Test forecast-based anomaly detection"""
@@ -775,11 +812,10 @@ class TestAnomalyDetectorIntegration:
 
                 # Verify insight was created
                 assert insights_created == 1
-                mock_repository.create.assert_called_once()
+                assert len(persisted_insights(mock_repository)) == 1
 
                 # Verify the insight created was correct type
-                call_args = mock_repository.create.call_args
-                insight_create = call_args[0][0]
+                insight_create = persisted_insights(mock_repository)[0]
                 assert isinstance(insight_create, InsightCreate)
                 assert insight_create.category == InsightCategory.RISK
 
@@ -849,7 +885,7 @@ class TestAnomalyDetectorIntegration:
                 insights_created = detector.detect()
 
                 assert insights_created == 0
-                mock_repository.create.assert_not_called()
+                assert persisted_insights(mock_repository) == []
 
     def test_detect_no_anomalies_returns_zero(
         self,
@@ -881,7 +917,7 @@ class TestAnomalyDetectorIntegration:
                     insights_created = detector.detect()
 
                 assert insights_created == 0
-                mock_repository.create.assert_not_called()
+                assert persisted_insights(mock_repository) == []
 
     def test_detect_with_property_filter(
         self,
@@ -1147,3 +1183,81 @@ class TestAnomalyScenarios:
             # Should detect anomaly (300 >> 120)
             assert anomaly is not None
             assert anomaly['direction'] == 'above'
+
+
+class TestAnomalyDetectorBatchMode:
+    """Test batch forecasting mode of detect()"""
+
+    @pytest.fixture
+    def batch_config(self, mock_config):
+        """Config selecting batch mode"""
+        mock_config.anomaly_forecast_mode = 'batch'
+        mock_config.anomaly_batch_max_pages = 1000
+        mock_config.anomaly_prophet_workers = 2
+        return mock_config
+
+    @pytest.fixture
+    def series_batch(self):
+        """Two steady pages and one with a last-day drop"""
+        from insights_core.batch_forecasting import generate_synthetic_batch
+        batch, _ = generate_synthetic_batch(3, anomaly_rate=0.0, seed=3)
+        batch.values[1, -1] = batch.values[1, -2] * 0.1
+        return batch
+
+    def test_detect_batch_creates_insight_for_confirmed_page(
+        self, mock_repository, batch_config, series_batch
+    ):
+        """Only the flagged page is refitted with Prophet and reported"""
+        with patch('insights_core.detectors.anomaly.ProphetForecaster'), \
+                patch(BASE_PSYCOPG2_PATH), \
+                patch('insights_core.detectors.anomaly.fetch_series_batch', return_value=series_batch) as mock_fetch, \
+                patch('insights_core.detectors.anomaly.refit_with_prophet') as mock_refit:
+            mock_refit.return_value = {1: (100.0, 80.0, 120.0)}
+
+            detector = AnomalyDetector(mock_repository, batch_config)
+            with patch.object(detector, '_detect_forecast_anomaly_sync') as mock_per_page:
+                insights_created = detector.detect(property='sc-domain:example.com')
+
+            mock_per_page.assert_not_called()
+            assert mock_fetch.call_args.kwargs['property'] == 'sc-domain:example.com'
+            assert list(mock_refit.call_args.args[1]) == [1]
+            assert mock_refit.call_args.kwargs['max_workers'] == 2
+            assert insights_created == 1
+
+            insight = persisted_insights(mock_repository)[-1]
+            assert insight.entity_id == '/page-1'
+            assert insight.category == InsightCategory.RISK
+            assert insight.metrics.forecast_upper_bound == 120.0
+
+    def test_detect_batch_prophet_within_interval_is_dropped(
+        self, mock_repository, batch_config, series_batch
+    ):
+        """A baseline flag that Prophet explains creates no insight"""
+        with patch('insights_core.detectors.anomaly.ProphetForecaster'), \
+                patch(BASE_PSYCOPG2_PATH), \
+                patch('insights_core.detectors.anomaly.fetch_series_batch', return_value=series_batch), \
+                patch('insights_core.detectors.anomaly.refit_with_prophet') as mock_refit:
+            actual = float(series_batch.values[1, -1])
+            mock_refit.return_value = {1: (actual, actual - 1, actual + 1)}
+
+            detector = AnomalyDetector(mock_repository, batch_config)
+            insights_created = detector.detect()
+
+            assert insights_created == 0
+            assert persisted_insights(mock_repository) == []
+
+    def test_detect_batch_without_workers_uses_baseline(
+        self, mock_repository, batch_config, series_batch
+    ):
+        """With no Prophet workers the baseline verdict stands"""
+        batch_config.anomaly_prophet_workers = 0
+        with patch('insights_core.detectors.anomaly.ProphetForecaster'), \
+                patch(BASE_PSYCOPG2_PATH), \
+                patch('insights_core.detectors.anomaly.fetch_series_batch', return_value=series_batch), \
+                patch('insights_core.detectors.anomaly.refit_with_prophet') as mock_refit:
+
+            detector = AnomalyDetector(mock_repository, batch_config)
+            insights_created = detector.detect()
+
+            mock_refit.assert_not_called()
+            assert insights_created == 1
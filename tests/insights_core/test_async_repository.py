@@ -0,0 +1,145 @@
+"""
+Tests for AsyncInsightRepository (MOCK MODE)
+
+Tests the asyncpg-backed read/update paths with a mocked pool - no real database.
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from insights_core.async_repository import AsyncInsightRepository
+from insights_core.models import (
+    InsightCategory,
+    InsightSeverity,
+    InsightStatus,
+    InsightUpdate,
+    EntityType
+)
+
+
+@pytest.fixture
+def sample_db_row():
+    """Sample row as returned by asyncpg (JSONB as text)"""
+    return {
+        'id': 'test-id-12345',
+        'generated_at': datetime(2024, 11, 15, 12, 0),
+        'property': 'sc-domain:example.com',
+        'entity_type': 'page',
+        'entity_id': '/test-page',
+        'category': 'risk',
+        'title': 'Test Traffic Drop',
+        'description': 'Test insight for validation',
+        'severity': 'high',
+        'confidence': 0.85,
+        'metrics': json.dumps({'gsc_clicks': 100.0, 'gsc_clicks_change': -25.5}),
+        'window_days': 7,
+        'source': 'TestDetector',
+        'status': 'new',
+        'linked_insight_id': None,
+        'created_at': datetime(2024, 11, 15, 12, 0),
+        'updated_at': datetime(2024, 11, 15, 12, 0)
+    }
+
+
+@pytest.fixture
+def mock_conn():
+    """Mock asyncpg connection"""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.fetchrow = AsyncMock(return_value=None)
+    return conn
+
+
+@pytest.fixture
+def repository(mock_conn):
+    """Repository on a mock pool handing out mock_conn"""
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return AsyncInsightRepository(pool)
+
+
+class TestAsyncInsightRepository:
+    """Test AsyncInsightRepository"""
+
+    async def test_get_by_id_found(self, repository, mock_conn, sample_db_row):
+        mock_conn.fetchrow.return_value = sample_db_row
+
+        insight = await repository.get_by_id('test-id-12345')
+
+        assert insight.id == 'test-id-12345'
+        assert insight.metrics.gsc_clicks == 100.0
+        assert mock_conn.fetchrow.call_args.args[1:] == ('test-id-12345',)
+
+    async def test_get_by_id_not_found(self, repository, mock_conn):
+        assert await repository.get_by_id('missing') is None
+
+    async def test_query_numbers_placeholders(self, repository, mock_conn, sample_db_row):
+        """Only set filters are bound, followed by limit and offset"""
+        mock_conn.fetch.return_value = [sample_db_row]
+
+        insights = await repository.query(
+            property='sc-domain:example.com',
+            severity=InsightSeverity.HIGH,
+            entity_type=EntityType.PAGE,
+            limit=10,
+            offset=20
+        )
+
+        assert len(insights) == 1
+        query, *args = mock_conn.fetch.call_args.args
+        assert 'property = $1 AND severity = $2 AND entity_type = $3' in query
+        assert 'LIMIT $4 OFFSET $5' in query
+        assert args == ['sc-domain:example.com', 'high', 'page', 10, 20]
+
+    async def test_query_no_filters(self, repository, mock_conn):
+        await repository.query()
+
+        query, *args = mock_conn.fetch.call_args.args
+        assert 'WHERE' not in query
+        assert args == [100, 0]
+
+    async def test_get_by_category(self, repository, mock_conn):
+        await repository.get_by_category(InsightCategory.OPPORTUNITY, property='p', limit=5)
+
+        assert mock_conn.fetch.call_args.args[1:] == ('p', 'opportunity', 5, 0)
+
+    async def test_get_for_entity(self, repository, mock_conn):
+        await repository.get_for_entity('page', '/a', 'p', days_back=30)
+
+        args = mock_conn.fetch.call_args.args[1:]
+        assert args[:3] == ('page', '/a', 'p')
+        assert isinstance(args[3], datetime)
+
+    async def test_query_recent_with_property(self, repository, mock_conn):
+        await repository.query_recent(hours=12, property='p')
+
+        query, *args = mock_conn.fetch.call_args.args
+        assert 'property = $2' in query
+        assert args[1] == 'p'
+
+    async def test_update_status(self, repository, mock_conn, sample_db_row):
+        mock_conn.fetchrow.return_value = {**sample_db_row, 'status': 'diagnosed'}
+
+        insight = await repository.update('test-id-12345', InsightUpdate(status=InsightStatus.DIAGNOSED))
+
+        assert insight.status == InsightStatus.DIAGNOSED
+        query, *args = mock_conn.fetchrow.call_args.args
+        assert 'UPDATE gsc.insights' in query
+        assert args == ['test-id-12345', 'diagnosed', None, None]
+
+    async def test_update_empty_returns_existing(self, repository, mock_conn, sample_db_row):
+        mock_conn.fetchrow.return_value = sample_db_row
+
+        insight = await repository.update('test-id-12345', InsightUpdate())
+
+        assert insight.id == 'test-id-12345'
+        assert 'SELECT' in mock_conn.fetchrow.call_args.args[0]
+
+    async def test_get_stats(self, repository, mock_conn):
+        mock_conn.fetchrow.return_value = {'total_insights': 3, 'unique_properties': 1}
+
+        assert (await repository.get_stats())['total_insights'] == 3
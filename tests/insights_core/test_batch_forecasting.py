@@ -0,0 +1,241 @@
+"""
+Tests for the vectorized batch forecasting engine
+
+Tests cover:
+- Pivoting long rows into the pages x days array
+- Single-query fetch and metric validation
+- Seasonal baseline scoring (spikes, drops, weekly seasonality, sparse pages)
+- Prophet refits for the flagged subset
+- Benchmark output
+
+All tests use mocks or synthetic series - no real database.
+"""
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from insights_core.batch_forecasting import (
+    SeriesBatch,
+    benchmark,
+    build_series_batch,
+    fetch_series_batch,
+    generate_synthetic_batch,
+    refit_with_prophet,
+    score_batch,
+)
+
+
+def make_batch(series, days=60, end=date(2025, 3, 2)):
+    """SeriesBatch from {page_path: values} aligned to the last days"""
+    start = end - timedelta(days=days - 1)
+    dates = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    values = np.array([np.asarray(v, dtype=float) for v in series.values()])
+    keys = [('sc-domain:example.com', path) for path in series]
+    return SeriesBatch(keys=keys, dates=dates, values=values)
+
+
+def weekly_series(days=60, weekday=100.0, weekend=40.0, end=date(2025, 3, 2), noise=0.0, seed=0):
+    """Series with a weekend dip ending on `end`"""
+    rng = np.random.default_rng(seed)
+    start = end - timedelta(days=days - 1)
+    values = [
+        (weekend if (start + timedelta(days=i)).weekday() >= 5 else weekday)
+        for i in range(days)
+    ]
+    return np.asarray(values) + rng.normal(0, noise, days)
+
+
+class TestBuildSeriesBatch:
+    """Test build_series_batch()"""
+
+    def test_pivots_rows_with_gaps(self):
+        """Rows land in their page/day cell; missing days are NaN"""
+        start = date(2025, 1, 1)
+        rows = [
+            ('p', '/a', date(2025, 1, 1), 5),
+            ('p', '/b', date(2025, 1, 2), 7),
+            ('p', '/a', date(2025, 1, 3), 9),
+        ]
+
+        batch = build_series_batch(rows, start, date(2025, 1, 3))
+
+        assert batch.keys == [('p', '/a'), ('p', '/b')]
+        assert batch.values.shape == (2, 3)
+        np.testing.assert_array_equal(batch.values[0], [5, np.nan, 9])
+        np.testing.assert_array_equal(batch.values[1], [np.nan, 7, np.nan])
+
+    def test_ignores_rows_outside_window(self):
+        """Dates outside [start, end] and NULL values are dropped"""
+        rows = [
+            ('p', '/a', date(2024, 12, 31), 5),
+            ('p', '/a', date(2025, 1, 1), None),
+            ('p', '/a', date(2025, 1, 2), 3),
+        ]
+
+        batch = build_series_batch(rows, date(2025, 1, 1), date(2025, 1, 2))
+
+        np.testing.assert_array_equal(batch.values[0], [np.nan, 3])
+
+    def test_observed_series(self):
+        """observed_series skips missing days"""
+        rows = [('p', '/a', date(2025, 1, 1), 5), ('p', '/a', date(2025, 1, 3), 9)]
+        batch = build_series_batch(rows, date(2025, 1, 1), date(2025, 1, 3))
+
+        ds, y = batch.observed_series(0)
+
+        assert ds == [date(2025, 1, 1), date(2025, 1, 3)]
+        assert y == [5.0, 9.0]
+
+
+class TestFetchSeriesBatch:
+    """Test fetch_series_batch()"""
+
+    def test_single_query_with_property_filter(self):
+        """All pages come back from one query with eligibility in SQL"""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [('p', '/a', date.today(), 10.0)]
+
+        batch = fetch_series_batch(conn, property='p', max_pages=250)
+
+        cursor.execute.assert_called_once()
+        query, params = cursor.execute.call_args.args
+        assert 'HAVING COUNT(*) >= %s' in query
+        assert params[1:] == ['p', 30, 100, 250]
+        assert len(batch) == 1
+        assert batch.values.shape == (1, 91)
+
+    def test_rejects_unknown_metric(self):
+        """Metric names are interpolated, so only known columns are accepted"""
+        with pytest.raises(ValueError, match='Unsupported metric'):
+            fetch_series_batch(MagicMock(), metric='gsc_clicks; DROP TABLE x')
+
+
+class TestScoreBatch:
+    """Test score_batch()"""
+
+    def test_flags_spike_and_drop(self):
+        """Last-day spikes and drops fall outside the interval"""
+        steady = weekly_series(noise=3, seed=1)
+        spike = weekly_series(noise=3, seed=2)
+        spike[-1] *= 3
+        drop = weekly_series(noise=3, seed=3)
+        drop[-1] *= 0.3
+
+        scores = score_batch(make_batch({'/steady': steady, '/spike': spike, '/drop': drop}))
+
+        assert scores.flagged.tolist() == [False, True, True]
+        assert scores.actual[1] > scores.upper[1]
+        assert scores.actual[2] < scores.lower[2]
+
+    def test_weekend_dip_is_not_anomalous(self):
+        """A normal weekend value is expected at the weekend level"""
+        series = weekly_series(noise=2, seed=4)  # 2025-03-02 is a Sunday
+
+        scores = score_batch(make_batch({'/page': series}))
+
+        assert not scores.flagged[0]
+        assert scores.expected[0] == pytest.approx(40, rel=0.1)
+
+    def test_scores_latest_observed_day(self):
+        """Trailing missing days are skipped"""
+        series = weekly_series(noise=2, seed=5)
+        series[-2:] = np.nan
+
+        batch = make_batch({'/page': series})
+        scores = score_batch(batch)
+
+        assert scores.latest_index[0] == 57
+        assert scores.latest_date(batch, 0) == date(2025, 2, 28)
+
+    def test_insufficient_data_never_flagged(self):
+        """Pages below min_points are not flagged"""
+        series = np.full(60, np.nan)
+        series[-10:] = 100
+        series[-1] = 1000
+
+        scores = score_batch(make_batch({'/sparse': series}))
+
+        assert not scores.enough_data[0]
+        assert not scores.flagged[0]
+
+    def test_empty_batch(self):
+        """No pages scores to empty arrays"""
+        batch = SeriesBatch(keys=[], dates=np.arange(np.datetime64('2025-01-01'), np.datetime64('2025-03-01')),
+                            values=np.empty((0, 59)))
+
+        scores = score_batch(batch)
+
+        assert scores.flagged.shape == (0,)
+
+
+class TestRefitWithProphet:
+    """Test refit_with_prophet()"""
+
+    @patch('insights_core.batch_forecasting.fit_prophet_interval')
+    def test_fits_only_requested_pages(self, mock_fit):
+        """Only the flagged indices are fitted"""
+        mock_fit.return_value = (100.0, 80.0, 120.0)
+        batch = make_batch({'/a': weekly_series(), '/b': weekly_series(), '/c': weekly_series()})
+
+        results = refit_with_prophet(batch, [2], max_workers=1)
+
+        assert results == {2: (100.0, 80.0, 120.0)}
+        mock_fit.assert_called_once()
+
+    @patch('insights_core.batch_forecasting.fit_prophet_interval')
+    def test_failed_fit_returns_none(self, mock_fit):
+        """A failing fit is reported as None for that page"""
+        mock_fit.side_effect = [ValueError("bad series"), (1.0, 0.0, 2.0)]
+        batch = make_batch({'/a': weekly_series(), '/b': weekly_series()})
+
+        results = refit_with_prophet(batch, [0, 1], max_workers=1)
+
+        assert results == {0: None, 1: (1.0, 0.0, 2.0)}
+
+    @patch('insights_core.batch_forecasting.ProcessPoolExecutor')
+    def test_uses_process_pool(self, mock_pool_class):
+        """Several pages are fitted in a process pool"""
+        future = Mock()
+        future.result.return_value = (1.0, 0.0, 2.0)
+        pool = mock_pool_class.return_value.__enter__.return_value
+        pool.submit.return_value = future
+        batch = make_batch({'/a': weekly_series(), '/b': weekly_series()})
+
+        with patch('insights_core.batch_forecasting.as_completed', side_effect=lambda fs: list(fs)):
+            refit_with_prophet(batch, [0, 1], max_workers=4)
+
+        mock_pool_class.assert_called_once_with(max_workers=2)
+        assert pool.submit.call_count == 2
+
+
+class TestBenchmark:
+    """Test benchmark()"""
+
+    @patch('insights_core.batch_forecasting.refit_with_prophet')
+    def test_reports_rates_and_agreement(self, mock_refit):
+        """Benchmark reports pages/sec for both methods and agreement"""
+        batch, injected = generate_synthetic_batch(200, anomaly_rate=0.2, seed=7)
+        scores = score_batch(batch)
+        # Prophet stand-in that agrees with the baseline everywhere
+        mock_refit.side_effect = lambda b, idx, max_workers: {
+            int(i): (scores.expected[i], scores.lower[i], scores.upper[i]) for i in idx
+        }
+
+        results = benchmark(batch, prophet_sample=20)
+
+        assert results['pages'] == 200
+        assert results['prophet']['sample'] == 20
+        assert results['agreement'] == 1.0
+        assert results['baseline']['pages_per_second'] > 0
+
+    def test_synthetic_anomalies_are_found(self):
+        """Most injected anomalies are flagged by the baseline"""
+        batch, injected = generate_synthetic_batch(500, anomaly_rate=0.1, seed=11)
+
+        scores = score_batch(batch)
+
+        assert (scores.flagged & injected).sum() >= 0.9 * injected.sum()
@@ -30,6 +30,7 @@ from insights_core.models import (
     Insight
 )
 from tests.fixtures.sample_data import generate_cannibalization_data, reset_seed
+from tests.fixtures.conftest_helpers import persisted_insights
 
 
 @pytest.fixture
@@ -45,7 +46,7 @@ def mock_repository():
     """Mock InsightRepository"""
     repository = Mock()
     # Mock create to return a valid Insight
-    repository.create = Mock(return_value=Mock(spec=Insight))
+    repository.create_many = Mock(return_value=[])
     return repository
 
 
@@ -141,7 +142,7 @@ class TestDetect:
             with patch.object(detector, '_identify_winner_loser', return_value=winner_loser):
                 result = detector.detect(property='sc-domain:example.com')
                 assert result == 1
-                detector.repository.create.assert_called_once()
+                assert len(persisted_insights(detector.repository)) == 1
 
     def test_detect_avoids_duplicate_pairs(self, detector):
         """Test that detector processes each pair only once"""
@@ -230,7 +231,7 @@ class TestDetect:
             'recommendation': 'consolidate'
         }
 
-        detector.repository.create.side_effect = Exception("Duplicate insight")
+        detector.repository.create_many.side_effect = Exception("Database write failed")
 
         with patch.object(detector, '_find_keyword_overlaps', return_value=overlaps):
             with patch.object(detector, '_identify_winner_loser', return_value=winner_loser):
@@ -245,30 +246,39 @@ class TestDetect:
             assert result == 0
 
 
+def keyword_rows(pages):
+    """gsc.search_performance (page, query) rows; clicks/impressions split evenly"""
+    rows = []
+    for page, (keywords, clicks, impressions) in pages.items():
+        for keyword in keywords:
+            rows.append({
+                'page': page,
+                'query': keyword,
+                'clicks': clicks / len(keywords),
+                'impressions': impressions / len(keywords)
+            })
+    return rows
+
+
+def mock_scan(rows):
+    """Connection whose cursor streams the given rows once"""
+    mock_conn = Mock()
+    mock_cursor = Mock()
+    mock_cursor.fetchmany.side_effect = [rows, []]
+    mock_cursor.close = Mock()
+    mock_conn.cursor.return_value = mock_cursor
+    return mock_conn, mock_cursor
+
+
 class TestFindKeywordOverlaps:
-    """Test keyword overlap detection"""
+    """Test keyword overlap detection (served by the sparse keyword matrix)"""
 
     def test_find_keyword_overlaps_success(self, detector):
         """Test successful keyword overlap detection"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
-
-        # Mock database response - proper dict
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/page1',
-                'page_b': '/page2',
-                'keywords_a': ['keyword1', 'keyword2', 'keyword3', 'keyword4'],
-                'keywords_b': ['keyword2', 'keyword3', 'keyword4', 'keyword5'],
-                'shared_keywords': ['keyword2', 'keyword3', 'keyword4'],
-                'clicks_a': 100,
-                'clicks_b': 50,
-                'impressions_a': 1000,
-                'impressions_b': 500
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+        mock_conn, mock_cursor = mock_scan(keyword_rows({
+            '/page1': (['keyword1', 'keyword2', 'keyword3', 'keyword4'], 100, 1000),
+            '/page2': (['keyword2', 'keyword3', 'keyword4', 'keyword5'], 50, 500),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
@@ -278,287 +288,141 @@ class TestFindKeywordOverlaps:
             assert overlap['page_a'] == '/page1'
             assert overlap['page_b'] == '/page2'
             assert overlap['shared_count'] == 3
+            assert sorted(overlap['shared_keywords']) == ['keyword2', 'keyword3', 'keyword4']
             # Union: keyword1, keyword2, keyword3, keyword4, keyword5 = 5
             # Intersection: keyword2, keyword3, keyword4 = 3
             # Jaccard: 3/5 = 0.6
             assert overlap['overlap_score'] == 0.6
+            assert overlap['clicks_a'] == 100
+            assert overlap['impressions_b'] == 500
 
-    def test_find_keyword_overlaps_same_keyword_multiple_pages(self, detector):
-        """Test same keyword appearing on multiple pages"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
-
-        # Three pages competing for same keywords
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/page1',
-                'page_b': '/page2',
-                'keywords_a': ['python tutorial', 'python guide', 'learn python'],
-                'keywords_b': ['python tutorial', 'python guide', 'python basics'],
-                'shared_keywords': ['python tutorial', 'python guide'],
-                'clicks_a': 150,
-                'clicks_b': 120,
-                'impressions_a': 2000,
-                'impressions_b': 1800
-            },
-            {
-                'page_a': '/page1',
-                'page_b': '/page3',
-                'keywords_a': ['python tutorial', 'python guide', 'learn python'],
-                'keywords_b': ['python tutorial', 'python course'],
-                'shared_keywords': ['python tutorial'],
-                'clicks_a': 150,
-                'clicks_b': 80,
-                'impressions_a': 2000,
-                'impressions_b': 1000
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_single_scan(self, detector):
+        """One aggregated scan of search_performance with the detector's filters"""
+        mock_conn, mock_cursor = mock_scan([])
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
-            overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
+            detector._find_keyword_overlaps('sc-domain:example.com')
 
-            assert len(overlaps) == 2
-            # Verify first overlap (page1 vs page2)
-            assert overlaps[0]['shared_count'] == 2
-            # Verify second overlap (page1 vs page3)
-            assert overlaps[1]['shared_count'] == 1
+        assert mock_cursor.execute.call_count == 1
+        sql, params = mock_cursor.execute.call_args.args
+        assert 'gsc.search_performance' in sql
+        assert 'CROSS JOIN' not in sql
+        assert params == ('sc-domain:example.com', 30, detector.MIN_KEYWORD_IMPRESSIONS)
+        mock_conn.close.assert_called_once()
 
-    def test_find_keyword_overlaps_different_intent_keywords(self, detector):
-        """Test pages with different intent keywords (no cannibalization)"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
-
-        # No shared keywords - different intent
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/buy-shoes',
-                'page_b': '/shoe-reviews',
-                'keywords_a': ['buy shoes online', 'cheap shoes', 'shoe store'],
-                'keywords_b': ['shoe reviews', 'best shoes', 'shoe ratings'],
-                'shared_keywords': [],
-                'clicks_a': 100,
-                'clicks_b': 80,
-                'impressions_a': 1200,
-                'impressions_b': 1000
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_same_keyword_multiple_pages(self, detector):
+        """Test same keywords appearing on multiple pages"""
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/page1': (['python tutorial', 'python guide', 'learn python', 'python basics'], 150, 2000),
+            '/page2': (['python tutorial', 'python guide', 'learn python', 'python course'], 120, 1800),
+            '/page3': (['python tutorial', 'python guide', 'python basics', 'python course'], 80, 1000),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            # Should return empty because no shared keywords
-            assert len(overlaps) == 0
-
-    def test_find_keyword_overlaps_single_page_keyword(self, detector):
-        """Test when keyword appears on only one page"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
+            pairs = {(o['page_a'], o['page_b']): o['shared_count'] for o in overlaps}
+            assert pairs == {('/page1', '/page2'): 3, ('/page1', '/page3'): 3, ('/page2', '/page3'): 3}
 
-        # Only one page - no pairs to compare
-        mock_cursor.fetchall.return_value = []
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_below_min_shared(self, detector):
+        """Pairs sharing fewer than MIN_SHARED_KEYWORDS are not returned"""
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/seo-tips': (['seo tips', 'seo best practices', 'seo optimization', 'seo tricks'], 120, 1500),
+            '/seo-guide': (['seo guide', 'seo best practices', 'seo optimization', 'seo tutorial'], 100, 1200),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            assert len(overlaps) == 0
-
-    def test_find_keyword_overlaps_high_similarity_urls(self, detector):
-        """Test pages with high URL similarity"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
+            assert overlaps == []
 
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/blog/python-tutorial',
-                'page_b': '/blog/python-tutorial/',  # Trailing slash variant
-                'keywords_a': ['python tutorial', 'learn python', 'python guide'],
-                'keywords_b': ['python tutorial', 'learn python', 'python guide'],
-                'shared_keywords': ['python tutorial', 'learn python', 'python guide'],
-                'clicks_a': 100,
-                'clicks_b': 95,
-                'impressions_a': 1000,
-                'impressions_b': 950
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_different_intent_keywords(self, detector):
+        """Test pages with different intent keywords (no cannibalization)"""
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/buy-shoes': (['buy shoes online', 'cheap shoes', 'shoe store'], 100, 1200),
+            '/shoe-reviews': (['shoe reviews', 'best shoes', 'shoe ratings'], 80, 1000),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            assert len(overlaps) == 1
-            # Perfect overlap (100%)
-            assert overlaps[0]['overlap_score'] == 1.0
-
-    def test_find_keyword_overlaps_no_cannibalization(self, detector):
-        """Test normal scenario with no cannibalization issues"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
+            assert len(overlaps) == 0
 
-        # Minimal overlap - below threshold
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/products/shoes',
-                'page_b': '/products/boots',
-                'keywords_a': ['shoes', 'sneakers', 'running shoes', 'casual shoes'],
-                'keywords_b': ['boots', 'winter boots', 'hiking boots', 'shoes'],
-                'shared_keywords': ['shoes'],
-                'clicks_a': 200,
-                'clicks_b': 150,
-                'impressions_a': 2000,
-                'impressions_b': 1500
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_single_page(self, detector):
+        """Test when only one page qualifies"""
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/only': (['a', 'b', 'c'], 100, 1000),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            assert len(overlaps) == 1
-            # Low overlap score (1/7 ≈ 0.14)
-            assert overlaps[0]['overlap_score'] < 0.5
-
-    def test_find_keyword_overlaps_partial_overlap(self, detector):
-        """Test partial keyword overlap scenario"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
+            assert len(overlaps) == 0
 
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/seo-tips',
-                'page_b': '/seo-guide',
-                'keywords_a': ['seo tips', 'seo best practices', 'seo optimization', 'seo tricks'],
-                'keywords_b': ['seo guide', 'seo best practices', 'seo optimization', 'seo tutorial'],
-                'shared_keywords': ['seo best practices', 'seo optimization'],
-                'clicks_a': 120,
-                'clicks_b': 100,
-                'impressions_a': 1500,
-                'impressions_b': 1200
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_trailing_slash_variants(self, detector):
+        """Test trailing slash URL variants"""
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/resources/documentation': (['documentation', 'docs', 'reference'], 150, 1500),
+            '/resources/documentation/': (['documentation', 'docs', 'reference'], 148, 1480),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
             assert len(overlaps) == 1
-            # Partial overlap: 2 shared out of 6 unique = 0.33
-            overlap_score = overlaps[0]['overlap_score']
-            assert 0.3 <= overlap_score <= 0.4
-
-    def test_find_keyword_overlaps_subdomain_variants(self, detector):
-        """Test subdomain URL variants"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
+            # Perfect overlap
+            assert overlaps[0]['overlap_score'] == 1.0
 
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': 'https://www.example.com/guide',
-                'page_b': 'https://blog.example.com/guide',
-                'keywords_a': ['guide', 'tutorial', 'how to'],
-                'keywords_b': ['guide', 'tutorial', 'walkthrough'],
-                'shared_keywords': ['guide', 'tutorial'],
-                'clicks_a': 80,
-                'clicks_b': 60,
-                'impressions_a': 800,
-                'impressions_b': 600
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_low_overlap_score(self, detector):
+        """Pairs above MIN_SHARED_KEYWORDS are returned with their Jaccard score"""
+        shared = ['shoes', 'footwear', 'sneakers']
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/products/shoes': (shared + ['running shoes', 'casual shoes', 'trainers'], 200, 2000),
+            '/products/boots': (shared + ['boots', 'winter boots', 'hiking boots'], 150, 1500),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
             assert len(overlaps) == 1
-            assert overlaps[0]['page_a'] == 'https://www.example.com/guide'
-            assert overlaps[0]['page_b'] == 'https://blog.example.com/guide'
+            # 3 shared out of 9 unique
+            assert overlaps[0]['overlap_score'] == pytest.approx(1 / 3)
 
-    def test_find_keyword_overlaps_trailing_slash_variants(self, detector):
-        """Test trailing slash URL variants"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
-
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/resources/documentation',
-                'page_b': '/resources/documentation/',
-                'keywords_a': ['documentation', 'docs', 'reference'],
-                'keywords_b': ['documentation', 'docs', 'reference'],
-                'shared_keywords': ['documentation', 'docs', 'reference'],
-                'clicks_a': 150,
-                'clicks_b': 148,
-                'impressions_a': 1500,
-                'impressions_b': 1480
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_min_page_clicks(self, detector):
+        """Pages below MIN_PAGE_CLICKS are excluded before pairing"""
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/a': (['x', 'y', 'z'], 100, 1000),
+            '/b': (['x', 'y', 'z'], 5, 1000),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            assert len(overlaps) == 1
-            # Perfect overlap
-            assert overlaps[0]['overlap_score'] == 1.0
+            assert overlaps == []
 
-    def test_find_keyword_overlaps_empty_data(self, detector):
-        """Test with empty database result"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
-        mock_cursor.fetchall.return_value = []
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_top_k_per_page(self, detector):
+        """Each page keeps at most MAX_PAIRS_PER_PAGE partners"""
+        detector.MAX_PAIRS_PER_PAGE = 1
+        mock_conn, _ = mock_scan(keyword_rows({
+            '/hub': (['a', 'b', 'c', 'd', 'e'], 100, 1000),
+            '/near': (['a', 'b', 'c', 'd'], 100, 1000),
+            '/far': (['a', 'b', 'c'], 100, 1000),
+        }))
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            assert len(overlaps) == 0
-
-    def test_find_keyword_overlaps_null_queries(self, detector):
-        """Test handling of null/None values in queries"""
-        mock_conn = Mock()
-        mock_cursor = Mock()
+            # /far's best partner is /hub or /near (3 shared each), /hub's is /near (4)
+            assert overlaps[0]['page_a'] == '/hub' and overlaps[0]['page_b'] == '/near'
+            assert len(overlaps) == 2
 
-        mock_cursor.fetchall.return_value = [
-            {
-                'page_a': '/page1',
-                'page_b': '/page2',
-                'keywords_a': None,
-                'keywords_b': ['keyword1', 'keyword2'],
-                'shared_keywords': None,
-                'clicks_a': 100,
-                'clicks_b': 50,
-                'impressions_a': 1000,
-                'impressions_b': 500
-            },
-            {
-                'page_a': '/page3',
-                'page_b': '/page4',
-                'keywords_a': ['keyword1'],
-                'keywords_b': None,
-                'shared_keywords': [],
-                'clicks_a': 100,
-                'clicks_b': 50,
-                'impressions_a': 1000,
-                'impressions_b': 500
-            }
-        ]
-        mock_cursor.close = Mock()
-        mock_conn.cursor.return_value = mock_cursor
+    def test_find_keyword_overlaps_empty_data(self, detector):
+        """Test with empty database result"""
+        mock_conn, _ = mock_scan([])
 
         with patch.object(detector, '_get_db_connection', return_value=mock_conn):
             overlaps = detector._find_keyword_overlaps('sc-domain:example.com')
 
-            # Should skip rows with null data
             assert len(overlaps) == 0
 
     def test_find_keyword_overlaps_database_error(self, detector):
@@ -1098,10 +962,10 @@ class TestIntegration:
 
                 # Verify flow completed
                 assert result == 1
-                assert detector.repository.create.called
+                assert persisted_insights(detector.repository)
 
                 # Verify insight structure
-                call_args = detector.repository.create.call_args[0][0]
+                call_args = persisted_insights(detector.repository)[-1]
                 assert isinstance(call_args, InsightCreate)
                 assert call_args.category == InsightCategory.RISK
                 assert call_args.entity_type == EntityType.PAGE
@@ -1147,4 +1011,4 @@ class TestIntegration:
 
                 # Should create 2 insights
                 assert result == 2
-                assert detector.repository.create.call_count == 2
+                assert len(persisted_insights(detector.repository)) == 2
@@ -0,0 +1,253 @@
+"""
+Tests for the quota-aware collection scheduler
+
+Tests cover:
+- Token bucket reservations and burst capacity
+- Bounded concurrency, retries with backoff and non-retryable errors
+- Batched writes and write failures
+- SerpTracker.track_all_queries and CoreWebVitalsMonitor.monitor_pages
+  storing results in batches (mocked pool)
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from insights_core import collection_scheduler
+from insights_core.collection_scheduler import (
+    CollectionScheduler,
+    ProviderQuota,
+    TokenBucket,
+    get_provider_quota,
+    is_retryable,
+)
+
+
+def http_error(status, headers=None):
+    request = httpx.Request('GET', 'https://api.example.com/search')
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f'{status}', request=request, response=response)
+
+
+def scheduler(max_concurrency=4, max_retries=2, rate=1000.0):
+    return CollectionScheduler(
+        'test',
+        quota=ProviderQuota(rate_per_second=rate, burst=100, max_concurrency=max_concurrency),
+        bucket=TokenBucket(rate, 100),
+        max_retries=max_retries,
+        backoff_base=0.001,
+    )
+
+
+@pytest.fixture
+def pool():
+    conn = MagicMock()
+    conn.executemany = AsyncMock()
+    conn.fetch = AsyncMock(return_value=[])
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool, conn
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate_per_second=10.0, capacity=2)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    async def test_acquire_waits(self):
+        bucket = TokenBucket(rate_per_second=50.0, capacity=1)
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+
+        assert loop.time() - start >= 0.05
+
+
+class TestProviderQuota:
+    def test_known_providers(self):
+        for provider in ('valueserp', 'serpapi', 'serpstack', 'pagespeed'):
+            assert provider in collection_scheduler.DEFAULT_PROVIDER_QUOTAS
+
+    def test_environment_override(self, monkeypatch):
+        monkeypatch.setenv('PAGESPEED_MAX_CONCURRENCY', '2')
+
+        quota = get_provider_quota('pagespeed')
+
+        assert quota.max_concurrency == 2
+        assert quota.rate_per_second == collection_scheduler.DEFAULT_PROVIDER_QUOTAS['pagespeed'].rate_per_second
+
+    def test_retryable_errors(self):
+        assert is_retryable(http_error(429))
+        assert is_retryable(http_error(503))
+        assert is_retryable(httpx.ConnectError('refused'))
+        assert not is_retryable(http_error(400))
+        assert not is_retryable(ValueError('bad'))
+
+
+class TestCollectionScheduler:
+    async def test_results_in_order_with_bounded_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def fetch(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return item * 2
+
+        results = await scheduler(max_concurrency=3).run(range(10), fetch)
+
+        assert [r.value for r in results] == [i * 2 for i in range(10)]
+        assert all(r.success for r in results)
+        assert peak == 3
+
+    async def test_retries_retryable_errors(self):
+        calls = {}
+
+        async def fetch(item):
+            calls[item] = calls.get(item, 0) + 1
+            if item == 'flaky' and calls[item] < 3:
+                raise http_error(429, headers={'Retry-After': '0'})
+            return item
+
+        runner = scheduler()
+        results = await runner.run(['ok', 'flaky'], fetch)
+
+        assert [r.success for r in results] == [True, True]
+        assert results[1].attempts == 3
+        assert runner.get_stats()['retries'] == 2
+
+    async def test_gives_up_after_max_retries_and_on_fatal_errors(self):
+        async def fetch(item):
+            raise http_error(503) if item == 'down' else ValueError('bad query')
+
+        results = await scheduler(max_retries=2).run(['down', 'bad'], fetch)
+
+        assert not results[0].success and results[0].attempts == 3
+        assert not results[1].success and results[1].attempts == 1
+        assert isinstance(results[1].error, ValueError)
+
+    async def test_batches_successful_results(self):
+        batches = []
+
+        async def fetch(item):
+            if item == 3:
+                raise ValueError('skip')
+            return item
+
+        async def write(batch):
+            batches.append(sorted(batch))
+
+        await scheduler(max_concurrency=1).run(range(8), fetch, on_batch=write, batch_size=3)
+
+        assert batches == [[0, 1, 2], [4, 5, 6], [7]]
+
+    async def test_write_failure_fails_batch(self):
+        async def fetch(item):
+            return item
+
+        async def write(batch):
+            raise RuntimeError('db down')
+
+        results = await scheduler().run(range(3), fetch, on_batch=write)
+
+        assert not any(r.success for r in results)
+        assert all(isinstance(r.error, RuntimeError) for r in results)
+
+    async def test_empty_input(self):
+        assert await scheduler().run([], AsyncMock()) == []
+
+
+class TestSerpTrackerCollection:
+    @pytest.fixture
+    def tracker(self, pool):
+        from insights_core.serp_tracker import SerpTracker
+
+        tracker = SerpTracker(db_dsn='postgresql://test', api_provider='valueserp',
+                              api_key='key', use_gsc_data=False, gsc_fallback=False)
+        tracker._pool = pool[0]
+        tracker.provider = MagicMock()
+        tracker.provider.search = AsyncMock(return_value={
+            'organic_results': [{
+                'position': 4, 'url': 'https://example.com/a', 'domain': 'example.com',
+                'title': 'A', 'description': 'd',
+            }],
+            'serp_features': {'people_also_ask': True},
+            'total_results': 1000,
+        })
+        return tracker
+
+    async def test_track_all_queries_stores_in_batches(self, tracker, pool):
+        _, conn = pool
+        queries = [{
+            'query_id': f'q{i}', 'query_text': f'query {i}', 'property': 'https://example.com/',
+            'target_page_path': None, 'location': 'United States', 'device': 'desktop',
+        } for i in range(5)]
+
+        with patch.object(tracker, 'fetch_active_queries', AsyncMock(return_value=queries)):
+            summary = await tracker.track_all_queries(batch_size=2)
+
+        assert summary['success_count'] == 5
+        assert [r['position'] for r in summary['results']] == [4] * 5
+        position_calls = [c for c in conn.executemany.call_args_list
+                          if 'position_history' in c.args[0]]
+        assert [len(c.args[1]) for c in position_calls] == [2, 2, 1]
+        assert conn.execute.call_count == 0
+
+    async def test_search_failures_reported_per_query(self, tracker):
+        tracker.provider.search.side_effect = ValueError('quota exhausted')
+        queries = [{
+            'query_id': 'q1', 'query_text': 'query', 'property': 'https://example.com/',
+            'target_page_path': None, 'location': 'United States', 'device': 'desktop',
+        }]
+
+        with patch.object(tracker, 'fetch_active_queries', AsyncMock(return_value=queries)):
+            summary = await tracker.track_all_queries()
+
+        assert summary['error_count'] == 1
+        assert summary['results'][0]['error'] == 'quota exhausted'
+
+
+class TestCWVMonitorCollection:
+    async def test_monitor_pages_stores_in_batches(self, pool):
+        from insights_core.cwv_monitor import CoreWebVitalsMonitor
+
+        _, conn = pool
+        monitor = CoreWebVitalsMonitor(db_dsn='postgresql://test')
+        monitor._pool = pool[0]
+
+        async def fetch_page_metrics(url, strategy):
+            if url.endswith('/broken'):
+                raise ValueError('lighthouse failed')
+            return {'strategy': strategy, 'performance_score': 90, 'lcp': 1200}
+
+        with patch.object(monitor, 'fetch_page_metrics', fetch_page_metrics):
+            summary = await monitor.monitor_pages(
+                'https://example.com/', ['/a', '/broken', '/c'], ['mobile', 'desktop']
+            )
+
+        assert summary['success_count'] == 4
+        assert summary['error_count'] == 2
+        assert [r['page_path'] for r in summary['results']] == ['/a', '/broken', '/c']
+        assert summary['results'][1]['results']['mobile']['success'] is False
+        assert conn.executemany.call_count == 1
+        rows = conn.executemany.call_args.args[1]
+        assert sorted((r[1], r[3]) for r in rows) == [
+            ('/a', 'desktop'), ('/a', 'mobile'), ('/c', 'desktop'), ('/c', 'mobile')
+        ]
+        assert all(r[0] == 'https://example.com' for r in rows)
@@ -37,6 +37,7 @@ from tests.fixtures.sample_data import (
     SAMPLE_PROPERTIES,
     SAMPLE_PAGES
 )
+from tests.fixtures.conftest_helpers import persisted_insights
 
 
 @pytest.fixture
@@ -51,7 +52,7 @@ def mock_config():
 def mock_repository():
     """Create mock repository"""
     repo = Mock(spec=InsightRepository)
-    repo.create = Mock(return_value=Mock())
+    repo.create_many = Mock(return_value=[])
     return repo
 
 
@@ -411,8 +412,8 @@ class TestDetectionLogic:
         insights_created = detector.detect(property='sc-domain:example.com')
 
         assert insights_created == 1
-        assert mock_repository.create.call_count == 1
-        insight_arg = mock_repository.create.call_args[0][0]
+        assert len(persisted_insights(mock_repository)) == 1
+        insight_arg = persisted_insights(mock_repository)[-1]
         assert insight_arg.title == "Thin Content"
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
@@ -445,7 +446,7 @@ class TestDetectionLogic:
 
         # Should create 4 insights: readability, meta, title, H1
         assert insights_created == 4
-        assert mock_repository.create.call_count == 4
+        assert len(persisted_insights(mock_repository)) == 4
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_low_engagement_scenario(self, mock_connect, detector, mock_repository):
@@ -477,7 +478,7 @@ class TestDetectionLogic:
 
         # Should create 2 insights: long title, thin content
         assert insights_created == 2
-        assert mock_repository.create.call_count == 2
+        assert len(persisted_insights(mock_repository)) == 2
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_stale_content_scenario(self, mock_connect, detector, mock_repository):
@@ -509,8 +510,8 @@ class TestDetectionLogic:
 
         # Should create 1 insight: short meta description
         assert insights_created == 1
-        assert mock_repository.create.call_count == 1
-        insight_arg = mock_repository.create.call_args[0][0]
+        assert len(persisted_insights(mock_repository)) == 1
+        insight_arg = persisted_insights(mock_repository)[-1]
         assert insight_arg.title == "Missing or Short Meta Description"
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
@@ -542,7 +543,7 @@ class TestDetectionLogic:
         insights_created = detector.detect(property='sc-domain:example.com')
 
         assert insights_created == 1
-        insight_arg = mock_repository.create.call_args[0][0]
+        insight_arg = persisted_insights(mock_repository)[-1]
         assert "no meta description" in insight_arg.description
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
@@ -586,7 +587,7 @@ class TestDetectionLogic:
 
         # 2 pages x 5 issues each = 10 insights
         assert insights_created == 10
-        assert mock_repository.create.call_count == 10
+        assert len(persisted_insights(mock_repository)) == 10
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_good_quality_scenario(self, mock_connect, detector, mock_repository):
@@ -617,7 +618,7 @@ class TestDetectionLogic:
         insights_created = detector.detect(property='sc-domain:example.com')
 
         assert insights_created == 0
-        assert mock_repository.create.call_count == 0
+        assert len(persisted_insights(mock_repository)) == 0
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_mixed_quality_scenario(self, mock_connect, detector, mock_repository):
@@ -660,7 +661,7 @@ class TestDetectionLogic:
 
         # Only bad page should generate insights (5 issues)
         assert insights_created == 5
-        assert mock_repository.create.call_count == 5
+        assert len(persisted_insights(mock_repository)) == 5
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_empty_data_scenario(self, mock_connect, detector, mock_repository):
@@ -679,7 +680,7 @@ class TestDetectionLogic:
         insights_created = detector.detect(property='sc-domain:nonexistent.com')
 
         assert insights_created == 0
-        assert mock_repository.create.call_count == 0
+        assert len(persisted_insights(mock_repository)) == 0
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_null_metrics_scenario(self, mock_connect, detector, mock_repository):
@@ -711,7 +712,7 @@ class TestDetectionLogic:
 
         # Should create insights for missing meta and H1 only
         assert insights_created == 2
-        assert mock_repository.create.call_count == 2
+        assert len(persisted_insights(mock_repository)) == 2
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_handles_database_error_gracefully(self, mock_connect, detector, mock_repository):
@@ -721,7 +722,7 @@ class TestDetectionLogic:
         insights_created = detector.detect(property='sc-domain:example.com')
 
         assert insights_created == 0
-        assert mock_repository.create.call_count == 0
+        assert len(persisted_insights(mock_repository)) == 0
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_handles_general_exception_gracefully(self, mock_connect, detector, mock_repository):
@@ -731,7 +732,7 @@ class TestDetectionLogic:
         insights_created = detector.detect(property='sc-domain:example.com')
 
         assert insights_created == 0
-        assert mock_repository.create.call_count == 0
+        assert len(persisted_insights(mock_repository)) == 0
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_detect_with_property_filter(self, mock_connect, detector):
@@ -802,7 +803,7 @@ class TestIntegrationWithRepository:
 
     @patch('insights_core.detectors.content_quality.psycopg2.connect')
     def test_insights_saved_via_repository(self, mock_connect, detector, mock_repository):
-        """Test insights are properly saved via repository.create()"""
+        """Test insights are properly saved via repository.create_many()"""
         mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = [
             {
@@ -829,10 +830,11 @@ class TestIntegrationWithRepository:
         insights_created = detector.detect(property='sc-domain:example.com')
 
         assert insights_created == 5
-        assert mock_repository.create.call_count == 5
+        assert len(persisted_insights(mock_repository)) == 5
 
-        for call in mock_repository.create.call_args_list:
-            assert isinstance(call[0][0], InsightCreate)
+        mock_repository.create_many.assert_called_once()
+        for insight in persisted_insights(mock_repository):
+            assert isinstance(insight, InsightCreate)
 
 
 class TestCannibalizationDetection:
@@ -871,9 +873,9 @@ class TestCannibalizationDetection:
                 insights_created = detector._detect_cannibalization('sc-domain:example.com')
 
             assert insights_created == 1
-            mock_repository.create.assert_called_once()
+            assert len(persisted_insights(mock_repository)) == 1
 
-            insight_arg = mock_repository.create.call_args[0][0]
+            insight_arg = persisted_insights(mock_repository)[-1]
             assert insight_arg.title == "Content Cannibalization Detected"
             assert insight_arg.category == InsightCategory.DIAGNOSIS
             assert insight_arg.severity == InsightSeverity.MEDIUM
@@ -898,7 +900,7 @@ class TestCannibalizationDetection:
             insights_created = detector._detect_cannibalization('sc-domain:example.com')
 
             assert insights_created == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
     def test_cannibalization_no_insight_below_query_overlap_threshold(
         self, mock_repository, mock_config
@@ -925,7 +927,7 @@ class TestCannibalizationDetection:
                 insights_created = detector._detect_cannibalization('sc-domain:example.com')
 
             assert insights_created == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
     def test_cannibalization_handles_exception_in_pair_processing(
         self, mock_repository, mock_config
@@ -972,15 +974,21 @@ class TestCannibalizationDetection:
             assert insights_created == 0
 
     def test_get_shared_keywords_count(self, mock_repository, mock_config):
-        """Test _get_shared_keywords_count queries database correctly"""
+        """Test _get_shared_keywords_count is served from one keyword matrix scan"""
         with patch('insights_core.embeddings.EmbeddingGenerator'):
             detector = ContentQualityDetector(mock_repository, mock_config)
 
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
-            mock_cursor.fetchone.return_value = (7,)
-            mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-            mock_cursor.__exit__ = Mock(return_value=False)
+            mock_cursor.fetchmany.side_effect = [[
+                {'page': 'https://example.com/page1', 'query': q, 'clicks': 1, 'impressions': 10}
+                for q in ('a', 'b', 'c')
+            ] + [
+                {'page': 'https://example.com/page2', 'query': q, 'clicks': 1, 'impressions': 10}
+                for q in ('b', 'c', 'd')
+            ] + [
+                {'page': 'https://example.com/page3', 'query': 'a', 'clicks': 1, 'impressions': 10}
+            ], []]
             mock_conn.cursor.return_value = mock_cursor
 
             with patch.object(detector, '_get_db_connection', return_value=mock_conn):
@@ -989,13 +997,20 @@ class TestCannibalizationDetection:
                     '/page1',
                     '/page2'
                 )
+                other = detector._get_shared_keywords_count(
+                    'sc-domain:example.com',
+                    '/page1',
+                    '/page3'
+                )
 
-            assert count == 7
+            assert count == 2
+            assert other == 1
 
+            # One scan for every pair
+            assert mock_cursor.execute.call_count == 1
             query_call = mock_cursor.execute.call_args
-            assert 'fact_gsc_daily' in query_call[0][0]
-            assert 'INNER JOIN' in query_call[0][0]
-            assert query_call[0][1] == ('sc-domain:example.com', '/page1', 'sc-domain:example.com', '/page2')
+            assert 'gsc.search_performance' in query_call[0][0]
+            assert query_call[0][1] == ('sc-domain:example.com', 30, 20)
 
     def test_get_shared_keywords_count_handles_exception(self, mock_repository, mock_config):
         """Test _get_shared_keywords_count handles exceptions gracefully"""
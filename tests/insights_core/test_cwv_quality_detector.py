@@ -27,6 +27,7 @@ from insights_core.models import (
     InsightSeverity,
     EntityType,
 )
+from tests.fixtures.conftest_helpers import persisted_insights
 
 # Base module path for patching psycopg2
 BASE_PSYCOPG2_PATH = 'insights_core.detectors.base.psycopg2'
@@ -44,7 +45,7 @@ def mock_config():
 def mock_repository():
     """Create mock InsightRepository"""
     repo = MagicMock()
-    repo.create = MagicMock(return_value=1)
+    repo.create_many = MagicMock(return_value=[])
     return repo
 
 
@@ -156,9 +157,9 @@ class TestPoorLCPDetection:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 1
-        mock_repository.create.assert_called_once()
+        assert len(persisted_insights(mock_repository)) == 1
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.category == InsightCategory.RISK
         assert insight.severity == InsightSeverity.HIGH
         assert 'LCP' in insight.title
@@ -179,7 +180,7 @@ class TestPoorLCPDetection:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_lcp_at_threshold_creates_no_insight(self, detector, mock_repository):
         """Test that LCP exactly at poor threshold creates no insight"""
@@ -219,7 +220,7 @@ class TestPoorFIDDetection:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 1
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.category == InsightCategory.RISK
         assert insight.severity == InsightSeverity.HIGH
         assert 'FID' in insight.title
@@ -240,7 +241,7 @@ class TestPoorFIDDetection:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 1
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert 'INP' in insight.title
 
     def test_good_fid_creates_no_insight(self, detector, mock_repository):
@@ -280,7 +281,7 @@ class TestPoorCLSDetection:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 1
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.category == InsightCategory.RISK
         assert insight.severity == InsightSeverity.HIGH
         assert 'CLS' in insight.title
@@ -321,7 +322,7 @@ class TestMetricsRequiredFields:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics
 
         # Check required fields
@@ -345,7 +346,7 @@ class TestMetricsRequiredFields:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics
 
         assert metrics.metric == 'fid'
@@ -367,7 +368,7 @@ class TestMetricsRequiredFields:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics
 
         assert metrics.metric == 'cls'
@@ -396,7 +397,7 @@ class TestMultiplePoorMetrics:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 3
-        assert mock_repository.create.call_count == 3
+        assert len(persisted_insights(mock_repository)) == 3
 
     def test_multiple_pages_with_issues(self, detector, mock_repository):
         """Test detection across multiple pages"""
@@ -452,7 +453,7 @@ class TestDeviceStrategy:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.metrics.device == 'mobile'
         assert 'mobile' in insight.description
 
@@ -470,7 +471,7 @@ class TestDeviceStrategy:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.metrics.device == 'desktop'
         assert 'desktop' in insight.description
 
@@ -563,8 +564,7 @@ class TestSeverityLevels:
             detector.detect(property="sc-domain:example.com")
 
         # All 3 insights should be HIGH severity
-        for call in mock_repository.create.call_args_list:
-            insight = call[0][0]
+        for insight in persisted_insights(mock_repository):
             assert insight.severity == InsightSeverity.HIGH
 
 
@@ -587,7 +587,7 @@ class TestInsightDetails:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.entity_type == EntityType.PAGE
 
     def test_insight_entity_id_is_page_path(self, detector, mock_repository):
@@ -604,7 +604,7 @@ class TestInsightDetails:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.entity_id == '/blog/my-article'
 
     def test_insight_source_is_cwv_quality_detector(self, detector, mock_repository):
@@ -621,7 +621,7 @@ class TestInsightDetails:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.source == "CWVQualityDetector"
 
     def test_insight_category_is_risk(self, detector, mock_repository):
@@ -638,7 +638,7 @@ class TestInsightDetails:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.category == InsightCategory.RISK
 
 
@@ -726,7 +726,7 @@ class TestComprehensiveScenarios:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_all_poor_metrics_creates_three_insights(self, detector, mock_repository):
         """Test that page with all poor CWV metrics creates exactly 3 insights"""
@@ -744,10 +744,10 @@ class TestComprehensiveScenarios:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 3
-        assert mock_repository.create.call_count == 3
+        assert len(persisted_insights(mock_repository)) == 3
 
         # Verify each metric created an insight
-        insights = [call[0][0] for call in mock_repository.create.call_args_list]
+        insights = persisted_insights(mock_repository)
         metrics_detected = [insight.metrics.metric for insight in insights]
         assert 'lcp' in metrics_detected
         assert 'fid' in metrics_detected
@@ -770,7 +770,7 @@ class TestComprehensiveScenarios:
         assert result == 2  # Only FID and CLS are poor
 
         # Verify correct insights were created
-        insights = [call[0][0] for call in mock_repository.create.call_args_list]
+        insights = persisted_insights(mock_repository)
         metrics_detected = [insight.metrics.metric for insight in insights]
         assert 'lcp' not in metrics_detected  # LCP was good
         assert 'fid' in metrics_detected
@@ -792,7 +792,7 @@ class TestComprehensiveScenarios:
 
         assert result == 1  # Only FID insight created
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.metrics.metric == 'fid'
 
     def test_missing_cls_only_checks_other_metrics(self, detector, mock_repository):
@@ -811,7 +811,7 @@ class TestComprehensiveScenarios:
 
         assert result == 1  # Only LCP insight created
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.metrics.metric == 'lcp'
 
     def test_empty_data_array_returns_zero(self, detector, mock_repository):
@@ -820,7 +820,7 @@ class TestComprehensiveScenarios:
             result = detector.detect(property="sc-domain:example.com")
 
         assert result == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_mobile_vs_desktop_separate_insights(self, detector, mock_repository):
         """Test that same page with different devices creates separate insights"""
@@ -849,7 +849,7 @@ class TestComprehensiveScenarios:
         assert result == 2  # One for mobile, one for desktop
 
         # Verify both devices are represented
-        insights = [call[0][0] for call in mock_repository.create.call_args_list]
+        insights = persisted_insights(mock_repository)
         devices = [insight.metrics.device for insight in insights]
         assert 'mobile' in devices
         assert 'desktop' in devices
@@ -871,7 +871,7 @@ class TestComprehensiveScenarios:
 
         assert result == 1  # LCP regression detected
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.metrics.metric == 'lcp'
         assert insight.category == InsightCategory.RISK
         assert insight.severity == InsightSeverity.HIGH
@@ -899,7 +899,7 @@ class TestINPMetric:
 
         assert result == 1
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.metrics.metric == 'inp'
         assert 'INP' in insight.title
 
@@ -920,7 +920,7 @@ class TestINPMetric:
 
         assert result == 1
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         # When both exist, FID value is used but metric is labeled as INP
         assert insight.metrics.metric == 'inp'
         assert insight.metrics.value == 400
@@ -1045,7 +1045,7 @@ class TestEdgeCases:
         assert result == 3  # All should create insights
 
         # Verify insights were created
-        insights = [call[0][0] for call in mock_repository.create.call_args_list]
+        insights = persisted_insights(mock_repository)
         assert len(insights) == 3
 
     def test_negative_values_handled_safely(self, detector, mock_repository):
@@ -1112,7 +1112,7 @@ class TestInsightContentQuality:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         description = insight.description.lower()
 
         # Should contain actionable recommendations
@@ -1134,7 +1134,7 @@ class TestInsightContentQuality:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         description = insight.description.lower()
 
         # Should explain visual stability
@@ -1154,7 +1154,7 @@ class TestInsightContentQuality:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
 
         assert hasattr(insight.metrics, 'excess_percent')
         # 8000 is 100% above 4000 threshold
@@ -1174,7 +1174,7 @@ class TestInsightContentQuality:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.confidence == 0.95  # High confidence for objective measurement
 
     def test_insight_window_days_is_seven(self, detector, mock_repository):
@@ -1191,7 +1191,7 @@ class TestInsightContentQuality:
         with patch.object(detector, '_get_cwv_data', return_value=data):
             detector.detect(property="sc-domain:example.com")
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.window_days == 7
 
 
@@ -0,0 +1,223 @@
+"""
+Tests for the refresh-scoped unified data snapshot
+
+Tests cover:
+- Pivoting view rows into per-metric pages x days arrays
+- Row accessors (long format, latest matching row per page)
+- SeriesBatch selection matching fetch_series_batch
+- SnapshotStore caching, per-property subsets and load failures
+
+All tests use mocks or synthetic rows - no real database.
+"""
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from insights_core.data_snapshot import (
+    SNAPSHOT_METRICS,
+    SnapshotStore,
+    build_snapshot,
+    load_snapshot,
+)
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 5)
+
+
+def view_row(property, page_path, day, clicks=10, impressions=100, position=5.0, sessions=20, engagement=0.5):
+    """Row in SNAPSHOT_METRICS column order"""
+    return (
+        property, page_path, day,
+        clicks, impressions, clicks / impressions, position,
+        sessions, engagement, 1 - engagement, 1, sessions * 2,
+    )
+
+
+@pytest.fixture
+def snapshot():
+    rows = [
+        view_row('b', '/x', date(2025, 1, 2), clicks=3),
+        view_row('a', '/2', date(2025, 1, 1), position=15.0),
+        view_row('a', '/1', date(2025, 1, 1), position=12.0),
+        view_row('a', '/1', date(2025, 1, 4), position=8.0),
+        view_row('a', '/1', date(2025, 1, 5), position=14.0),
+    ]
+    return build_snapshot(rows, START, END)
+
+
+class TestBuildSnapshot:
+    """Test build_snapshot()"""
+
+    def test_pivots_rows_sorted_by_page(self, snapshot):
+        """Pages are sorted; each metric is a pages x days array with NaN gaps"""
+        assert snapshot.keys == [('a', '/1'), ('a', '/2'), ('b', '/x')]
+        assert set(snapshot.metrics) == set(SNAPSHOT_METRICS)
+        assert snapshot.metric('gsc_position').shape == (3, 5)
+        np.testing.assert_array_equal(
+            snapshot.metric('gsc_position')[0], [12.0, np.nan, np.nan, 8.0, 14.0]
+        )
+        np.testing.assert_array_equal(snapshot.observed[2], [False, True, False, False, False])
+
+    def test_ignores_rows_outside_window(self):
+        """Rows outside [start, end] are dropped"""
+        rows = [view_row('a', '/1', date(2024, 12, 31)), view_row('a', '/2', date(2025, 1, 6))]
+
+        snapshot = build_snapshot(rows, START, END)
+
+        assert len(snapshot) == 0
+        assert snapshot.records(['gsc_clicks'], since=START) == []
+
+    def test_rejects_unknown_metric(self, snapshot):
+        with pytest.raises(ValueError, match='Unknown metric'):
+            snapshot.metric('gsc_revenue')
+
+
+class TestRowAccessors:
+    """Test records(), latest_records() and properties()"""
+
+    def test_records_in_window(self, snapshot):
+        """Rows are ordered by property, page, date; until is exclusive"""
+        rows = snapshot.records(['gsc_clicks', 'gsc_position'], since=date(2025, 1, 2), until=END)
+
+        assert [(r['property'], r['page_path'], r['date']) for r in rows] == [
+            ('a', '/1', date(2025, 1, 4)),
+            ('b', '/x', date(2025, 1, 2)),
+        ]
+        assert rows[1]['gsc_clicks'] == 3
+        assert isinstance(rows[1]['gsc_clicks'], int)
+        assert rows[0]['gsc_position'] == pytest.approx(8.0)
+
+    def test_null_values_become_none(self):
+        rows = [('a', '/1', START) + (None,) * len(SNAPSHOT_METRICS)]
+
+        snapshot = build_snapshot(rows, START, END)
+
+        record = snapshot.records(['gsc_clicks', 'gsc_ctr'], since=START)[0]
+        assert record['gsc_clicks'] is None
+        assert record['gsc_ctr'] is None
+
+    def test_latest_matching_row_per_page(self, snapshot):
+        """Like DISTINCT ON (property, page_path) ... ORDER BY date DESC"""
+        position = snapshot.metric('gsc_position')
+
+        rows = snapshot.latest_records(
+            ['gsc_position'], since=START, where=(position >= 11) & (position <= 20)
+        )
+
+        assert [(r['page_path'], r['date']) for r in rows] == [
+            ('/1', date(2025, 1, 5)),
+            ('/2', date(2025, 1, 1)),
+        ]
+        assert rows[0]['gsc_position'] == pytest.approx(14.0)
+
+    def test_latest_records_respects_since(self, snapshot):
+        rows = snapshot.latest_records(['gsc_clicks'], since=date(2025, 1, 3))
+
+        assert [r['page_path'] for r in rows] == ['/1']
+
+    def test_properties(self, snapshot):
+        assert snapshot.properties() == ['a', 'b']
+        assert snapshot.properties(since=date(2025, 1, 3)) == ['a']
+
+    def test_subset(self, snapshot):
+        subset = snapshot.subset('a')
+
+        assert subset.property == 'a'
+        assert subset.keys == [('a', '/1'), ('a', '/2')]
+        assert subset.metric('gsc_clicks').shape == (2, 5)
+
+
+class TestSeriesBatch:
+    """Test series_batch()"""
+
+    def test_selects_eligible_pages_by_total(self):
+        """Only days above zero count; pages need min_points and min_total"""
+        end = date(2025, 3, 1)
+        start = end - timedelta(days=9)
+        rows = []
+        for i in range(10):
+            day = start + timedelta(days=i)
+            rows.append(view_row('p', '/big', day, clicks=50))
+            rows.append(view_row('p', '/small', day, clicks=20))
+            rows.append(view_row('p', '/sparse', day, clicks=100 if i < 2 else 0))
+
+        snapshot = build_snapshot(rows, start, end)
+        batch = snapshot.series_batch('gsc_clicks', min_points=5, min_total=100)
+
+        assert batch.keys == [('p', '/big'), ('p', '/small')]
+        assert batch.values.dtype == np.float64
+        np.testing.assert_array_equal(batch.values[0], [50.0] * 10)
+
+    def test_zero_days_are_missing(self):
+        rows = [view_row('p', '/a', START, clicks=0), view_row('p', '/a', END, clicks=200)]
+
+        batch = build_snapshot(rows, START, END).series_batch(min_points=1)
+
+        assert np.isnan(batch.values[0, 0])
+        assert batch.values[0, -1] == 200.0
+
+    def test_max_pages(self, snapshot):
+        batch = snapshot.series_batch(min_points=1, min_total=1, max_pages=1)
+
+        assert batch.keys == [('a', '/1')]
+
+
+class TestLoadSnapshot:
+    """Test load_snapshot()"""
+
+    def test_single_query_with_property_filter(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [view_row('p', '/a', date.today())]
+
+        snapshot = load_snapshot(conn, property='p')
+
+        cursor.execute.assert_called_once()
+        query, params = cursor.execute.call_args.args
+        assert 'vw_unified_page_performance' in query
+        assert params == [date.today() - timedelta(days=90), 'p']
+        assert snapshot.property == 'p'
+        assert snapshot.metric('gsc_clicks').shape == (1, 91)
+
+
+class TestSnapshotStore:
+    """Test SnapshotStore"""
+
+    @patch('insights_core.data_snapshot.load_snapshot')
+    @patch('insights_core.data_snapshot.psycopg2')
+    def test_loads_once_per_property(self, mock_psycopg2, mock_load, snapshot):
+        mock_load.return_value = snapshot
+        store = SnapshotStore("postgresql://test")
+
+        assert store.get('a') is snapshot
+        assert store.get('a') is snapshot
+
+        mock_load.assert_called_once()
+        assert store.stats()['loads'] == 1
+        mock_psycopg2.connect.return_value.close.assert_called_once()
+
+    @patch('insights_core.data_snapshot.load_snapshot')
+    @patch('insights_core.data_snapshot.psycopg2')
+    def test_property_cut_from_all_property_snapshot(self, mock_psycopg2, mock_load, snapshot):
+        mock_load.return_value = snapshot
+        store = SnapshotStore("postgresql://test")
+
+        store.get()
+        subset = store.get('b')
+
+        mock_load.assert_called_once()
+        assert subset.keys == [('b', '/x')]
+        assert store.stats()['pages_loaded'] == 3
+
+    @patch('insights_core.data_snapshot.psycopg2')
+    def test_failed_load_is_cached_as_none(self, mock_psycopg2):
+        mock_psycopg2.connect.side_effect = Exception("connection refused")
+        store = SnapshotStore("postgresql://test")
+
+        assert store.get('a') is None
+        assert store.get('a') is None
+
+        mock_psycopg2.connect.assert_called_once()
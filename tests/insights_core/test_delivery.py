@@ -0,0 +1,245 @@
+"""
+Tests for the async delivery engine
+
+Tests cover:
+- Latency histogram buckets and quantiles
+- Per-channel concurrency limits and keep-alive endpoint clients
+- InsightDispatcher concurrent and digest delivery
+- AlertManager.process_notification_queue sending concurrently
+
+HTTP deliveries go to a local stub server (no network access needed).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from insights_core.delivery import DeliveryEngine, EndpointClients, LatencyHistogram
+from insights_core.dispatcher import InsightDispatcher
+
+
+class StubServer:
+    """Threaded HTTP/1.1 server recording requests; /slow/* paths are delayed"""
+
+    def __init__(self, delay=0.2):
+        self.requests = []
+        self.delay = delay
+        self.fail_paths = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                stub.requests.append({
+                    'path': self.path,
+                    'body': json.loads(body or b'null'),
+                    'client_port': self.client_address[1],
+                })
+                if self.path.startswith('/slow'):
+                    time.sleep(stub.delay)
+                status = 500 if self.path in stub.fail_paths else 200
+                self.send_response(status)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            do_PUT = do_POST
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def paths(self, prefix):
+        return [r for r in self.requests if r['path'].startswith(prefix)]
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def insight(i, severity='high'):
+    return SimpleNamespace(
+        id=f'insight-{i}', title=f'Insight {i}', description='Clicks dropped',
+        property='sc-domain:example.com', category=SimpleNamespace(value='risk'),
+        severity=severity, confidence=0.9, entity_id=f'/page-{i}', entity_type='page',
+        metrics={}, actions=[], source='test', generated_at=SimpleNamespace(isoformat=lambda: '2024-01-01'),
+        expires_at=None,
+    )
+
+
+def dispatcher(stub, **config):
+    return InsightDispatcher({
+        'max_retries': 1,
+        'retry_delays': [0],
+        'routing_rules': {'risk': {'high': ['slack', 'webhook'], 'low': ['webhook']}},
+        'channels': {
+            'slack': {'webhook_url': f'{stub.url}/slow/slack'},
+            'webhook': {'url': f'{stub.url}/hook'},
+        },
+        **config,
+    })
+
+
+class TestLatencyHistogram:
+    def test_buckets_and_quantiles(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1.0, float('inf')))
+        for seconds in (0.05, 0.05, 0.5, 0.5, 2.0):
+            histogram.observe(seconds)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot['count'] == 5
+        assert snapshot['buckets'] == {'0.1': 2, '1.0': 2, '+Inf': 1}
+        assert snapshot['max_seconds'] == 2.0
+        assert 0 < histogram.quantile(0.2) <= 0.1
+        assert 0.1 < histogram.quantile(0.6) <= 1.0
+        assert histogram.quantile(1.0) == 2.0
+
+    def test_empty(self):
+        assert LatencyHistogram().snapshot()['p95_seconds'] == 0.0
+
+
+class TestDeliveryEngine:
+    async def test_per_channel_concurrency(self):
+        engine = DeliveryEngine({'slack': 2, 'webhook': 5})
+        in_flight = {'slack': 0, 'webhook': 0}
+        peak = {'slack': 0, 'webhook': 0}
+
+        async def send(channel):
+            in_flight[channel] += 1
+            peak[channel] = max(peak[channel], in_flight[channel])
+            await asyncio.sleep(0.01)
+            in_flight[channel] -= 1
+            return channel
+
+        results = await asyncio.gather(*(
+            engine.deliver(channel, lambda channel=channel: send(channel))
+            for channel in ['slack'] * 6 + ['webhook'] * 6
+        ))
+
+        assert results == ['slack'] * 6 + ['webhook'] * 6
+        assert peak == {'slack': 2, 'webhook': 5}
+        stats = engine.get_stats()
+        assert stats['slack']['count'] == 6
+        assert stats['slack']['concurrency'] == 2
+
+    async def test_errors_counted_and_raised(self):
+        engine = DeliveryEngine()
+
+        async def fail():
+            raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            await engine.deliver('jira', fail)
+
+        assert engine.get_stats()['jira']['errors'] == 1
+        assert engine.get_stats()['jira']['count'] == 1
+
+    async def test_keep_alive_client_per_endpoint(self, stub):
+        clients = EndpointClients()
+        try:
+            assert clients.get(f'{stub.url}/a') is clients.get(f'{stub.url}/b')
+            assert clients.get('https://hooks.slack.com/x') is not clients.get(f'{stub.url}/a')
+            assert len(clients) == 2
+
+            for _ in range(5):
+                response = await clients.get(f'{stub.url}/hook').post(f'{stub.url}/hook', json={})
+                assert response.status_code == 200
+        finally:
+            await clients.aclose()
+
+        assert len({r['client_port'] for r in stub.requests}) == 1
+        assert len(clients) == 0
+
+
+class TestDispatcherConcurrentDelivery:
+    def test_slow_channel_does_not_block_others(self, stub):
+        slow = dispatcher(stub, concurrent=True, channel_concurrency={'slack': 4})
+
+        stats = slow.dispatch_batch([insight(i) for i in range(4)])
+
+        assert stats['successes'] == 8 and stats['failures'] == 0
+        assert len(stub.paths('/slow/slack')) == 4
+        assert len(stub.paths('/hook')) == 4
+        # 4 slow sends overlap instead of taking 4 x delay
+        assert stats['duration_seconds'] < 4 * stub.delay
+        assert stats['latency']['slack']['count'] == 4
+        assert stats['latency']['webhook']['p95_seconds'] < stub.delay
+
+    def test_dispatch_single_insight(self, stub):
+        results = dispatcher(stub, concurrent=True).dispatch(insight(1))
+
+        assert set(results) == {'slack', 'webhook'}
+        assert all(r.success for r in results.values())
+
+    def test_digest_combines_batch_per_channel(self, stub):
+        stats = dispatcher(stub, digest=True).dispatch_batch(
+            [insight(i) for i in range(5)] + [insight(9, severity='low')]
+        )
+
+        slack_requests = stub.paths('/slow/slack')
+        assert len(slack_requests) == 1
+        assert '5 new insights' in slack_requests[0]['body']['text']
+        # Webhooks stay one request per insight
+        assert len(stub.paths('/hook')) == 6
+        assert stats['messages'] == 7
+        assert stats['total_dispatches'] == 11
+        digest_results = [r for r in stats['results'] if r.channel == 'slack']
+        assert [r.insight_id for r in digest_results] == [f'insight-{i}' for i in range(5)]
+
+    def test_retries_failed_endpoint(self, stub):
+        stub.fail_paths.add('/hook')
+
+        stats = dispatcher(stub, concurrent=True).dispatch_batch([insight(1, severity='low')])
+
+        assert stats['failures'] == 1
+        assert stats['results'][0].retry_count == 1
+        assert len(stub.paths('/hook')) == 2
+
+
+class TestAlertManagerQueue:
+    async def test_queue_sent_concurrently_over_keep_alive_client(self, stub):
+        from notifications.alert_manager import AlertManager
+        from notifications.channels.slack_notifier import SlackNotifier
+
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        conn.fetch = AsyncMock(return_value=[{
+            'queue_id': f'q{i}', 'alert_id': f'a{i}', 'channel_type': 'slack',
+            'channel_config': {'webhook_url': f'{stub.url}/slow/alerts'},
+            'payload': {'title': f'Alert {i}', 'message': 'm', 'severity': 'high'},
+            'attempts': 0,
+        } for i in range(4)])
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        manager = AlertManager(db_dsn='postgresql://test', channel_concurrency={'slack': 4})
+        manager._pool = pool
+        manager.register_notifier('slack', SlackNotifier())
+
+        start = time.perf_counter()
+        await manager.process_notification_queue()
+
+        assert time.perf_counter() - start < 4 * stub.delay
+        assert len(stub.paths('/slow/alerts')) == 4
+        sent = [c for c in conn.execute.call_args_list if "status = 'sent'" in c.args[0]]
+        assert len(sent) == 4
+        assert manager.get_delivery_stats()['slack']['count'] == 4
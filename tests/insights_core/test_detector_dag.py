@@ -0,0 +1,143 @@
+"""
+Tests for DetectorDAG dependency-aware detector execution
+"""
+import threading
+import time
+
+import pytest
+
+from insights_core.detector_dag import DETECTOR_DEPENDENCIES, DetectorDAG
+
+
+def make_detector(name, result=1, delay=0.0, error=None, log=None):
+    """Create a detector instance of a class called `name`"""
+    def detect(self, property=None):
+        if log is not None:
+            log.append(('start', name, property))
+        time.sleep(delay)
+        if error:
+            raise error
+        if log is not None:
+            log.append(('end', name, property))
+        return result
+
+    return type(name, (), {'detect': detect})()
+
+
+class TestDetectorDAG:
+    """Test DetectorDAG"""
+
+    def test_rejects_invalid_worker_count(self):
+        """Test max_workers must be positive"""
+        with pytest.raises(ValueError):
+            DetectorDAG([], max_workers=0)
+
+    def test_runs_all_detectors_in_input_order(self):
+        """Test every detector runs once and results keep input order"""
+        detectors = [make_detector(f"Detector{i}", result=i) for i in range(5)]
+
+        runs = DetectorDAG(detectors, max_workers=3).run()
+
+        assert [run.detector for run in runs] == [f"Detector{i}" for i in range(5)]
+        assert [run.insights_created for run in runs] == list(range(5))
+        assert all(run.error is None and run.property is None for run in runs)
+
+    def test_independent_detectors_run_concurrently(self):
+        """Test independent detectors overlap instead of running in sequence"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def detect(self, property=None):
+            barrier.wait()  # Only passes if all three are running at once
+            return 1
+
+        detectors = [type(f"Detector{i}", (), {'detect': detect})() for i in range(3)]
+
+        runs = DetectorDAG(detectors, max_workers=3).run()
+
+        assert all(run.error is None for run in runs)
+
+    def test_diagnosis_waits_for_risk_detectors(self):
+        """Test DiagnosisDetector starts only after its dependencies finish"""
+        log = []
+        detectors = [
+            make_detector('AnomalyDetector', delay=0.05, log=log),
+            make_detector('DiagnosisDetector', log=log),
+            make_detector('TrendDetector', delay=0.1, log=log),
+            make_detector('OpportunityDetector', delay=0.2, log=log),
+        ]
+
+        DetectorDAG(detectors, max_workers=4).run()
+
+        diagnosis_start = log.index(('start', 'DiagnosisDetector', None))
+        assert log.index(('end', 'AnomalyDetector', None)) < diagnosis_start
+        assert log.index(('end', 'TrendDetector', None)) < diagnosis_start
+        # OpportunityDetector is not a dependency, so diagnosis doesn't wait for it
+        assert diagnosis_start < log.index(('end', 'OpportunityDetector', None))
+
+    def test_dependent_runs_after_failed_dependency(self):
+        """Test a failing dependency still lets dependents run"""
+        detectors = [
+            make_detector('AnomalyDetector', error=RuntimeError("boom")),
+            make_detector('DiagnosisDetector', result=2),
+        ]
+
+        anomaly, diagnosis = DetectorDAG(detectors).run()
+
+        assert anomaly.error == "boom"
+        assert anomaly.insights_created == 0
+        assert diagnosis.error is None
+        assert diagnosis.insights_created == 2
+
+    def test_timeout_marks_run_failed(self):
+        """Test a detector exceeding its timeout is reported and not waited for"""
+        detectors = [
+            make_detector('SlowDetector', delay=2.0),
+            make_detector('FastDetector'),
+        ]
+
+        start = time.monotonic()
+        slow, fast = DetectorDAG(detectors, timeout_seconds=0.2).run()
+
+        assert time.monotonic() - start < 1.5
+        assert slow.timed_out is True
+        assert "Timed out" in slow.error
+        assert fast.error is None
+
+    def test_fans_out_over_properties(self):
+        """Test dependencies only apply between runs for the same property"""
+        log = []
+        detectors = [
+            make_detector('TrendDetector', delay=0.05, log=log),
+            make_detector('DiagnosisDetector', log=log),
+        ]
+
+        runs = DetectorDAG(detectors, max_workers=4).run(['a', 'b'])
+
+        assert [(run.detector, run.property) for run in runs] == [
+            ('TrendDetector', 'a'), ('DiagnosisDetector', 'a'),
+            ('TrendDetector', 'b'), ('DiagnosisDetector', 'b'),
+        ]
+        for prop in ('a', 'b'):
+            assert log.index(('end', 'TrendDetector', prop)) < log.index(('start', 'DiagnosisDetector', prop))
+
+    def test_single_worker_runs_one_at_a_time(self):
+        """Test max_workers=1 never overlaps detectors"""
+        log = []
+        detectors = [make_detector(f"Detector{i}", delay=0.01, log=log) for i in range(3)]
+
+        DetectorDAG(detectors, max_workers=1).run()
+
+        assert [event for event, _, _ in log] == ['start', 'end'] * 3
+
+    def test_cycle_raises(self):
+        """Test cyclic dependencies are rejected"""
+        detectors = [make_detector('A'), make_detector('B')]
+        dag = DetectorDAG(detectors, dependencies={'A': ('B',), 'B': ('A',)})
+
+        with pytest.raises(ValueError, match="cycle"):
+            dag.run()
+
+    def test_default_dependencies(self):
+        """Test only DiagnosisDetector depends on other detectors"""
+        assert set(DETECTOR_DEPENDENCIES) == {'DiagnosisDetector'}
+        assert 'OpportunityDetector' not in DETECTOR_DEPENDENCIES['DiagnosisDetector']
@@ -28,6 +28,7 @@ from insights_core.models import (
     EntityType,
     InsightMetrics,
 )
+from tests.fixtures.conftest_helpers import persisted_insights
 
 # Module paths for patching
 BASE_PSYCOPG2_PATH = 'insights_core.detectors.base.psycopg2'
@@ -56,8 +57,8 @@ def mock_config():
 def mock_repository():
     """Mock InsightRepository."""
     repo = Mock()
-    repo.create = Mock(return_value=Mock(id="test-insight-id"))
-    repo.update = Mock()
+    repo.create_many = Mock(return_value=[])
+    repo.update_many = Mock(return_value=[])
     repo.get_by_status = Mock(return_value=[])
     return repo
 
@@ -213,7 +214,7 @@ class TestDiagnosisDetectorDetect:
         count = detector.detect()
 
         assert count == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_detect_filters_to_risk_category(self, mock_repository, mock_config):
         """Test that detect only processes RISK category insights."""
@@ -263,10 +264,10 @@ class TestDiagnosisDetectorDetect:
             count = detector.detect()
 
         assert count == 1
-        mock_repository.create.assert_called_once()
+        assert len(persisted_insights(mock_repository)) == 1
 
         # Verify insight created
-        call_args = mock_repository.create.call_args[0][0]
+        call_args = persisted_insights(mock_repository)[-1]
         assert isinstance(call_args, InsightCreate)
         assert call_args.category == InsightCategory.DIAGNOSIS
         assert "Ranking Issue" in call_args.title
@@ -292,11 +293,15 @@ class TestDiagnosisDetectorDetect:
             detector.detect()
 
         # Verify original risk was updated
-        mock_repository.update.assert_called_once()
-        update_args = mock_repository.update.call_args
-        assert update_args[0][0] == sample_risk_insight.id
-        assert isinstance(update_args[0][1], InsightUpdate)
-        assert update_args[0][1].status == InsightStatus.DIAGNOSED
+        mock_repository.update_many.assert_called_once()
+        [(risk_id, update)] = mock_repository.update_many.call_args[0][0]
+        assert risk_id == sample_risk_insight.id
+        assert isinstance(update, InsightUpdate)
+        assert update.status == InsightStatus.DIAGNOSED
+
+        # Risk is linked to the diagnosis by its deterministic ID
+        diagnosis = persisted_insights(mock_repository)[0]
+        assert update.linked_insight_id == diagnosis.to_insight().id
 
     def test_detect_handles_errors_gracefully(
         self,
@@ -785,16 +790,16 @@ class TestIntegration:
         assert count == 1
 
         # Verify insight was created correctly
-        create_call = mock_repository.create.call_args[0][0]
+        create_call = persisted_insights(mock_repository)[-1]
         assert create_call.category == InsightCategory.DIAGNOSIS
         assert create_call.source == "DiagnosisDetector"
         assert create_call.property == "sc-domain:example.com"
         assert create_call.entity_id == "/blog/seo-tips/"
 
         # Verify original risk was updated
-        update_call = mock_repository.update.call_args
-        assert update_call[0][0] == sample_risk_insight.id
-        assert update_call[0][1].status == InsightStatus.DIAGNOSED
+        [(risk_id, update)] = mock_repository.update_many.call_args[0][0]
+        assert risk_id == sample_risk_insight.id
+        assert update.status == InsightStatus.DIAGNOSED
 
     def test_diagnosis_preserves_risk_severity(
         self,
@@ -817,7 +822,7 @@ class TestIntegration:
             detector = DiagnosisDetector(mock_repository, mock_config, use_correlation=False)
             detector.detect()
 
-        create_call = mock_repository.create.call_args[0][0]
+        create_call = persisted_insights(mock_repository)[-1]
         assert create_call.severity == InsightSeverity.HIGH
 
 
@@ -1256,7 +1261,7 @@ class TestRiskCategorizationBySeverity:
             count = detector.detect()
 
         assert count == 1
-        created_insight = mock_repository.create.call_args[0][0]
+        created_insight = persisted_insights(mock_repository)[-1]
         assert created_insight.severity == InsightSeverity.HIGH
 
     def test_medium_severity_risk_diagnosis(
@@ -1306,7 +1311,7 @@ class TestRiskCategorizationBySeverity:
             count = detector.detect()
 
         assert count == 1
-        created_insight = mock_repository.create.call_args[0][0]
+        created_insight = persisted_insights(mock_repository)[-1]
         assert created_insight.severity == InsightSeverity.LOW
 
 
@@ -1413,7 +1418,7 @@ class TestDiagnosisScenarios:
             count = detector.detect()
 
         assert count == 1
-        created_insight = mock_repository.create.call_args[0][0]
+        created_insight = persisted_insights(mock_repository)[-1]
         assert created_insight.category == InsightCategory.DIAGNOSIS
         assert "Ranking Issue" in created_insight.title
 
@@ -1475,7 +1480,7 @@ class TestDiagnosisScenarios:
             count = detector.detect()
 
         assert count == 2
-        assert mock_repository.create.call_count == 2
+        assert len(persisted_insights(mock_repository)) == 2
 
     def test_cascading_issues_diagnosis(
         self,
@@ -1571,7 +1576,7 @@ class TestDiagnosisScenarios:
             count = detector.detect()
 
         assert count == 1
-        created_insight = mock_repository.create.call_args[0][0]
+        created_insight = persisted_insights(mock_repository)[-1]
 
         # Verify historical metrics are included
         metrics = created_insight.metrics
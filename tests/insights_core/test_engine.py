@@ -1,7 +1,7 @@
 """
 Comprehensive tests for InsightEngine
 
-Tests the orchestration engine that runs all 8 detectors in sequence,
+Tests the orchestration engine that runs all 8 detectors concurrently,
 handles failures, generates actions, and returns statistics.
 
 Coverage: >95% of insights_core/engine.py
@@ -10,7 +10,7 @@ Test Count: 20+ test cases covering all scenarios
 
 import pytest
 from unittest.mock import Mock, MagicMock, patch, call
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List
 
 from insights_core.engine import InsightEngine
@@ -37,6 +37,10 @@ def mock_config():
     config.opportunity_threshold_impressions_pct = 50.0
     config.min_confidence_for_action = 0.7
     config.default_window_days = 7
+    config.engine_max_workers = 4
+    config.engine_detector_timeout_seconds = 60.0
+    config.engine_property_fanout = False
+    config.engine_data_snapshot = False
     return config
 
 
@@ -152,7 +156,7 @@ class TestInsightEngineRefresh:
     """Test the main refresh() method"""
 
     def test_refresh_runs_all_detectors_in_sequence(self, mock_config):
-        """Test that refresh runs all 8 detectors in order"""
+        """Test that refresh runs all 8 detectors"""
         with patch('insights_core.engine.InsightRepository'):
             engine = InsightEngine(config=mock_config)
 
@@ -333,6 +337,139 @@ class TestInsightEngineRefresh:
             assert stats['insights_by_detector']['Detector2'] == 5
             assert stats['insights_by_detector']['Detector3'] == 0  # Failed detector shows 0
 
+    def test_refresh_reports_detector_durations(self, mock_config):
+        """Test that wall time is reported per detector"""
+        with patch('insights_core.engine.InsightRepository'):
+            engine = InsightEngine(config=mock_config)
+
+            detector = Mock()
+            detector.__class__.__name__ = "TestDetector"
+            detector.detect = Mock(return_value=5)
+            engine.detectors = [detector]
+
+            stats = engine.refresh(generate_actions=False)
+
+            assert set(stats['detector_duration_seconds']) == {"TestDetector"}
+            assert stats['detector_duration_seconds']["TestDetector"] >= 0
+            assert stats['detectors_timed_out'] == 0
+
+    def test_refresh_runs_diagnosis_after_risk_detectors(self, mock_config):
+        """Test that DiagnosisDetector sees the risks written by other detectors"""
+        with patch('insights_core.engine.InsightRepository'):
+            engine = InsightEngine(config=mock_config)
+
+            calls = []
+
+            def make(name):
+                detector = Mock()
+                detector.__class__.__name__ = name
+                detector.detect = Mock(side_effect=lambda property=None: calls.append(name) or 1)
+                return detector
+
+            # Diagnosis listed first, but depends on the risk detectors
+            engine.detectors = [make("DiagnosisDetector"), make("AnomalyDetector"), make("TrendDetector")]
+
+            stats = engine.refresh(generate_actions=False)
+
+            assert calls[-1] == "DiagnosisDetector"
+            assert stats['total_insights_created'] == 3
+
+    def test_refresh_fans_out_per_property(self, mock_config):
+        """Test all-property refresh runs detectors once per property in fan-out mode"""
+        mock_config.engine_property_fanout = True
+
+        with patch('insights_core.engine.InsightRepository'):
+            engine = InsightEngine(config=mock_config)
+
+            detector = Mock()
+            detector.__class__.__name__ = "TestDetector"
+            detector.detect = Mock(side_effect=lambda property=None: 2 if property == "sc-domain:a.com" else 1)
+            engine.detectors = [detector]
+
+            properties = ["sc-domain:a.com", "sc-domain:b.com"]
+            with patch.object(engine, '_get_properties', return_value=properties):
+                stats = engine.refresh(generate_actions=False)
+
+            assert detector.detect.call_count == 2
+            detector.detect.assert_any_call(property="sc-domain:a.com")
+            detector.detect.assert_any_call(property="sc-domain:b.com")
+            assert stats['properties'] == properties
+            assert stats['detectors_run'] == 2
+            assert stats['insights_by_detector']["TestDetector"] == 3
+            assert stats['insights_by_property'] == {"sc-domain:a.com": 2, "sc-domain:b.com": 1}
+
+    def test_refresh_shares_snapshot_store(self, mock_config):
+        """Test detectors get one SnapshotStore for the refresh, cleared afterwards"""
+        mock_config.engine_data_snapshot = True
+
+        with patch('insights_core.engine.InsightRepository'), \
+                patch('insights_core.engine.SnapshotStore') as mock_store_class:
+            mock_store_class.return_value.stats.return_value = {'loads': 1}
+            engine = InsightEngine(config=mock_config)
+
+            seen = []
+            detectors = []
+            for name in ("AnomalyDetector", "TrendDetector"):
+                detector = Mock()
+                detector.__class__.__name__ = name
+                detector.detect = Mock(
+                    side_effect=lambda property=None, d=detector: seen.append(d.snapshots) or 1
+                )
+                detectors.append(detector)
+            engine.detectors = detectors
+
+            stats = engine.refresh(generate_actions=False)
+
+            mock_store_class.assert_called_once_with(mock_config.warehouse_dsn)
+            assert seen == [mock_store_class.return_value] * 2
+            assert all(detector.snapshots is None for detector in detectors)
+            assert stats['snapshot'] == {'loads': 1}
+
+    def test_fanout_properties_from_snapshot(self, mock_config):
+        """Test fan-out reads properties from the all-property snapshot"""
+        from insights_core.data_snapshot import SNAPSHOT_METRICS, build_snapshot
+
+        today = date.today()
+        padding = (0,) * len(SNAPSHOT_METRICS)
+        snapshot = build_snapshot(
+            [
+                ("sc-domain:b.com", "/", today) + padding,
+                ("sc-domain:a.com", "/", today) + padding,
+                ("sc-domain:old.com", "/", today - timedelta(days=60)) + padding,
+            ],
+            today - timedelta(days=90),
+            today
+        )
+        store = Mock()
+        store.get.return_value = snapshot
+
+        with patch('insights_core.engine.InsightRepository'), \
+                patch('insights_core.engine.psycopg2') as mock_psycopg2:
+            engine = InsightEngine(config=mock_config)
+
+            assert engine._get_properties(store) == ["sc-domain:a.com", "sc-domain:b.com"]
+            store.get.assert_called_once_with()
+            mock_psycopg2.connect.assert_not_called()
+
+    def test_refresh_with_property_ignores_fanout(self, mock_config):
+        """Test a property filter runs detectors once even in fan-out mode"""
+        mock_config.engine_property_fanout = True
+
+        with patch('insights_core.engine.InsightRepository'):
+            engine = InsightEngine(config=mock_config)
+
+            detector = Mock()
+            detector.__class__.__name__ = "TestDetector"
+            detector.detect = Mock(return_value=1)
+            engine.detectors = [detector]
+
+            with patch.object(engine, '_get_properties') as mock_get_properties:
+                stats = engine.refresh(property="sc-domain:a.com", generate_actions=False)
+
+            mock_get_properties.assert_not_called()
+            detector.detect.assert_called_once_with(property="sc-domain:a.com")
+            assert 'insights_by_property' not in stats
+
 
 # ===== TEST ACTION GENERATION =====
 
@@ -43,6 +43,10 @@ def mock_config():
     config.risk_threshold_clicks_pct = -20.0
     config.risk_threshold_conversions_pct = -20.0
     config.opportunity_threshold_impressions_pct = 50.0
+    config.engine_max_workers = 4
+    config.engine_detector_timeout_seconds = 60.0
+    config.engine_property_fanout = False
+    config.engine_data_snapshot = False
     return config
 
 
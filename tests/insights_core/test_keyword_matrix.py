@@ -0,0 +1,146 @@
+"""
+Tests for the sparse page x query keyword matrix
+
+Tests cover:
+- Building from rows (merging duplicates and page keys, click totals)
+- Pair lookups (shared keywords and counts)
+- All-pairs overlap against brute force, thresholds and top-k
+- Loading from one scan of gsc.search_performance (mocked connection)
+"""
+
+import itertools
+import random
+from unittest.mock import Mock
+
+import pytest
+
+from insights_core import keyword_matrix
+from insights_core.keyword_matrix import KeywordMatrix, load_keyword_matrix, url_path
+
+
+def rows(mapping, clicks=10):
+    return [{'page': page, 'query': q, 'clicks': clicks, 'impressions': 100}
+            for page, queries in mapping.items() for q in queries]
+
+
+@pytest.fixture
+def matrix():
+    return KeywordMatrix.from_rows(rows({
+        '/a': ['x', 'y', 'z'],
+        '/b': ['y', 'z', 'w'],
+        '/c': ['q'],
+    }))
+
+
+class TestBuild:
+    def test_shape_and_totals(self, matrix):
+        assert len(matrix) == 3
+        assert matrix.matrix.shape == (3, 5)
+        assert matrix.page_clicks('/a') == 30
+        assert matrix.page_impressions('/c') == 100
+        assert matrix.page_clicks('/missing') == 0
+
+    def test_duplicate_cells_are_incidence(self):
+        m = KeywordMatrix.from_rows(rows({'/a': ['x', 'x']}))
+        assert m.matrix.nnz == 1
+        assert m.keywords('/a') == ['x']
+
+    def test_page_key_merges_urls(self):
+        m = KeywordMatrix.from_rows(rows({
+            'https://example.com/a': ['x'],
+            'http://example.com/a': ['y'],
+        }), page_key=url_path)
+
+        assert m.pages == ['/a']
+        assert sorted(m.keywords('/a')) == ['x', 'y']
+
+    def test_url_path(self):
+        assert url_path('https://example.com') == '/'
+        assert url_path('/already/a/path') == '/already/a/path'
+
+
+class TestLookups:
+    def test_shared(self, matrix):
+        assert matrix.shared_count('/a', '/b') == 2
+        assert sorted(matrix.shared_keywords('/a', '/b')) == ['y', 'z']
+        assert matrix.shared_count('/a', '/missing') == 0
+
+    def test_restrict(self, matrix):
+        restricted = matrix.restrict(min_page_clicks=20)
+
+        assert restricted.pages == ['/a', '/b']
+        assert restricted.shared_count('/a', '/b') == 2
+        assert matrix.restrict(0) is matrix
+
+
+class TestOverlappingPairs:
+    def test_small(self, matrix):
+        assert matrix.overlapping_pairs() == [('/a', '/b', 2, 0.5)]
+        assert matrix.overlapping_pairs(min_shared=3) == []
+        assert matrix.overlapping_pairs(min_overlap=0.6) == []
+
+    def test_matches_brute_force(self, monkeypatch):
+        monkeypatch.setattr(keyword_matrix, 'PAIR_BLOCK', 7)  # several blocks
+        rng = random.Random(3)
+        vocabulary = [f'q{i}' for i in range(60)]
+        pages = {f'/p{i}': set(rng.sample(vocabulary, rng.randint(1, 15))) for i in range(40)}
+        m = KeywordMatrix.from_rows(rows(pages))
+
+        found = {(a, b): (n, s) for a, b, n, s in m.overlapping_pairs(min_shared=2)}
+
+        expected = {}
+        for a, b in itertools.combinations(sorted(pages), 2):
+            shared = len(pages[a] & pages[b])
+            if shared >= 2:
+                expected[(a, b)] = (shared, shared / len(pages[a] | pages[b]))
+        assert found.keys() == expected.keys()
+        for key, (count, score) in expected.items():
+            assert found[key][0] == count
+            assert found[key][1] == pytest.approx(score)
+
+    def test_sorted_and_top_k(self):
+        m = KeywordMatrix.from_rows(rows({
+            '/hub': ['a', 'b', 'c', 'd'],
+            '/x': ['a', 'b', 'c'],
+            '/y': ['a', 'b'],
+            '/z': ['a'],
+        }))
+
+        all_pairs = m.overlapping_pairs()
+        top1 = m.overlapping_pairs(top_k=1)
+
+        assert [p[2] for p in all_pairs] == sorted((p[2] for p in all_pairs), reverse=True)
+        assert len(all_pairs) == 6
+        # /hub-/x (best for both), /y's best is /x (2/3 overlap beats 2/4), /z's is /y
+        assert {(a, b) for a, b, _, _ in top1} == {('/hub', '/x'), ('/x', '/y'), ('/y', '/z')}
+
+    def test_single_page(self):
+        assert KeywordMatrix.from_rows(rows({'/a': ['x']})).overlapping_pairs() == []
+
+
+class TestLoad:
+    def test_one_scan_with_filters(self):
+        cursor = Mock()
+        cursor.fetchmany.side_effect = [rows({'/a': ['x']}), rows({'/b': ['x']}), []]
+        conn = Mock()
+        conn.cursor.return_value = cursor
+
+        m = load_keyword_matrix(conn, 'sc-domain:example.com', days=14, min_impressions=50, max_position=10)
+
+        sql, params = cursor.execute.call_args.args
+        assert 'GROUP BY page, query' in sql
+        assert 'impressions >= %s' in sql and 'position <= %s' in sql
+        assert params == ('sc-domain:example.com', 14, 50, 10)
+        assert m.shared_count('/a', '/b') == 1
+        cursor.close.assert_called_once()
+
+    def test_without_filters(self):
+        cursor = Mock()
+        cursor.fetchmany.side_effect = [[]]
+        conn = Mock()
+        conn.cursor.return_value = cursor
+
+        m = load_keyword_matrix(conn, 'p')
+
+        assert len(m) == 0
+        assert cursor.execute.call_args.args[1] == ('p', 30)
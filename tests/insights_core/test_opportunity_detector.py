@@ -31,6 +31,7 @@ from tests.fixtures.sample_data import (
     SAMPLE_PAGES,
     reset_seed,
 )
+from tests.fixtures.conftest_helpers import persisted_insights
 
 # Base module path for patching psycopg2
 BASE_PSYCOPG2_PATH = 'insights_core.detectors.base.psycopg2'
@@ -49,7 +50,7 @@ def mock_config():
 def mock_repository():
     """Mock InsightRepository"""
     repo = Mock()
-    repo.create = Mock(return_value=Mock(id="test-insight-id"))
+    repo.create_many = Mock(return_value=[])
     return repo
 
 
@@ -213,11 +214,10 @@ class TestStrikingDistanceDetection:
 
             # Should create insights for both pages
             assert insights_created == 2
-            assert mock_repository.create.call_count == 2
+            assert len(persisted_insights(mock_repository)) == 2
 
             # Verify insights are OPPORTUNITY category
-            for call_obj in mock_repository.create.call_args_list:
-                insight: InsightCreate = call_obj[0][0]
+            for insight in persisted_insights(mock_repository):
                 assert insight.category == InsightCategory.OPPORTUNITY
                 assert insight.entity_type == EntityType.PAGE
                 assert insight.title == "Striking Distance Opportunity"
@@ -238,7 +238,7 @@ class TestStrikingDistanceDetection:
             detector._find_striking_distance()
 
             # Get the created insight
-            insight: InsightCreate = mock_repository.create.call_args[0][0]
+            insight: InsightCreate = persisted_insights(mock_repository)[-1]
 
             # Verify metrics
             assert insight.metrics.gsc_position == 15.5
@@ -278,7 +278,7 @@ class TestStrikingDistanceDetection:
 
             # No insights should be created
             assert insights_created == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
     def test_striking_distance_with_property_filter(
         self, mock_repository, mock_config, striking_distance_data
@@ -299,6 +299,37 @@ class TestStrikingDistanceDetection:
             assert 'sc-domain:example.com' in call_args[0][1]
 
 
+    def test_striking_distance_uses_refresh_snapshot(
+        self, mock_repository, mock_config
+    ):
+        """Test striking distance reads the shared snapshot instead of querying"""
+        from insights_core.data_snapshot import build_snapshot
+
+        today = date.today()
+        # property, page, date, clicks, impressions, ctr, position, sessions,
+        # engagement, bounce, conversions, page views
+        rows = [
+            ('sc-domain:example.com', '/in-range', today - timedelta(days=2), 50, 1000, 0.05, 14.0, 40, 0.6, 0.4, 2, 80),
+            ('sc-domain:example.com', '/in-range', today - timedelta(days=1), 60, 1200, 0.05, 9.0, 40, 0.6, 0.4, 2, 80),
+            ('sc-domain:example.com', '/low-volume', today - timedelta(days=1), 1, 50, 0.02, 15.0, 2, 0.6, 0.4, 0, 4),
+            ('sc-domain:example.com', '/too-old', today - timedelta(days=10), 50, 1000, 0.05, 15.0, 40, 0.6, 0.4, 2, 80),
+        ]
+        detector = OpportunityDetector(mock_repository, mock_config)
+        detector.snapshots = Mock()
+        detector.snapshots.get.return_value = build_snapshot(rows, today - timedelta(days=90), today)
+
+        with patch(BASE_PSYCOPG2_PATH) as mock_psycopg2:
+            insights_created = detector._find_striking_distance()
+
+        mock_psycopg2.connect.assert_not_called()
+        assert insights_created == 1
+        insight = persisted_insights(mock_repository)[0]
+        assert insight.entity_id == '/in-range'
+        # Latest row still in positions 11-20, not the most recent row overall
+        assert insight.metrics.gsc_position == pytest.approx(14.0)
+        assert insight.metrics.gsc_impressions == 1000
+
+
 class TestContentGapDetection:
     """Test content gap opportunity detection (high impressions, low engagement)"""
 
@@ -318,11 +349,10 @@ class TestContentGapDetection:
 
             # Should create insights for both pages
             assert insights_created == 2
-            assert mock_repository.create.call_count == 2
+            assert len(persisted_insights(mock_repository)) == 2
 
             # Verify insights are OPPORTUNITY category with LOW severity
-            for call_obj in mock_repository.create.call_args_list:
-                insight: InsightCreate = call_obj[0][0]
+            for insight in persisted_insights(mock_repository):
                 assert insight.category == InsightCategory.OPPORTUNITY
                 assert insight.entity_type == EntityType.PAGE
                 assert insight.title == "Content Gap Opportunity"
@@ -343,7 +373,7 @@ class TestContentGapDetection:
             detector._find_content_gaps()
 
             # Get the created insight
-            insight: InsightCreate = mock_repository.create.call_args[0][0]
+            insight: InsightCreate = persisted_insights(mock_repository)[-1]
 
             # Verify metrics
             assert insight.metrics.gsc_impressions == 5000
@@ -382,7 +412,7 @@ class TestContentGapDetection:
 
             # No insights should be created
             assert insights_created == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
     def test_content_gap_with_property_filter(
         self, mock_repository, mock_config, content_gap_data
@@ -463,7 +493,7 @@ class TestURLConsolidationDetection:
 
                 # Should create insights for both candidates
                 assert insights_created == 2
-                assert mock_repository.create.call_count == 2
+                assert len(persisted_insights(mock_repository)) == 2
 
     def test_url_consolidation_filters_low_priority(
         self, mock_repository, mock_config
@@ -499,7 +529,7 @@ class TestURLConsolidationDetection:
 
                 # No insights should be created
                 assert insights_created == 0
-                mock_repository.create.assert_not_called()
+                assert persisted_insights(mock_repository) == []
 
     def test_url_consolidation_with_property_filter(
         self, mock_repository, mock_config
@@ -604,7 +634,7 @@ class TestOpportunityDetectorEdgeCases:
             insights_created = detector._find_striking_distance()
 
             assert insights_created == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
     def test_saturated_queries_no_opportunity(
         self, mock_repository, mock_config, saturated_queries_data
@@ -665,20 +695,19 @@ class TestOpportunityDetectorEdgeCases:
             mock_cursor = MagicMock()
             mock_psycopg2.connect.return_value = mock_conn
             mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-            # Return multiple rows
-            mock_cursor.fetchall.return_value = striking_distance_data
-
-            # Make first create fail, second succeed
-            mock_repository.create.side_effect = [
-                Exception("Creation failed"),
-                Mock(id="test-insight-id"),
+            # Return multiple rows, the first one malformed
+            mock_cursor.fetchall.return_value = [
+                {**striking_distance_data[0], 'gsc_ctr': None},
+                striking_distance_data[1],
             ]
 
             detector = OpportunityDetector(mock_repository, mock_config)
             insights_created = detector._find_striking_distance()
 
-            # Should create 1 (second one succeeded)
+            # Should create 1 (second one succeeded) in a single batch
             assert insights_created == 1
+            mock_repository.create_many.assert_called_once()
+            assert len(persisted_insights(mock_repository)) == 1
 
 
 class TestOpportunityPrioritization:
@@ -713,7 +742,7 @@ class TestOpportunityPrioritization:
             insights_created = detector._find_striking_distance()
 
             assert insights_created == 1
-            insight: InsightCreate = mock_repository.create.call_args[0][0]
+            insight: InsightCreate = persisted_insights(mock_repository)[-1]
             # Should be MEDIUM severity (striking distance default)
             assert insight.severity == InsightSeverity.MEDIUM
             # High impressions should be mentioned
@@ -734,7 +763,7 @@ class TestOpportunityPrioritization:
             insights_created = detector._find_content_gaps()
 
             assert insights_created == 1
-            insight: InsightCreate = mock_repository.create.call_args[0][0]
+            insight: InsightCreate = persisted_insights(mock_repository)[-1]
             # Should be LOW severity (content gap default)
             assert insight.severity == InsightSeverity.LOW
             # Should mention engagement rate
@@ -758,7 +787,7 @@ class TestOpportunityMetrics:
             detector = OpportunityDetector(mock_repository, mock_config)
             detector._find_striking_distance()
 
-            insight: InsightCreate = mock_repository.create.call_args[0][0]
+            insight: InsightCreate = persisted_insights(mock_repository)[-1]
 
             # Verify all metrics are present
             assert insight.metrics.gsc_position is not None
@@ -781,7 +810,7 @@ class TestOpportunityMetrics:
             detector = OpportunityDetector(mock_repository, mock_config)
             detector._find_content_gaps()
 
-            insight: InsightCreate = mock_repository.create.call_args[0][0]
+            insight: InsightCreate = persisted_insights(mock_repository)[-1]
 
             # Verify engagement metrics
             assert insight.metrics.gsc_impressions is not None
@@ -802,12 +831,10 @@ class TestExceptionHandling:
             mock_cursor = MagicMock()
             mock_psycopg2.connect.return_value = mock_conn
             mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-            mock_cursor.fetchall.return_value = content_gap_data
-
-            # Make repository.create fail for first, succeed for second
-            mock_repository.create.side_effect = [
-                Exception("Failed to create insight"),
-                Mock(id="test-insight-id"),
+            # Make the first row malformed, the second valid
+            mock_cursor.fetchall.return_value = [
+                {**content_gap_data[0], 'ga_engagement_rate': None},
+                content_gap_data[1],
             ]
 
             detector = OpportunityDetector(mock_repository, mock_config)
@@ -815,6 +842,7 @@ class TestExceptionHandling:
 
             # Should create 1 (second one succeeded)
             assert insights_created == 1
+            assert len(persisted_insights(mock_repository)) == 1
 
     def test_url_consolidation_handles_create_insight_errors(
         self, mock_repository, mock_config
@@ -853,7 +881,7 @@ class TestExceptionHandling:
 
                 # Should return 0 due to error
                 assert insights_created == 0
-                mock_repository.create.assert_not_called()
+                assert persisted_insights(mock_repository) == []
 
     def test_url_consolidation_handles_property_analysis_errors(
         self, mock_repository, mock_config
@@ -84,16 +84,33 @@ def sample_db_row():
 class TestInsightRepository:
     """Test InsightRepository"""
 
-    def test_init_connects_to_database(self, mock_dsn):
-        """Test repository initialization connects to database"""
+    def test_init_does_not_connect(self, mock_dsn):
+        """Test repository initialization opens no connection until first use"""
         with patch('insights_core.repository.psycopg2.connect') as mock_connect:
-            mock_conn = Mock()
+            repo = InsightRepository(mock_dsn)
+
+            assert repo.dsn == mock_dsn
+            mock_connect.assert_not_called()
+
+    def test_connections_are_pooled(self, mock_dsn, sample_db_row):
+        """Test consecutive calls reuse one pooled connection"""
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+            mock_conn = MagicMock()
+            mock_conn.closed = 0
+            mock_conn.info.transaction_status = 0  # idle
             mock_connect.return_value = mock_conn
+            mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+            mock_cursor.fetchone.return_value = sample_db_row
 
             repo = InsightRepository(mock_dsn)
+            repo.get_by_id("test-id-12345")
+            repo.get_by_id("test-id-12345")
+            repo.get_stats()
 
-            assert repo.dsn == mock_dsn
             mock_connect.assert_called_once_with(mock_dsn)
+            mock_conn.close.assert_not_called()
+
+            repo.close()
             mock_conn.close.assert_called_once()
 
     def test_get_connection(self, mock_dsn):
@@ -116,13 +133,15 @@ class TestInsightRepository:
 
     def test_create_insight_success(self, mock_dsn, sample_insight_create, sample_db_row):
         """Test creating a new insight"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             # Setup mocks
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
             mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-            mock_cursor.fetchone.return_value = sample_db_row
+            row = dict(sample_db_row, id=sample_insight_create.to_insight().id)
+            mock_execute_values.return_value = [row]
 
             repo = InsightRepository(mock_dsn)
             result = repo.create(sample_insight_create)
@@ -131,33 +150,33 @@ class TestInsightRepository:
             assert isinstance(result, Insight)
             assert result.title == "Test Traffic Drop"
             assert result.category == InsightCategory.RISK
-            mock_cursor.execute.assert_called_once()
+            mock_execute_values.assert_called_once()
+            assert 'ON CONFLICT (id) DO NOTHING' in mock_execute_values.call_args[0][1]
+            mock_cursor.execute.assert_not_called()
             mock_conn.commit.assert_called_once()
-            mock_conn.close.assert_called()
 
     def test_create_insight_duplicate(self, mock_dsn, sample_insight_create, sample_db_row):
         """Test creating duplicate insight returns existing"""
-        import psycopg2
-
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
             mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
 
-            # First call raises IntegrityError (duplicate)
-            mock_cursor.execute.side_effect = [
-                psycopg2.IntegrityError("duplicate key"),
-                None  # Second call for get_by_id
-            ]
-            mock_cursor.fetchone.return_value = sample_db_row
+            # Conflict: nothing returned by the INSERT, existing row read back
+            mock_execute_values.return_value = []
+            insight_id = sample_insight_create.to_insight().id
+            mock_cursor.fetchall.return_value = [dict(sample_db_row, id=insight_id)]
 
             repo = InsightRepository(mock_dsn)
             result = repo.create(sample_insight_create)
 
-            # Verify rollback was called and existing insight returned
+            # Verify existing insight returned without a rollback
             assert isinstance(result, Insight)
-            mock_conn.rollback.assert_called_once()
+            assert result.id == insight_id
+            assert mock_cursor.execute.call_args[0][1] == ([insight_id],)
+            mock_conn.rollback.assert_not_called()
 
     def test_get_by_id_found(self, mock_dsn, sample_db_row):
         """Test get_by_id returns insight when found"""
@@ -191,7 +210,8 @@ class TestInsightRepository:
 
     def test_update_status(self, mock_dsn, sample_db_row):
         """Test updating insight status"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
@@ -200,18 +220,20 @@ class TestInsightRepository:
             # Update to diagnosed status
             updated_row = sample_db_row.copy()
             updated_row['status'] = 'diagnosed'
-            mock_cursor.fetchone.return_value = updated_row
+            mock_execute_values.return_value = [updated_row]
 
             repo = InsightRepository(mock_dsn)
             update = InsightUpdate(status=InsightStatus.DIAGNOSED)
             result = repo.update("test-id-12345", update)
 
             assert result.status == InsightStatus.DIAGNOSED
+            assert mock_execute_values.call_args[0][2] == [("test-id-12345", 'diagnosed', None, None)]
             mock_conn.commit.assert_called_once()
 
     def test_update_description(self, mock_dsn, sample_db_row):
         """Test updating insight description"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
@@ -219,7 +241,7 @@ class TestInsightRepository:
 
             updated_row = sample_db_row.copy()
             updated_row['description'] = "Updated description"
-            mock_cursor.fetchone.return_value = updated_row
+            mock_execute_values.return_value = [updated_row]
 
             repo = InsightRepository(mock_dsn)
             update = InsightUpdate(description="Updated description")
@@ -229,7 +251,8 @@ class TestInsightRepository:
 
     def test_update_linked_insight(self, mock_dsn, sample_db_row):
         """Test updating linked insight"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
@@ -237,7 +260,7 @@ class TestInsightRepository:
 
             updated_row = sample_db_row.copy()
             updated_row['linked_insight_id'] = "parent-insight-id"
-            mock_cursor.fetchone.return_value = updated_row
+            mock_execute_values.return_value = [updated_row]
 
             repo = InsightRepository(mock_dsn)
             update = InsightUpdate(linked_insight_id="parent-insight-id")
@@ -592,12 +615,13 @@ class TestInsightRepository:
 
     def test_update_not_found(self, mock_dsn):
         """Test update returns None when insight not found"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
             mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-            mock_cursor.fetchone.return_value = None
+            mock_execute_values.return_value = []
 
             repo = InsightRepository(mock_dsn)
             update = InsightUpdate(status=InsightStatus.DIAGNOSED)
@@ -607,7 +631,8 @@ class TestInsightRepository:
 
     def test_update_multiple_fields(self, mock_dsn, sample_db_row):
         """Test updating multiple fields at once"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
@@ -617,7 +642,7 @@ class TestInsightRepository:
             updated_row['status'] = 'diagnosed'
             updated_row['description'] = 'Updated description'
             updated_row['linked_insight_id'] = 'parent-id'
-            mock_cursor.fetchone.return_value = updated_row
+            mock_execute_values.return_value = [updated_row]
 
             repo = InsightRepository(mock_dsn)
             update = InsightUpdate(
@@ -716,10 +741,12 @@ class TestInsightRepository:
             assert results[0].category == InsightCategory.RISK
             assert results[0].severity == InsightSeverity.HIGH
 
-    def test_connection_closed_on_error(self, mock_dsn):
-        """Test connection is closed even when error occurs"""
+    def test_connection_released_on_error(self, mock_dsn):
+        """Test connection is returned to the pool even when error occurs"""
         with patch('insights_core.repository.psycopg2.connect') as mock_connect:
             mock_conn = MagicMock()
+            mock_conn.closed = 0
+            mock_conn.info.transaction_status = 3  # in error
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
             mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
@@ -730,8 +757,10 @@ class TestInsightRepository:
             with pytest.raises(Exception):
                 repo.get_by_id("test-id")
 
-            # Connection should be closed even on error
-            mock_conn.close.assert_called()
+            # Connection should be back in the pool even on error
+            mock_conn.rollback.assert_called_once()
+            assert repo._pool._used == {}
+            assert repo._pool._pool == [mock_conn]
 
     def test_row_to_insight_with_all_fields(self, mock_dsn):
         """Test _row_to_insight with all fields populated"""
@@ -783,7 +812,8 @@ class TestInsightRepository:
 
     def test_create_with_linked_insight_id(self, mock_dsn, sample_insight_create):
         """Test creating insight with linked_insight_id"""
-        with patch('insights_core.repository.psycopg2.connect') as mock_connect:
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
             mock_conn = MagicMock()
             mock_cursor = MagicMock()
             mock_connect.return_value = mock_conn
@@ -808,18 +838,18 @@ class TestInsightRepository:
                 'created_at': datetime(2024, 11, 15, 12, 0),
                 'updated_at': datetime(2024, 11, 15, 12, 0)
             }
-            mock_cursor.fetchone.return_value = returned_row
-
             # Add linked_insight_id to the insight create
             sample_insight_create.linked_insight_id = "parent-id-123"
+            returned_row['id'] = sample_insight_create.to_insight().id
+            mock_execute_values.return_value = [returned_row]
 
             repo = InsightRepository(mock_dsn)
             result = repo.create(sample_insight_create)
 
             assert result.linked_insight_id == "parent-id-123"
             # Verify linked_insight_id was passed to the INSERT
-            call_args = mock_cursor.execute.call_args[0]
-            assert "parent-id-123" in call_args[1]
+            inserted_row = mock_execute_values.call_args[0][2][0]
+            assert "parent-id-123" in inserted_row
 
     def test_query_sorting_by_generated_at_desc(self, mock_dsn, sample_db_row):
         """Test query results are sorted by generated_at DESC"""
@@ -851,3 +881,116 @@ class TestInsightRepository:
             # Results should be in order
             assert results[0].id == 'id-2'
             assert results[1].id == 'id-1'
+
+
+class TestInsightRepositoryBatch:
+    """Test create_many / update_many"""
+
+    @pytest.fixture
+    def pooled(self, mock_dsn):
+        """Repository whose pool hands out one mocked connection"""
+        with patch('insights_core.repository.psycopg2.connect') as mock_connect, \
+                patch('insights_core.repository.execute_values') as mock_execute_values:
+            mock_conn = MagicMock()
+            mock_conn.closed = 0
+            mock_conn.info.transaction_status = 0  # idle
+            mock_connect.return_value = mock_conn
+            mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+            yield InsightRepository(mock_dsn), mock_conn, mock_cursor, mock_execute_values
+
+    def _creates(self, sample_insight_create, count):
+        return [
+            sample_insight_create.model_copy(update={'entity_id': f'/page-{i}'})
+            for i in range(count)
+        ]
+
+    def test_create_many_single_round_trip(self, pooled, sample_insight_create, sample_db_row):
+        """All insights are written by one multi-row INSERT"""
+        repo, mock_conn, mock_cursor, mock_execute_values = pooled
+        creates = self._creates(sample_insight_create, 3)
+        ids = [c.to_insight().id for c in creates]
+        mock_execute_values.side_effect = lambda cur, sql, rows, **kwargs: [
+            dict(sample_db_row, id=row[0], entity_id=row[4]) for row in reversed(rows)
+        ]
+
+        results = repo.create_many(creates)
+
+        mock_execute_values.assert_called_once()
+        assert len(mock_execute_values.call_args[0][2]) == 3
+        assert 'RETURNING *' in mock_execute_values.call_args[0][1]
+        mock_cursor.execute.assert_not_called()
+        mock_conn.commit.assert_called_once()
+        # Results follow input order, not RETURNING order
+        assert [r.id for r in results] == ids
+
+    def test_create_many_reads_back_existing(self, pooled, sample_insight_create, sample_db_row):
+        """Rows skipped by ON CONFLICT are fetched in one query"""
+        repo, mock_conn, mock_cursor, mock_execute_values = pooled
+        creates = self._creates(sample_insight_create, 3)
+        ids = [c.to_insight().id for c in creates]
+        mock_execute_values.return_value = [dict(sample_db_row, id=ids[0])]
+        mock_cursor.fetchall.return_value = [dict(sample_db_row, id=i) for i in ids[1:]]
+
+        results = repo.create_many(creates)
+
+        assert mock_cursor.execute.call_args[0][1] == (ids[1:],)
+        assert [r.id for r in results] == ids
+
+    def test_create_many_deduplicates_input(self, pooled, sample_insight_create, sample_db_row):
+        """The same deterministic ID is only sent once"""
+        repo, _, _, mock_execute_values = pooled
+        insight_id = sample_insight_create.to_insight().id
+        mock_execute_values.return_value = [dict(sample_db_row, id=insight_id)]
+
+        results = repo.create_many([sample_insight_create, sample_insight_create])
+
+        assert len(mock_execute_values.call_args[0][2]) == 1
+        assert len(results) == 1
+
+    def test_create_many_empty(self, pooled):
+        """Nothing to write makes no database call"""
+        repo, mock_conn, _, mock_execute_values = pooled
+
+        assert repo.create_many([]) == []
+        mock_execute_values.assert_not_called()
+        mock_conn.cursor.assert_not_called()
+
+    def test_create_many_error_rolls_back(self, pooled, sample_insight_create):
+        """A failed batch is rolled back and the connection returned to the pool"""
+        repo, mock_conn, _, mock_execute_values = pooled
+        mock_execute_values.side_effect = Exception("check constraint")
+
+        with pytest.raises(Exception, match="check constraint"):
+            repo.create_many([sample_insight_create])
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        assert repo._pool._used == {}
+
+    def test_update_many_single_round_trip(self, pooled, sample_db_row):
+        """All updates run as one UPDATE ... FROM (VALUES ...)"""
+        repo, mock_conn, _, mock_execute_values = pooled
+        mock_execute_values.return_value = [
+            dict(sample_db_row, id='a', status='diagnosed'),
+            dict(sample_db_row, id='b', status='diagnosed'),
+        ]
+
+        results = repo.update_many([
+            ('a', InsightUpdate(status=InsightStatus.DIAGNOSED, linked_insight_id='d1')),
+            ('b', InsightUpdate(status=InsightStatus.DIAGNOSED, linked_insight_id='d2')),
+            ('c', InsightUpdate()),
+        ])
+
+        mock_execute_values.assert_called_once()
+        sql, rows = mock_execute_values.call_args[0][1:3]
+        assert 'FROM (VALUES %s)' in sql
+        assert rows == [('a', 'diagnosed', None, 'd1'), ('b', 'diagnosed', None, 'd2')]
+        assert [r.id for r in results] == ['a', 'b']
+        mock_conn.commit.assert_called_once()
+
+    def test_update_many_nothing_to_update(self, pooled):
+        """Updates without fields make no database call"""
+        repo, _, _, mock_execute_values = pooled
+
+        assert repo.update_many([('a', InsightUpdate())]) == []
+        mock_execute_values.assert_not_called()
@@ -26,6 +26,7 @@ from insights_core.models import (
     InsightSeverity,
     EntityType,
 )
+from tests.fixtures.conftest_helpers import persisted_insights
 
 
 @pytest.fixture
@@ -40,7 +41,7 @@ def mock_config():
 def mock_repository():
     """Mock InsightRepository."""
     repo = Mock()
-    repo.create = Mock(return_value=Mock(id="test-insight-id"))
+    repo.create_many = Mock(return_value=[])
     return repo
 
 
@@ -165,7 +166,7 @@ class TestTopicStrategyDetectorDetect:
         count = detector.detect(property="sc-domain:example.com")
 
         assert count == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     @pytest.mark.skipif(not TOPIC_CLUSTERER_AVAILABLE, reason="TopicClusterer not available")
     def test_detect_handles_no_topics(self, mock_repository, mock_config):
@@ -184,7 +185,7 @@ class TestTopicStrategyDetectorDetect:
             count = detector.detect(property="sc-domain:example.com")
 
             assert count == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
 
 @pytest.mark.skipif(not TOPIC_CLUSTERER_AVAILABLE, reason="TopicClusterer not available")
@@ -214,10 +215,10 @@ class TestUnderrepresentedTopicDetection:
             count = detector.detect(property="sc-domain:example.com")
 
             assert count == 1
-            mock_repository.create.assert_called_once()
+            assert len(persisted_insights(mock_repository)) == 1
 
             # Verify insight created
-            call_args = mock_repository.create.call_args[0][0]
+            call_args = persisted_insights(mock_repository)[-1]
             assert isinstance(call_args, InsightCreate)
             assert call_args.category == InsightCategory.OPPORTUNITY
             assert "Underrepresented" in call_args.title
@@ -245,7 +246,7 @@ class TestUnderrepresentedTopicDetection:
 
             detector.detect(property="sc-domain:example.com")
 
-            call_args = mock_repository.create.call_args[0][0]
+            call_args = persisted_insights(mock_repository)[-1]
             assert call_args.entity_id == "topic:python-tutorials"
 
     def test_underrepresented_topic_metrics(
@@ -270,7 +271,7 @@ class TestUnderrepresentedTopicDetection:
 
             detector.detect(property="sc-domain:example.com")
 
-            call_args = mock_repository.create.call_args[0][0]
+            call_args = persisted_insights(mock_repository)[-1]
             metrics = call_args.metrics
 
             assert hasattr(metrics, 'topic')
@@ -313,9 +314,7 @@ class TestUnderrepresentedTopicDetection:
             count = detector.detect(property="sc-domain:example.com")
 
             # Check that no opportunity insight was created
-            created_insights = [
-                call[0][0] for call in mock_repository.create.call_args_list
-            ]
+            created_insights = persisted_insights(mock_repository)
             opportunity_insights = [
                 i for i in created_insights
                 if i.category == InsightCategory.OPPORTUNITY
@@ -352,9 +351,7 @@ class TestCannibalizationDetection:
             assert count >= 1
 
             # Find the diagnosis insight
-            created_insights = [
-                call[0][0] for call in mock_repository.create.call_args_list
-            ]
+            created_insights = persisted_insights(mock_repository)
             diagnosis_insights = [
                 i for i in created_insights
                 if i.category == InsightCategory.DIAGNOSIS
@@ -386,9 +383,7 @@ class TestCannibalizationDetection:
             detector.detect(property="sc-domain:example.com")
 
             # Find the diagnosis insight
-            created_insights = [
-                call[0][0] for call in mock_repository.create.call_args_list
-            ]
+            created_insights = persisted_insights(mock_repository)
             diagnosis_insights = [
                 i for i in created_insights
                 if i.category == InsightCategory.DIAGNOSIS
@@ -420,9 +415,7 @@ class TestCannibalizationDetection:
             detector.detect(property="sc-domain:example.com")
 
             # Find the diagnosis insight
-            created_insights = [
-                call[0][0] for call in mock_repository.create.call_args_list
-            ]
+            created_insights = persisted_insights(mock_repository)
             diagnosis_insights = [
                 i for i in created_insights
                 if i.category == InsightCategory.DIAGNOSIS
@@ -432,6 +425,64 @@ class TestCannibalizationDetection:
             assert hasattr(metrics, 'cannibalization_score')
             assert metrics.cannibalization_score > CANNIBALIZATION_THRESHOLD
 
+    def test_cannibalization_includes_similar_page_pairs(
+        self,
+        mock_repository,
+        mock_config,
+        sample_topic_cannibalized
+    ):
+        """Test that near-duplicate pairs from the vector index are reported."""
+        with patch('insights_core.detectors.topic_strategy.TopicClusterer') as mock_clusterer_class:
+            mock_clusterer = Mock()
+            mock_clusterer.analyze_topic_performance = AsyncMock(
+                return_value=[sample_topic_cannibalized]
+            )
+            mock_clusterer.similar_page_pairs = AsyncMock(return_value={2: 4})
+            mock_clusterer_class.return_value = mock_clusterer
+
+            detector = TopicStrategyDetector(
+                mock_repository,
+                mock_config,
+                use_topic_clustering=True
+            )
+
+            detector.detect(property="sc-domain:example.com")
+
+            mock_clusterer.similar_page_pairs.assert_awaited_once()
+            assert mock_clusterer.similar_page_pairs.call_args.args == ("sc-domain:example.com", [2])
+
+            diagnosis = persisted_insights(mock_repository)[0]
+            assert diagnosis.metrics.similar_page_pairs == 4
+            assert "4 page pair(s) have near-duplicate content" in diagnosis.description
+
+    def test_cannibalization_without_vector_index(
+        self,
+        mock_repository,
+        mock_config,
+        sample_topic_cannibalized
+    ):
+        """Test that an unavailable vector index does not block the insight."""
+        with patch('insights_core.detectors.topic_strategy.TopicClusterer') as mock_clusterer_class:
+            mock_clusterer = Mock()
+            mock_clusterer.analyze_topic_performance = AsyncMock(
+                return_value=[sample_topic_cannibalized]
+            )
+            mock_clusterer.similar_page_pairs = AsyncMock(side_effect=Exception("no embeddings"))
+            mock_clusterer_class.return_value = mock_clusterer
+
+            detector = TopicStrategyDetector(
+                mock_repository,
+                mock_config,
+                use_topic_clustering=True
+            )
+
+            count = detector.detect(property="sc-domain:example.com")
+
+            assert count == 1
+            diagnosis = persisted_insights(mock_repository)[0]
+            assert diagnosis.metrics.similar_page_pairs is None
+            assert "near-duplicate" not in diagnosis.description
+
 
 class TestCannibalizationScoreCalculation:
     """Tests for cannibalization score calculation."""
@@ -552,7 +603,7 @@ class TestMultipleTopics:
             count = detector.detect(property="sc-domain:example.com")
 
             assert count == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
 
 class TestGetTopicSummary:
@@ -901,7 +952,7 @@ class TestSingleTopicScenario:
             count = detector.detect(property="sc-domain:example.com")
 
             assert count == 1
-            mock_repository.create.assert_called_once()
+            assert len(persisted_insights(mock_repository)) == 1
 
 
 class TestNoTopicsScenario:
@@ -924,7 +975,7 @@ class TestNoTopicsScenario:
             count = detector.detect(property="sc-domain:example.com")
 
             assert count == 0
-            mock_repository.create.assert_not_called()
+            assert persisted_insights(mock_repository) == []
 
     @pytest.mark.skipif(not TOPIC_CLUSTERER_AVAILABLE, reason="TopicClusterer not available")
     def test_none_topics_result(self, mock_repository, mock_config):
@@ -34,6 +34,7 @@ from insights_core.models import (
 )
 from insights_core.repository import InsightRepository
 from insights_core.config import InsightsConfig
+from tests.fixtures.conftest_helpers import persisted_insights
 
 
 @pytest.fixture
@@ -48,7 +49,7 @@ def mock_config():
 def mock_repository():
     """Create mock repository"""
     repo = Mock(spec=InsightRepository)
-    repo.create = Mock(return_value=Mock())
+    repo.create_many = Mock(return_value=[])
     return repo
 
 
@@ -389,10 +390,10 @@ class TestDeclineDetection:
 
         # Verify insight was created
         assert insights_created == 1
-        mock_repository.create.assert_called_once()
+        assert len(persisted_insights(mock_repository)) == 1
 
         # Verify the insight details
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert isinstance(insight, InsightCreate)
         assert insight.title == "Gradual Traffic Decline Detected"
         assert insight.category == InsightCategory.RISK
@@ -419,7 +420,7 @@ class TestDeclineDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.severity == InsightSeverity.HIGH
 
     def test_decline_severity_medium(self, mock_repository, mock_config):
@@ -437,7 +438,7 @@ class TestDeclineDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.severity == InsightSeverity.MEDIUM
 
     def test_decline_severity_low(self, mock_repository, mock_config):
@@ -455,7 +456,7 @@ class TestDeclineDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.severity == InsightSeverity.LOW
 
     def test_decline_metrics_accuracy(self, mock_repository, mock_config):
@@ -477,7 +478,7 @@ class TestDeclineDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics.__pydantic_extra__
 
         assert metrics['days_analyzed'] == days
@@ -507,10 +508,10 @@ class TestGrowthDetection:
 
         # Verify insight was created
         assert insights_created == 1
-        mock_repository.create.assert_called_once()
+        assert len(persisted_insights(mock_repository)) == 1
 
         # Verify the insight details
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert isinstance(insight, InsightCreate)
         assert insight.title == "Gradual Traffic Growth Detected"
         assert insight.category == InsightCategory.OPPORTUNITY
@@ -537,7 +538,7 @@ class TestGrowthDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.severity == InsightSeverity.HIGH
 
     def test_growth_severity_medium(self, mock_repository, mock_config):
@@ -555,7 +556,7 @@ class TestGrowthDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.severity == InsightSeverity.MEDIUM
 
     def test_growth_severity_low(self, mock_repository, mock_config):
@@ -573,7 +574,7 @@ class TestGrowthDetection:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.severity == InsightSeverity.LOW
 
 
@@ -598,7 +599,7 @@ class TestNoTrendScenarios:
 
         # Should not create insight (slope not strong enough)
         assert insights_created == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_no_trend_for_weak_rsquared(self, mock_repository, mock_config):
         """Test that trends with low R² (weak correlation) don't create insights"""
@@ -640,7 +641,7 @@ class TestNoTrendScenarios:
 
         # Should not create insight (insufficient data)
         assert insights_created == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_no_trend_for_exactly_30_days_with_weak_trend(self, mock_repository, mock_config):
         """Test edge case: exactly 30 days with weak trend"""
@@ -718,7 +719,7 @@ class TestTimeWindows:
 
         # Should create insight
         assert insights_created == 1
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         assert insight.window_days == 90
 
 
@@ -740,7 +741,7 @@ class TestMetricsValidation:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics.__pydantic_extra__
 
         # Verify all required metrics present
@@ -772,7 +773,7 @@ class TestMetricsValidation:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics.__pydantic_extra__
 
         # Verify all required metrics present
@@ -800,7 +801,7 @@ class TestMetricsValidation:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             detector.detect('sc-domain:example.com')
 
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
         metrics = insight.metrics.__pydantic_extra__
 
         # Confidence should be min(0.95, r_squared)
@@ -819,7 +820,7 @@ class TestDetectionLogic:
             insights_created = detector.detect('sc-domain:example.com')
 
         assert insights_created == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_detect_processes_multiple_pages(self, mock_repository, mock_config):
         """Test detect processes multiple pages correctly"""
@@ -837,7 +838,7 @@ class TestDetectionLogic:
 
         # Should create 2 insights (decline + growth, not flat or short)
         assert insights_created == 2
-        assert mock_repository.create.call_count == 2
+        assert len(persisted_insights(mock_repository)) == 2
 
     def test_detect_handles_database_errors_gracefully(self, mock_repository, mock_config):
         """Test detect handles database errors gracefully"""
@@ -897,7 +898,7 @@ class TestIntegrationWithRepository:
     """Test integration with repository"""
 
     def test_insights_saved_via_repository(self, mock_repository, mock_config):
-        """Test that insights are saved via repository.create()"""
+        """Test that insights are saved via repository.create_many()"""
         detector = TrendDetector(mock_repository, mock_config)
 
         # Create mixed traffic data
@@ -908,16 +909,17 @@ class TestIntegrationWithRepository:
         with patch.object(detector, '_get_traffic_data', return_value=traffic_data):
             insights_created = detector.detect('sc-domain:example.com')
 
-        # Verify repository.create() was called
+        # Verify repository.create_many() was called once for the run
         assert insights_created == 2
-        assert mock_repository.create.call_count == 2
+        mock_repository.create_many.assert_called_once()
+        assert len(persisted_insights(mock_repository)) == 2
 
         # Verify all calls were InsightCreate objects
-        for call in mock_repository.create.call_args_list:
-            assert isinstance(call[0][0], InsightCreate)
+        for insight in persisted_insights(mock_repository):
+            assert isinstance(insight, InsightCreate)
 
     def test_repository_create_called_with_valid_insight(self, mock_repository, mock_config):
-        """Test repository.create() is called with valid InsightCreate"""
+        """Test repository.create_many() is called with valid InsightCreate"""
         detector = TrendDetector(mock_repository, mock_config)
 
         traffic_data = create_traffic_data(
@@ -932,7 +934,7 @@ class TestIntegrationWithRepository:
             detector.detect('sc-domain:example.com')
 
         # Get the insight passed to repository
-        insight = mock_repository.create.call_args[0][0]
+        insight = persisted_insights(mock_repository)[-1]
 
         # Validate insight structure
         assert insight.property == 'sc-domain:example.com'
@@ -1013,6 +1015,35 @@ class TestDatabaseIntegration:
         # Verify connection was closed even with error
         mock_conn.close.assert_called_once()
 
+    def test_get_traffic_data_uses_refresh_snapshot(self, mock_repository, mock_config):
+        """Test _get_traffic_data reads the shared snapshot instead of querying"""
+        from insights_core.data_snapshot import SNAPSHOT_METRICS, build_snapshot
+
+        today = datetime.now().date()
+        start = today - timedelta(days=90)
+        rows = [
+            ('sc-domain:example.com', '/page', day, 10, 100) + (0,) * (len(SNAPSHOT_METRICS) - 2)
+            for day in (start - timedelta(days=1), start, today - timedelta(days=1), today)
+        ]
+        detector = TrendDetector(mock_repository, mock_config)
+        detector.snapshots = Mock()
+        detector.snapshots.get.return_value = build_snapshot(rows, start, today)
+
+        with patch.object(detector, '_get_db_connection') as mock_connect:
+            result = detector._get_traffic_data('sc-domain:example.com')
+
+        mock_connect.assert_not_called()
+        detector.snapshots.get.assert_called_once_with('sc-domain:example.com')
+        # Lookback window excludes today, like the SQL query
+        assert [r['date'] for r in result] == [start, today - timedelta(days=1)]
+        assert result[0] == {
+            'property': 'sc-domain:example.com',
+            'page_path': '/page',
+            'date': start,
+            'clicks': 10,
+            'impressions': 100,
+        }
+
 
 class TestEdgeCasesAndErrorHandling:
     """Test edge cases and error handling"""
@@ -1056,7 +1087,7 @@ class TestEdgeCasesAndErrorHandling:
 
         # Should skip page and create no insights
         assert insights_created == 0
-        mock_repository.create.assert_not_called()
+        assert persisted_insights(mock_repository) == []
 
     def test_change_percent_with_zero_initial_clicks(self, detector):
         """Test _analyze_trend handles zero initial clicks"""
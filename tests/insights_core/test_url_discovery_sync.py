@@ -198,6 +198,12 @@ class TestSyncConfig:
         config = SyncConfig.from_dict({})
         assert config.min_gsc_clicks == 10
         assert config.min_ga4_sessions == 5
+        assert config.set_based is False
+
+    def test_from_dict_set_based(self):
+        """Test enabling set-based sync from dictionary"""
+        config = SyncConfig.from_dict({'set_based': True})
+        assert config.set_based is True
 
 
 # ============================================================================
@@ -372,6 +378,29 @@ class TestPriorityScoring:
 
         assert recent_score > old_score
 
+    def test_vectorized_scores_match_scalar(self, sync, sample_gsc_urls, sample_ga4_urls):
+        """Test calculate_priority_scores matches calculate_priority_score"""
+        urls = sample_gsc_urls + sample_ga4_urls + [
+            DiscoveredURL(property='https://a.com/', page_path='/none', source='gsc'),
+            DiscoveredURL(
+                property='https://a.com/', page_path='/date', source='gsc',
+                clicks=20000, sessions=7, avg_position=0.5,
+                last_seen_at=date.today() - timedelta(days=100)
+            ),
+            DiscoveredURL(
+                property='https://a.com/', page_path='/hours', source='ga4',
+                sessions=12, last_seen_at=datetime.now() - timedelta(hours=47)
+            ),
+        ]
+
+        assert sync.calculate_priority_scores(urls) == [
+            sync.calculate_priority_score(url) for url in urls
+        ]
+
+    def test_vectorized_scores_empty(self, sync):
+        """Test vectorized scoring of no URLs"""
+        assert sync.calculate_priority_scores([]) == []
+
 
 # ============================================================================
 # Test GSC URL Discovery (Mocked)
@@ -560,6 +589,155 @@ class TestSyncToMonitoredPages:
         assert stats['urls_updated'] == 0
 
 
+# ============================================================================
+# Test Set-Based Sync (Mocked)
+# ============================================================================
+
+@pytest.fixture
+def bulk_conn():
+    """Mock connection whose cursor reports merge counts and deactivations"""
+    with patch('psycopg2.connect') as mock_connect:
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=False)
+        mock_cursor.fetchone.return_value = {'urls_new': 2, 'urls_updated': 1, 'urls_skipped': 0}
+        mock_cursor.rowcount = 4
+        mock_cursor.staged = []
+        mock_cursor.copy_expert.side_effect = lambda sql, stream: mock_cursor.staged.extend(
+            line.split('\t') for line in stream.read().splitlines()
+        )
+        yield mock_conn, mock_cursor
+
+
+class TestSetBasedSync:
+    """Test staging, single-statement merge and folded deactivation"""
+
+    def test_statement_count_independent_of_url_count(self, sync, bulk_conn):
+        """Test that 500 URLs take one COPY and three statements"""
+        mock_conn, mock_cursor = bulk_conn
+        urls = [
+            DiscoveredURL(property='https://a.com/', page_path=f'/page{i}', source='gsc', clicks=i)
+            for i in range(500)
+        ]
+
+        stats = sync.sync_to_monitored_pages_bulk(urls, property='https://a.com/')
+
+        assert mock_cursor.copy_expert.call_count == 1
+        assert len(mock_cursor.staged) == 500
+        assert mock_cursor.execute.call_count == 3
+        stage_sql, merge_call, stale_call = mock_cursor.execute.call_args_list
+        assert 'CREATE TEMP TABLE monitored_pages_stage' in stage_sql.args[0]
+        assert 'ON CONFLICT (property, page_path) DO UPDATE' in merge_call.args[0]
+        assert merge_call.args[1] == {'check_mobile': True, 'check_desktop': False, 'max_new': 100}
+        assert 'SET is_active = false' in stale_call.args[0]
+        assert stale_call.args[1] == [90, 'https://a.com/']
+        assert stats == {
+            'urls_processed': 500,
+            'urls_new': 2,
+            'urls_updated': 1,
+            'urls_skipped': 0,
+            'urls_deactivated': 4,
+        }
+        mock_conn.commit.assert_called_once()
+
+    def test_staged_in_priority_order(self, sync, bulk_conn):
+        """Test that seq follows priority so the new-URL limit keeps the best"""
+        _, mock_cursor = bulk_conn
+        urls = [
+            DiscoveredURL(property='https://a.com/', page_path='/low', source='gsc', clicks=10),
+            DiscoveredURL(property='https://a.com/', page_path='/high', source='gsc+ga4', clicks=900),
+        ]
+
+        sync.sync_to_monitored_pages_bulk(urls)
+
+        assert [row[:4] for row in mock_cursor.staged] == [
+            ['0', 'https://a.com/', '/high', 'gsc+ga4'],
+            ['1', 'https://a.com/', '/low', 'gsc'],
+        ]
+        assert mock_cursor.staged[1][6] == '\\N'  # unknown avg_position
+        assert float(mock_cursor.staged[0][7]) == sync.calculate_priority_score(urls[0])
+
+    def test_duplicate_pages_staged_once(self, sync, bulk_conn):
+        """Test that duplicate (property, page_path) keeps the higher priority entry"""
+        _, mock_cursor = bulk_conn
+        urls = [
+            DiscoveredURL(property='https://a.com/', page_path='/p', source='gsc', clicks=5),
+            DiscoveredURL(property='https://a.com/', page_path='/p', source='ga4', clicks=500),
+        ]
+
+        stats = sync.sync_to_monitored_pages_bulk(urls)
+
+        assert len(mock_cursor.staged) == 1
+        assert mock_cursor.staged[0][3] == 'ga4'
+        assert stats['urls_processed'] == 2
+
+    def test_dry_run_rolls_back(self, sync, bulk_conn, sample_gsc_urls):
+        """Test dry run reports statistics but rolls back"""
+        mock_conn, _ = bulk_conn
+
+        stats = sync.sync_to_monitored_pages_bulk(sample_gsc_urls, dry_run=True)
+
+        assert stats['urls_new'] == 2
+        mock_conn.commit.assert_not_called()
+        mock_conn.rollback.assert_called_once()
+
+    def test_empty_urls_still_deactivates(self, sync, bulk_conn):
+        """Test that no discovered URLs skips staging but not deactivation"""
+        mock_conn, mock_cursor = bulk_conn
+
+        stats = sync.sync_to_monitored_pages_bulk([])
+
+        mock_cursor.copy_expert.assert_not_called()
+        assert mock_cursor.execute.call_count == 1
+        assert stats['urls_deactivated'] == 4
+        mock_conn.commit.assert_called_once()
+
+    def test_error_rolls_back(self, sync, bulk_conn, sample_gsc_urls):
+        """Test failures roll back the whole transaction"""
+        mock_conn, mock_cursor = bulk_conn
+        mock_cursor.execute.side_effect = Exception("merge failed")
+
+        with pytest.raises(Exception, match="merge failed"):
+            sync.sync_to_monitored_pages_bulk(sample_gsc_urls)
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+    @patch.object(URLDiscoverySync, 'discover_gsc_urls')
+    @patch.object(URLDiscoverySync, 'discover_ga4_urls')
+    @patch.object(URLDiscoverySync, 'sync_to_monitored_pages_bulk')
+    @patch.object(URLDiscoverySync, 'sync_to_monitored_pages')
+    @patch.object(URLDiscoverySync, 'deactivate_stale_urls')
+    def test_full_sync_uses_set_based_mode(
+        self,
+        mock_deactivate,
+        mock_sync_pages,
+        mock_bulk,
+        mock_ga4,
+        mock_gsc,
+        sync,
+        sample_gsc_urls
+    ):
+        """Test sync() routes through the set-based path when configured"""
+        sync.config.set_based = True
+        mock_gsc.return_value = sample_gsc_urls
+        mock_ga4.return_value = []
+        mock_bulk.return_value = {
+            'urls_new': 1, 'urls_updated': 2, 'urls_skipped': 0, 'urls_deactivated': 3
+        }
+
+        result = sync.sync(property='https://example.com/', dry_run=True)
+
+        assert result.success is True
+        assert (result.urls_new, result.urls_updated, result.urls_deactivated) == (1, 2, 3)
+        mock_bulk.assert_called_once()
+        assert mock_bulk.call_args.kwargs == {'property': 'https://example.com/', 'dry_run': True}
+        mock_sync_pages.assert_not_called()
+        mock_deactivate.assert_not_called()
+
+
 # ============================================================================
 # Test Stale URL Deactivation (Mocked)
 # ============================================================================
@@ -626,9 +626,10 @@ class TestURLParserDatabase:
             if original:
                 os.environ['WAREHOUSE_DSN'] = original
 
+    @patch('psycopg2.extras.execute_values')
     @patch('psycopg2.connect')
-    def test_batch_store_variations_success(self, mock_connect, parser_with_db):
-        """Test batch storing variations"""
+    def test_batch_store_variations_success(self, mock_connect, mock_execute_values, parser_with_db):
+        """Test batch storing variations with one multi-row upsert"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
@@ -643,16 +644,20 @@ class TestURLParserDatabase:
         result = parser_with_db.batch_store_variations('sc-domain:example.com', url_pairs)
 
         assert result == 3
-        assert mock_cursor.execute.call_count == 3
+        mock_execute_values.assert_called_once()
+        cursor, sql, rows = mock_execute_values.call_args.args
+        assert cursor is mock_cursor
+        assert 'ON CONFLICT' in sql and 'EXCLUDED.occurrences' in sql
+        assert len(rows) == 3
+        mock_cursor.execute.assert_not_called()
         mock_conn.commit.assert_called_once()
 
+    @patch('psycopg2.extras.execute_values')
     @patch('psycopg2.connect')
-    def test_batch_store_variations_skips_identical(self, mock_connect, parser_with_db):
+    def test_batch_store_variations_skips_identical(self, mock_connect, mock_execute_values, parser_with_db):
         """Test that batch store skips identical URLs"""
         mock_conn = MagicMock()
-        mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
 
         url_pairs = [
             ('/page', '/page'),  # Identical, should be skipped
@@ -662,7 +667,67 @@ class TestURLParserDatabase:
         result = parser_with_db.batch_store_variations('sc-domain:example.com', url_pairs)
 
         assert result == 1
-        assert mock_cursor.execute.call_count == 1
+        assert len(mock_execute_values.call_args.args[2]) == 1
+
+    @patch('psycopg2.extras.execute_values')
+    @patch('psycopg2.connect')
+    def test_batch_store_variations_counts_duplicates(self, mock_connect, mock_execute_values, parser_with_db):
+        """Test that repeated pairs become one row carrying their occurrence count"""
+        mock_connect.return_value = MagicMock()
+
+        url_pairs = [('/page', '/page?utm_source=google')] * 3 + [('/page', '/Page')]
+
+        result = parser_with_db.batch_store_variations('sc-domain:example.com', url_pairs)
+
+        assert result == 4
+        rows = mock_execute_values.call_args.args[2]
+        assert sorted(rows) == [
+            ('sc-domain:example.com', '/page', '/Page', 'case', 1),
+            ('sc-domain:example.com', '/page', '/page?utm_source=google', 'query_param', 3),
+        ]
+
+    @patch('psycopg2.connect')
+    def test_batch_store_variations_all_identical(self, mock_connect, parser_with_db):
+        """Test that nothing is written when every pair is identical"""
+        result = parser_with_db.batch_store_variations('sc-domain:example.com', [('/page', '/page')])
+
+        assert result == 0
+        mock_connect.assert_not_called()
+
+    @patch('psycopg2.extras.execute_values')
+    @patch('psycopg2.connect')
+    def test_store_variations_from_facts(self, mock_connect, mock_execute_values, parser_with_db):
+        """Test streaming fact_gsc_daily URLs into variation upserts"""
+        reader = MagicMock()
+        reader.fetchmany.side_effect = [
+            [('https://example.com/Page/',), ('https://example.com/page',)],
+            [('https://example.com/other?utm_source=x',)],
+            [],
+        ]
+        writer = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.side_effect = lambda name=None: reader if name else writer
+        mock_connect.return_value = mock_conn
+
+        result = parser_with_db.store_variations_from_facts('sc-domain:example.com', days=7)
+
+        assert result == 3
+        sql, params = reader.execute.call_args.args
+        assert 'gsc.fact_gsc_daily' in sql
+        assert params == ('sc-domain:example.com', 7)
+        assert mock_execute_values.call_count == 2
+        assert all(call_.args[0] is writer for call_ in mock_execute_values.call_args_list)
+        stored = [row[1:3] for call_ in mock_execute_values.call_args_list for row in call_.args[2]]
+        assert ('/page', 'https://example.com/Page/') in stored
+        assert ('/other', 'https://example.com/other?utm_source=x') in stored
+        mock_conn.commit.assert_called_once()
+
+    @patch('psycopg2.connect')
+    def test_store_variations_from_facts_error(self, mock_connect, parser_with_db):
+        """Test error handling when streaming fact URLs"""
+        mock_connect.side_effect = Exception("Connection failed")
+
+        assert parser_with_db.store_variations_from_facts('sc-domain:example.com') == 0
 
     @patch('psycopg2.connect')
     def test_batch_store_variations_handles_error(self, mock_connect, parser_with_db):
@@ -689,6 +754,69 @@ class TestURLParserDatabase:
         assert result == 0
 
 
+class TestURLParserBulkNormalization:
+    """Test memoized bulk normalization and its fast path"""
+
+    @pytest.fixture
+    def parser(self):
+        """Create parser instance without database"""
+        return URLParser()
+
+    @pytest.mark.parametrize('url', [
+        '/', '/Page/', '/a/b///', '//', '///', '/page;params', '/Page?id=1',
+        'https://example.com', 'https://example.com/', 'HTTPS://Example.com/Blog/',
+        'https://example.com//double', 'http://[::1]/Page', 'http://exämple.com/A/',
+        'https://user@example.com:8080/Page/', 'page/relative/', 'mailto:someone',
+        '/page ', '/page\t', '/page\x00', '/Path#Frag',
+    ])
+    def test_fast_path_matches_urlparse(self, parser, url):
+        """Test that fast-path results are identical to the urlparse path"""
+        assert parser.normalize(url) == parser._parse_normalize(url)
+        assert parser.normalize(url, remove_fragment=False) == parser._parse_normalize(url, remove_fragment=False)
+
+    def test_normalize_many(self, parser):
+        """Test bulk normalization preserves order and handles empties"""
+        urls = ['/Page/', '', '/page?utm_source=google&id=1', None, '/Page/']
+
+        assert parser.normalize_many(urls) == ['/page', '', '/page?id=1', '', '/page']
+        info = parser.cache_info()
+        assert info.hits == 1
+        assert info.misses == 2
+
+    def test_memo_is_bounded(self):
+        """Test that the LRU memo never grows past its size"""
+        parser = URLParser(cache_size=10)
+
+        parser.normalize_many(f'/page-{i}?utm_source=x' for i in range(100))
+
+        assert parser.cache_info().currsize == 10
+
+    def test_memo_keyed_by_fragment_flag(self, parser):
+        """Test that remove_fragment is part of the memo key"""
+        assert parser.normalize('/page#top') == '/page'
+        assert parser.normalize('/page#top', remove_fragment=False) == '/page#top'
+
+    def test_clear_cache(self, parser):
+        """Test clearing the memo"""
+        parser.normalize('/page')
+        parser.clear_cache()
+
+        assert parser.cache_info().currsize == 0
+
+    def test_benchmark_reports_urls_per_second(self):
+        """Test benchmark result shape on a small synthetic stream"""
+        from insights_core.url_parser import benchmark, generate_synthetic_urls
+
+        urls = generate_synthetic_urls(2000, distinct=100)
+        results = benchmark(urls, repeat=1)
+
+        assert results['urls'] == 2000
+        assert results['distinct'] <= 100
+        assert results['urlparse']['urls_per_second'] > 0
+        assert results['normalize_many']['urls_per_second'] > 0
+        assert results['speedup'] is not None
+
+
 class TestURLParserRecommendations:
     """Test recommendation generation logic"""
 
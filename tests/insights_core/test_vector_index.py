@@ -0,0 +1,232 @@
+"""
+Tests for the in-process ANN vector index
+
+Tests cover:
+- Exact search and pair queries on small indexes
+- IVF search and pairs agreeing with brute force on clustered data
+- Incremental upserts, removal and quantizer retraining
+- Persistence (memory-mapped vectors, metadata, IVF lists)
+- Opening a property's index and syncing it from the warehouse (mocked pool)
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from insights_core import vector_index
+from insights_core.vector_index import VectorIndex, open_property_index, parse_vector
+
+DIM = 16
+
+
+def clustered_vectors(n, n_clusters=40, noise=0.05, seed=0):
+    """Unit vectors scattered around random cluster centres"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_clusters, DIM))
+    vectors = centres[rng.integers(n_clusters, size=n)] + noise * rng.normal(size=(n, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def brute_force_pairs(paths, vectors, threshold):
+    scores = vectors @ vectors.T
+    i, j = np.nonzero(np.triu(scores >= threshold, k=1))
+    return {tuple(sorted((paths[a], paths[b]))) for a, b in zip(i, j)}
+
+
+@pytest.fixture
+def small_index():
+    index = VectorIndex(dim=3)
+    index.build(['/a', '/b', '/c'], [[1, 0, 0], [0.9, 0.1, 0], [0, 0, 1]])
+    return index
+
+
+class TestParseVector:
+    def test_pgvector_text(self):
+        np.testing.assert_allclose(parse_vector('[0.5,-1,2e-3]'), [0.5, -1, 0.002])
+
+    def test_list(self):
+        assert parse_vector([1, 2]).dtype == np.float32
+
+
+class TestExactIndex:
+    """Indexes below IVF_MIN_VECTORS are searched exactly"""
+
+    def test_search_by_page_excludes_itself(self, small_index):
+        results = small_index.search('/a', k=5)
+
+        assert [path for path, _ in results] == ['/b', '/c']
+        assert results[0][1] == pytest.approx(0.9 / np.sqrt(0.82), rel=1e-5)
+
+    def test_search_threshold_and_k(self, small_index):
+        assert small_index.search([1, 0, 0], k=1) == [('/a', pytest.approx(1.0))]
+        assert [p for p, _ in small_index.search([1, 0, 0], threshold=0.5)] == ['/a', '/b']
+
+    def test_pairs_above(self, small_index):
+        pairs = small_index.pairs_above(0.8)
+
+        assert len(pairs) == 1
+        assert pairs[0][:2] == ('/a', '/b')
+
+    def test_pairs_restricted_to_pages(self, small_index):
+        assert small_index.pairs_above(0.8, page_paths=['/a', '/c']) == []
+
+    def test_upsert_replaces_and_remove(self, small_index):
+        small_index.upsert('/c', [1, 0, 0])
+        small_index.upsert('/d', [0, 1, 0])
+
+        assert len(small_index) == 4
+        assert small_index.search('/a', k=1)[0][0] == '/c'
+
+        assert small_index.remove('/c') is True
+        assert small_index.remove('/missing') is False
+        assert '/c' not in small_index
+        assert small_index.search('/a', k=1)[0][0] == '/b'
+
+    def test_rejects_wrong_dimension(self, small_index):
+        with pytest.raises(ValueError, match='3-d'):
+            small_index.upsert('/x', [1, 0])
+
+
+class TestIVFIndex:
+    """Large indexes probe IVF lists"""
+
+    @pytest.fixture
+    def data(self, monkeypatch):
+        monkeypatch.setattr(vector_index, 'IVF_MIN_VECTORS', 500)
+        vectors = clustered_vectors(2000)
+        paths = [f'/page-{i:05d}' for i in range(len(vectors))]
+        index = VectorIndex(dim=DIM)
+        index.build(paths, vectors)
+        return index, paths, vectors
+
+    def test_trained_when_large(self, data):
+        index, _, _ = data
+        assert index.is_trained
+
+    def test_search_recall_against_brute_force(self, data):
+        index, paths, vectors = data
+        hits = 0
+        for q in range(0, 2000, 50):
+            exact = np.argsort(-(vectors @ vectors[q]))[1:11]
+            found = {path for path, _ in index.search(paths[q], k=10)}
+            hits += len(found & {paths[i] for i in exact})
+
+        assert hits / (40 * 10) >= 0.9
+
+    def test_pairs_match_brute_force(self, data):
+        index, paths, vectors = data
+
+        found = {(a, b) for a, b, _ in index.pairs_above(0.995)}
+
+        expected = brute_force_pairs(paths, vectors, 0.995)
+        assert expected
+        assert len(found & expected) / len(expected) >= 0.95
+        assert found <= expected
+
+    def test_pairs_sorted_and_limited(self, data):
+        index, _, _ = data
+
+        pairs = index.pairs_above(0.99, limit=5)
+
+        assert len(pairs) == 5
+        assert [s for _, _, s in pairs] == sorted((s for _, _, s in pairs), reverse=True)
+        assert all(a < b for a, b, _ in pairs)
+
+    def test_incremental_upsert_is_searchable_and_retrains(self, data):
+        index, _, vectors = data
+        lists_before = index._centroids.shape[0]
+
+        new = clustered_vectors(2100, seed=1)
+        index.upsert_many([f'/new-{i}' for i in range(len(new))], new)
+
+        assert index.search(new[7], k=1)[0][0] == '/new-7'
+        assert index._trained_size == 4000  # retrained on doubling
+        assert index._centroids.shape[0] > lists_before
+
+
+class TestPersistence:
+    def test_save_and_reopen(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vector_index, 'IVF_MIN_VECTORS', 100)
+        vectors = clustered_vectors(300)
+        paths = [f'/p{i}' for i in range(300)]
+
+        index = VectorIndex(dim=DIM, directory=str(tmp_path))
+        index.build(paths, vectors)
+        index.remove('/p3')
+        index.save()
+
+        reopened = VectorIndex(dim=DIM, directory=str(tmp_path))
+
+        assert len(reopened) == 299
+        assert reopened.is_trained
+        assert isinstance(reopened._vectors, np.memmap)
+        assert reopened.search(vectors[5], k=1)[0][0] == '/p5'
+        assert '/p3' not in reopened
+
+    def test_upserts_grow_mapped_file(self, tmp_path):
+        index = VectorIndex(dim=DIM, directory=str(tmp_path))
+        vectors = clustered_vectors(100)
+        for i, vector in enumerate(vectors):
+            index.upsert(f'/p{i}', vector)
+        index.save()
+
+        reopened = VectorIndex(dim=DIM, directory=str(tmp_path))
+
+        assert len(reopened) == 100
+        np.testing.assert_allclose(reopened._vectors[42], vectors[42], rtol=1e-5)
+
+    def test_dimension_mismatch(self, tmp_path):
+        VectorIndex(dim=DIM, directory=str(tmp_path)).save()
+
+        with pytest.raises(ValueError, match='expected 8-d'):
+            VectorIndex(dim=8, directory=str(tmp_path))
+
+
+class TestOpenPropertyIndex:
+    """Test open_property_index()"""
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        conn.fetch = AsyncMock(return_value=[
+            {'page_path': '/a', 'content_embedding': '[1,0,0]'},
+            {'page_path': '/b', 'content_embedding': '[0,1,0]'},
+        ])
+        return conn
+
+    @pytest.fixture
+    def pool(self, conn):
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        return pool
+
+    async def test_builds_then_syncs_incrementally(self, pool, conn, tmp_path):
+        index = await open_property_index(pool, 'sc-domain:example.com', dim=3, index_dir=str(tmp_path))
+
+        assert len(index) == 2
+        assert conn.fetch.call_args.args[1:] == ('sc-domain:example.com', None)
+
+        conn.fetch.return_value = [{'page_path': '/c', 'content_embedding': '[0,0,1]'}]
+        reopened = await open_property_index(pool, 'sc-domain:example.com', dim=3, index_dir=str(tmp_path))
+
+        assert len(reopened) == 3
+        assert conn.fetch.call_args.args[2] is not None  # only pages analyzed since last sync
+        assert reopened.search('/a', k=1)[0][1] == pytest.approx(0.0)
+
+    async def test_in_memory_without_directory(self, pool, monkeypatch):
+        monkeypatch.delenv('EMBEDDING_INDEX_DIR', raising=False)
+
+        index = await open_property_index(pool, 'p', dim=3)
+
+        assert index.directory is None
+        assert '/b' in index
+
+    def test_index_directory_per_property(self, tmp_path):
+        a = vector_index.index_directory(str(tmp_path), 'https://example.com/')
+        b = vector_index.index_directory(str(tmp_path), 'https://example.com')
+
+        assert a != b
+        assert a.startswith(str(tmp_path / 'https_example_com-'))
+        assert vector_index.index_directory(None, 'p') is None
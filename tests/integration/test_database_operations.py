@@ -570,7 +570,7 @@ class TestMaterializedViews:
     """Test materialized view creation and refresh"""
 
     async def test_materialized_view_exists(self, db_connection: asyncpg.Connection):
-        """Test that materialized views exist"""
+        """Test that the unified rollup tables exist"""
         mv_names = [
             'mv_unified_page_performance',
             'mv_unified_page_performance_weekly',
@@ -581,14 +581,15 @@ class TestMaterializedViews:
             exists = await db_connection.fetchval(
                 """
                 SELECT EXISTS (
-                    SELECT FROM pg_matviews
-                    WHERE schemaname = 'gsc'
-                    AND matviewname = $1
+                    SELECT FROM information_schema.tables
+                    WHERE table_schema = 'gsc'
+                    AND table_name = $1
+                    AND table_type = 'BASE TABLE'
                 )
                 """,
                 mv_name
             )
-            assert exists, f"Materialized view gsc.{mv_name} does not exist"
+            assert exists, f"Rollup table gsc.{mv_name} does not exist"
 
     async def test_materialized_view_refresh_functions_exist(self, db_connection: asyncpg.Connection):
         """Test that refresh functions exist"""
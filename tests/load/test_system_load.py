@@ -3,6 +3,7 @@ System Load Testing Suite
 
 Comprehensive load tests for the GSC Warehouse system including:
 - API endpoint testing with 50 concurrent requests
+- API read-path throughput (requests/sec, p99) for before/after comparisons
 - Database connection pool testing with 100 concurrent queries
 - Agent concurrency testing
 - Data ingestion throughput testing
@@ -34,6 +35,8 @@ TEST_CONCURRENT_API_REQUESTS = 50
 TEST_CONCURRENT_DB_QUERIES = 100
 TEST_MIN_SUCCESS_RATE = 0.90  # 90%
 TEST_API_TIMEOUT = 30.0  # seconds
+TEST_API_READ_WORKERS = 50  # concurrent clients in the read-path scenario
+TEST_API_READ_REQUESTS = 1000  # total requests (enough samples for p99)
 
 
 class LoadTestMetrics:
@@ -249,6 +252,100 @@ async def test_api_concurrent_health_checks(api_base_url, load_test_metrics):
         f"Health check success rate {summary['success_rate']:.2%} too low"
 
 
+@pytest.mark.e2e
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_api_read_path_throughput(api_base_url, load_test_metrics):
+    """
+    Measure requests/sec and p99 latency of the database-backed read endpoints.
+
+    50 concurrent clients issue 1000 requests against the insight query and
+    aggregation endpoints. Run it against two builds of the API to compare
+    them; set LOAD_TEST_LABEL (e.g. "before"/"after") and LOAD_TEST_RESULTS
+    (a JSON lines file) to record each run's summary.
+
+    Requirements:
+    - Success rate >= 90%
+    - Enough samples for a p99 figure
+    """
+    import json
+    import os
+
+    metrics = load_test_metrics
+    property_url = os.getenv('TEST_PROPERTY', 'sc-domain:example.com')
+
+    endpoints = [
+        '/api/stats',
+        '/api/insights?limit=50',
+        f'/api/insights/status/new?property={property_url}&limit=50',
+        f'/api/v1/insights/aggregations/dashboard?property={property_url}',
+        f'/api/v1/insights/aggregations/by-category?property={property_url}',
+        f'/api/v1/insights/aggregations/by-page?property={property_url}&limit=50',
+        f'/api/v1/insights/aggregations/timeseries?property={property_url}&days=30',
+        f'/api/v1/insights/aggregations/top-issues?property={property_url}',
+    ]
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(TEST_API_READ_REQUESTS):
+        queue.put_nowait(endpoints[i % len(endpoints)])
+
+    async def worker(client: httpx.AsyncClient):
+        """Issue requests until the queue is drained."""
+        while True:
+            try:
+                endpoint = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.get(f"{api_base_url}{endpoint}", timeout=TEST_API_TIMEOUT)
+                if response.status_code == 200:
+                    metrics.record_success(time.perf_counter() - start)
+                else:
+                    metrics.record_failure(f"HTTP {response.status_code}: {endpoint}")
+            except Exception as e:
+                metrics.record_failure(f"{type(e).__name__}: {str(e)[:100]}")
+
+    limits = httpx.Limits(max_connections=TEST_API_READ_WORKERS)
+    async with httpx.AsyncClient(limits=limits) as client:
+        metrics.start_time = datetime.now()
+        await asyncio.gather(*(worker(client) for _ in range(TEST_API_READ_WORKERS)))
+        metrics.end_time = datetime.now()
+
+    summary = metrics.get_summary()
+    label = os.getenv('LOAD_TEST_LABEL', 'current')
+
+    print(f"\n{'='*70}")
+    print(f"API Read Path Throughput ({label})")
+    print(f"{'='*70}")
+    print(f"Total Requests: {summary['total_operations']} ({TEST_API_READ_WORKERS} concurrent clients)")
+    print(f"Success Rate: {summary['success_rate']:.2%}")
+    print(f"Throughput: {summary['throughput']:.2f} req/s")
+    print(f"P50: {summary['p50_response_time'] * 1000:.1f}ms")
+    print(f"P95: {summary['p95_response_time'] * 1000:.1f}ms")
+    print(f"P99: {summary['p99_response_time'] * 1000:.1f}ms")
+    if summary['error_sample']:
+        print(f"Error samples: {summary['error_sample'][:3]}")
+    print(f"{'='*70}\n")
+
+    results_file = os.getenv('LOAD_TEST_RESULTS')
+    if results_file:
+        with open(results_file, 'a') as f:
+            f.write(json.dumps({
+                'label': label,
+                'timestamp': metrics.end_time.isoformat(),
+                'requests': summary['total_operations'],
+                'success_rate': summary['success_rate'],
+                'requests_per_second': summary['throughput'],
+                'p50_ms': summary['p50_response_time'] * 1000,
+                'p99_ms': summary['p99_response_time'] * 1000,
+            }) + "\n")
+
+    assert summary['success_rate'] >= TEST_MIN_SUCCESS_RATE, \
+        f"Success rate {summary['success_rate']:.2%} < {TEST_MIN_SUCCESS_RATE:.0%}. " \
+        f"Errors: {summary['error_sample']}"
+    assert summary['successful'] > 100, "Too few successful requests for a p99 figure"
+
+
 # ============================================================================
 # DATABASE LOAD TESTS
 # ============================================================================
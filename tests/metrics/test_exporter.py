@@ -224,6 +224,110 @@ class TestMetricsCollector:
         collector.collect_all_metrics()
 
 
+class TestFactTableMetricsModes:
+    """Test exact/estimated fact table metrics and the quality refresh interval"""
+
+    @staticmethod
+    def quality(duplicates=0, nulls=0):
+        return {'duplicates': duplicates, 'clicks': nulls, 'impressions': 0, 'ctr': 0, 'position': 0}
+
+    @pytest.fixture
+    def cursor(self):
+        with patch('metrics_exporter.exporter.psycopg2.connect') as mock_connect:
+            mock_conn = MagicMock()
+            mock_cursor = MagicMock()
+            mock_connect.return_value = mock_conn
+            mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+            mock_conn.cursor.return_value.__exit__ = Mock(return_value=False)
+            yield mock_cursor
+
+    def test_exact_mode_skips_until_refresh_due(self, cursor):
+        """Exact scans run once per quality refresh interval"""
+        from metrics_exporter.exporter import MetricsCollector
+
+        cursor.fetchone.return_value = {'total': 10, 'duplicates': 0, 'null_count': 0}
+        collector = MetricsCollector("test_dsn", "/tmp/metrics.json",
+                                     fact_metrics_mode='exact', quality_refresh_interval=3600)
+
+        collector.collect_fact_table_metrics()
+        calls = cursor.execute.call_count
+        collector.collect_fact_table_metrics()
+
+        assert calls == 6
+        assert cursor.execute.call_count == calls
+
+    def test_estimated_mode_uses_statistics(self, cursor):
+        """Row count is summed from partition statistics, never COUNT(*)"""
+        from metrics_exporter.exporter import MetricsCollector, fact_table_rows, duplicate_records
+
+        cursor.fetchall.return_value = [
+            {'partition': 'fact_gsc_daily_p2025_01', 'estimated_rows': 700, 'modifications': 5},
+            {'partition': 'fact_gsc_daily_default', 'estimated_rows': 300, 'modifications': 0},
+        ]
+        cursor.fetchone.side_effect = [self.quality(duplicates=2), self.quality(nulls=1)]
+        collector = MetricsCollector("test_dsn", "/tmp/metrics.json",
+                                     fact_metrics_mode='estimated', quality_refresh_interval=0)
+
+        collector.collect_fact_table_metrics()
+
+        assert fact_table_rows._value.get() == 1000
+        assert duplicate_records._value.get() == 2
+        assert 'pg_stat_user_tables' in cursor.execute.call_args_list[0].args[0]
+        assert not any('COUNT(*) as total' in str(c.args[0]) for c in cursor.execute.call_args_list)
+
+    def test_estimated_mode_rescans_only_modified_partitions(self, cursor):
+        """Unchanged partitions reuse cached counts; dropped ones are forgotten"""
+        from metrics_exporter.exporter import MetricsCollector, null_values_count
+
+        cursor.fetchall.return_value = [
+            {'partition': 'fact_gsc_daily_p2025_01', 'estimated_rows': 700, 'modifications': 5},
+            {'partition': 'fact_gsc_daily_p2025_02', 'estimated_rows': 300, 'modifications': 8},
+        ]
+        cursor.fetchone.side_effect = [self.quality(nulls=4), self.quality(nulls=1)]
+        collector = MetricsCollector("test_dsn", "/tmp/metrics.json",
+                                     fact_metrics_mode='estimated', quality_refresh_interval=0)
+        collector.collect_fact_table_metrics()
+
+        cursor.execute.reset_mock()
+        cursor.fetchall.return_value = [
+            {'partition': 'fact_gsc_daily_p2025_02', 'estimated_rows': 350, 'modifications': 9},
+            {'partition': 'fact_gsc_daily_p2025_03', 'estimated_rows': 10, 'modifications': 0},
+        ]
+        cursor.fetchone.side_effect = [self.quality(nulls=2), self.quality(nulls=0)]
+        collector.collect_fact_table_metrics()
+
+        scanned = [c.args[0] for c in cursor.execute.call_args_list[1:]]
+        assert len(scanned) == 2
+        assert set(collector._partition_quality) == {'fact_gsc_daily_p2025_02', 'fact_gsc_daily_p2025_03'}
+        assert null_values_count.labels(field='clicks')._value.get() == 2
+
+        # Nothing modified: only the statistics query runs
+        cursor.execute.reset_mock()
+        collector.collect_fact_table_metrics()
+        assert cursor.execute.call_count == 1
+
+    def test_estimated_mode_refresh_interval(self, cursor):
+        """Row estimate updates every scrape, quality checks wait for the interval"""
+        from metrics_exporter.exporter import MetricsCollector, fact_table_rows
+
+        cursor.fetchall.return_value = [
+            {'partition': 'fact_gsc_daily', 'estimated_rows': 50, 'modifications': 1},
+        ]
+        cursor.fetchone.return_value = self.quality()
+        collector = MetricsCollector("test_dsn", "/tmp/metrics.json",
+                                     fact_metrics_mode='estimated', quality_refresh_interval=3600)
+        collector.collect_fact_table_metrics()
+
+        cursor.execute.reset_mock()
+        cursor.fetchall.return_value = [
+            {'partition': 'fact_gsc_daily', 'estimated_rows': 80, 'modifications': 2},
+        ]
+        collector.collect_fact_table_metrics()
+
+        assert cursor.execute.call_count == 1
+        assert fact_table_rows._value.get() == 80
+
+
 class TestConfigLoading:
     """Test configuration loading"""
     
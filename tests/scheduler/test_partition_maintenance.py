@@ -0,0 +1,137 @@
+"""
+Tests for scheduler.py - fact_gsc_daily Partition Maintenance
+
+Tests verify:
+- Partition maintenance runs as part of weekly maintenance
+- Upcoming partitions are ensured every run
+- Retention drops partitions only when configured
+- Non-partitioned tables and failures are handled gracefully
+"""
+import pytest
+from unittest.mock import Mock, patch, MagicMock
+import sys
+import os
+
+# Add scheduler to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from scheduler import scheduler
+
+
+def make_connection(is_partitioned=True, created=2, dropped=None):
+    """Mock connection answering the partition maintenance queries"""
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__ = Mock(return_value=mock_cursor)
+    mock_cursor.__exit__ = Mock(return_value=False)
+    mock_cursor.fetchone.side_effect = [(is_partitioned,), (created,)]
+    mock_cursor.fetchall.return_value = [(name,) for name in (dropped or [])]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    return mock_conn, mock_cursor
+
+
+def task_config(**settings):
+    """Scheduler config with partition_maintenance settings"""
+    return {'weekly_maintenance': {'tasks': {'partition_maintenance': settings}}}
+
+
+@patch('scheduler.scheduler.check_warehouse_health', return_value=True)
+@patch('scheduler.scheduler.get_db_connection')
+@patch('scheduler.scheduler.update_metrics')
+class TestMaintainFactPartitions:
+    """Test maintain_fact_partitions() function"""
+
+    def test_ensures_partitions_without_retention(self, mock_metrics, mock_db, mock_health):
+        """Default config creates partitions and never drops any"""
+        mock_conn, mock_cursor = make_connection(created=3)
+        mock_db.return_value = mock_conn
+
+        with patch('scheduler.scheduler.load_scheduler_config', return_value=task_config()):
+            result = scheduler.maintain_fact_partitions()
+
+        assert result is True
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert any('ensure_fact_gsc_daily_partitions' in s for s in statements)
+        assert not any('drop_fact_gsc_daily_partitions_before' in s for s in statements)
+        mock_conn.commit.assert_called_once()
+
+        call_args = mock_metrics.call_args_list[-1]
+        assert call_args[0][:2] == ('partition_maintenance', 'success')
+        assert call_args[1]['extra']['partitions_created'] == 3
+        assert call_args[1]['extra']['partitions_dropped'] == 0
+
+    def test_retention_drops_partitions(self, mock_metrics, mock_db, mock_health):
+        """retention_months drops expired partitions instead of deleting rows"""
+        mock_conn, mock_cursor = make_connection(
+            created=0, dropped=['fact_gsc_daily_p2023_01', 'fact_gsc_daily_p2023_02']
+        )
+        mock_db.return_value = mock_conn
+
+        config = task_config(months_ahead=2, retention_months=24)
+        with patch('scheduler.scheduler.load_scheduler_config', return_value=config):
+            result = scheduler.maintain_fact_partitions()
+
+        assert result is True
+        ensure_call, drop_call = mock_cursor.execute.call_args_list[1:]
+        assert ensure_call.args[1] == (2,)
+        assert 'drop_fact_gsc_daily_partitions_before' in drop_call.args[0]
+        assert drop_call.args[1] == (24,)
+        assert not any('DELETE' in c.args[0] for c in mock_cursor.execute.call_args_list)
+        assert mock_metrics.call_args_list[-1][1]['extra']['partitions_dropped'] == 2
+
+    def test_skips_non_partitioned_table(self, mock_metrics, mock_db, mock_health):
+        """A table that has not been migrated yet is skipped, not failed"""
+        mock_conn, mock_cursor = make_connection(is_partitioned=False)
+        mock_db.return_value = mock_conn
+
+        with patch('scheduler.scheduler.load_scheduler_config', return_value=task_config()):
+            result = scheduler.maintain_fact_partitions()
+
+        assert result is True
+        assert mock_cursor.execute.call_count == 1
+        assert mock_metrics.call_args_list[-1][0][1] == 'skipped'
+
+    def test_disabled_in_config(self, mock_metrics, mock_db, mock_health):
+        """Disabled task does not touch the database"""
+        with patch('scheduler.scheduler.load_scheduler_config',
+                   return_value=task_config(enabled=False)):
+            result = scheduler.maintain_fact_partitions()
+
+        assert result is True
+        mock_db.assert_not_called()
+
+    def test_handles_database_error(self, mock_metrics, mock_db, mock_health):
+        """Database errors are reported as a failed task"""
+        mock_db.side_effect = Exception("Database connection failed")
+
+        with patch('scheduler.scheduler.load_scheduler_config', return_value=task_config()):
+            result = scheduler.maintain_fact_partitions()
+
+        assert result is False
+        assert mock_metrics.call_args_list[-1][0][1] == 'failed'
+
+
+class TestWeeklyMaintenancePartitions:
+    """Test partition maintenance integration with weekly maintenance"""
+
+    @patch('scheduler.scheduler.reconcile_watermarks', return_value=True)
+    @patch('scheduler.scheduler.reconcile_recent_data', return_value=True)
+    @patch('scheduler.scheduler.maintain_fact_partitions', return_value=True)
+    @patch('scheduler.scheduler.run_transforms', return_value=True)
+    @patch('scheduler.scheduler.refresh_cannibalization_analysis', return_value=True)
+    @patch('scheduler.scheduler.run_content_analysis', return_value=True)
+    @patch('scheduler.scheduler.time.sleep')
+    def test_weekly_maintenance_runs_partition_maintenance(
+        self, mock_sleep, mock_content, mock_cann, mock_trans, mock_partitions,
+        mock_reconcile, mock_watermarks
+    ):
+        """Partition maintenance runs before the transforms refresh"""
+        order = []
+        mock_partitions.side_effect = lambda: order.append('partitions') or True
+        mock_trans.side_effect = lambda: order.append('transforms') or True
+
+        scheduler.weekly_maintenance()
+
+        mock_partitions.assert_called_once()
+        assert order == ['partitions', 'transforms']
@@ -0,0 +1,121 @@
+"""
+Test suite for the fact_gsc_daily partitioning migration script
+
+Verifies:
+- The migration runs in one transaction and re-binds the views
+- 04_ga4_schema.sql is never re-applied
+- Row count mismatches roll back
+- Already-partitioned tables and dry runs make no changes
+"""
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch, MagicMock
+
+from scripts.migrate_partition_fact_gsc_daily import (
+    PARTITIONING_FILE,
+    VIEW_FILES,
+    PartitionMigration,
+    main,
+)
+
+
+@pytest.fixture
+def sql_dir(tmp_path):
+    """SQL directory with stub files"""
+    for filename in [PARTITIONING_FILE] + VIEW_FILES:
+        (tmp_path / filename).write_text(f"-- {filename}")
+    return tmp_path
+
+
+@pytest.fixture
+def mock_conn():
+    """Mock connection with a context-managed cursor"""
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+    conn.cursor.return_value = cursor
+    return conn
+
+
+class TestPartitionMigration:
+    """Test PartitionMigration"""
+
+    def test_migrate_applies_files_in_one_transaction(self, mock_conn, sql_dir):
+        """Partitioning functions, migration and view files run before a single commit"""
+        cursor = mock_conn.cursor.return_value
+        cursor.fetchone.side_effect = [(100,), (100,), (100,)]
+
+        with patch('scripts.migrate_partition_fact_gsc_daily.psycopg2.connect', return_value=mock_conn):
+            migration = PartitionMigration('postgresql://test', sql_dir)
+            copied = migration.migrate()
+
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert copied == 100
+        assert statements[1] == f"-- {PARTITIONING_FILE}"
+        assert 'migrate_fact_gsc_daily_to_partitioned' in statements[2]
+        assert statements[3:6] == [f"-- {f}" for f in VIEW_FILES]
+        assert statements[-1] == 'ANALYZE gsc.fact_gsc_daily'
+        mock_conn.rollback.assert_not_called()
+
+    def test_view_files_exclude_ga4_schema(self):
+        """The GA4 schema file drops fact_ga4_daily and must not be re-applied"""
+        assert '04_ga4_schema.sql' not in VIEW_FILES
+        for filename in [PARTITIONING_FILE] + VIEW_FILES:
+            assert (Path(__file__).resolve().parents[2] / 'sql' / filename).exists()
+
+    def test_row_count_mismatch_rolls_back(self, mock_conn, sql_dir):
+        """A short copy is rolled back and reported"""
+        cursor = mock_conn.cursor.return_value
+        cursor.fetchone.side_effect = [(100,), (90,), (90,)]
+
+        with patch('scripts.migrate_partition_fact_gsc_daily.psycopg2.connect', return_value=mock_conn):
+            migration = PartitionMigration('postgresql://test', sql_dir)
+            with pytest.raises(RuntimeError, match='Row count mismatch'):
+                migration.migrate()
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+
+class TestMain:
+    """Test the command line entry point"""
+
+    def test_requires_dsn(self, monkeypatch):
+        """WAREHOUSE_DSN is required"""
+        monkeypatch.delenv('WAREHOUSE_DSN', raising=False)
+        assert main([]) == 1
+
+    @patch('scripts.migrate_partition_fact_gsc_daily.PartitionMigration')
+    def test_already_partitioned_is_noop(self, mock_migration_class, monkeypatch):
+        """An already partitioned table is left alone"""
+        monkeypatch.setenv('WAREHOUSE_DSN', 'postgresql://test')
+        migration = mock_migration_class.return_value
+        migration.is_partitioned.return_value = True
+
+        assert main([]) == 0
+        migration.migrate.assert_not_called()
+        migration.close.assert_called_once()
+
+    @patch('scripts.migrate_partition_fact_gsc_daily.PartitionMigration')
+    def test_dry_run_does_not_migrate(self, mock_migration_class, monkeypatch):
+        """Dry run lists partitions without migrating"""
+        monkeypatch.setenv('WAREHOUSE_DSN', 'postgresql://test')
+        migration = mock_migration_class.return_value
+        migration.is_partitioned.return_value = False
+        migration.plan.return_value = ['fact_gsc_daily_p2025_01']
+
+        assert main(['--dry-run']) == 0
+        migration.migrate.assert_not_called()
+
+    @patch('scripts.migrate_partition_fact_gsc_daily.PartitionMigration')
+    def test_failure_returns_error(self, mock_migration_class, monkeypatch):
+        """Migration errors exit non-zero and skip dropping the legacy table"""
+        monkeypatch.setenv('WAREHOUSE_DSN', 'postgresql://test')
+        migration = mock_migration_class.return_value
+        migration.is_partitioned.return_value = False
+        migration.plan.return_value = []
+        migration.migrate.side_effect = RuntimeError("boom")
+
+        assert main(['--drop-legacy']) == 1
+        migration.drop_legacy.assert_not_called()
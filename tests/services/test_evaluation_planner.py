@@ -0,0 +1,298 @@
+"""
+Tests for services/alert_engine/evaluation_planner.py
+
+Tests cover:
+- Grouping rules by (property, page_path) with the longest lookback
+- Vectorized threshold, anomaly and pattern evaluation matching
+  AlertRuleEvaluator rule by rule on the same data
+- One series fetch per group and one deduplication query per run
+"""
+import random
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from services.alert_engine import AlertRuleEvaluator, EvaluationPlanner
+from services.alert_engine.evaluation_planner import (
+    AVERAGED_METRICS,
+    METRICS,
+    MetricSeries,
+    evaluate_anomaly_rules,
+    evaluate_pattern_rules,
+    evaluate_threshold_rules,
+    rule_lookback_days,
+)
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def raw_rows(seed=0, days=40, pages=3):
+    """Rows of the unified view: (age_days, metric values), some null"""
+    rng = random.Random(seed)
+    rows = []
+    for age in range(days, -1, -1):
+        if rng.random() < 0.1:
+            continue  # missing day
+        for _ in range(rng.randint(1, pages)):
+            rows.append({'age_days': age, **{
+                m: None if rng.random() < 0.15 else round(rng.uniform(0, 100), 2) for m in METRICS
+            }})
+    return rows
+
+
+def series_rows(rows):
+    """SERIES_SQL output for raw rows"""
+    out = []
+    for age in sorted({r['age_days'] for r in rows}, reverse=True):
+        day = [r for r in rows if r['age_days'] == age]
+        row = {'date': f'day-{age}', 'age_days': age}
+        for m in METRICS:
+            values = [r[m] for r in day if r[m] is not None]
+            row[f'{m}_sum'] = sum(values) if values else None
+            row[f'{m}_count'] = len(values)
+        out.append(row)
+    return out
+
+
+def reference_history(rows, lookback):
+    """fetch_metrics_history output for raw rows"""
+    history = []
+    for age in sorted({r['age_days'] for r in rows if r['age_days'] <= lookback}, reverse=True):
+        day = [r for r in rows if r['age_days'] == age]
+        entry = {'date': f'day-{age}'}
+        for m in METRICS:
+            values = [r[m] for r in day if r[m] is not None]
+            if not values:
+                entry[m] = None
+            elif m in AVERAGED_METRICS:
+                entry[m] = sum(values) / len(values)
+            else:
+                entry[m] = sum(values)
+        history.append(entry)
+    return history
+
+
+def reference_current(rows):
+    """fetch_current_metrics output for raw rows"""
+    current = {}
+    for m in METRICS:
+        values = [r[m] for r in rows if r['age_days'] <= 7 and r[m] is not None]
+        if values:
+            current[m] = sum(values) / len(values)
+    return current
+
+
+@pytest.fixture
+def evaluator():
+    return AlertRuleEvaluator(db_dsn='postgresql://test')
+
+
+# =============================================================================
+# PLANNING
+# =============================================================================
+
+class TestPlan:
+    def test_groups_by_series_with_longest_lookback(self, evaluator):
+        rules = [
+            {'rule_id': 1, 'rule_type': 'threshold', 'property': 'p1', 'page_path': '/a'},
+            {'rule_id': 2, 'rule_type': 'anomaly', 'property': 'p1', 'page_path': '/a'},
+            {'rule_id': 3, 'rule_type': 'pattern', 'property': 'p1', 'page_path': '/a',
+             'condition': {'duration': 10}},
+            {'rule_id': 4, 'rule_type': 'threshold', 'property': 'p1', 'page_path': None},
+            {'rule_id': 5, 'rule_type': 'threshold', 'property': None, 'page_path': None},
+            {'rule_id': 6, 'rule_type': 'threshold', 'property': 'p2', 'page_path': None},
+        ]
+
+        plans = EvaluationPlanner(evaluator).plan(rules, property='p1')
+
+        assert [(p.property, p.page_path, p.lookback_days) for p in plans] == [
+            ('p1', '/a', 30), ('p1', None, 7)
+        ]
+        assert [r['rule_id'] for r in plans[1].rules] == [4, 5]
+
+    def test_rule_lookback_days(self):
+        assert rule_lookback_days({'rule_type': 'threshold'}) == 7
+        assert rule_lookback_days({'rule_type': 'anomaly'}) == 30
+        assert rule_lookback_days({'rule_type': 'pattern', 'condition': {'duration': 3}}) == 14
+        assert rule_lookback_days({'rule_type': 'pattern', 'condition': {'duration': 20}}) == 27
+
+
+# =============================================================================
+# VECTORIZED EVALUATION
+# =============================================================================
+
+class TestMetricSeries:
+    def test_matches_history_and_current(self):
+        rows = raw_rows(seed=1)
+        series = MetricSeries.from_rows(series_rows(rows))
+
+        assert series.current() == pytest.approx(reference_current(rows))
+        history = reference_history(rows, 14)
+        for m in METRICS:
+            expected = [h[m] for h in history if h[m] is not None]
+            assert series.values(m, 14).tolist() == pytest.approx(expected)
+        assert series.latest(14) == pytest.approx(history[-1])
+
+    def test_empty(self):
+        series = MetricSeries.from_rows([])
+
+        assert len(series) == 0
+        assert series.current() == {}
+        assert series.values('gsc_clicks', 30).size == 0
+        assert series.latest(30) == {}
+
+
+class TestThresholdRules:
+    def test_operators(self):
+        current = {'gsc_clicks': 100.0, 'gsc_ctr': 0.05}
+        rules = [
+            {'metric': 'gsc_clicks', 'condition': {'operator': '>', 'threshold': 50}},
+            {'metric': 'gsc_clicks', 'condition': {'operator': '<', 'threshold': 50}},
+            {'metric': 'gsc_clicks', 'condition': {'operator': '=', 'threshold': 100}},
+            {'metric': 'gsc_ctr', 'condition': {'operator': 'between', 'threshold': [0.01, 0.1]}},
+            {'metric': 'gsc_ctr', 'condition': {'operator': 'not_between', 'threshold': [0.01, 0.1]}},
+            {'metric': 'gsc_ctr', 'condition': {'operator': 'between', 'threshold': 0.1}},
+            {'metric': 'ga4_sessions', 'condition': {'operator': '!=', 'threshold': 1}},
+            {'metric': 'gsc_clicks', 'condition': {'operator': '~', 'threshold': 1}},
+            {'metric': 'gsc_clicks', 'condition': {'operator': '>', 'threshold': 'x'}},
+            {'metric': 'gsc_clicks', 'condition': {}},
+        ]
+
+        result = evaluate_threshold_rules(rules, current)
+
+        assert result.tolist() == [True, False, True, True, False, False, False, False, False, False]
+
+    def test_empty(self):
+        assert evaluate_threshold_rules([], {}).tolist() == []
+
+
+class TestMatchesRuleEvaluator:
+    """Each vectorized result equals AlertRuleEvaluator on the rule's own fetch"""
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_random_rules(self, evaluator, seed):
+        rng = random.Random(seed)
+        rows = raw_rows(seed=seed)
+        series = MetricSeries.from_rows(series_rows(rows))
+        current = reference_current(rows)
+
+        threshold_rules = [{
+            'rule_type': 'threshold', 'metric': rng.choice(METRICS),
+            'condition': {'operator': rng.choice(['>', '<', '>=', '<=', 'between', 'not_between']),
+                          'threshold': sorted([rng.uniform(0, 100), rng.uniform(0, 100)])},
+        } for _ in range(40)]
+        for rule in threshold_rules:
+            if rule['condition']['operator'] not in ('between', 'not_between'):
+                rule['condition']['threshold'] = rule['condition']['threshold'][0]
+
+        anomaly_rules = [{
+            'rule_type': 'anomaly', 'metric': rng.choice(METRICS),
+            'condition': {'sensitivity': rng.choice(['low', 'medium', 'high'])},
+        } for _ in range(20)]
+
+        pattern_rules = [{
+            'rule_type': 'pattern', 'metric': rng.choice(METRICS),
+            'condition': {'pattern': rng.choice(AlertRuleEvaluator.PATTERN_TYPES),
+                          'duration': rng.randint(2, 5)},
+        } for _ in range(40)]
+
+        expected = [evaluator.evaluate_threshold_rule(r, current) for r in threshold_rules]
+        assert evaluate_threshold_rules(threshold_rules, series.current()).tolist() == expected
+
+        expected = [evaluator.evaluate_anomaly_rule(r, reference_history(rows, 30)) for r in anomaly_rules]
+        assert evaluate_anomaly_rules(anomaly_rules, series).tolist() == expected
+
+        expected = [
+            evaluator.evaluate_pattern_rule(r, reference_history(rows, rule_lookback_days(r)))
+            for r in pattern_rules
+        ]
+        assert evaluate_pattern_rules(pattern_rules, series).tolist() == expected
+
+    def test_patterns(self, evaluator):
+        def series_of(values):
+            return MetricSeries.from_rows(series_rows([
+                {'age_days': len(values) - 1 - i, **{m: v for m in METRICS}} for i, v in enumerate(values)
+            ]))
+
+        def pattern(name, duration=3):
+            return {'rule_type': 'pattern', 'metric': 'gsc_clicks',
+                    'condition': {'pattern': name, 'duration': duration}}
+
+        rules = [pattern('consecutive_decline'), pattern('consecutive_decline', 5),
+                 pattern('consecutive_growth'), pattern('trend_reversal')]
+
+        assert evaluate_pattern_rules(rules, series_of([9, 8, 7, 6, 5, 4, 3])).tolist() == [
+            True, True, False, False]
+        assert evaluate_pattern_rules(rules, series_of([9, 8, 7, 6, 8, 9, 10])).tolist() == [
+            False, False, True, True]
+
+    def test_anomaly_spike(self):
+        values = [100, 102, 98, 101, 99, 100, 500]
+        series = MetricSeries.from_rows(series_rows([
+            {'age_days': len(values) - 1 - i, **{m: v for m in METRICS}} for i, v in enumerate(values)
+        ]))
+        rules = [{'rule_type': 'anomaly', 'metric': 'gsc_clicks', 'condition': {'sensitivity': s}}
+                 for s in ('low', 'medium', 'high')]
+
+        assert evaluate_anomaly_rules(rules, series).tolist() == [True, True, True]
+        assert evaluate_anomaly_rules(
+            [{'rule_type': 'anomaly', 'metric': 'unknown'}], series
+        ).tolist() == [False]
+
+
+# =============================================================================
+# RUN
+# =============================================================================
+
+class TestRun:
+    @pytest.fixture
+    def conn(self):
+        rows = series_rows([{'age_days': 1, **{m: 10.0 for m in METRICS}}])
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.side_effect = lambda: (
+            [(1,)] if 'alert_history' in cursor.execute.call_args.args[0] else rows
+        )
+        return conn
+
+    def test_fetches_each_series_once_and_dedups_in_one_query(self, evaluator, conn):
+        rules = [
+            {'rule_id': f'r{i}', 'rule_name': f'rule {i}', 'rule_type': 'threshold',
+             'property': 'p1', 'page_path': '/a', 'metric': 'gsc_clicks',
+             'condition': {'operator': '>', 'threshold': 5}}
+            for i in range(3)
+        ] + [
+            {'rule_id': 'r3', 'rule_name': 'quiet', 'rule_type': 'threshold',
+             'property': 'p1', 'page_path': None, 'metric': 'gsc_clicks',
+             'condition': {'operator': '>', 'threshold': 50}},
+        ]
+
+        with patch.object(evaluator, '_get_connection', return_value=conn), \
+                patch.object(evaluator, 'trigger_alert', return_value='alert-1') as trigger:
+            summary = EvaluationPlanner(evaluator).run(rules)
+
+        sql = [c.args[0] for c in conn.cursor.return_value.execute.call_args_list]
+        assert len(sql) == 3
+        assert sum('vw_unified_page_performance' in s for s in sql) == 2
+        dedup_params = conn.cursor.return_value.execute.call_args_list[-1].args[1]
+        assert dedup_params == (['r0', 'r1', 'r2'], ['p1', 'p1', 'p1'], [24, 24, 24])
+
+        # r0 (position 1) already alerted
+        assert [c.args[0]['rule_id'] for c in trigger.call_args_list] == ['r1', 'r2']
+        assert all(c.kwargs['skip_dedup'] for c in trigger.call_args_list)
+        alert_data = trigger.call_args_list[0].args[1]
+        assert alert_data['page_path'] == '/a'
+        assert alert_data['metrics']['gsc_clicks'] == 10.0
+        assert summary == {'rules_evaluated': 4, 'alerts_triggered': 2,
+                           'series_fetched': 2, 'duplicates_skipped': 1}
+        conn.close.assert_called_once()
+
+    def test_failed_dedup_check_allows_alerts(self, evaluator, conn):
+        planner = EvaluationPlanner(evaluator)
+        conn.cursor.return_value.execute.side_effect = Exception('db down')
+
+        assert planner.find_duplicates(conn, [({'rule_id': 'r'}, 'p1')]) == [False]
+        assert planner.find_duplicates(conn, []) == []
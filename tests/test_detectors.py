@@ -21,6 +21,7 @@ from insights_core.models import (
     EntityType,
     InsightMetrics,
 )
+from tests.fixtures.conftest_helpers import persisted_insights
 
 
 @pytest.fixture
@@ -215,13 +216,13 @@ class TestAnomalyDetector:
             }
         ]
         
-        mock_repository.create.return_value = None
+        mock_repository.create_many.return_value = []
         
         detector = AnomalyDetector(mock_repository, mock_config)
         insights_created = detector.detect()
         
         assert insights_created >= 1
-        mock_repository.create.assert_called()
+        mock_repository.create_many.assert_called_once()
 
 
 class TestDiagnosisDetector:
@@ -317,16 +318,16 @@ class TestOpportunityDetector:
             }
         ]
         
-        mock_repository.create.return_value = None
+        mock_repository.create_many.return_value = []
         
         detector = OpportunityDetector(mock_repository, mock_config)
         insights_created = detector._find_striking_distance()
         
         assert insights_created >= 1
-        mock_repository.create.assert_called()
+        mock_repository.create_many.assert_called_once()
         
         # Verify the insight created
-        call_args = mock_repository.create.call_args[0][0]
+        call_args = persisted_insights(mock_repository)[-1]
         assert call_args.category == InsightCategory.OPPORTUNITY
         assert "Striking Distance" in call_args.title
     
@@ -354,16 +355,16 @@ class TestOpportunityDetector:
             }
         ]
         
-        mock_repository.create.return_value = None
+        mock_repository.create_many.return_value = []
         
         detector = OpportunityDetector(mock_repository, mock_config)
         insights_created = detector._find_content_gaps()
         
         assert insights_created >= 1
-        mock_repository.create.assert_called()
+        mock_repository.create_many.assert_called_once()
         
         # Verify the insight created
-        call_args = mock_repository.create.call_args[0][0]
+        call_args = persisted_insights(mock_repository)[-1]
         assert call_args.category == InsightCategory.OPPORTUNITY
         assert "Content Gap" in call_args.title
 
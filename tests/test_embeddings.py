@@ -4,6 +4,7 @@ Tests for Embedding Generator
 import pytest
 import numpy as np
 from insights_core.embeddings import EmbeddingGenerator
+from insights_core.vector_index import VectorIndex
 
 
 class TestEmbeddingGenerator:
@@ -170,3 +171,182 @@ class TestEmbeddingSimilarity:
         assert len(results) == 1
         assert results[0]['similarity'] == 0.92
         assert results[0]['page_a'] == '/page-1/'
+
+
+def make_pool(mocker, conn):
+    """Mock asyncpg pool handing out conn"""
+    pool = mocker.MagicMock()
+    pool.acquire.return_value.__aenter__ = mocker.AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = mocker.AsyncMock(return_value=False)
+    return pool
+
+
+def snapshot_row(id, page_path, text, title=None, content_hash=None, model=None,
+                 has_content=False, has_title=False):
+    """Row as returned by the page chunk query"""
+    return {
+        'id': id,
+        'page_path': page_path,
+        'title': title,
+        'text_content': text,
+        'content_hash': content_hash,
+        'embedding_model': model,
+        'has_content_embedding': has_content,
+        'has_title_embedding': has_title,
+    }
+
+
+class TestBatchedGeneration:
+    """Test batched embedding generation (model and database mocked)"""
+
+    @pytest.fixture
+    def generator(self, mocker):
+        """Generator with a fake sentence-transformer returning one row per text"""
+        model = mocker.patch('insights_core.embeddings.SentenceTransformer').return_value
+        model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[float(len(text)), 1.0] for text in texts], dtype=np.float32
+        )
+        return EmbeddingGenerator(model_name='test-model')
+
+    def test_generate_embeddings_batches_non_empty_texts(self, generator):
+        """Texts are encoded in one call per batch; empty texts get zero vectors"""
+        embeddings = generator.generate_embeddings(['abc', '', 'hello'], batch_size=32)
+
+        generator.model.encode.assert_called_once()
+        args, kwargs = generator.model.encode.call_args
+        assert args[0] == ['abc', 'hello']
+        assert kwargs['batch_size'] == 32
+        assert embeddings.shape == (3, 2)
+        assert embeddings[0, 0] == 3.0
+        assert np.all(embeddings[1] == 0)
+
+    @pytest.mark.asyncio
+    async def test_skips_reuses_and_bulk_writes(self, generator, mocker):
+        """Up-to-date pages are skipped, stored vectors reused, the rest encoded once"""
+        from insights_core.embeddings import _content_hash
+
+        conn = mocker.MagicMock()
+        conn.fetch = mocker.AsyncMock(side_effect=[
+            [
+                snapshot_row(1, '/a', 'same text', content_hash=_content_hash('same text'),
+                             model='test-model', has_content=True),
+                snapshot_row(2, '/b', 'known text'),
+                snapshot_row(3, '/c', 'new text', title='Title'),
+                snapshot_row(4, '/d', 'new text', title='Title'),
+            ],
+            [{'content_hash': _content_hash('known text'), 'content_embedding': '[1,2]'}],
+        ])
+        conn.execute = mocker.AsyncMock(return_value='UPDATE 3')
+        generator._pool = make_pool(mocker, conn)
+
+        result = await generator._generate_for_property_async('https://example.com', chunk_size=10)
+
+        assert result['pages_processed'] == 4
+        assert result['pages_skipped'] == 1
+        assert result['embeddings_reused'] == 1
+        assert result['texts_encoded'] == 2  # 'new text' and 'Title', once each
+        assert result['embeddings_created'] == 3
+
+        # One bulk UPDATE for the chunk
+        conn.execute.assert_called_once()
+        query, ids, hashes, content_vectors, title_vectors, model, _ = conn.execute.call_args.args
+        assert 'unnest' in query
+        assert ids == [2, 3, 4]
+        assert content_vectors[0] == '[1,2]'
+        assert content_vectors[1] == content_vectors[2] == '[8,1]'
+        assert title_vectors == [None, '[5,1]', '[5,1]']
+        assert model == 'test-model'
+
+    @pytest.mark.asyncio
+    async def test_force_reembeds_up_to_date_pages(self, generator, mocker):
+        """force=True ignores stored hashes"""
+        from insights_core.embeddings import _content_hash
+
+        conn = mocker.MagicMock()
+        conn.fetch = mocker.AsyncMock(return_value=[
+            snapshot_row(1, '/a', 'text', content_hash=_content_hash('text'),
+                         model='test-model', has_content=True),
+        ])
+        conn.execute = mocker.AsyncMock(return_value='UPDATE 1')
+        generator._pool = make_pool(mocker, conn)
+
+        result = await generator._generate_for_property_async('https://example.com', force=True)
+
+        assert result['pages_skipped'] == 0
+        assert result['embeddings_created'] == 1
+        conn.fetch.assert_called_once()  # No stored-vector lookup
+
+    @pytest.mark.asyncio
+    async def test_reads_pages_in_chunks(self, generator, mocker):
+        """Full chunks trigger a keyset read for the next chunk"""
+        conn = mocker.MagicMock()
+        conn.fetch = mocker.AsyncMock(side_effect=[
+            [snapshot_row(1, '/a', 'one'), snapshot_row(2, '/b', 'two')],
+            [],
+            [snapshot_row(3, '/c', 'three')],
+            [],
+        ])
+        conn.execute = mocker.AsyncMock(side_effect=['UPDATE 2', 'UPDATE 1'])
+        generator._pool = make_pool(mocker, conn)
+
+        result = await generator._generate_for_property_async('https://example.com', chunk_size=2)
+
+        assert result['pages_processed'] == 3
+        assert result['embeddings_created'] == 3
+        assert conn.fetch.call_args_list[2].args[2] == '/b'  # after_path of 2nd chunk
+
+
+class TestVectorIndexQueries:
+    """Test similarity queries served from an open vector index (database mocked)"""
+
+    @pytest.fixture
+    def generator(self, mocker):
+        mocker.patch('insights_core.embeddings.SentenceTransformer')
+        generator = EmbeddingGenerator(model_name='test-model')
+        index = VectorIndex(dim=2)
+        index.build(['/a', '/b', '/c'], [[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]])
+        generator._indexes['https://example.com'] = index
+        return generator
+
+    @pytest.mark.asyncio
+    async def test_find_cannibalization_from_index(self, generator, mocker):
+        conn = mocker.MagicMock()
+        conn.fetch = mocker.AsyncMock(return_value=[
+            {'page_path': '/a', 'title': 'A', 'word_count': 500},
+            {'page_path': '/b', 'title': 'B', 'word_count': 550},
+        ])
+        conn.executemany = mocker.AsyncMock()
+        generator._pool = make_pool(mocker, conn)
+
+        results = await generator.find_cannibalization('https://example.com', similarity_threshold=0.9)
+
+        assert len(results) == 1
+        assert results[0]['page_a'] == '/a'
+        assert results[0]['words_b'] == 550
+        assert sorted(conn.fetch.call_args.args[2]) == ['/a', '/b']  # One details query
+        records = conn.executemany.call_args.args[1]
+        assert [r[1:3] for r in records] == [('/a', '/b')]
+        assert records[0][4] == 'high'
+
+    @pytest.mark.asyncio
+    async def test_find_similar_pages_from_index(self, generator, mocker):
+        conn = mocker.MagicMock()
+        conn.fetch = mocker.AsyncMock(return_value=[{'page_path': '/b', 'title': 'B', 'word_count': 550}])
+        generator._pool = make_pool(mocker, conn)
+
+        results = await generator.find_similar_pages('https://example.com', '/a', limit=5, threshold=0.5)
+
+        assert [r['page_path'] for r in results] == ['/b']
+        assert results[0]['similarity'] == pytest.approx(0.995, abs=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_store_embedding_updates_open_index(self, generator, mocker):
+        conn = mocker.MagicMock()
+        conn.execute = mocker.AsyncMock()
+        generator._pool = make_pool(mocker, conn)
+        mocker.patch.object(generator, 'generate_embedding', return_value=np.array([0.0, 1.0]))
+
+        assert await generator.store_embedding('https://example.com', '/d', 'new page')
+
+        index = generator._indexes['https://example.com']
+        assert index.search('/c', k=1) == [('/d', pytest.approx(1.0))]
@@ -514,6 +514,118 @@ async def test_consumer_run_loop_error_handling(event_stream):
         pytest.fail(f"Consumer run loop should handle errors gracefully: {e}")
 
 
+# =============================================
+# PIPELINED CONSUMER TESTS (fakeredis)
+# =============================================
+
+@pytest.fixture
+def fake_stream():
+    """EventStream backed by an in-process fakeredis server"""
+    fakeredis = pytest.importorskip('fakeredis')
+    with patch('redis.from_url', return_value=fakeredis.FakeRedis(decode_responses=True)):
+        stream = EventStream('redis://fake')
+    yield stream
+    stream.close()
+
+
+class RecordingConsumer(EventConsumer):
+    """Consumer that records events and fails the ones marked 'fail'"""
+
+    def __init__(self, *args, delay=0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.seen = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def process_event(self, event):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.seen.append(event['event_id'])
+        return not event['data'].get('fail')
+
+
+def test_group_created_once(fake_stream):
+    """xgroup_create is only attempted on first use"""
+    with patch.object(fake_stream.redis, 'xgroup_create', wraps=fake_stream.redis.xgroup_create) as create:
+        for _ in range(3):
+            fake_stream.consume_events('s', 'g', 'c', block=None)
+
+    assert create.call_count == 1
+
+
+def test_read_events_does_not_ack(fake_stream):
+    """read_events leaves events pending until ack_events"""
+    ids = [fake_stream.publish_event('s', 'e', {'i': i}) for i in range(3)]
+
+    events = fake_stream.read_events(['s'], 'g', 'c', block=None)
+
+    assert [e['event_id'] for e in events] == ids
+    assert fake_stream.redis.xpending('s', 'g')['pending'] == 3
+    assert fake_stream.ack_events('s', 'g', ids) == 3
+    assert fake_stream.redis.xpending('s', 'g')['pending'] == 0
+
+
+def test_claim_stale_events(fake_stream):
+    """Events pending on a dead consumer are claimed by another"""
+    fake_stream.publish_event('s', 'e', {'i': 1})
+    fake_stream.read_events(['s'], 'g', 'dead_consumer', block=None)
+
+    claimed = fake_stream.claim_stale_events('s', 'g', 'live_consumer', min_idle_ms=0)
+
+    assert [e['data'] for e in claimed] == [{'i': 1}]
+    consumers = {c['name']: c['pending'] for c in fake_stream.redis.xinfo_consumers('s', 'g')}
+    assert consumers['live_consumer'] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_pipelined_processes_concurrently_and_acks(fake_stream):
+    """Workers run concurrently and successes are acknowledged in batches"""
+    for i in range(40):
+        fake_stream.publish_event('a', 'e', {'i': i})
+        fake_stream.publish_event('b', 'e', {'i': i})
+
+    consumer = RecordingConsumer(fake_stream, 'g', 'c1', delay=0.01)
+    with patch.object(fake_stream.redis, 'xack', wraps=fake_stream.redis.xack) as xack:
+        processed = await consumer.run_pipelined(
+            ['a', 'b'], stop_after=80, workers=8, block=10, ack_interval=0.01
+        )
+
+    assert processed >= 80
+    assert consumer.max_in_flight > 1
+    assert consumer.max_in_flight <= 8
+    assert xack.call_count < 80
+    assert fake_stream.redis.xpending('a', 'g')['pending'] == 0
+    assert fake_stream.redis.xpending('b', 'g')['pending'] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_pipelined_leaves_failures_pending_and_reclaims(fake_stream):
+    """Failed events stay pending and are retried once reclaimed"""
+    fake_stream.publish_event('s', 'e', {'fail': True})
+    fake_stream.publish_event('s', 'e', {'fail': False})
+
+    first = RecordingConsumer(fake_stream, 'g', 'c1')
+    await first.run_pipelined(['s'], stop_after=1, block=10, claim_idle_ms=0)
+    await asyncio.sleep(0.05)
+
+    assert fake_stream.redis.xpending('s', 'g')['pending'] == 1
+
+    second = RecordingConsumer(fake_stream, 'g', 'c2')
+    with patch.object(fake_stream, 'claim_stale_events', wraps=fake_stream.claim_stale_events) as claim:
+        task = asyncio.create_task(
+            second.run_pipelined(['s'], stop_after=100, block=10, claim_idle_ms=20)
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert claim.called
+    assert len(second.seen) >= 1
+
+
 # =============================================
 # INTEGRATION TESTS
 # =============================================
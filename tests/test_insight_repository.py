@@ -33,7 +33,7 @@ def repository():
     cur = conn.cursor()
     cur.execute("DELETE FROM gsc.insights WHERE source LIKE 'Test%'")
     conn.commit()
-    conn.close()
+    repo._release_connection(conn)
     
     yield repo
     
@@ -42,7 +42,8 @@ def repository():
     cur = conn.cursor()
     cur.execute("DELETE FROM gsc.insights WHERE source LIKE 'Test%'")
     conn.commit()
-    conn.close()
+    repo._release_connection(conn)
+    repo.close()
 
 
 def test_table_exists(repository):
@@ -57,7 +58,7 @@ def test_table_exists(repository):
         );
     """)
     exists = cur.fetchone()[0]
-    conn.close()
+    repository._release_connection(conn)
     
     assert exists, "gsc.insights table should exist"
 
@@ -74,7 +75,7 @@ def test_table_schema(repository):
         ORDER BY ordinal_position;
     """)
     columns = [row[0] for row in cur.fetchall()]
-    conn.close()
+    repository._release_connection(conn)
     
     expected_columns = [
         'id', 'generated_at', 'property', 'entity_type', 'entity_id',
@@ -294,7 +295,7 @@ def test_validation_function(repository):
     cur = conn.cursor()
     cur.execute("SELECT * FROM gsc.validate_insights_table();")
     results = cur.fetchall()
-    conn.close()
+    repository._release_connection(conn)
     
     assert len(results) > 0, "Validation function should return results"
     
@@ -337,7 +338,7 @@ def test_indexes_exist(repository):
         AND tablename = 'insights';
     """)
     indexes = [row[0] for row in cur.fetchall()]
-    conn.close()
+    repository._release_connection(conn)
     
     # Check for critical indexes
     assert any('property' in idx for idx in indexes), "Property index should exist"
@@ -9,7 +9,14 @@ import pytest
 import numpy as np
 from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
-from insights_core.topic_clustering import TopicClusterer
+from sklearn.metrics import adjusted_rand_score
+
+from insights_core.topic_clustering import (
+    TopicClusterer,
+    _stratified_sample,
+    benchmark,
+    generate_synthetic_embeddings,
+)
 
 
 @pytest.fixture
@@ -117,6 +124,73 @@ def test_cluster_embeddings_auto_detect(clusterer, sample_embeddings):
     assert 2 <= n_clusters <= 10
 
 
+# =============================================
+# SCALABLE CLUSTERING TESTS
+# =============================================
+
+def test_find_optimal_clusters_scalable(clusterer):
+    """Scalable mode recovers the true topic count"""
+    embeddings, _ = generate_synthetic_embeddings(1500, topics=7, dim=96, seed=3)
+
+    optimal_k = clusterer.find_optimal_clusters(
+        embeddings,
+        min_clusters=3,
+        max_clusters=12,
+        scalable=True,
+        pca_components=16,
+        sample_size=400
+    )
+
+    assert optimal_k == 7
+
+
+def test_scalable_mode_used_for_large_inputs(clusterer):
+    """Large inputs switch to the scalable mode automatically"""
+    embeddings, _ = generate_synthetic_embeddings(60, topics=3, dim=16)
+
+    with patch('insights_core.topic_clustering.SCALABLE_CLUSTERING_MIN_PAGES', 50), \
+            patch.object(clusterer, '_find_optimal_clusters_scalable', return_value=3) as scalable:
+        assert clusterer.find_optimal_clusters(embeddings, min_clusters=2, max_clusters=5) == 3
+
+    scalable.assert_called_once()
+
+
+def test_cluster_embeddings_scalable(clusterer):
+    """Scalable fit keeps full-dimension centroids"""
+    embeddings, true_labels = generate_synthetic_embeddings(1000, topics=5, dim=96, seed=5)
+
+    labels, centroids, model = clusterer.cluster_embeddings(embeddings, n_clusters=5, scalable=True)
+
+    assert centroids.shape == (5, 96)
+    assert adjusted_rand_score(true_labels, labels) > 0.95
+
+
+def test_stratified_sample_keeps_every_cluster():
+    """Small clusters keep at least two sampled rows"""
+    labels = np.array([0] * 990 + [1] * 8 + [2] * 2)
+
+    sample = _stratified_sample(labels, 100, np.random.default_rng(0))
+
+    assert len(np.unique(sample)) == len(sample)
+    assert set(labels[sample]) == {0, 1, 2}
+    assert (labels[sample] == 2).sum() == 2
+    assert 95 <= len(sample) <= 105
+
+
+def test_benchmark_reports_both_modes():
+    """Benchmark reports time and quality per mode"""
+    embeddings, true_labels = generate_synthetic_embeddings(400, topics=4, dim=32, seed=1)
+
+    results = benchmark(embeddings, true_labels, min_clusters=2, max_clusters=6, pca_components=8, sample_size=200)
+
+    assert results['pages'] == 400
+    for mode in ('exhaustive', 'scalable'):
+        assert results[mode]['k'] == 4
+        assert results[mode]['adjusted_rand'] > 0.95
+        assert results[mode]['total_seconds'] >= results[mode]['selection_seconds']
+    assert 'speedup' in results
+
+
 # =============================================
 # LLM TOPIC NAMING TESTS
 # =============================================
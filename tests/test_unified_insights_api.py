@@ -8,7 +8,7 @@ import pytest
 import sys
 import os
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 # Add insights_api to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -71,8 +71,8 @@ def create_mock_insight(
 
 @pytest.fixture
 def mock_repository():
-    """Mock InsightRepository for tests"""
-    with patch('insights_api.insights_api.repository') as mock_repo:
+    """Mock AsyncInsightRepository for tests"""
+    with patch('insights_api.insights_api.repository', new_callable=AsyncMock) as mock_repo:
         yield mock_repo
 
 
@@ -0,0 +1,138 @@
+"""
+Tests for the incremental unified rollup refresh
+
+Tests cover:
+- A single refresh_unified_rollups() call maintains all three rollups
+- Per-rollup results expose the recomputed date range and rows written
+- Full rebuilds and failures
+
+All tests use mocks - no real database.
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add warehouse directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../warehouse'))
+
+from refresh_views import ViewRefreshManager, main
+
+
+def rollup_row(rollup_name, status='success', rows=10, from_date=date(2025, 1, 1), to_date=date(2025, 1, 29)):
+    """Row as returned by gsc.refresh_unified_rollups()"""
+    return {
+        'rollup_name': rollup_name,
+        'status': status,
+        'from_date': from_date if status == 'success' else None,
+        'to_date': to_date if status == 'success' else None,
+        'rows_written': rows if status == 'success' else 0,
+        'refresh_time': timedelta(seconds=1.5),
+    }
+
+
+@pytest.fixture
+def manager():
+    """Manager with a mocked cursor"""
+    manager = ViewRefreshManager(dsn='postgresql://test')
+    manager.conn = MagicMock()
+    manager.cursor = MagicMock()
+    manager.cursor.fetchall.return_value = [
+        rollup_row('mv_unified_page_performance', rows=300),
+        rollup_row('mv_unified_page_performance_weekly', rows=50),
+        rollup_row('mv_unified_page_performance_monthly', rows=20),
+    ]
+    return manager
+
+
+class TestRefreshRollups:
+    """Test ViewRefreshManager refresh methods"""
+
+    def test_refresh_all_views_single_call(self, manager):
+        """All rollups are refreshed by one incremental function call"""
+        results = manager.refresh_all_views()
+
+        manager.cursor.execute.assert_called_once_with(
+            "SELECT * FROM gsc.refresh_unified_rollups(%s)", (False,)
+        )
+        assert [r['view_name'] for r in results] == list(ViewRefreshManager.AVAILABLE_VIEWS)
+        assert all(r['status'] == 'success' for r in results)
+        assert results[0]['row_count'] == 300
+        assert results[0]['from_date'] == '2025-01-01'
+        assert results[0]['to_date'] == '2025-01-29'
+        assert results[0]['duration'] == 1.5
+
+    def test_no_materialized_view_refresh(self, manager):
+        """The rollups are never rebuilt with REFRESH MATERIALIZED VIEW"""
+        manager.refresh_all_views()
+
+        statements = [c.args[0] for c in manager.cursor.execute.call_args_list]
+        assert not any('REFRESH MATERIALIZED VIEW' in s for s in statements)
+
+    def test_refresh_view_returns_requested_rollup(self, manager):
+        """refresh_view returns the entry for the requested rollup"""
+        result = manager.refresh_view('unified_weekly', full=True)
+
+        manager.cursor.execute.assert_called_once_with(
+            "SELECT * FROM gsc.refresh_unified_rollups(%s)", (True,)
+        )
+        assert result['view_name'] == 'unified_weekly'
+        assert result['row_count'] == 50
+
+    def test_refresh_view_unknown(self, manager):
+        """Unknown views are rejected before touching the database"""
+        with pytest.raises(ValueError, match='Unknown view'):
+            manager.refresh_view('unified_yearly')
+        manager.cursor.execute.assert_not_called()
+
+    def test_unchanged_is_success(self, manager):
+        """A run with no fact changes succeeds without writing rows"""
+        manager.cursor.fetchall.return_value = [
+            rollup_row(name, status='unchanged')
+            for name in ViewRefreshManager.AVAILABLE_VIEWS.values()
+        ]
+
+        results = manager.refresh_all_views()
+
+        assert all(r['status'] == 'success' for r in results)
+        assert all(r['row_count'] == 0 for r in results)
+        assert results[0]['from_date'] is None
+
+    def test_failure_reported_for_every_rollup(self, manager):
+        """A failed refresh marks every rollup as failed"""
+        manager.cursor.execute.side_effect = Exception("deadlock detected")
+
+        results = manager.refresh_all_views()
+
+        assert len(results) == 3
+        assert all(r['status'] == 'failed' for r in results)
+        assert 'deadlock detected' in results[0]['error']
+
+    def test_get_view_stats_uses_period_columns(self, manager):
+        """Weekly and monthly stats read their own period column"""
+        manager.cursor.fetchone.return_value = {'row_count': 0}
+
+        manager.get_view_stats()
+
+        statements = [c.args[0] for c in manager.cursor.execute.call_args_list]
+        assert 'MIN(date)' in statements[0]
+        assert 'MIN(week_start)' in statements[1]
+        assert 'MIN(month_start)' in statements[2]
+
+
+class TestMain:
+    """Test the command line entry point"""
+
+    @patch('refresh_views.ViewRefreshManager')
+    def test_full_flag(self, mock_manager_class):
+        """--full requests a full rebuild"""
+        manager = mock_manager_class.return_value
+        manager.refresh_all_views.return_value = [{'status': 'success'}]
+
+        with patch.object(sys, 'argv', ['refresh_views.py', '--view', 'all', '--full']):
+            assert main() == 0
+
+        manager.refresh_all_views.assert_called_once_with(full=True)
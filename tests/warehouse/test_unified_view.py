@@ -235,43 +235,46 @@ class TestUnifiedView:
 
 
 class TestMaterializedViews:
-    """Test cases for materialized views"""
+    """Test cases for the unified rollup tables"""
     
     def test_mv_daily_exists(self, db_cursor):
-        """Test that daily materialized view exists"""
+        """Test that daily rollup table exists"""
         db_cursor.execute("""
             SELECT EXISTS (
-                SELECT 1 FROM pg_matviews 
-                WHERE schemaname = 'gsc' 
-                AND matviewname = 'mv_unified_page_performance'
+                SELECT 1 FROM information_schema.tables 
+                WHERE table_schema = 'gsc' 
+                AND table_name = 'mv_unified_page_performance'
+                AND table_type = 'BASE TABLE'
             )
         """)
         result = db_cursor.fetchone()
-        assert result['exists'], "Daily materialized view does not exist"
+        assert result['exists'], "Daily rollup table does not exist"
     
     def test_mv_weekly_exists(self, db_cursor):
-        """Test that weekly materialized view exists"""
+        """Test that weekly rollup table exists"""
         db_cursor.execute("""
             SELECT EXISTS (
-                SELECT 1 FROM pg_matviews 
-                WHERE schemaname = 'gsc' 
-                AND matviewname = 'mv_unified_page_performance_weekly'
+                SELECT 1 FROM information_schema.tables 
+                WHERE table_schema = 'gsc' 
+                AND table_name = 'mv_unified_page_performance_weekly'
+                AND table_type = 'BASE TABLE'
             )
         """)
         result = db_cursor.fetchone()
-        assert result['exists'], "Weekly materialized view does not exist"
+        assert result['exists'], "Weekly rollup table does not exist"
     
     def test_mv_monthly_exists(self, db_cursor):
-        """Test that monthly materialized view exists"""
+        """Test that monthly rollup table exists"""
         db_cursor.execute("""
             SELECT EXISTS (
-                SELECT 1 FROM pg_matviews 
-                WHERE schemaname = 'gsc' 
-                AND matviewname = 'mv_unified_page_performance_monthly'
+                SELECT 1 FROM information_schema.tables 
+                WHERE table_schema = 'gsc' 
+                AND table_name = 'mv_unified_page_performance_monthly'
+                AND table_type = 'BASE TABLE'
             )
         """)
         result = db_cursor.fetchone()
-        assert result['exists'], "Monthly materialized view does not exist"
+        assert result['exists'], "Monthly rollup table does not exist"
     
     def test_mv_has_indexes(self, db_cursor):
         """Test that materialized view has proper indexes"""
@@ -290,7 +293,8 @@ class TestMaterializedViews:
             'refresh_mv_unified_daily',
             'refresh_mv_unified_weekly',
             'refresh_mv_unified_monthly',
-            'refresh_all_unified_views'
+            'refresh_all_unified_views',
+            'refresh_unified_rollups'
         ]
         
         for func in functions:
@@ -49,6 +49,8 @@ TRANSFORM_FILES = [
     'sql/28_actions_metrics_views.sql',  # Actions metrics views
     'sql/29_hugo_content_schema.sql',  # Hugo content tracking schema
     'sql/30_monitored_pages_schema.sql',  # CWV monitored pages for URL discovery sync
+    'sql/31_bulk_load_staging.sql',  # Unlogged COPY staging for fact table bulk loads
+    'sql/32_fact_gsc_daily_partitioning.sql',  # Monthly partition management for fact_gsc_daily
 ]
 
 def get_db_connection():
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-Materialized View Refresh Manager
-Handles refresh operations for unified page performance materialized views
+Unified Rollup Refresh Manager
+Handles incremental refresh of the unified page performance rollup tables
 """
 
 import os
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
 
 
 class ViewRefreshManager:
-    """Manages materialized view refresh operations"""
+    """Manages unified rollup refresh operations"""
     
     AVAILABLE_VIEWS = {
         'unified_page_performance': 'mv_unified_page_performance',
@@ -32,6 +32,12 @@ class ViewRefreshManager:
         'unified_monthly': 'mv_unified_page_performance_monthly',
     }
     
+    DATE_COLUMNS = {
+        'unified_page_performance': 'date',
+        'unified_weekly': 'week_start',
+        'unified_monthly': 'month_start',
+    }
+    
     def __init__(self, dsn: Optional[str] = None):
         """Initialize the refresh manager"""
         self.dsn = dsn or os.getenv('WAREHOUSE_DSN')
@@ -60,85 +66,99 @@ class ViewRefreshManager:
             self.conn.close()
         logger.info("Database connection closed")
     
-    def refresh_view(self, view_name: str, concurrent: bool = True) -> Dict:
+    def refresh_rollups(self, full: bool = False) -> List[Dict]:
         """
-        Refresh a specific materialized view
-        
+        Incrementally refresh all unified rollups in one pass
+
+        Only dates whose fact rows changed since the previous refresh (plus
+        the trailing 28 days that depend on them) are recomputed.
+
         Args:
-            view_name: Name of the view to refresh (key from AVAILABLE_VIEWS)
-            concurrent: Whether to use CONCURRENTLY option (default: True)
-        
+            full: Rebuild every rollup from the complete fact history
+
         Returns:
-            Dictionary with refresh results
+            List of per-rollup result dictionaries
         """
-        if view_name not in self.AVAILABLE_VIEWS:
-            raise ValueError(f"Unknown view: {view_name}. Available: {list(self.AVAILABLE_VIEWS.keys())}")
-        
-        full_view_name = f"gsc.{self.AVAILABLE_VIEWS[view_name]}"
         start_time = datetime.now()
-        
+        view_keys = {full_name: key for key, full_name in self.AVAILABLE_VIEWS.items()}
+
         try:
-            logger.info(f"Starting refresh of {full_view_name}")
-            
-            # Execute refresh
-            if concurrent:
-                query = f"REFRESH MATERIALIZED VIEW CONCURRENTLY {full_view_name}"
-            else:
-                query = f"REFRESH MATERIALIZED VIEW {full_view_name}"
-            
-            self.cursor.execute(query)
-            
+            logger.info(f"Starting {'full' if full else 'incremental'} refresh of unified rollups")
+
+            self.cursor.execute("SELECT * FROM gsc.refresh_unified_rollups(%s)", (full,))
+            rows = self.cursor.fetchall()
+
             end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            # Get row count
-            self.cursor.execute(f"SELECT COUNT(*) as count FROM {full_view_name}")
-            row_count = self.cursor.fetchone()['count']
-            
-            result = {
-                'view_name': view_name,
-                'status': 'success',
-                'duration': duration,
-                'row_count': row_count,
-                'start_time': start_time.isoformat(),
-                'end_time': end_time.isoformat()
-            }
-            
-            logger.info(f"Successfully refreshed {full_view_name} in {duration:.2f}s ({row_count} rows)")
-            return result
-            
+            results = []
+            for row in rows:
+                refresh_time = row['refresh_time']
+                result = {
+                    'view_name': view_keys.get(row['rollup_name'], row['rollup_name']),
+                    'status': 'success' if row['status'] in ('success', 'unchanged') else row['status'],
+                    'duration': refresh_time.total_seconds() if refresh_time is not None else 0.0,
+                    'row_count': row['rows_written'],
+                    'from_date': row['from_date'].isoformat() if row['from_date'] else None,
+                    'to_date': row['to_date'].isoformat() if row['to_date'] else None,
+                    'start_time': start_time.isoformat(),
+                    'end_time': end_time.isoformat()
+                }
+                results.append(result)
+                logger.info(
+                    f"Refreshed gsc.{row['rollup_name']}: {row['status']} "
+                    f"({result['from_date']} to {result['to_date']}, {result['row_count']} rows)"
+                )
+
+            return results
+
         except Exception as e:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
-            
-            result = {
-                'view_name': view_name,
-                'status': 'failed',
-                'duration': duration,
-                'error': str(e),
-                'start_time': start_time.isoformat(),
-                'end_time': end_time.isoformat()
-            }
-            
-            logger.error(f"Failed to refresh {full_view_name}: {e}")
-            return result
-    
-    def refresh_all_views(self) -> List[Dict]:
-        """Refresh all unified materialized views"""
-        results = []
-        
+
+            logger.error(f"Failed to refresh unified rollups: {e}")
+            return [
+                {
+                    'view_name': view_name,
+                    'status': 'failed',
+                    'duration': duration,
+                    'error': str(e),
+                    'start_time': start_time.isoformat(),
+                    'end_time': end_time.isoformat()
+                }
+                for view_name in self.AVAILABLE_VIEWS
+            ]
+
+    def refresh_view(self, view_name: str, full: bool = False) -> Dict:
+        """
+        Refresh a specific unified rollup
+
+        The daily, weekly and monthly rollups are maintained together, so this
+        runs the shared incremental refresh and returns the requested entry.
+
+        Args:
+            view_name: Name of the view to refresh (key from AVAILABLE_VIEWS)
+            full: Rebuild from the complete fact history (default: False)
+
+        Returns:
+            Dictionary with refresh results
+        """
+        if view_name not in self.AVAILABLE_VIEWS:
+            raise ValueError(f"Unknown view: {view_name}. Available: {list(self.AVAILABLE_VIEWS.keys())}")
+
+        results = self.refresh_rollups(full=full)
+        return next(r for r in results if r['view_name'] == view_name)
+
+    def refresh_all_views(self, full: bool = False) -> List[Dict]:
+        """Refresh all unified rollups"""
         logger.info("Starting refresh of all unified views")
-        
-        for view_name in self.AVAILABLE_VIEWS.keys():
-            result = self.refresh_view(view_name)
-            results.append(result)
-        
+
+        results = self.refresh_rollups(full=full)
+
         # Log summary
         success_count = sum(1 for r in results if r['status'] == 'success')
         total_duration = sum(r['duration'] for r in results)
-        
+
         logger.info(f"Refresh complete: {success_count}/{len(results)} successful in {total_duration:.2f}s")
-        
+
         return results
     
     def validate_view_quality(self) -> List[Dict]:
@@ -167,7 +187,7 @@ class ViewRefreshManager:
             return []
     
     def get_view_stats(self) -> Dict:
-        """Get statistics for all materialized views"""
+        """Get statistics for all unified rollups"""
         stats = {}
         
         for view_name, full_name in self.AVAILABLE_VIEWS.items():
@@ -177,8 +197,8 @@ class ViewRefreshManager:
                     SELECT 
                         COUNT(*) as row_count,
                         MAX(last_refreshed) as last_refreshed,
-                        MIN(date) as min_date,
-                        MAX(date) as max_date
+                        MIN({self.DATE_COLUMNS[view_name]}) as min_date,
+                        MAX({self.DATE_COLUMNS[view_name]}) as max_date
                     FROM gsc.{full_name}
                 """
                 self.cursor.execute(query)
@@ -218,7 +238,7 @@ class ViewRefreshManager:
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
-        description='Refresh materialized views for unified page performance'
+        description='Refresh unified page performance rollups'
     )
     parser.add_argument(
         '--view',
@@ -235,6 +255,11 @@ def main():
         action='store_true',
         help='Show materialized view statistics'
     )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Rebuild rollups from the complete fact history instead of only changed dates'
+    )
     parser.add_argument(
         '--use-function',
         action='store_true',
@@ -273,9 +298,9 @@ def main():
             if args.use_function:
                 results = manager.refresh_using_function()
             elif args.view == 'all':
-                results = manager.refresh_all_views()
+                results = manager.refresh_all_views(full=args.full)
             else:
-                result = manager.refresh_view(args.view)
+                result = manager.refresh_view(args.view, full=args.full)
                 results = [result]
             
             # Check for failures